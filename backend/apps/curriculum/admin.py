@@ -13,7 +13,7 @@ from .models import (
     Course, Unit, Lesson, Sentence, Flashcard, GrammarRule,
     PhonemeCategory, Phoneme, PhonemeWord, MinimalPair,
     PronunciationLesson, TongueTwister,
-    AudioSource, AudioCache, AudioVersion
+    AudioSource, AudioCache, AudioVersion, AudioBatchRun
 )
 
 
@@ -1115,6 +1115,51 @@ class AudioVersionAdmin(admin.ModelAdmin):
     deactivate_selected_versions.short_description = "✗ Deactivate selected versions"
 
 
+@admin.register(AudioBatchRun)
+class AudioBatchRunAdmin(admin.ModelAdmin):
+    """
+    Admin interface for chunked TTS batch runs.
+    
+    Features:
+    - Progress, failures and throughput of each run
+    - Resume runs from the chunks not completed yet
+    """
+    
+    list_display = [
+        'id', 'kind', 'status', 'progress_display', 'succeeded', 'failed', 'skipped',
+        'items_per_second', 'created_at'
+    ]
+    list_filter = ['kind', 'status']
+    readonly_fields = [
+        'kind', 'status', 'items', 'params', 'chunk_size', 'total_chunks', 'completed_chunks',
+        'succeeded', 'failed', 'skipped', 'failures', 'task_id', 'started_at', 'dispatched_at',
+        'finished_at', 'elapsed_seconds', 'items_per_second', 'created_at', 'updated_at'
+    ]
+    actions = ['resume_runs']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def progress_display(self, obj):
+        """Completed chunks"""
+        return f"{len(obj.completed_chunks)}/{obj.total_chunks} ({obj.progress_percent}%)"
+    progress_display.short_description = 'Chunks'
+    
+    def resume_runs(self, request, queryset):
+        """Re-dispatch the pending chunks of the selected runs"""
+        from apps.curriculum.tasks import resume_audio_batch_run
+        
+        runs = [run for run in queryset if run.status != 'running' and run.pending_chunks()]
+        for run in runs:
+            resume_audio_batch_run.delay(run.id)
+        
+        self.message_user(
+            request,
+            f"🔁 Resumed {len(runs)} batch run(s). Runs still running or complete were skipped."
+        )
+    resume_runs.short_description = "🔁 Resume selected runs"
+
+
 # =============================================================================
 # MINIMAL PAIR ADMIN
 # =============================================================================
@@ -15,6 +15,7 @@ from datetime import timedelta
 
 from apps.curriculum.models import Phoneme, PhonemeAttempt, TongueTwister, MinimalPair
 from apps.users.models import UserPhonemeProgress
+from services.progress_timeseries import BUCKET_DAY, BUCKETS, get_time_series
 
 
 class PhonemeProgressAPIView(APIView):
@@ -367,62 +368,46 @@ class ProgressHistoryAPIView(APIView):
     
     Query params:
         - phoneme_id: specific phoneme (optional)
-        - days: number of days (default 30)
+        - days: number of days (default 30, today included)
+        - bucket: 'day' or 'week' (default day); empty buckets are zero-filled
     """
     
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         phoneme_id = request.query_params.get('phoneme_id')
-        days = int(request.query_params.get('days', 30))
-        
-        # Calculate date range
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=days)
-        
-        # Filter attempts
-        attempts = PhonemeAttempt.objects.filter(
-            user=request.user,
-            attempted_at__gte=start_date,
-            attempted_at__lte=end_date
-        ).order_by('attempted_at')
-        
-        if phoneme_id:
-            attempts = attempts.filter(phoneme_id=phoneme_id)
-        
-        # Group by date
-        daily_data = {}
-        for attempt in attempts:
-            date_key = attempt.attempted_at.date().isoformat()
-            
-            if date_key not in daily_data:
-                daily_data[date_key] = {
-                    'date': date_key,
-                    'attempts': 0,
-                    'total_accuracy': 0,
-                    'avg_accuracy': 0,
-                    'successful_attempts': 0
-                }
-            
-            daily_data[date_key]['attempts'] += 1
-            daily_data[date_key]['total_accuracy'] += attempt.accuracy
-            if attempt.accuracy >= 70:
-                daily_data[date_key]['successful_attempts'] += 1
-        
-        # Calculate averages
-        for data in daily_data.values():
-            data['avg_accuracy'] = round(data['total_accuracy'] / data['attempts'], 2)
-            del data['total_accuracy']  # Remove intermediate calculation
-        
-        # Convert to list sorted by date
-        history = sorted(daily_data.values(), key=lambda x: x['date'])
+        try:
+            days = max(1, int(request.query_params.get('days', 30)))
+        except ValueError:
+            days = 30
+        bucket = request.query_params.get('bucket', BUCKET_DAY)
+        if bucket not in BUCKETS:
+            bucket = BUCKET_DAY
+        
+        # One grouped query, zero-filled and cached per user
+        series = get_time_series(
+            request.user, 'phoneme_attempts', days, bucket,
+            phoneme_id=int(phoneme_id) if phoneme_id else None
+        )
+        values = series['values']
+        history = [
+            {
+                'date': start.isoformat(),
+                'attempts': values['attempts'][i],
+                'avg_accuracy': values['avg_accuracy'][i],
+                'successful_attempts': values['successful_attempts'][i]
+            }
+            for i, start in enumerate(series['dates'])
+        ]
         
+        end_date = timezone.localdate()
         return Response({
             'history': history,
             'period': {
-                'start_date': start_date.date().isoformat(),
-                'end_date': end_date.date().isoformat(),
-                'days': days
+                'start_date': (end_date - timedelta(days=days - 1)).isoformat(),
+                'end_date': end_date.isoformat(),
+                'days': days,
+                'bucket': bucket
             }
         })
 
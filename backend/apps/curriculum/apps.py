@@ -11,3 +11,8 @@ class CurriculumConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.curriculum'
     verbose_name = 'Curriculum Management'
+    
+    def ready(self):
+        import apps.curriculum.signals  # noqa
+        from apps.curriculum.usage_counters import install_shutdown_hooks
+        install_shutdown_hooks()
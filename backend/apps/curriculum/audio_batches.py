@@ -0,0 +1,258 @@
+"""
+Chunked TTS Batch Runs
+
+Fan-out/fan-in orchestration for bulk audio generation (phoneme audio from
+the admin and Celery Beat, flashcard audio of whole decks). No task ever
+waits on another task's result:
+
+    start_audio_batch()  ->  AudioBatchRun row
+        chord(process_audio_batch_chunk x N)  ->  finalize_audio_batch
+
+Features:
+- Items split into chunks of settings.AUDIO_BATCH_CHUNK_SIZE; each chunk
+  task synthesizes its items concurrently on one event loop
+  (TTSBatchSynthesizer / FlashcardTTSService.generate_batch)
+- Each chunk records its counters and failures on the run under a row lock;
+  recording is idempotent, so redelivered chunks are not counted twice
+- The chord callback stamps status, elapsed time and items/second
+- resume_audio_batch() re-dispatches only the chunks not recorded yet
+- Chunk handlers registered per run kind (BATCH_HANDLERS)
+
+Usage:
+    from apps.curriculum.audio_batches import start_audio_batch, resume_audio_batch
+
+    run = start_audio_batch('phoneme_audio', phoneme_ids, {'voice_id': voice_id})
+    run.refresh_from_db()
+    run.status, run.progress_percent, run.items_per_second
+
+    resume_audio_batch(run.id)
+"""
+
+import logging
+import math
+import time
+from functools import partial
+from typing import Dict, Iterable, Optional
+
+from celery import chord
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import AudioBatchRun
+
+logger = logging.getLogger(__name__)
+
+# Run kind -> chunk handler ``(items, params) -> summary``, where summary is
+# {'succeeded': int, 'failed': int, 'skipped': int, 'failures': [{'item', 'error'}]}
+BATCH_HANDLERS = {
+    'phoneme_audio': 'apps.curriculum.tasks.synthesize_phoneme_chunk',
+    'flashcard_audio': 'apps.vocabulary.tasks.synthesize_word_chunk',
+}
+
+MAX_RECORDED_FAILURES = 100
+
+
+def start_audio_batch(
+    kind: str,
+    items: Iterable,
+    params: Optional[Dict] = None,
+    chunk_size: Optional[int] = None
+) -> AudioBatchRun:
+    """
+    Create a batch run and dispatch its chunks once the transaction commits.
+
+    Args:
+        kind: AudioBatchRun.KIND_CHOICES value (key of BATCH_HANDLERS)
+        items: Phoneme IDs / words (duplicates dropped, order kept)
+        params: Handler parameters (voice, speed, force_regenerate...)
+        chunk_size: Items per chunk task (default: settings.AUDIO_BATCH_CHUNK_SIZE)
+
+    Returns:
+        AudioBatchRun (dispatched immediately outside a transaction)
+    """
+    if kind not in BATCH_HANDLERS:
+        raise ValueError(f"Unknown audio batch kind: {kind}")
+
+    items = list(dict.fromkeys(items))
+    chunk_size = max(1, chunk_size or getattr(settings, 'AUDIO_BATCH_CHUNK_SIZE', 25))
+    run = AudioBatchRun.objects.create(
+        kind=kind,
+        items=items,
+        params=params or {},
+        chunk_size=chunk_size,
+        total_chunks=math.ceil(len(items) / chunk_size),
+    )
+    logger.info(f"🎙️ Audio batch #{run.id} ({kind}): {len(items)} items in {run.total_chunks} chunks")
+
+    # Workers must see the run row before they pick up its chunks
+    transaction.on_commit(partial(dispatch_audio_batch, run.id))
+    return run
+
+
+def dispatch_audio_batch(run_id: int) -> Optional[str]:
+    """
+    Queue a chord over the run's pending chunks.
+
+    Args:
+        run_id: AudioBatchRun ID
+
+    Returns:
+        Chord task ID (None when nothing was pending and the run was closed)
+    """
+    from .tasks import finalize_audio_batch, process_audio_batch_chunk
+
+    run = AudioBatchRun.objects.get(id=run_id)
+    pending = run.pending_chunks()
+    now = timezone.now()
+    AudioBatchRun.objects.filter(id=run_id).update(
+        status='running',
+        started_at=run.started_at or now,
+        dispatched_at=now,
+        finished_at=None,
+    )
+
+    if not pending:
+        finalize_run(run_id)
+        return None
+
+    result = chord(
+        process_audio_batch_chunk.s(run_id, index) for index in pending
+    )(finalize_audio_batch.si(run_id))
+    AudioBatchRun.objects.filter(id=run_id).update(task_id=result.id or '')
+    return result.id
+
+
+def resume_audio_batch(run_id: int) -> Optional[str]:
+    """
+    Re-dispatch the chunks of a run that were never recorded.
+
+    Args:
+        run_id: AudioBatchRun ID
+
+    Returns:
+        Chord task ID (None when every chunk was already recorded)
+    """
+    run = AudioBatchRun.objects.get(id=run_id)
+    logger.info(f"🔁 Resuming audio batch #{run_id}: {len(run.pending_chunks())}/{run.total_chunks} chunks pending")
+    return dispatch_audio_batch(run_id)
+
+
+def process_chunk(run_id: int, index: int) -> Dict:
+    """
+    Synthesize one chunk and record it on the run.
+
+    Handler errors leave the chunk pending (the run ends 'failed' and can be
+    resumed) instead of failing the chord.
+
+    Returns:
+        dict: {'chunk': int, 'recorded': bool, ...handler summary or 'error'}
+    """
+    run = AudioBatchRun.objects.get(id=run_id)
+    if index in run.completed_chunks:
+        return {'chunk': index, 'recorded': False, 'message': 'Chunk already recorded'}
+
+    items = run.chunk_items(index)
+    handler = import_string(BATCH_HANDLERS[run.kind])
+    started = time.monotonic()
+    try:
+        summary = handler(items, run.params)
+    except Exception as e:
+        logger.error(f"❌ Audio batch #{run_id} chunk {index} failed: {e}")
+        return {'chunk': index, 'recorded': False, 'error': str(e)}
+
+    recorded = record_chunk(run_id, index, summary)
+    logger.info(
+        f"Audio batch #{run_id} chunk {index + 1}/{run.total_chunks}: "
+        f"{summary.get('succeeded', 0)} ok, {summary.get('failed', 0)} failed, "
+        f"{summary.get('skipped', 0)} skipped in {time.monotonic() - started:.2f}s"
+    )
+    return {
+        'chunk': index,
+        'recorded': recorded,
+        'succeeded': summary.get('succeeded', 0),
+        'failed': summary.get('failed', 0),
+        'skipped': summary.get('skipped', 0),
+    }
+
+
+def record_chunk(run_id: int, index: int, summary: Dict) -> bool:
+    """
+    Add a chunk's counters to the run (once per chunk).
+
+    Returns:
+        True if recorded, False if the chunk had been recorded before
+    """
+    with transaction.atomic():
+        run = AudioBatchRun.objects.select_for_update().get(id=run_id)
+        if index in run.completed_chunks:
+            return False
+
+        run.succeeded += summary.get('succeeded', 0)
+        run.failed += summary.get('failed', 0)
+        run.skipped += summary.get('skipped', 0)
+        room = MAX_RECORDED_FAILURES - len(run.failures)
+        if room > 0:
+            run.failures += list(summary.get('failures', []))[:room]
+        run.completed_chunks = sorted(run.completed_chunks + [index])
+        run.save(update_fields=[
+            'succeeded', 'failed', 'skipped', 'failures', 'completed_chunks', 'updated_at'
+        ])
+    return True
+
+
+def finalize_run(run_id: int) -> Dict:
+    """
+    Close the current dispatch of a run: status, elapsed time, throughput.
+
+    Returns:
+        dict: Run summary
+    """
+    with transaction.atomic():
+        run = AudioBatchRun.objects.select_for_update().get(id=run_id)
+        now = timezone.now()
+        if run.dispatched_at:
+            run.elapsed_seconds += (now - run.dispatched_at).total_seconds()
+
+        pending = run.pending_chunks()
+        if pending:
+            run.status = 'failed'
+        elif run.failed:
+            run.status = 'partial'
+        else:
+            run.status = 'completed'
+        run.finished_at = now
+        run.items_per_second = (
+            round(run.processed_items / run.elapsed_seconds, 2) if run.elapsed_seconds > 0 else 0
+        )
+        run.save(update_fields=[
+            'status', 'finished_at', 'elapsed_seconds', 'items_per_second', 'updated_at'
+        ])
+
+    summary = run_summary(run)
+    emoji = '✅' if run.status == 'completed' else '⚠️'
+    logger.info(
+        f"{emoji} Audio batch #{run_id} {run.status}: {run.succeeded} ok, {run.failed} failed, "
+        f"{run.skipped} skipped, {len(pending)} chunks pending "
+        f"({run.items_per_second} items/s)"
+    )
+    return summary
+
+
+def run_summary(run: AudioBatchRun) -> Dict:
+    """Dict view of a run for task results and API responses."""
+    return {
+        'batch_run_id': run.id,
+        'kind': run.kind,
+        'status': run.status,
+        'total': run.total_items,
+        'successful': run.succeeded,
+        'failed': run.failed,
+        'skipped': run.skipped,
+        'chunks': run.total_chunks,
+        'pending_chunks': run.pending_chunks(),
+        'elapsed_seconds': round(run.elapsed_seconds, 3),
+        'items_per_second': run.items_per_second,
+    }
+
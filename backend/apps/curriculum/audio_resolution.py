@@ -0,0 +1,378 @@
+"""
+Phoneme Audio Resolution Cache
+
+Which AudioSource plays for a phoneme (and voice), as decided by
+PhonemeAudioService's fallback chain, cached as a plain serializable
+descriptor: the AudioSource fields plus URL and quality score. A hit
+rebuilds the AudioSource without a query.
+
+Features:
+- Two tiers:
+    * bounded in-process LRU (AUDIO_RESOLUTION_LRU_SIZE entries), no I/O
+    * shared cache backend (Redis/Memcached), so a worker's cold LRU is
+      filled from what other workers resolved
+- Generation counters instead of deletes: every key embeds the namespace
+  generation and the phoneme's generation, so bumping one counter (one
+  cache.incr) invalidates a phoneme, all its voices, or everything;
+  orphaned entries age out of the LRU and expire in the shared tier
+- Shared generations are kept in process memory for
+  AUDIO_RESOLUTION_LOCAL_TTL (the bound LRU copies already have), so an
+  LRU hit does no cache I/O; a bump made in this process is seen at once,
+  one made elsewhere within that TTL
+- TTS descriptors never outlive AudioSource.cached_until
+- Hit/miss metrics per process (local hits, shared hits, misses, errors)
+- Local-only mode (AUDIO_RESOLUTION_SHARED_CACHE, auto for LocMem/Dummy
+  caches and tests): generations and descriptors live in process memory
+- A failing shared tier is a miss, never an error for the caller
+
+Usage:
+    from apps.curriculum.audio_resolution import get_resolution_cache
+
+    resolution_cache = get_resolution_cache()
+    descriptor = resolution_cache.get(phoneme.id, voice_id)
+    resolution_cache.set(phoneme.id, voice_id, describe_audio(audio), ttl=3600)
+
+    invalidate_phoneme_audio(phoneme.id)    # One phoneme, every voice
+    invalidate_all_phoneme_audio()          # Whole namespace
+    resolution_cache.stats()
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.cache_versions import bump_version, get_versions
+
+from .usage_counters import LOCAL_CACHE_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_VERSION_KEY = 'phoneme_audio:version'
+DATETIME_FIELDS = ('cached_until', 'created_at', 'updated_at')
+
+
+def _phoneme_version_key(phoneme_id: int) -> str:
+    return f"phoneme_audio:version:{phoneme_id}"
+
+
+def _descriptor_key(namespace: int, version: int, phoneme_id: int, voice_id: Optional[str]) -> str:
+    return f"phoneme_audio:{namespace}.{version}:{phoneme_id}:{voice_id or '*'}"
+
+
+def uses_shared_tier() -> bool:
+    """Keep descriptors and generations in the cache backend (True) or in process memory (False)."""
+    shared = getattr(settings, 'AUDIO_RESOLUTION_SHARED_CACHE', None)
+    if shared is not None:
+        return shared
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+# =========================================================================
+# DESCRIPTORS
+# =========================================================================
+
+def describe_audio(audio) -> Dict:
+    """
+    Serializable descriptor of an AudioSource (JSON-safe values only).
+
+    Every concrete field except metadata, plus 'url' and 'quality'.
+    """
+    descriptor = {
+        'id': audio.id,
+        'phoneme_id': audio.phoneme_id,
+        'source_type': audio.source_type,
+        'voice_id': audio.voice_id,
+        'language': audio.language,
+        'audio_file': audio.audio_file.name or '',
+        'audio_duration': audio.audio_duration,
+        'url': audio.get_url(),
+        'quality': audio.get_quality_score(),
+    }
+    for name in DATETIME_FIELDS:
+        value = getattr(audio, name)
+        descriptor[name] = value.isoformat() if value else None
+    return descriptor
+
+
+def audio_from_descriptor(descriptor: Dict):
+    """
+    AudioSource rebuilt from a descriptor, as if loaded from the database
+    (metadata is deferred and loads on first access).
+    """
+    from .models import AudioSource
+
+    values = dict(descriptor)
+    for name in DATETIME_FIELDS:
+        values[name] = parse_datetime(values[name]) if values[name] else None
+    fields = [f.attname for f in AudioSource._meta.concrete_fields if f.attname in values]
+    return AudioSource.from_db('default', fields, [values[name] for name in fields])
+
+
+def descriptor_ttl(descriptor: Dict, ttl: int) -> int:
+    """TTL capped so a TTS descriptor expires with its audio (0 = don't cache)."""
+    if descriptor['source_type'] == 'native':
+        return ttl
+    if not descriptor['cached_until']:
+        return 0
+    remaining = (parse_datetime(descriptor['cached_until']) - timezone.now()).total_seconds()
+    return max(0, min(ttl, int(remaining)))
+
+
+# =========================================================================
+# CACHE
+# =========================================================================
+
+class LocalLRU:
+    """Bounded, thread-safe {key: (expires_at, value)} in least recently used order."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
+
+
+class AudioResolutionCache:
+    """
+    In-process LRU in front of the shared cache, keyed by generation.
+
+    Args:
+        max_entries: LRU bound (default: settings.AUDIO_RESOLUTION_LRU_SIZE)
+    """
+
+    STATS = ('local_hits', 'shared_hits', 'misses', 'sets', 'invalidations', 'errors')
+    DEFAULT_TTL = 3600
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.local = LocalLRU(max_entries or getattr(settings, 'AUDIO_RESOLUTION_LRU_SIZE', 2048))
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(self.STATS, 0)
+        # Local-only generations (shared tier off); start from a fresh
+        # number so keys from before a reset are never taken for current
+        self._versions: Dict = {}
+        self._base_version = time.time_ns()
+        # Shared generations read recently: {key: (expires_at, version)}
+        self._shared_seen: Dict[str, Tuple[float, int]] = {}
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    # Generations
+
+    def _local_versions(self, phoneme_id: int):
+        with self._lock:
+            return (
+                self._versions.get(NAMESPACE_VERSION_KEY, self._base_version),
+                self._versions.get(phoneme_id, self._base_version),
+            )
+
+    def _shared_versions(self, phoneme_id: int):
+        """
+        Namespace and phoneme generation: from process memory while fresh,
+        else one get_many (created on first use).
+        """
+        keys = (NAMESPACE_VERSION_KEY, _phoneme_version_key(phoneme_id))
+        now = time.monotonic()
+        with self._lock:
+            seen = {key: self._shared_seen.get(key) for key in keys}
+        versions = {key: entry[1] for key, entry in seen.items() if entry and entry[0] > now}
+        stale = [key for key in keys if key not in versions]
+        if stale:
+            fetched = get_versions(stale)
+            expires_at = now + self._local_ttl(self.DEFAULT_TTL)
+            with self._lock:
+                for key, version in fetched.items():
+                    self._shared_seen[key] = (expires_at, version)
+            versions.update(fetched)
+        return versions[keys[0]], versions[keys[1]]
+
+    def _key(self, phoneme_id: int, voice_id: Optional[str], shared: bool) -> str:
+        versions = self._shared_versions(phoneme_id) if shared else self._local_versions(phoneme_id)
+        return _descriptor_key(*versions, phoneme_id, voice_id)
+
+    def _bump(self, key, shared: bool) -> None:
+        if shared:
+            version_key = key if key == NAMESPACE_VERSION_KEY else _phoneme_version_key(key)
+            bump_version(version_key)
+            with self._lock:
+                self._shared_seen.pop(version_key, None)
+        else:
+            with self._lock:
+                self._versions[key] = self._versions.get(key, self._base_version) + 1
+
+    # Lookups
+
+    def get(self, phoneme_id: int, voice_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Cached descriptor of the audio resolved for a phoneme.
+
+        Args:
+            phoneme_id: Phoneme ID
+            voice_id: Voice the audio was resolved for (None = any)
+
+        Returns:
+            Descriptor dict or None
+        """
+        shared = uses_shared_tier()
+        try:
+            key = self._key(phoneme_id, voice_id, shared)
+            descriptor = self.local.get(key)
+            if descriptor is not None:
+                self._count('local_hits')
+                return descriptor
+            if shared:
+                descriptor = cache.get(key)
+                if descriptor is not None:
+                    self.local.set(key, descriptor, descriptor_ttl(descriptor, self._local_ttl(self.DEFAULT_TTL)))
+                    self._count('shared_hits')
+                    return descriptor
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Phoneme audio cache unavailable, resolving from the database: {e}")
+        self._count('misses')
+        return None
+
+    def set(self, phoneme_id: int, voice_id: Optional[str], descriptor: Dict, ttl: int) -> bool:
+        """
+        Cache a descriptor in both tiers.
+
+        Args:
+            phoneme_id: Phoneme ID
+            voice_id: Voice the audio was resolved for (None = any)
+            descriptor: describe_audio() result
+            ttl: Seconds (capped by the audio's cached_until)
+
+        Returns:
+            True if cached
+        """
+        ttl = descriptor_ttl(descriptor, ttl)
+        if ttl <= 0:
+            return False
+        shared = uses_shared_tier()
+        try:
+            key = self._key(phoneme_id, voice_id, shared)
+            if shared:
+                cache.set(key, descriptor, ttl)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Phoneme audio cache unavailable, not cached: {e}")
+            return False
+        self.local.set(key, descriptor, self._local_ttl(ttl))
+        self._count('sets')
+        return True
+
+    @staticmethod
+    def _local_ttl(ttl: int) -> int:
+        # Kept short: the LRU copy must not outlive the shared entry by much
+        return min(ttl, getattr(settings, 'AUDIO_RESOLUTION_LOCAL_TTL', 300))
+
+    # Invalidation
+
+    def invalidate_phoneme(self, phoneme_id: int) -> None:
+        """Every voice of one phoneme (one counter bump)."""
+        self._invalidate(phoneme_id)
+
+    def invalidate_all(self) -> int:
+        """
+        Every phoneme (one counter bump).
+
+        Returns:
+            In-process entries dropped (shared entries are orphaned by the
+            bump and expire on their TTL)
+        """
+        self._invalidate(NAMESPACE_VERSION_KEY)
+        return self.local.clear()
+
+    def _invalidate(self, key) -> None:
+        try:
+            self._bump(key, uses_shared_tier())
+        except Exception as e:
+            self._count('errors')
+            logger.error(f"❌ Phoneme audio cache invalidation failed for {key}: {e}")
+            # The LRU can't tell which entries went stale: drop it
+            self.local.clear()
+            return
+        self._count('invalidations')
+
+    # Metrics
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            dict: counters, 'lookups', 'hit_rate', 'local_entries',
+            'max_entries', 'shared'
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats.update(
+            lookups=lookups,
+            hit_rate=round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else 0.0,
+            local_entries=len(self.local),
+            max_entries=self.local.max_entries,
+            shared=uses_shared_tier(),
+        )
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = dict.fromkeys(self.STATS, 0)
+
+
+_resolution_cache: Optional[AudioResolutionCache] = None
+_resolution_cache_lock = threading.Lock()
+
+
+def get_resolution_cache() -> AudioResolutionCache:
+    """Per-process AudioResolutionCache."""
+    global _resolution_cache
+    if _resolution_cache is None:
+        with _resolution_cache_lock:
+            if _resolution_cache is None:
+                _resolution_cache = AudioResolutionCache()
+    return _resolution_cache
+
+
+def invalidate_phoneme_audio(phoneme_id: int) -> None:
+    """Audio of a phoneme changed (new source, preferred source, deletion)."""
+    get_resolution_cache().invalidate_phoneme(phoneme_id)
+
+
+def invalidate_all_phoneme_audio() -> int:
+    """Every cached phoneme audio resolution is stale."""
+    return get_resolution_cache().invalidate_all()
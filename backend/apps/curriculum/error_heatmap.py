@@ -0,0 +1,254 @@
+"""
+Pronunciation Error Heatmap Document
+
+Per-user summary behind the error heatmap page
+(views_error_heatmap.PronunciationErrorHeatmapView).
+
+Features:
+- Built from 4 queries whatever the phoneme/lesson count:
+  1. Weak UserPhonemeProgress rows joined with phoneme + category
+  2. Weak lesson progress rows (accuracy annotated in SQL) with lesson + stage
+  3. One grouped aggregate over all lesson progress (totals, avg accuracy)
+  4. First published lesson for each of the top phoneme errors
+- The document holds plain dicts/lists only and is cached per user
+- Dropped when the user's phoneme or lesson progress changes
+  (apps/users/signals.py), so the page renders from one cache read
+
+Usage:
+    from apps.curriculum.error_heatmap import get_error_heatmap
+
+    context.update(get_error_heatmap(request.user))
+"""
+
+import logging
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, FloatField, Q
+from django.db.models.functions import Cast
+
+logger = logging.getLogger(__name__)
+
+HEATMAP_VERSION = 'v1'
+
+ERROR_THRESHOLD = 70        # Accuracy (%) below which a phoneme/lesson is an error
+CRITICAL_THRESHOLD = 50     # Lesson accuracy (%) recommended for a retake
+
+ENDING_STAGE = 4            # Stage holding the ending-sound / cluster lessons
+
+
+def heatmap_cache_key(user_id: int) -> str:
+    return f"error_heatmap:{HEATMAP_VERSION}:{user_id}"
+
+
+def invalidate_error_heatmap(user_id: int) -> None:
+    """Drop the user's heatmap document (progress changed)."""
+    cache.delete(heatmap_cache_key(user_id))
+
+
+def _lesson_accuracy():
+    """challenge_correct / challenge_total as a percentage (SQL expression)."""
+    return Cast(F('challenge_correct'), FloatField()) * 100.0 / F('challenge_total')
+
+
+def _phoneme_errors(user) -> List[Dict]:
+    """Practiced phonemes under the error threshold, highest error rate first."""
+    from apps.users.models import UserPhonemeProgress
+
+    rows = UserPhonemeProgress.objects.filter(
+        user=user,
+        discrimination_accuracy__lt=ERROR_THRESHOLD / 100
+    ).select_related('phoneme__category').order_by(
+        'discrimination_accuracy', 'phoneme__category__order', 'phoneme__order'
+    )
+
+    errors = []
+    for progress in rows:
+        phoneme = progress.phoneme
+        accuracy = progress.discrimination_accuracy * 100
+        errors.append({
+            'phoneme': {
+                'id': phoneme.id,
+                'ipa_symbol': phoneme.ipa_symbol,
+                'vietnamese_approx': phoneme.vietnamese_approx,
+                'vietnamese_comparison': phoneme.vietnamese_comparison,
+                'phoneme_type': phoneme.phoneme_type,
+                'category': phoneme.category.name_vi,
+            },
+            'accuracy': accuracy,
+            'attempts': progress.times_practiced,
+            'error_rate': 100 - accuracy,
+        })
+    return errors
+
+
+def _lesson_mistakes(user) -> List[Dict]:
+    """Lessons with challenge accuracy under the error threshold, lowest first."""
+    from apps.users.models import UserPronunciationLessonProgress
+
+    rows = UserPronunciationLessonProgress.objects.filter(
+        user=user,
+        challenge_total__gt=0
+    ).annotate(
+        accuracy=_lesson_accuracy()
+    ).filter(
+        accuracy__lt=ERROR_THRESHOLD
+    ).select_related('pronunciation_lesson__stage').order_by('accuracy')
+
+    mistakes = []
+    for progress in rows:
+        lesson = progress.pronunciation_lesson
+        stage = lesson.stage
+        mistakes.append({
+            'lesson': {
+                'id': lesson.id,
+                'title': lesson.title,
+                'title_vi': lesson.title_vi,
+                'slug': lesson.slug,
+            },
+            'stage': {'number': stage.number, 'name_vi': stage.name_vi} if stage else None,
+            'accuracy': progress.accuracy,
+            'correct': progress.challenge_correct,
+            'total': progress.challenge_total,
+        })
+    return mistakes
+
+
+def _lesson_totals(user) -> Dict:
+    """Lesson counts and average challenge accuracy in one aggregate query."""
+    from apps.users.models import UserPronunciationLessonProgress
+
+    return UserPronunciationLessonProgress.objects.filter(user=user).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        avg_accuracy=Avg(_lesson_accuracy(), filter=Q(challenge_total__gt=0)),
+    )
+
+
+def _lessons_for_phonemes(phoneme_ids: List[int]) -> Dict[int, Dict]:
+    """First published lesson (curriculum order) covering each phoneme."""
+    from apps.curriculum.models import PronunciationLesson
+
+    if not phoneme_ids:
+        return {}
+
+    rows = PronunciationLesson.objects.filter(
+        status='published',
+        phonemes__in=phoneme_ids
+    ).annotate(
+        phoneme_ref=F('phonemes')
+    ).values('phoneme_ref', 'id', 'title', 'title_vi', 'slug')
+
+    lessons = {}
+    for row in rows:
+        lessons.setdefault(row.pop('phoneme_ref'), row)
+    return lessons
+
+
+def _recommendations(phoneme_errors: List[Dict], common_mistakes: List[Dict]) -> List[Dict]:
+    """Lessons for the top 5 phoneme errors, then retakes of the worst lessons."""
+    top_errors = phoneme_errors[:5]
+    lessons = _lessons_for_phonemes([error['phoneme']['id'] for error in top_errors])
+
+    recommendations = []
+    for error in top_errors:
+        lesson = lessons.get(error['phoneme']['id'])
+        if lesson:
+            recommendations.append({
+                'type': 'phoneme',
+                'title': f"Luyện tập âm /{error['phoneme']['ipa_symbol']}/",
+                'reason': f'Độ chính xác chỉ {error["accuracy"]:.0f}%',
+                'lesson': lesson,
+                'priority': 'high' if error['error_rate'] > 50 else 'medium'
+            })
+
+    for mistake in common_mistakes[:3]:
+        if mistake['accuracy'] < CRITICAL_THRESHOLD:
+            recommendations.append({
+                'type': 'lesson',
+                'title': f'Học lại: {mistake["lesson"]["title_vi"]}',
+                'reason': f'Chỉ {mistake["accuracy"]:.0f}% câu đúng',
+                'lesson': mistake['lesson'],
+                'priority': 'critical'
+            })
+    return recommendations
+
+
+def _error_categories(phoneme_errors: List[Dict], common_mistakes: List[Dict]) -> Dict:
+    """Vowel/consonant phoneme errors and ending-sound/cluster lesson errors."""
+    from apps.curriculum.models import Phoneme
+
+    vowels = sum(1 for error in phoneme_errors if error['phoneme']['phoneme_type'] in Phoneme.VOWEL_TYPES)
+
+    ending_sounds = clusters = 0
+    for mistake in common_mistakes:
+        if not mistake['stage'] or mistake['stage']['number'] != ENDING_STAGE:
+            continue
+        title = mistake['lesson']['title'].lower()
+        title_vi = mistake['lesson']['title_vi'].lower()
+        if 'ending' in title or 'cuối' in title_vi:
+            ending_sounds += 1
+        elif 'cluster' in title or 'tổ hợp' in title_vi:
+            clusters += 1
+
+    return {
+        'vowels': vowels,
+        'consonants': len(phoneme_errors) - vowels,
+        'ending_sounds': ending_sounds,
+        'clusters': clusters,
+    }
+
+
+def build_error_heatmap(user) -> Dict:
+    """
+    Compute the heatmap document (no cache).
+
+    Args:
+        user: User instance
+
+    Returns:
+        Template context dict: phoneme_errors, common_mistakes,
+        recommendations, lesson totals, error_categories, has_errors
+    """
+    phoneme_errors = _phoneme_errors(user)
+    common_mistakes = _lesson_mistakes(user)
+    totals = _lesson_totals(user)
+
+    total_lessons = totals['total']
+    completed_lessons = totals['completed']
+
+    return {
+        'phoneme_errors': phoneme_errors[:10],  # Top 10 errors
+        'common_mistakes': common_mistakes[:5],  # Top 5 mistakes
+        'recommendations': _recommendations(phoneme_errors, common_mistakes),
+        'total_lessons': total_lessons,
+        'completed_lessons': completed_lessons,
+        'completion_rate': int(completed_lessons / total_lessons * 100) if total_lessons > 0 else 0,
+        'avg_accuracy': int(totals['avg_accuracy'] or 0),
+        'error_categories': _error_categories(phoneme_errors, common_mistakes),
+        'has_errors': bool(phoneme_errors or common_mistakes),
+    }
+
+
+def get_error_heatmap(user, use_cache: bool = True) -> Dict:
+    """
+    Cached heatmap document for a user.
+
+    Args:
+        user: User instance
+        use_cache: Read/write the per-user cache
+
+    Returns:
+        Heatmap document (see build_error_heatmap)
+    """
+    key = heatmap_cache_key(user.id)
+    if use_cache:
+        document = cache.get(key)
+        if document is not None:
+            return document
+
+    document = build_error_heatmap(user)
+    if use_cache:
+        cache.set(key, document, getattr(settings, 'ERROR_HEATMAP_CACHE_TIMEOUT', 3600))
+    return document
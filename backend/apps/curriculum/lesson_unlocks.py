@@ -0,0 +1,307 @@
+"""
+Pronunciation Lesson Unlock Resolver
+
+Access and progress of every pronunciation lesson for one user, for the
+library page (template_views.PronunciationLibraryView) and the lesson
+list API (views_pronunciation.PronunciationLessonListView).
+
+Features:
+- Prerequisite graph (stage -> required stages, lesson -> prerequisite
+  lessons, published lessons per stage) loaded with 4 queries, kept in the
+  Django cache + process memory under a version number bumped when a
+  curriculum edit commits (apps/curriculum/signals.py); a graph older than
+  GRAPH_MAX_AGE is rebuilt whatever the version, so a bump missed by this
+  process (per-process cache) is picked up
+- Lessons asked for but missing from the graph (created after it was
+  built) trigger a rebuild instead of a KeyError
+- Lessons kept in topological order (prerequisites first, curriculum order
+  otherwise), so one pass resolves every lesson with each stage's
+  completion computed once
+- The user's lesson progress (status + completed screens) is one query
+- Same rules and lock reasons as PronunciationLesson.can_access(), which
+  delegates here
+
+Usage:
+    from apps.curriculum.lesson_unlocks import resolve_lesson_access
+
+    access = resolve_lesson_access(request.user, [lesson.id for lesson in lessons])
+    access[lesson.id]['can_access'], access[lesson.id]['progress']
+"""
+
+import heapq
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from services.cache_versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+GRAPH_VERSION_KEY = 'lesson_unlocks:graph:version'
+GRAPH_TTL = 24 * 3600
+GRAPH_MAX_AGE = 300         # Seconds a built graph is used, in any tier
+
+LESSON_SCREENS = 5          # Intro, Practice 1, Practice 2, Challenge, Summary
+
+# Lesson the resolver returned nothing for (deleted meanwhile): open, no
+# progress, as PronunciationLesson.can_access() treats it
+UNRESOLVED_ACCESS = {
+    'can_access': True, 'reason': 'unlocked', 'lock_reason': None,
+    'progress': 0, 'is_completed': False, 'status': None,
+}
+
+
+@dataclass
+class LessonGraph:
+    """Stage and lesson prerequisites of the pronunciation curriculum."""
+
+    version: int
+    built_at: float = field(default_factory=time.time)
+    order: List[int] = field(default_factory=list)                  # All lessons, topological
+    lesson_stage: Dict[int, Optional[int]] = field(default_factory=dict)
+    lesson_title: Dict[int, str] = field(default_factory=dict)
+    lesson_prerequisites: Dict[int, List[int]] = field(default_factory=dict)
+    stage_number: Dict[int, int] = field(default_factory=dict)
+    stage_requires: Dict[int, List[int]] = field(default_factory=dict)
+    stage_lessons: Dict[int, List[int]] = field(default_factory=dict)   # Published only
+
+
+# =========================================================================
+# GRAPH
+# =========================================================================
+
+def get_graph_version() -> int:
+    return get_version(GRAPH_VERSION_KEY)
+
+
+def invalidate_lesson_graph() -> None:
+    """New graph version (a stage, lesson or prerequisite changed)."""
+    bump_version(GRAPH_VERSION_KEY)
+
+
+def _graph_key(version: int) -> str:
+    return f"lesson_unlocks:graph:{version}"
+
+
+def _topological_order(nodes: List[int], edges: Dict[int, List[int]]) -> List[int]:
+    """
+    Kahn's algorithm; ties (and nodes on a cycle) keep their order in nodes.
+
+    Args:
+        nodes: Lesson IDs in curriculum order
+        edges: lesson -> lessons that must come before it
+    """
+    position = {node: i for i, node in enumerate(nodes)}
+    pending = {node: 0 for node in nodes}
+    followers = defaultdict(list)
+    for node in nodes:
+        for before in edges.get(node, ()):
+            if before in pending and before != node:
+                pending[node] += 1
+                followers[before].append(node)
+
+    ready = [(position[node], node) for node in nodes if pending[node] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, node = heapq.heappop(ready)
+        order.append(node)
+        for follower in followers[node]:
+            pending[follower] -= 1
+            if pending[follower] == 0:
+                heapq.heappush(ready, (position[follower], follower))
+
+    if len(order) < len(nodes):
+        # Prerequisite cycle: keep the remaining lessons in curriculum order
+        placed = set(order)
+        order += [node for node in nodes if node not in placed]
+    return order
+
+
+def build_lesson_graph(version: int = 0) -> LessonGraph:
+    """Four queries: stages, stage prerequisites, lessons, lesson prerequisites."""
+    from .models import CurriculumStage, PronunciationLesson
+
+    graph = LessonGraph(version=version)
+
+    stages = CurriculumStage.objects.values_list('id', 'number')
+    stage_rank = {}
+    for rank, (stage_id, number) in enumerate(stages):
+        graph.stage_number[stage_id] = number
+        stage_rank[stage_id] = rank
+
+    required = CurriculumStage.required_previous_stages.through.objects.values_list(
+        'from_curriculumstage_id', 'to_curriculumstage_id'
+    )
+    for stage_id, required_id in required:
+        graph.stage_requires.setdefault(stage_id, []).append(required_id)
+    for required_ids in graph.stage_requires.values():
+        required_ids.sort(key=lambda stage_id: stage_rank.get(stage_id, 0))
+
+    lessons = list(PronunciationLesson.objects.values_list('id', 'stage_id', 'title_vi', 'status'))
+    for lesson_id, stage_id, title_vi, status in lessons:
+        graph.lesson_stage[lesson_id] = stage_id
+        graph.lesson_title[lesson_id] = title_vi
+        if status == 'published' and stage_id is not None:
+            graph.stage_lessons.setdefault(stage_id, []).append(lesson_id)
+
+    prerequisites = PronunciationLesson.prerequisites.through.objects.values_list(
+        'from_pronunciationlesson_id', 'to_pronunciationlesson_id'
+    )
+    for lesson_id, prerequisite_id in prerequisites:
+        graph.lesson_prerequisites.setdefault(lesson_id, []).append(prerequisite_id)
+
+    # Lessons of required stages and prerequisite lessons come first
+    curriculum_order = [lesson_id for lesson_id, *_ in lessons]
+    lesson_rank = {lesson_id: i for i, lesson_id in enumerate(curriculum_order)}
+    for prerequisite_ids in graph.lesson_prerequisites.values():
+        prerequisite_ids.sort(key=lambda lesson_id: lesson_rank.get(lesson_id, 0))
+
+    edges = {}
+    for lesson_id, stage_id in graph.lesson_stage.items():
+        before = list(graph.lesson_prerequisites.get(lesson_id, ()))
+        for required_id in graph.stage_requires.get(stage_id, ()):
+            before += graph.stage_lessons.get(required_id, ())
+        edges[lesson_id] = before
+    graph.order = _topological_order(curriculum_order, edges)
+
+    return graph
+
+
+_graph: Optional[LessonGraph] = None
+
+
+def _is_current(graph: Optional[LessonGraph], version: int) -> bool:
+    return (
+        graph is not None
+        and graph.version == version
+        and time.time() - graph.built_at < GRAPH_MAX_AGE
+    )
+
+
+def get_lesson_graph(rebuild: bool = False) -> LessonGraph:
+    """
+    Current graph: process memory, then Django cache, then database.
+
+    Args:
+        rebuild: Skip both cached copies (e.g. a lesson is missing from them)
+    """
+    global _graph
+    version = get_graph_version()
+    if not rebuild and _is_current(_graph, version):
+        return _graph
+
+    graph = None if rebuild else cache.get(_graph_key(version))
+    if not _is_current(graph, version):
+        graph = build_lesson_graph(version)
+        cache.set(_graph_key(version), graph, GRAPH_TTL)
+        logger.info(f"Built lesson unlock graph v{version}: {len(graph.order)} lessons")
+
+    _graph = graph
+    return graph
+
+
+# =========================================================================
+# RESOLVER
+# =========================================================================
+
+def _user_progress(user) -> Dict[int, Tuple[str, int]]:
+    """{lesson_id: (status, completed screen count)} in one query."""
+    from apps.users.models import UserPronunciationLessonProgress
+
+    rows = UserPronunciationLessonProgress.objects.filter(user=user).values_list(
+        'pronunciation_lesson_id', 'status', 'completed_screens'
+    )
+    return {lesson_id: (status, len(screens or [])) for lesson_id, status, screens in rows}
+
+
+def _progress_percent(status: Optional[str], screens: int) -> int:
+    """Same rule as PronunciationLesson.get_user_progress()."""
+    if status == 'completed':
+        return 100
+    if screens > 0:
+        return int((screens / LESSON_SCREENS) * 100)
+    return 0
+
+
+def resolve_lesson_access(user, lesson_ids=None) -> Dict[int, Dict]:
+    """
+    Access and progress of lessons for a user (graph from cache + one query).
+
+    Args:
+        user: User (anonymous or None: every lesson open as 'guest')
+        lesson_ids: Only these lessons (default: all)
+
+    Returns:
+        {
+            lesson_id: {
+                'can_access': bool,
+                'reason': str,          # 'unlocked', 'guest' or the lock message
+                'lock_reason': str|None,
+                'progress': int,        # 0-100
+                'is_completed': bool,
+                'status': str|None,     # UserPronunciationLessonProgress.status
+            }
+        }
+    """
+    graph = get_lesson_graph()
+    wanted = set(lesson_ids) if lesson_ids is not None else None
+    if wanted and not wanted.issubset(graph.lesson_stage):
+        # Created after the graph was built (invalidation not committed or
+        # not seen by this process yet)
+        graph = get_lesson_graph(rebuild=True)
+
+    if not user or not user.is_authenticated:
+        return {
+            lesson_id: {
+                'can_access': True, 'reason': 'guest', 'lock_reason': None,
+                'progress': 0, 'is_completed': False, 'status': None,
+            }
+            for lesson_id in graph.order
+            if wanted is None or lesson_id in wanted
+        }
+
+    progress = _user_progress(user)
+    completed = {lesson_id for lesson_id, (status, _) in progress.items() if status == 'completed'}
+
+    stage_complete: Dict[int, bool] = {}
+
+    def is_stage_complete(stage_id):
+        if stage_id not in stage_complete:
+            stage_complete[stage_id] = all(
+                lesson_id in completed for lesson_id in graph.stage_lessons.get(stage_id, ())
+            )
+        return stage_complete[stage_id]
+
+    result = {}
+    for lesson_id in graph.order:
+        if wanted is not None and lesson_id not in wanted:
+            continue
+
+        reason = 'unlocked'
+        for required_id in graph.stage_requires.get(graph.lesson_stage[lesson_id], ()):
+            if not is_stage_complete(required_id):
+                reason = f'Hoàn thành Giai đoạn {graph.stage_number[required_id]} trước'
+                break
+        else:
+            for prerequisite_id in graph.lesson_prerequisites.get(lesson_id, ()):
+                if prerequisite_id not in completed:
+                    reason = f'Hoàn thành bài "{graph.lesson_title[prerequisite_id]}" trước'
+                    break
+
+        status, screens = progress.get(lesson_id, (None, 0))
+        percent = _progress_percent(status, screens)
+        can_access = reason == 'unlocked'
+        result[lesson_id] = {
+            'can_access': can_access,
+            'reason': reason,
+            'lock_reason': None if can_access else reason,
+            'progress': percent,
+            'is_completed': percent >= 100,
+            'status': status,
+        }
+    return result
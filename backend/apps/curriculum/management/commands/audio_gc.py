@@ -0,0 +1,64 @@
+"""
+Management command to garbage-collect synthesized audio (services.audio_gc).
+
+Removes audio store files not served for --max-age-days (and the least
+recently used files above --budget-mb) plus expired TTS AudioSource rows,
+then prints the bytes reclaimed and the expected hit-rate loss.
+
+Usage:
+    python manage.py audio_gc --dry-run
+    python manage.py audio_gc --budget-mb 2048
+    python manage.py audio_gc --pool audio_store --max-age-days 60
+"""
+
+from django.core.management.base import BaseCommand
+
+from services.audio_gc import POOLS, run_audio_gc
+
+
+class Command(BaseCommand):
+    help = 'Remove least recently used / expired TTS audio and report the space reclaimed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report only, delete nothing')
+        parser.add_argument('--pool', action='append', choices=POOLS, help='Only this pool (repeatable)')
+        parser.add_argument('--max-age-days', type=float, help='Store files not served for this long are removed')
+        parser.add_argument('--budget-mb', type=float, help='Evict least recently used store files above this size')
+        parser.add_argument('--keep-played-days', type=float, help='Renew expired AudioSources played this recently')
+        parser.add_argument('--workers', type=int, help='File removal threads')
+
+    def handle(self, *args, **options):
+        budget_mb = options['budget_mb']
+        report = run_audio_gc(
+            pools=options['pool'] or POOLS,
+            dry_run=options['dry_run'],
+            max_age_days=options['max_age_days'],
+            budget_bytes=int(budget_mb * 1024 * 1024) if budget_mb is not None else None,
+            keep_played_days=options['keep_played_days'],
+            workers=options['workers'],
+        )
+
+        title = '\n🧹 Audio GC (dry run)' if report['dry_run'] else '\n🧹 Audio GC'
+        self.stdout.write(self.style.SUCCESS(title))
+        self.stdout.write('=' * 60)
+        for pool, stats in report['pools'].items():
+            impact = stats['hit_rate_impact']
+            self.stdout.write(f'\n{pool}')
+            self.stdout.write(f"  Candidates: {stats['candidates']}")
+            if 'renewed' in stats:
+                self.stdout.write(f"  Renewed (played recently): {stats['renewed']}")
+            if 'over_budget' in stats:
+                self.stdout.write(f"  Expired: {stats['expired']}, over budget: {stats['over_budget']}")
+            self.stdout.write(f"  Files removed: {stats['files_removed']}")
+            self.stdout.write(f"  Reclaimed: {stats['bytes_reclaimed'] / (1024 * 1024):.2f} MB")
+            self.stdout.write(
+                f"  Hit-rate impact: {impact['expected_hit_rate_loss']:.2%} "
+                f"({impact['victim_accesses']}/{impact['total_accesses']} recorded plays)"
+            )
+            if stats['errors']:
+                self.stdout.write(self.style.WARNING(f"  ⚠️  {stats['errors']} files could not be removed"))
+
+        self.stdout.write('')
+        self.stdout.write(f"Total reclaimed: {report['bytes_reclaimed'] / (1024 * 1024):.2f} MB")
+        self.stdout.write(f"Time: {report['elapsed_seconds']}s")
+        self.stdout.write('=' * 60)
@@ -5,16 +5,22 @@ Usage:
     python manage.py auto_generate_minimal_pairs --phoneme1 p --phoneme2 b
     python manage.py auto_generate_minimal_pairs --auto --max-pairs 50
     python manage.py auto_generate_minimal_pairs --suggest (preview only)
+
+Pairs come from the IPA minimal pair index
+(apps.curriculum.services.minimal_pair_index): PhonemeWord and vocabulary
+transcriptions differing in exactly one phoneme slot, for all contrasts
+in one pass.
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Q
-from apps.curriculum.models import Phoneme, PhonemeWord, MinimalPair
+from apps.curriculum.models import Phoneme, MinimalPair
+from apps.curriculum.services.minimal_pair_index import build_minimal_pair_index, normalize_ipa
+from apps.study.quiz_engine import invalidate_pair_catalogue
 import difflib
 
 
 class Command(BaseCommand):
-    help = 'Auto-generate minimal pairs from phoneme words based on similarity'
+    help = 'Auto-generate minimal pairs from phoneme word and vocabulary transcriptions'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -46,8 +52,13 @@ class Command(BaseCommand):
         parser.add_argument(
             '--min-similarity',
             type=float,
-            default=0.7,
-            help='Minimum word similarity score (0-1, default: 0.7)'
+            default=0.5,
+            help='Minimum phoneme similarity for --auto (0-1, default: 0.5)'
+        )
+        parser.add_argument(
+            '--no-vocabulary',
+            action='store_true',
+            help='Only use PhonemeWord transcriptions, not vocabulary Word.ipa'
         )
 
     def handle(self, *args, **options):
@@ -58,16 +69,20 @@ class Command(BaseCommand):
         suggest_only = options.get('suggest')
         min_similarity = options.get('min_similarity')
 
+        if not auto and not (phoneme1_ipa and phoneme2_ipa):
+            raise CommandError(
+                'Please provide either --phoneme1 and --phoneme2, or --auto'
+            )
+
+        self.index = build_minimal_pair_index(include_vocabulary=not options.get('no_vocabulary'))
+        self.stdout.write(f'📚 Indexed {len(self.index)} transcriptions')
+
         if auto:
             self.auto_generate_all(max_pairs, suggest_only, min_similarity)
-        elif phoneme1_ipa and phoneme2_ipa:
+        else:
             self.generate_for_pair(
                 phoneme1_ipa, phoneme2_ipa, suggest_only, min_similarity
             )
-        else:
-            raise CommandError(
-                'Please provide either --phoneme1 and --phoneme2, or --auto'
-            )
 
     def auto_generate_all(self, max_pairs, suggest_only, min_similarity):
         """Auto-detect and generate pairs for all similar phonemes"""
@@ -75,24 +90,29 @@ class Command(BaseCommand):
             self.style.SUCCESS('📊 Analyzing phonemes for similarity...')
         )
 
-        phonemes = Phoneme.objects.filter(is_active=True)
+        phonemes = {
+            normalize_ipa(p.ipa_symbol): p for p in Phoneme.objects.filter(is_active=True)
+        }
         pair_candidates = []
+        similarities = {}
 
-        # Find similar phoneme pairs
-        for i, p1 in enumerate(phonemes):
-            for p2 in phonemes[i+1:]:
-                similarity = self.calculate_phoneme_similarity(p1, p2)
-                if similarity >= 0.5:  # Similar enough to be confusing
-                    pairs = self.find_minimal_pairs(p1, p2, min_similarity)
-                    if pairs:
-                        for pair in pairs:
-                            pair_candidates.append({
-                                'phoneme1': p1,
-                                'phoneme2': p2,
-                                'pair': pair,
-                                'similarity': similarity,
-                                'score': pair['similarity'] * similarity
-                            })
+        # All contrasts in one pass; keep those between confusable phonemes
+        for match in self.index.pairs():
+            p1 = phonemes.get(match.phoneme_1)
+            p2 = phonemes.get(match.phoneme_2)
+            if p1 is None or p2 is None:
+                continue
+            if match.contrast not in similarities:
+                similarities[match.contrast] = self.calculate_phoneme_similarity(p1, p2)
+            similarity = similarities[match.contrast]
+            if similarity >= min_similarity:  # Similar enough to be confusing
+                pair_candidates.append({
+                    'phoneme1': p1,
+                    'phoneme2': p2,
+                    'pair': self._pair_dict(match),
+                    'similarity': similarity,
+                    'score': similarity
+                })
 
         # Sort by score (best pairs first)
         pair_candidates.sort(key=lambda x: x['score'], reverse=True)
@@ -121,7 +141,7 @@ class Command(BaseCommand):
                 f"{i}. /{p1.ipa_symbol}/ vs /{p2.ipa_symbol}/: "
                 f"{pair['word1']} ({pair['ipa1']}) ↔ "
                 f"{pair['word2']} ({pair['ipa2']}) "
-                f"[score: {candidate['score']:.2f}]"
+                f"[{pair['position']}, score: {candidate['score']:.2f}]"
             )
 
         if suggest_only:
@@ -140,40 +160,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('Cancelled.'))
             return
 
-        # Create pairs
-        created_count = 0
-        skipped_count = 0
-
-        for candidate in top_pairs:
-            p1 = candidate['phoneme1']
-            p2 = candidate['phoneme2']
-            pair = candidate['pair']
-            
-            # Check if pair already exists
-            exists = MinimalPair.objects.filter(
-                Q(phoneme_1=p1, phoneme_2=p2, word_1=pair['word1'], word_2=pair['word2']) |
-                Q(phoneme_1=p2, phoneme_2=p1, word_1=pair['word2'], word_2=pair['word1'])
-            ).exists()
-            
-            if exists:
-                skipped_count += 1
-                continue
-            
-            # Create minimal pair
-            MinimalPair.objects.create(
-                phoneme_1=p1,
-                phoneme_2=p2,
-                word_1=pair['word1'],
-                word_2=pair['word2'],
-                ipa_1=pair['ipa1'],
-                ipa_2=pair['ipa2'],
-                meaning_1=pair.get('meaning1', ''),
-                meaning_2=pair.get('meaning2', ''),
-                difficulty_level=self.calculate_difficulty(p1, p2),
-                difference_note=self.generate_difference_note(p1, p2),
-                is_verified=False
-            )
-            created_count += 1
+        created_count, skipped_count = self.create_pairs(
+            (c['phoneme1'], c['phoneme2'], c['pair']) for c in top_pairs
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -200,7 +189,7 @@ class Command(BaseCommand):
             )
         )
 
-        pairs = self.find_minimal_pairs(phoneme1, phoneme2, min_similarity)
+        pairs = self.find_minimal_pairs(phoneme1, phoneme2)
 
         if not pairs:
             self.stdout.write(
@@ -220,7 +209,7 @@ class Command(BaseCommand):
             self.stdout.write(
                 f"{i}. {pair['word1']} ({pair['ipa1']}) ↔ "
                 f"{pair['word2']} ({pair['ipa2']}) "
-                f"[similarity: {pair['similarity']:.2f}]"
+                f"[{pair['position']}]"
             )
 
         if suggest_only:
@@ -236,38 +225,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('Cancelled.'))
             return
 
-        # Create pairs
-        created_count = 0
-        skipped_count = 0
-
-        for pair in pairs:
-            # Check if pair already exists
-            exists = MinimalPair.objects.filter(
-                Q(phoneme_1=phoneme1, phoneme_2=phoneme2, 
-                  word_1=pair['word1'], word_2=pair['word2']) |
-                Q(phoneme_1=phoneme2, phoneme_2=phoneme1, 
-                  word_1=pair['word2'], word_2=pair['word1'])
-            ).exists()
-            
-            if exists:
-                skipped_count += 1
-                continue
-            
-            # Create minimal pair
-            MinimalPair.objects.create(
-                phoneme_1=phoneme1,
-                phoneme_2=phoneme2,
-                word_1=pair['word1'],
-                word_2=pair['word2'],
-                ipa_1=pair['ipa1'],
-                ipa_2=pair['ipa2'],
-                meaning_1=pair.get('meaning1', ''),
-                meaning_2=pair.get('meaning2', ''),
-                difficulty_level=self.calculate_difficulty(phoneme1, phoneme2),
-                difference_note=self.generate_difference_note(phoneme1, phoneme2),
-                is_verified=False
-            )
-            created_count += 1
+        created_count, skipped_count = self.create_pairs(
+            (phoneme1, phoneme2, pair) for pair in pairs
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -281,62 +241,76 @@ class Command(BaseCommand):
                 )
             )
 
-    def find_minimal_pairs(self, phoneme1, phoneme2, min_similarity=0.7):
+    def find_minimal_pairs(self, phoneme1, phoneme2):
         """
-        Find minimal pairs between two phonemes by comparing their example words.
+        Find minimal pairs between two phonemes in the transcription index.
         
         A minimal pair is two words that differ by only one phoneme.
         """
-        words1 = PhonemeWord.objects.filter(phoneme=phoneme1)
-        words2 = PhonemeWord.objects.filter(phoneme=phoneme2)
+        matches = self.index.pairs(contrast=(phoneme1.ipa_symbol, phoneme2.ipa_symbol))
         
-        # Check if we have data
-        if not words1.exists():
-            self.stdout.write(
-                self.style.WARNING(
-                    f'⚠️  No example words found for /{phoneme1.ipa_symbol}/. '
-                    f'Please add PhonemeWord entries for this phoneme.'
-                )
-            )
+        # Initial/final contrasts first, then alphabetical
+        matches.sort(key=lambda m: (m.position_label == 'medial', m.word_1.word.lower()))
         
-        if not words2.exists():
-            self.stdout.write(
-                self.style.WARNING(
-                    f'⚠️  No example words found for /{phoneme2.ipa_symbol}/. '
-                    f'Please add PhonemeWord entries for this phoneme.'
-                )
-            )
+        return [self._pair_dict(match) for match in matches]
+
+    def _pair_dict(self, match):
+        return {
+            'word1': match.word_1.word,
+            'word2': match.word_2.word,
+            'ipa1': match.word_1.ipa,
+            'ipa2': match.word_2.ipa,
+            'meaning1': match.word_1.meaning_vi,
+            'meaning2': match.word_2.meaning_vi,
+            'position': match.position_label,
+        }
+
+    def create_pairs(self, candidates):
+        """
+        Insert new minimal pairs in bulk.
         
-        pairs = []
+        Args:
+            candidates: Iterable of (phoneme1, phoneme2, pair dict)
         
-        for w1 in words1:
-            for w2 in words2:
-                # Calculate word similarity
-                similarity = difflib.SequenceMatcher(
-                    None, 
-                    w1.word.lower(), 
-                    w2.word.lower()
-                ).ratio()
-                
-                # Check if words are similar enough (minimal pair condition)
-                if similarity >= min_similarity:
-                    # Words should have similar length (differ by 1-2 chars max)
-                    len_diff = abs(len(w1.word) - len(w2.word))
-                    if len_diff <= 1:
-                        pairs.append({
-                            'word1': w1.word,
-                            'word2': w2.word,
-                            'ipa1': w1.ipa_transcription or f"/{phoneme1.ipa_symbol}/",
-                            'ipa2': w2.ipa_transcription or f"/{phoneme2.ipa_symbol}/",
-                            'meaning1': w1.meaning_vi or '',
-                            'meaning2': w2.meaning_vi or '',
-                            'similarity': similarity
-                        })
+        Returns:
+            (created_count, skipped_count)
+        """
+        # Existing pairs in both orientations (one query)
+        existing = set()
+        for p1, p2, w1, w2 in MinimalPair.objects.values_list(
+            'phoneme_1_id', 'phoneme_2_id', 'word_1', 'word_2'
+        ):
+            existing.add((p1, p2, w1, w2))
+            existing.add((p2, p1, w2, w1))
         
-        # Sort by similarity (best matches first)
-        pairs.sort(key=lambda x: x['similarity'], reverse=True)
+        new_pairs = []
+        skipped_count = 0
+        for phoneme1, phoneme2, pair in candidates:
+            key = (phoneme1.id, phoneme2.id, pair['word1'], pair['word2'])
+            if key in existing:
+                skipped_count += 1
+                continue
+            existing.add(key)
+            existing.add((phoneme2.id, phoneme1.id, pair['word2'], pair['word1']))
+            
+            new_pairs.append(MinimalPair(
+                phoneme_1=phoneme1,
+                phoneme_2=phoneme2,
+                word_1=pair['word1'],
+                word_2=pair['word2'],
+                word_1_ipa=pair['ipa1'],
+                word_2_ipa=pair['ipa2'],
+                word_1_meaning=pair.get('meaning1', ''),
+                word_2_meaning=pair.get('meaning2', ''),
+                difficulty=self.calculate_difficulty(phoneme1, phoneme2),
+                difference_note=self.generate_difference_note(phoneme1, phoneme2),
+            ))
         
-        return pairs
+        if new_pairs:
+            MinimalPair.objects.bulk_create(new_pairs)
+            # bulk_create() skips the post_save signal that refreshes the quiz catalogue
+            invalidate_pair_catalogue()
+        return len(new_pairs), skipped_count
 
     def calculate_phoneme_similarity(self, phoneme1, phoneme2):
         """
@@ -358,32 +332,34 @@ class Command(BaseCommand):
             score += 0.3
         
         # Similar Vietnamese approximation (if available)
-        if (phoneme1.vietnamese_approximation and 
-            phoneme2.vietnamese_approximation):
+        if (phoneme1.vietnamese_approx and 
+            phoneme2.vietnamese_approx):
             similarity = difflib.SequenceMatcher(
                 None,
-                phoneme1.vietnamese_approximation.lower(),
-                phoneme2.vietnamese_approximation.lower()
+                phoneme1.vietnamese_approx.lower(),
+                phoneme2.vietnamese_approx.lower()
             ).ratio()
             score += similarity * 0.2
         
         return score
 
     def calculate_difficulty(self, phoneme1, phoneme2):
-        """Calculate difficulty level for a minimal pair"""
-        # Vowel vs vowel = easier
-        if phoneme1.phoneme_type == 'vowel' and phoneme2.phoneme_type == 'vowel':
-            return 'intermediate'
+        """Calculate difficulty (MinimalPair.difficulty, 1-5) for a minimal pair"""
+        vowel_1 = phoneme1.phoneme_type in Phoneme.VOWEL_TYPES
+        vowel_2 = phoneme2.phoneme_type in Phoneme.VOWEL_TYPES
+        
+        # Vowel vs vowel = intermediate
+        if vowel_1 and vowel_2:
+            return 2
         
         # Consonant vs consonant with same features = harder
-        if (phoneme1.phoneme_type == 'consonant' and 
-            phoneme2.phoneme_type == 'consonant'):
+        if not vowel_1 and not vowel_2:
             if phoneme1.voicing == phoneme2.voicing:
-                return 'advanced'
+                return 3
             else:
-                return 'intermediate'
+                return 2
         
-        return 'beginner'
+        return 1
 
     def generate_difference_note(self, phoneme1, phoneme2):
         """Generate a note explaining the difference between phonemes"""
@@ -401,10 +377,10 @@ class Command(BaseCommand):
                 f"{phoneme2.mouth_position or 'N/A'}"
             )
         
-        if phoneme1.vietnamese_approximation and phoneme2.vietnamese_approximation:
+        if phoneme1.vietnamese_approx and phoneme2.vietnamese_approx:
             notes.append(
-                f"Vietnamese: {phoneme1.vietnamese_approximation} vs "
-                f"{phoneme2.vietnamese_approximation}"
+                f"Vietnamese: {phoneme1.vietnamese_approx} vs "
+                f"{phoneme2.vietnamese_approx}"
             )
         
         return '. '.join(notes) if notes else 'Practice listening carefully to distinguish these sounds.'
@@ -0,0 +1,114 @@
+"""
+Management command to benchmark spelling-based phoneme detection.
+
+Runs PhonemeAnalyzer over the Oxford 5000 word list and compares the previous
+per-pattern re.finditer() detector with the precompiled GraphemeTrie (cold,
+memoized, and through the batch API). Results are checked to be identical.
+
+Usage:
+    python manage.py benchmark_phoneme_detector
+    python manage.py benchmark_phoneme_detector --csv ../The_Oxford_5000.csv --text-size 8
+"""
+
+import random
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.curriculum.phoneme_analyzer import (
+    PHONEME_SPELLING_CHECKS, PhonemeAnalyzer, detect_word_phonemes
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark phoneme detection (regex per pattern vs precompiled trie) on Oxford 5000'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--csv',
+            type=str,
+            default=str(Path(settings.BASE_DIR).parent / 'The_Oxford_5000.csv'),
+            help='Oxford word list ("word pos. LEVEL" per line)'
+        )
+        parser.add_argument('--text-size', type=int, default=6, help='Words per generated text')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+
+    def handle(self, *args, **options):
+        path = Path(options['csv'])
+        if not path.exists():
+            raise CommandError(f'Word list not found: {path}')
+
+        words = self._load_words(path)
+        rng = random.Random(5000)
+        size = max(1, options['text_size'])
+        texts = [' '.join(rng.sample(words, size)) for _ in range(len(words) // size)]
+
+        analyzer = PhonemeAnalyzer()
+        legacy = [self._legacy_analyze(text) for text in texts]
+        if analyzer.analyze_texts_for_phonemes(texts) != legacy:
+            raise CommandError('Trie detector output differs from the regex detector')
+
+        self.stdout.write(self.style.SUCCESS('\n🔤 Phoneme Detector Benchmark'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Word list: {path.name} ({len(words)} entries)')
+        self.stdout.write(f'Texts: {len(texts)} x {size} words')
+        self.stdout.write('')
+
+        def cold():
+            detect_word_phonemes.cache_clear()
+            for text in texts:
+                analyzer.analyze_text_for_phonemes(text)
+
+        cases = [
+            ('regex per pattern', lambda: [self._legacy_analyze(text) for text in texts]),
+            ('trie (cold cache)', cold),
+            ('trie (memoized)', lambda: [analyzer.analyze_text_for_phonemes(text) for text in texts]),
+            ('trie batch API', lambda: analyzer.analyze_texts_for_phonemes(texts)),
+        ]
+        baseline = None
+        for name, func in cases:
+            best = self._best(func, options['repeat'])
+            baseline = baseline or best
+            self.stdout.write(
+                f'{name:<20} {best * 1000:8.1f} ms | {baseline / best if best else float("inf"):5.1f}x'
+            )
+
+        self.stdout.write('=' * 60)
+
+    @staticmethod
+    def _load_words(path):
+        words = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3:
+                    words.append(' '.join(parts[:-2]))
+        return words
+
+    @staticmethod
+    def _best(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _legacy_analyze(text):
+        """Previous detector: one re.finditer() per check, per word, per call."""
+        detected = []
+        for word in text.lower().split():
+            for alternatives, phonemes in PHONEME_SPELLING_CHECKS:
+                for match in re.finditer('|'.join(alternatives), word):
+                    for phoneme in phonemes:
+                        detected.append({
+                            'phoneme': phoneme,
+                            'position': match.start(),
+                            'spelling': match.group(),
+                            'word': word
+                        })
+        return detected
@@ -0,0 +1,107 @@
+"""
+Management command to run (or benchmark) batch TTS synthesis for vocabulary.
+
+Synthesizes every word × voice × speed combination through
+TTSBatchSynthesizer on a single event loop.
+
+Usage:
+    # Offline benchmark (mock mode, simulated 200ms Edge TTS latency)
+    python manage.py benchmark_tts_batch --mock --limit 500 --concurrency 32
+
+    # Regenerate Oxford words for 4 voices x 3 speeds
+    python manage.py benchmark_tts_batch \
+        --voices us_female_clear us_male_standard gb_female gb_male \
+        --speeds beginner intermediate advanced
+"""
+
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from apps.curriculum.services.edge_tts_service import EnglishTTSService
+from apps.curriculum.services.tts_batch import TTSBatchSynthesizer, TTSJob
+from apps.vocabulary.models import Word
+
+
+class Command(BaseCommand):
+    help = 'Batch-synthesize vocabulary audio (word x voice x speed) and report throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--voices',
+            nargs='+',
+            default=['us_female_clear', 'us_male_standard', 'gb_female', 'gb_male'],
+            help='Voice keys from EnglishTTSService.VOICES'
+        )
+        parser.add_argument(
+            '--speeds',
+            nargs='+',
+            default=['beginner', 'intermediate', 'advanced'],
+            help='Speed levels from EnglishTTSService.SPEED_LEVELS'
+        )
+        parser.add_argument('--level', type=str, help='Only words of this CEFR level')
+        parser.add_argument('--limit', type=int, help='Limit number of words')
+        parser.add_argument('--concurrency', type=int, default=16, help='Max in-flight requests')
+        parser.add_argument('--rate', type=float, default=None, help='Requests/second per voice')
+        parser.add_argument('--mock', action='store_true', help='Use mock TTS (offline benchmark)')
+        parser.add_argument(
+            '--mock-latency',
+            type=float,
+            default=0.2,
+            help='Simulated Edge TTS latency in seconds (mock mode)'
+        )
+
+    def handle(self, *args, **options):
+        if options['mock']:
+            os.environ['MOCK_TTS'] = 'true'
+            output_dir = tempfile.mkdtemp(prefix='tts_batch_bench_')
+        else:
+            output_dir = None
+
+        words = Word.objects.order_by('id')
+        if options.get('level'):
+            words = words.filter(cefr_level=options['level'])
+        words = list(words.values_list('text', flat=True).distinct())
+        if options.get('limit'):
+            words = words[:options['limit']]
+
+        jobs = [
+            TTSJob(text=word, voice_key=voice_key, speed_level=speed_level)
+            for word in words
+            for voice_key in options['voices']
+            for speed_level in options['speeds']
+        ]
+
+        self.stdout.write(self.style.SUCCESS('\n🎵 Batch TTS Synthesis'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Words: {len(words)}')
+        self.stdout.write(f'Voices: {", ".join(options["voices"])}')
+        self.stdout.write(f'Speeds: {", ".join(options["speeds"])}')
+        self.stdout.write(f'Jobs: {len(jobs)}')
+        self.stdout.write(f'Concurrency: {options["concurrency"]}')
+        self.stdout.write(f'Mock mode: {options["mock"]}')
+        self.stdout.write('=' * 60)
+
+        step = max(len(jobs) // 20, 1)
+
+        def report_progress(done, total, result):
+            if done % step == 0 or done == total:
+                self.stdout.write(f'Progress: {done}/{total}')
+
+        synthesizer = TTSBatchSynthesizer(
+            tts_service=EnglishTTSService(output_dir=output_dir),
+            concurrency=options['concurrency'],
+            rate_per_voice=options['rate'],
+            progress_callback=report_progress,
+            mock_latency=options['mock_latency'],
+        )
+        summary = synthesizer.run_sync(jobs)
+
+        self.stdout.write('=' * 60)
+        self.stdout.write(self.style.SUCCESS(f'Success: {summary["successful"]}'))
+        self.stdout.write(self.style.ERROR(f'Failed: {summary["failed"]}'))
+        self.stdout.write(f'Retries: {summary["retries"]}')
+        self.stdout.write(f'Elapsed: {summary["elapsed_seconds"]}s')
+        self.stdout.write(f'Throughput: {summary["jobs_per_second"]} jobs/s')
+        self.stdout.write('=' * 60 + '\n')
@@ -0,0 +1,80 @@
+"""
+Management command to precompute reference-audio features for scoring.
+
+Decodes every reference audio once and stores its float16 feature matrix
+(see apps.curriculum.reference_features):
+- Phoneme.preferred_audio_source (warms the phoneme -> features mapping)
+- AudioVersion.audio_source
+- MinimalPair.word_1_audio / word_2_audio
+
+Files already in the store (same content hash) are not decoded again.
+
+Usage:
+    python manage.py build_reference_features
+    python manage.py build_reference_features --skip-minimal-pairs
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.curriculum.models import AudioVersion, MinimalPair, Phoneme
+from apps.curriculum.pronunciation_scoring import NUMPY_AVAILABLE, ScoringError
+from apps.curriculum.reference_features import content_hash, get_reference_feature_store
+
+
+class Command(BaseCommand):
+    help = 'Precompute float16 reference-audio features (phonemes, audio versions, minimal pairs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-versions', action='store_true', help='Skip AudioVersion audio')
+        parser.add_argument('--skip-minimal-pairs', action='store_true', help='Skip MinimalPair audio')
+
+    def handle(self, *args, **options):
+        if not NUMPY_AVAILABLE:
+            raise CommandError('numpy is required to build reference features')
+
+        store = get_reference_feature_store()
+        self.stats = {'computed': 0, 'existing': 0, 'failed': 0}
+        started = time.perf_counter()
+
+        self.stdout.write(self.style.SUCCESS('\n🎧 Reference Feature Store'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Root: {store.root}')
+
+        phonemes = Phoneme.objects.select_related('preferred_audio_source').filter(
+            preferred_audio_source__isnull=False
+        )
+        for phoneme in phonemes:
+            self._build(store, f'/{phoneme.ipa_symbol}/', phoneme.preferred_audio_source.audio_file, phoneme)
+
+        if not options['skip_versions']:
+            for version in AudioVersion.objects.select_related('audio_source', 'phoneme'):
+                self._build(store, str(version), version.audio_source.audio_file)
+
+        if not options['skip_minimal_pairs']:
+            for pair in MinimalPair.objects.all():
+                for audio in (pair.word_1_audio, pair.word_2_audio):
+                    if audio:
+                        self._build(store, str(pair), audio)
+
+        self.stdout.write('')
+        self.stdout.write(f"Computed: {self.stats['computed']}")
+        self.stdout.write(f"Already stored: {self.stats['existing']}")
+        self.stdout.write(f"Failed: {self.stats['failed']}")
+        self.stdout.write(f'Time: {time.perf_counter() - started:.1f}s')
+        self.stdout.write('=' * 60)
+
+    def _build(self, store, label, audio_file, phoneme=None):
+        try:
+            key = content_hash(audio_file)
+            existing = store.exists(key)
+            if phoneme is not None:
+                store.for_phoneme(phoneme, phoneme.preferred_audio_source)
+            else:
+                store.get(audio_file, key=key)
+        except (OSError, ScoringError) as e:
+            self.stats['failed'] += 1
+            self.stdout.write(self.style.WARNING(f'⚠️  {label}: {e}'))
+            return
+        self.stats['existing' if existing else 'computed'] += 1
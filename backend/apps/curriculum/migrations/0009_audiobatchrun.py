@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0008_phonemeattempt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudioBatchRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("phoneme_audio", "Phoneme audio"),
+                            ("flashcard_audio", "Flashcard audio"),
+                        ],
+                        db_index=True,
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("partial", "Completed with failures"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("items", models.JSONField(default=list)),
+                ("params", models.JSONField(blank=True, default=dict)),
+                ("chunk_size", models.PositiveIntegerField(default=25)),
+                ("total_chunks", models.PositiveIntegerField(default=0)),
+                ("completed_chunks", models.JSONField(blank=True, default=list)),
+                ("succeeded", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("skipped", models.PositiveIntegerField(default=0)),
+                (
+                    "failures",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text='[{"item", "error"}] (capped)',
+                    ),
+                ),
+                (
+                    "task_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Chord of the latest dispatch",
+                        max_length=255,
+                    ),
+                ),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("dispatched_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("elapsed_seconds", models.FloatField(default=0)),
+                ("items_per_second", models.FloatField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Audio Batch Run",
+                "verbose_name_plural": "Audio Batch Runs",
+                "db_table": "curriculum_audio_batch_run",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
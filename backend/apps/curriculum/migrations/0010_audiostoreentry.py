@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:22
+
+import os
+import sqlite3
+from datetime import datetime, timezone as dt_timezone
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def import_sqlite_index(apps, schema_editor):
+    """Copy the rows of the old index.sqlite3 (kept under AUDIO_STORE_ROOT) into the table."""
+    root = getattr(settings, 'AUDIO_STORE_ROOT', os.path.join(settings.MEDIA_ROOT, 'audio_store'))
+    path = os.path.join(root, 'index.sqlite3')
+    if not os.path.exists(path):
+        return
+
+    AudioStoreEntry = apps.get_model('curriculum', 'AudioStoreEntry')
+    conn = sqlite3.connect(path)
+    try:
+        cursor = conn.execute(
+            "SELECT key, relative_path, size_bytes, duration, engine, voice, rate, pitch, "
+            "text, created_at, last_accessed_at, access_count FROM audio_entries"
+        )
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            AudioStoreEntry.objects.bulk_create([
+                AudioStoreEntry(
+                    key=key, relative_path=relative_path, size_bytes=size_bytes,
+                    duration=duration, engine=engine, voice=voice, rate=rate,
+                    pitch=pitch, text=text,
+                    created_at=datetime.fromtimestamp(created_at, dt_timezone.utc),
+                    last_accessed_at=datetime.fromtimestamp(last_accessed_at, dt_timezone.utc),
+                    access_count=access_count,
+                )
+                for (key, relative_path, size_bytes, duration, engine, voice, rate, pitch,
+                     text, created_at, last_accessed_at, access_count) in rows
+            ], ignore_conflicts=True)
+    except sqlite3.Error:
+        pass    # No usable index: entries are re-created on the next access
+    finally:
+        conn.close()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0009_audiobatchrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudioStoreEntry",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        help_text="SHA-256 of the synthesis parameters",
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("relative_path", models.CharField(max_length=255)),
+                ("size_bytes", models.BigIntegerField(default=0)),
+                ("duration", models.FloatField(blank=True, null=True)),
+                ("engine", models.CharField(blank=True, max_length=20, null=True)),
+                (
+                    "voice",
+                    models.CharField(
+                        blank=True, db_index=True, max_length=100, null=True
+                    ),
+                ),
+                ("rate", models.CharField(blank=True, max_length=20, null=True)),
+                ("pitch", models.CharField(blank=True, max_length=20, null=True)),
+                ("text", models.CharField(blank=True, max_length=500, null=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "last_accessed_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("access_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Audio Store Entry",
+                "verbose_name_plural": "Audio Store Entries",
+                "db_table": "curriculum_audio_store_entry",
+            },
+        ),
+        migrations.RunPython(import_sqlite_index, migrations.RunPython.noop),
+    ]
@@ -821,6 +821,7 @@ class Phoneme(models.Model):
         ('approximant', 'Âm tiếp cận (Approximants)'),
         ('lateral', 'Âm bên (Laterals)'),
     ]
+    VOWEL_TYPES = ('short_vowel', 'long_vowel', 'diphthong')
     
     VOICING_TYPES = [
         ('voiced', 'Hữu thanh (Voiced)'),
@@ -1170,39 +1171,20 @@ class PronunciationLesson(models.Model):
         """
         Check if user can access this lesson based on prerequisites.
         Returns (can_access: bool, reason: str)
-        """
-        if not user or not user.is_authenticated:
-            # Public lessons or allow guest preview
-            return (True, 'guest')
-        
-        # Check stage prerequisites
-        if self.stage and self.stage.required_previous_stages.exists():
-            from apps.users.models import UserPronunciationLessonProgress
-            
-            for prev_stage in self.stage.required_previous_stages.all():
-                # Check if all lessons in previous stage are completed
-                prev_lessons = prev_stage.lessons.filter(status='published')
-                for prev_lesson in prev_lessons:
-                    if not UserPronunciationLessonProgress.objects.filter(
-                        user=user,
-                        pronunciation_lesson=prev_lesson,
-                        status='completed'
-                    ).exists():
-                        return (False, f'Hoàn thành Giai đoạn {prev_stage.number} trước')
         
-        # Check lesson prerequisites
-        if self.prerequisites.exists():
-            from apps.users.models import UserPronunciationLessonProgress
-            
-            for prereq_lesson in self.prerequisites.all():
-                if not UserPronunciationLessonProgress.objects.filter(
-                    user=user,
-                    pronunciation_lesson=prereq_lesson,
-                    status='completed'
-                ).exists():
-                    return (False, f'Hoàn thành bài "{prereq_lesson.title_vi}" trước')
+        Resolved from the cached prerequisite graph (lesson_unlocks); use
+        resolve_lesson_access() directly when checking many lessons.
+        """
+        from .lesson_unlocks import resolve_lesson_access
         
-        return (True, 'unlocked')
+        if self.pk is None:
+            # Unsaved lesson: not in the graph
+            return (True, 'unlocked')
+        access = resolve_lesson_access(user, [self.id]).get(self.id)
+        if access is None:
+            # Deleted meanwhile
+            return (True, 'unlocked')
+        return (access['can_access'], access['reason'])
     
     def get_user_progress(self, user):
         """
@@ -1660,6 +1642,11 @@ class AudioVersion(models.Model):
             # Update phoneme's preferred_audio_source
             self.phoneme.preferred_audio_source = self.audio_source
             self.phoneme.save(update_fields=['preferred_audio_source'])
+            
+            # Scorers must stop using the previous version's reference features
+            from .reference_features import invalidate_phoneme_features
+            phoneme_id = self.phoneme_id
+            transaction.on_commit(lambda: invalidate_phoneme_features(phoneme_id))
     
     def get_duration_text(self):
         """Get human-readable duration"""
@@ -1674,9 +1661,14 @@ class AudioVersion(models.Model):
             return f"Was active for {days} days"
     
     def increment_usage(self):
-        """Increment usage counter (called when audio is played)"""
-        self.usage_count = models.F('usage_count') + 1
-        self.save(update_fields=['usage_count'])
+        """
+        Count a playback (called when audio is played).
+        
+        Write-behind: buffered in memory and added to usage_count by
+        apps.curriculum.usage_counters, so the row is not written per play.
+        """
+        from .usage_counters import AUDIO_VERSION, record_usage
+        record_usage(AUDIO_VERSION, self.pk)
     
     def add_rating(self, rating):
         """
@@ -1696,6 +1688,123 @@ class AudioVersion(models.Model):
         self.save(update_fields=['avg_user_rating', 'user_rating_count'])
 
 
+class AudioBatchRun(models.Model):
+    """
+    Persistent record of a chunked TTS batch (apps.curriculum.audio_batches).
+    
+    Items are split into chunks synthesized by parallel Celery tasks; a chord
+    callback closes the run. Completed chunk indices are stored, so a run
+    interrupted by a crashed worker or failed chunk resumes from the chunks
+    still missing instead of starting over.
+    """
+    KIND_CHOICES = [
+        ('phoneme_audio', 'Phoneme audio'),
+        ('flashcard_audio', 'Flashcard audio'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('partial', 'Completed with failures'),
+        ('failed', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    
+    # Input: items (phoneme IDs / words) and handler parameters (voice, speed...)
+    items = models.JSONField(default=list)
+    params = models.JSONField(default=dict, blank=True)
+    chunk_size = models.PositiveIntegerField(default=25)
+    total_chunks = models.PositiveIntegerField(default=0)
+    completed_chunks = models.JSONField(default=list, blank=True)
+    
+    # Progress
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    failures = models.JSONField(default=list, blank=True, help_text='[{"item", "error"}] (capped)')
+    
+    # Throughput (elapsed_seconds sums the dispatch windows of resumed runs)
+    task_id = models.CharField(max_length=255, blank=True, help_text='Chord of the latest dispatch')
+    started_at = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    elapsed_seconds = models.FloatField(default=0)
+    items_per_second = models.FloatField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'curriculum_audio_batch_run'
+        ordering = ['-created_at']
+        verbose_name = 'Audio Batch Run'
+        verbose_name_plural = 'Audio Batch Runs'
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+    
+    @property
+    def total_items(self):
+        return len(self.items)
+    
+    @property
+    def processed_items(self):
+        return self.succeeded + self.failed + self.skipped
+    
+    @property
+    def progress_percent(self):
+        if not self.total_chunks:
+            return 100
+        return int(len(self.completed_chunks) / self.total_chunks * 100)
+    
+    def chunk_items(self, index):
+        """Items of chunk ``index``."""
+        start = index * self.chunk_size
+        return self.items[start:start + self.chunk_size]
+    
+    def pending_chunks(self):
+        """Indices of chunks not recorded yet."""
+        done = set(self.completed_chunks)
+        return [index for index in range(self.total_chunks) if index not in done]
+
+
+class AudioStoreEntry(models.Model):
+    """
+    Index row of one file in the content-addressed audio store
+    (services.audio_store).
+    
+    Kept in the database rather than next to the files: AUDIO_STORE_ROOT
+    is shared between hosts, and every host must see the same sizes and
+    last-access times for lookups and the storage GC (services.audio_gc).
+    """
+    key = models.CharField(max_length=64, primary_key=True, help_text='SHA-256 of the synthesis parameters')
+    relative_path = models.CharField(max_length=255)
+    size_bytes = models.BigIntegerField(default=0)
+    duration = models.FloatField(null=True, blank=True)
+    
+    # Synthesis parameters (informational, the key is authoritative)
+    engine = models.CharField(max_length=20, null=True, blank=True)
+    voice = models.CharField(max_length=100, null=True, blank=True, db_index=True)
+    rate = models.CharField(max_length=20, null=True, blank=True)
+    pitch = models.CharField(max_length=20, null=True, blank=True)
+    text = models.CharField(max_length=500, null=True, blank=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    last_accessed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    access_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'curriculum_audio_store_entry'
+        verbose_name = 'Audio Store Entry'
+        verbose_name_plural = 'Audio Store Entries'
+    
+    def __str__(self):
+        return self.relative_path
+
+
 #============================================================================
 # PHASE 5.4: PHONEME ATTEMPT TRACKING MODEL
 #============================================================================
@@ -3,11 +3,13 @@ Phase 5.2: Phoneme-level Analysis
 Detailed pronunciation feedback with phoneme identification.
 """
 
-import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 
+from .word_alignment import OP_DELETION, OP_INSERTION, OP_SUBSTITUTION, align_words
+
 logger = logging.getLogger(__name__)
 
 # IPA to common spelling patterns mapping
@@ -98,6 +100,104 @@ COMMON_ERRORS = {
 }
 
 
+# Spelling checks used to spot key phonemes in a word:
+# (alternatives, phonemes). Alternatives are tried in order at each position,
+# like a regex alternation; a leading '^' anchors to the start of the word.
+PHONEME_SPELLING_CHECKS = [
+    (('th',), ['θ', 'ð']),  # think, this
+    (('sh', 'tion', 'sion'), ['ʃ']),  # ship, nation, vision
+    (('ch', 'tch'), ['tʃ']),  # church, catch
+    (('ng',), ['ŋ']),  # sing
+    (('ee', 'ea'), ['iː']),  # see, sea
+    (('^s',), ['s']),  # sell
+    (('r',), ['r']),  # red
+    (('l',), ['l']),  # shell
+]
+
+# Distinct words kept by the per-word memo
+WORD_PHONEME_CACHE_SIZE = 8192
+
+# Correctly aligned words below this STT confidence are flagged as unclear
+UNCLEAR_CONFIDENCE = 0.85
+
+
+class GraphemeTrie:
+    """
+    Trie over the spelling patterns of all checks, built once.
+    
+    One walk per start position finds the candidates of every check at
+    once; each check then keeps its leftmost non-overlapping matches, which
+    is exactly what re.finditer() per pattern used to return.
+    """
+    
+    _END = ''  # Node key holding the patterns that end here
+    
+    def __init__(self, checks):
+        self.checks = checks
+        self.root = {}
+        
+        for check_index, (alternatives, _) in enumerate(checks):
+            for priority, pattern in enumerate(alternatives):
+                anchored = pattern.startswith('^')
+                node = self.root
+                for char in pattern.lstrip('^'):
+                    node = node.setdefault(char, {})
+                node.setdefault(self._END, []).append((check_index, priority, anchored))
+    
+    def find(self, word: str) -> Tuple[Tuple[str, int, str], ...]:
+        """
+        Detect phonemes in a word.
+        
+        Returns:
+            Tuple of (phoneme, position, spelling), ordered by check then
+            position
+        """
+        # Per check: start position -> (alternative priority, end)
+        candidates = [{} for _ in self.checks]
+        root = self.root
+        length = len(word)
+        
+        for start in range(length):
+            node = root
+            for end in range(start, length):
+                node = node.get(word[end])
+                if node is None:
+                    break
+                for check_index, priority, anchored in node.get(self._END, ()):
+                    if anchored and start:
+                        continue
+                    found = candidates[check_index].get(start)
+                    if found is None or priority < found[0]:
+                        candidates[check_index][start] = (priority, end + 1)
+        
+        detected = []
+        for (_, phonemes), matches in zip(self.checks, candidates):
+            position = 0
+            for start in sorted(matches):
+                if start < position:
+                    continue
+                position = matches[start][1]
+                spelling = word[start:position]
+                for phoneme in phonemes:
+                    detected.append((phoneme, start, spelling))
+        
+        return tuple(detected)
+
+
+_grapheme_trie = GraphemeTrie(PHONEME_SPELLING_CHECKS)
+
+
+@lru_cache(maxsize=WORD_PHONEME_CACHE_SIZE)
+def detect_word_phonemes(word: str) -> Tuple[Tuple[str, int, str], ...]:
+    """
+    Memoized phoneme detection for one (lowercase) word.
+    
+    Returns:
+        Tuple of (phoneme, position, spelling)
+    """
+    return _grapheme_trie.find(word)
+
+
 class PhonemeAnalyzer:
     """
     Analyze pronunciation at phoneme level.
@@ -117,58 +217,50 @@ class PhonemeAnalyzer:
         Returns:
             List of phoneme information
         """
-        # Convert to lowercase for analysis
-        text_lower = text.lower()
-        words = text_lower.split()
+        return self.analyze_texts_for_phonemes([text])[0]
+    
+    def analyze_texts_for_phonemes(self, texts: List[str]) -> List[List[Dict]]:
+        """
+        Analyze many texts at once (each distinct word is detected once).
         
-        detected_phonemes = []
+        Args:
+            texts: Texts to analyze
+        
+        Returns:
+            One list of phoneme information per text
+        """
+        seen = {}
+        results = []
         
-        # Detect key phonemes based on common patterns
-        for word in words:
-            word_phonemes = self._detect_word_phonemes(word)
-            for phoneme_info in word_phonemes:
-                phoneme_info['word'] = word
-                detected_phonemes.append(phoneme_info)
+        for text in texts:
+            detected_phonemes = []
+            
+            # Detect key phonemes based on common patterns
+            for word in text.lower().split():
+                word_phonemes = seen.get(word)
+                if word_phonemes is None:
+                    word_phonemes = seen[word] = detect_word_phonemes(word)
+                
+                for phoneme, position, spelling in word_phonemes:
+                    detected_phonemes.append({
+                        'phoneme': phoneme,
+                        'position': position,
+                        'spelling': spelling,
+                        'word': word
+                    })
+            
+            results.append(detected_phonemes)
         
-        return detected_phonemes
+        return results
     
     def _detect_word_phonemes(self, word: str) -> List[Dict]:
         """
         Detect phonemes in a single word based on spelling patterns.
         """
-        phonemes = []
-        
-        # Check for common patterns
-        checks = [
-            # TH sounds
-            (r'th', ['θ', 'ð']),  # think, this
-            # SH sound
-            (r'sh|tion|sion', ['ʃ']),  # ship, nation, vision
-            # CH sound
-            (r'ch|tch', ['tʃ']),  # church, catch
-            # NG sound
-            (r'ng', ['ŋ']),  # sing
-            # Double EE
-            (r'ee|ea', ['iː']),  # see, sea
-            # S at start
-            (r'^s', ['s']),  # sell
-            # R sound
-            (r'r', ['r']),  # red
-            # L sound
-            (r'l', ['l']),  # shell
+        return [
+            {'phoneme': phoneme, 'position': position, 'spelling': spelling}
+            for phoneme, position, spelling in detect_word_phonemes(word)
         ]
-        
-        for pattern, possible_phonemes in checks:
-            matches = re.finditer(pattern, word)
-            for match in matches:
-                for phoneme in possible_phonemes:
-                    phonemes.append({
-                        'phoneme': phoneme,
-                        'position': match.start(),
-                        'spelling': match.group()
-                    })
-        
-        return phonemes
     
     def identify_problem_phonemes(
         self, 
@@ -179,6 +271,9 @@ class PhonemeAnalyzer:
         """
         Identify phonemes that likely caused pronunciation issues.
         
+        Expected and detected words are aligned first, so only missed,
+        substituted or low-confidence words are analyzed.
+        
         Args:
             expected_text: Expected text
             detected_words: Words detected by STT
@@ -190,47 +285,48 @@ class PhonemeAnalyzer:
         expected_words = expected_text.lower().split()
         problem_phonemes = []
         
-        # Analyze each expected word
-        for i, expected_word in enumerate(expected_words):
-            if i >= len(detected_words):
+        # Align words so an inserted/dropped word doesn't shift the rest
+        alignment = align_words(expected_words, detected_words, word_confidences)
+        
+        for aligned in alignment.words:
+            if aligned.op == OP_INSERTION:
+                # Extra detected word - no expected phonemes to blame
+                continue
+            
+            expected_word = expected_words[aligned.expected_index]
+            confidence = aligned.confidence if aligned.confidence is not None else 0.0
+            
+            if aligned.op == OP_DELETION:
                 # Word was completely missed
-                word_phonemes = self._detect_word_phonemes(expected_word)
-                for phoneme_info in word_phonemes:
-                    problem_phonemes.append({
-                        'phoneme': phoneme_info['phoneme'],
-                        'word': expected_word,
-                        'issue': 'word_missed',
-                        'severity': 'high',
-                        'confidence': 0.0
-                    })
-            elif i < len(word_confidences) and word_confidences[i] < 0.85:
-                # Word had low confidence - likely pronunciation issue
-                detected_word = detected_words[i]
-                
-                # Compare expected vs detected
-                if expected_word != detected_word:
-                    # Words are different - find phoneme differences
-                    word_phonemes = self._detect_word_phonemes(expected_word)
-                    for phoneme_info in word_phonemes:
-                        problem_phonemes.append({
-                            'phoneme': phoneme_info['phoneme'],
-                            'word': expected_word,
-                            'issue': 'mispronounced',
-                            'severity': 'medium' if word_confidences[i] > 0.7 else 'high',
-                            'confidence': word_confidences[i],
-                            'detected_as': detected_word
-                        })
-                else:
-                    # Same word but low confidence - unclear pronunciation
-                    word_phonemes = self._detect_word_phonemes(expected_word)
-                    for phoneme_info in word_phonemes:
-                        problem_phonemes.append({
-                            'phoneme': phoneme_info['phoneme'],
-                            'word': expected_word,
-                            'issue': 'unclear',
-                            'severity': 'low',
-                            'confidence': word_confidences[i]
-                        })
+                problem = {
+                    'issue': 'word_missed',
+                    'severity': 'high',
+                    'confidence': 0.0
+                }
+            elif aligned.op == OP_SUBSTITUTION:
+                # Words are different - find phoneme differences
+                problem = {
+                    'issue': 'mispronounced',
+                    'severity': 'medium' if confidence > 0.7 else 'high',
+                    'confidence': confidence,
+                    'detected_as': aligned.detected
+                }
+            elif aligned.confidence is not None and confidence < UNCLEAR_CONFIDENCE:
+                # Same word but low confidence - unclear pronunciation
+                problem = {
+                    'issue': 'unclear',
+                    'severity': 'low',
+                    'confidence': confidence
+                }
+            else:
+                continue
+            
+            for phoneme_info in self._detect_word_phonemes(expected_word):
+                problem_phonemes.append({
+                    'phoneme': phoneme_info['phoneme'],
+                    'word': expected_word,
+                    **problem
+                })
         
         return problem_phonemes
     
@@ -0,0 +1,564 @@
+"""
+Offline Pronunciation Scoring for Production Recordings
+
+Scores a user's recording against the reference audio of the phoneme without
+any cloud service (works in air-gapped deployments).
+
+Pipeline (decode once, then fixed-size frame blocks):
+1. Decode + downmix + resample to SCORING_SAMPLE_RATE (WAV via stdlib,
+   other formats via pydub/ffmpeg)
+2. Stream 25 ms frames (10 ms hop) in blocks of FRAME_BLOCK_SIZE frames and
+   compute per-frame log energy, MFCC-like cepstra and autocorrelation pitch
+   with vectorized NumPy
+3. Energy VAD -> speech segments, speech duration, speaking rate
+4. Compare with the reference: DTW over cepstra, duration ratio, pitch contour
+
+Supported Providers:
+- local: NumPy feature extraction + DTW (default)
+
+Usage:
+    >>> from apps.curriculum.pronunciation_scoring import get_pronunciation_scorer
+    >>> result = get_pronunciation_scorer().score(recording.recording_file, audio_source.audio_file)
+    >>> result['score'], result['feedback']
+"""
+
+import io
+import logging
+import math
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Optional imports
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy not installed. Local pronunciation scoring disabled.")
+
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+# Framing (16 kHz: 25 ms window, 10 ms hop)
+SCORING_SAMPLE_RATE = 16000
+FRAME_LENGTH = 400
+HOP_LENGTH = 160
+FFT_SIZE = 512
+FRAME_BLOCK_SIZE = 256          # Frames processed per block (bounded memory)
+
+# Cepstral features
+MEL_BANDS = 26
+MFCC_COUNT = 13                 # c0 (energy) is dropped for the DTW distance
+
+# Pitch (autocorrelation)
+PITCH_MIN_HZ = 60
+PITCH_MAX_HZ = 400
+VOICING_THRESHOLD = 0.45        # Normalized autocorrelation peak
+
+# Energy VAD
+VAD_FLOOR_MARGIN_DB = 12.0      # Above the noise floor (10th percentile)
+VAD_DYNAMIC_RANGE_DB = 40.0     # Below the loudest frame
+VAD_MIN_LEVEL_DB = -60.0        # Absolute floor (dBFS)
+VAD_MIN_GAP_FRAMES = 15         # Pauses shorter than 150 ms are bridged
+VAD_MIN_SEGMENT_FRAMES = 5      # Segments shorter than 50 ms are dropped
+
+# Syllable nuclei (speaking rate)
+NUCLEUS_PROMINENCE_DB = 3.0
+NUCLEUS_MIN_DISTANCE = 10       # 100 ms between nuclei
+
+# Score model
+DTW_DISTANCE_SCALE = 8.0        # Mean cepstral distance giving 100·e⁻¹ ≈ 37
+PITCH_CONTOUR_POINTS = 50
+MIN_VOICED_FRAMES = 5
+SCORE_WEIGHTS = {'spectral': 0.7, 'duration': 0.15, 'pitch': 0.15}
+
+
+class ScoringError(Exception):
+    """Audio could not be decoded or contains no speech."""
+
+
+@dataclass
+class AudioFeatures:
+    """Per-frame features of one recording (arrays are NumPy, one row per frame)."""
+
+    sample_rate: int
+    duration: float
+    energy_db: 'np.ndarray'
+    mfcc: 'np.ndarray'
+    pitch_hz: 'np.ndarray'          # 0 for unvoiced frames
+    speech_mask: 'np.ndarray'
+    segments: List[Tuple[int, int]]  # (start_frame, end_frame) half-open
+    nuclei: int
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.energy_db)
+
+    @property
+    def speech_duration(self) -> float:
+        frames = sum(end - start for start, end in self.segments)
+        return frames * HOP_LENGTH / self.sample_rate
+
+    @property
+    def speaking_rate(self) -> float:
+        """Syllable nuclei per second of speech."""
+        duration = self.speech_duration
+        return self.nuclei / duration if duration else 0.0
+
+    def speech_frames(self) -> 'np.ndarray':
+        """Cepstra from the first to the last speech frame (leading/trailing silence trimmed)."""
+        if not self.segments:
+            return self.mfcc[:0]
+        return self.mfcc[self.segments[0][0]:self.segments[-1][1]]
+
+    def voiced_pitch(self) -> 'np.ndarray':
+        """Pitch of voiced speech frames, in Hz."""
+        return self.pitch_hz[(self.pitch_hz > 0) & self.speech_mask]
+
+    def summary(self) -> Dict:
+        pitch = self.voiced_pitch()
+        return {
+            'duration': round(self.duration, 3),
+            'speech_duration': round(self.speech_duration, 3),
+            'segments': len(self.segments),
+            'speaking_rate': round(self.speaking_rate, 2),
+            'pitch_mean': round(float(pitch.mean()), 1) if len(pitch) else None,
+            'pitch_range': round(float(pitch.max() - pitch.min()), 1) if len(pitch) else None,
+        }
+
+
+# =========================================================================
+# DECODING
+# =========================================================================
+
+def _read_bytes(source) -> bytes:
+    """Read a Django File, file-like object or path (file pointer is restored)."""
+    if hasattr(source, 'read'):
+        if getattr(source, 'closed', False) and hasattr(source, 'open'):
+            source.open('rb')
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        data = source.read()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return data
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def _decode_wav(data: bytes) -> Tuple['np.ndarray', int]:
+    with wave.open(io.BytesIO(data)) as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width in (2, 4):
+        dtype = np.int16 if width == 2 else np.int32
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.float32) / np.iinfo(dtype).max
+    else:
+        raise ScoringError(f'Unsupported WAV sample width: {width} bytes')
+
+    return samples.reshape(-1, channels).mean(axis=1), rate
+
+
+def _decode_with_pydub(data: bytes) -> Tuple['np.ndarray', int]:
+    if not PYDUB_AVAILABLE:
+        raise ScoringError('pydub is required to decode compressed audio')
+    try:
+        segment = AudioSegment.from_file(io.BytesIO(data))
+    except Exception as e:
+        raise ScoringError(f'Could not decode audio: {e}') from e
+
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    samples /= float(1 << (8 * segment.sample_width - 1))
+    return samples.reshape(-1, segment.channels).mean(axis=1), segment.frame_rate
+
+
+def resample(samples: 'np.ndarray', rate: int, target_rate: int = SCORING_SAMPLE_RATE) -> 'np.ndarray':
+    """Linear-interpolation resampling (a 3-tap average is applied first when downsampling)."""
+    if rate == target_rate or not len(samples):
+        return samples.astype(np.float32, copy=False)
+    if rate > target_rate:
+        samples = np.convolve(samples, np.full(3, 1 / 3, dtype=np.float32), mode='same')
+    count = int(round(len(samples) * target_rate / rate))
+    positions = np.arange(count, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def decode_audio(source, sample_rate: int = SCORING_SAMPLE_RATE) -> 'np.ndarray':
+    """
+    Decode audio to mono float32 samples in [-1, 1] at sample_rate.
+
+    Args:
+        source: Django File, file-like object or path
+        sample_rate: Target sample rate
+
+    Returns:
+        1-D float32 array
+    """
+    if not NUMPY_AVAILABLE:
+        raise ScoringError('numpy is required for local pronunciation scoring')
+
+    data = _read_bytes(source)
+    if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+        samples, rate = _decode_wav(data)
+    else:
+        samples, rate = _decode_with_pydub(data)
+    return resample(samples, rate, sample_rate)
+
+
+# =========================================================================
+# FRAME FEATURES
+# =========================================================================
+
+def iter_frame_blocks(
+    samples: 'np.ndarray',
+    block_size: int = FRAME_BLOCK_SIZE
+) -> Iterator['np.ndarray']:
+    """
+    Yield (frames, FRAME_LENGTH) views over the signal, block_size frames at a time.
+
+    The last frame is zero-padded, so every sample belongs to a frame.
+    """
+    frame_count = max(1, 1 + math.ceil(max(0, len(samples) - FRAME_LENGTH) / HOP_LENGTH))
+    padded_length = (frame_count - 1) * HOP_LENGTH + FRAME_LENGTH
+    if padded_length > len(samples):
+        samples = np.pad(samples, (0, padded_length - len(samples)))
+
+    for first in range(0, frame_count, block_size):
+        last = min(frame_count, first + block_size)
+        chunk = samples[first * HOP_LENGTH:(last - 1) * HOP_LENGTH + FRAME_LENGTH]
+        yield np.lib.stride_tricks.sliding_window_view(chunk, FRAME_LENGTH)[::HOP_LENGTH]
+
+
+@lru_cache(maxsize=4)
+def _analysis_matrices(sample_rate: int):
+    """Window, mel filterbank and DCT-II matrices (built once per sample rate)."""
+    window = np.hamming(FRAME_LENGTH).astype(np.float32)
+
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), MEL_BANDS + 2)
+    hz_points = 700 * (10 ** (mel_points / 2595) - 1)
+    bins = np.floor((FFT_SIZE + 1) * hz_points / sample_rate).astype(int)
+
+    filterbank = np.zeros((MEL_BANDS, FFT_SIZE // 2 + 1), dtype=np.float32)
+    for band in range(1, MEL_BANDS + 1):
+        left, center, right = bins[band - 1], bins[band], bins[band + 1]
+        if center > left:
+            filterbank[band - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filterbank[band - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+
+    n = np.arange(MEL_BANDS)
+    dct = np.cos(np.pi / MEL_BANDS * (n + 0.5)[None, :] * np.arange(MFCC_COUNT)[:, None])
+    return window, filterbank.T, dct.T.astype(np.float32)
+
+
+def _block_features(frames: 'np.ndarray', sample_rate: int):
+    """Log energy (dB), MFCC-like cepstra and pitch for one block of frames."""
+    window, filterbank, dct = _analysis_matrices(sample_rate)
+    centered = frames - frames.mean(axis=1, keepdims=True)
+
+    energy_db = 10 * np.log10(np.mean(centered ** 2, axis=1) + 1e-10)
+
+    power = np.abs(np.fft.rfft(centered * window, FFT_SIZE)) ** 2
+    mfcc = np.log(power @ filterbank + 1e-10) @ dct
+
+    # Autocorrelation via FFT (Wiener-Khinchin), normalized by lag 0
+    autocorr = np.fft.irfft(np.abs(np.fft.rfft(centered, 2 * FFT_SIZE)) ** 2)
+    min_lag = sample_rate // PITCH_MAX_HZ
+    max_lag = min(FRAME_LENGTH - 1, sample_rate // PITCH_MIN_HZ)
+    lags = autocorr[:, min_lag:max_lag + 1]
+    best = lags.argmax(axis=1)
+    strength = lags[np.arange(len(lags)), best] / (autocorr[:, 0] + 1e-10)
+    pitch_hz = np.where(strength >= VOICING_THRESHOLD, sample_rate / (best + min_lag), 0.0)
+
+    return energy_db, mfcc, pitch_hz
+
+
+def _speech_segments(energy_db: 'np.ndarray') -> Tuple['np.ndarray', List[Tuple[int, int]], float]:
+    """Energy VAD: threshold, bridge short pauses, drop short blips."""
+    threshold = max(
+        np.percentile(energy_db, 10) + VAD_FLOOR_MARGIN_DB,
+        energy_db.max() - VAD_DYNAMIC_RANGE_DB,
+        VAD_MIN_LEVEL_DB,
+    )
+    edges = np.diff(np.concatenate(([0], (energy_db > threshold).astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if segments and start - segments[-1][1] < VAD_MIN_GAP_FRAMES:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    segments = [(s, e) for s, e in segments if e - s >= VAD_MIN_SEGMENT_FRAMES]
+
+    mask = np.zeros(len(energy_db), dtype=bool)
+    for start, end in segments:
+        mask[start:end] = True
+    return mask, segments, threshold
+
+
+def _count_nuclei(energy_db: 'np.ndarray', mask: 'np.ndarray', threshold: float) -> int:
+    """Count energy peaks (syllable nuclei) inside speech."""
+    if len(energy_db) < 3:
+        return int(mask.any())
+    smoothed = np.convolve(energy_db, np.ones(5) / 5, mode='same')
+    inner = smoothed[1:-1]
+    peaks = np.flatnonzero(
+        (inner > smoothed[:-2]) & (inner >= smoothed[2:])
+        & mask[1:-1] & (inner > threshold + NUCLEUS_PROMINENCE_DB)
+    ) + 1
+
+    count, last = 0, -NUCLEUS_MIN_DISTANCE
+    for peak in peaks.tolist():
+        if peak - last >= NUCLEUS_MIN_DISTANCE:
+            count += 1
+            last = peak
+    return count
+
+
+def extract_features(samples: 'np.ndarray', sample_rate: int = SCORING_SAMPLE_RATE) -> AudioFeatures:
+    """
+    Frame-level features for a decoded signal (processed block by block).
+
+    Args:
+        samples: Mono float32 samples
+        sample_rate: Sample rate of samples
+
+    Returns:
+        AudioFeatures
+    """
+    energy, cepstra, pitch = [], [], []
+    for frames in iter_frame_blocks(samples):
+        block_energy, block_mfcc, block_pitch = _block_features(frames, sample_rate)
+        energy.append(block_energy)
+        cepstra.append(block_mfcc)
+        pitch.append(block_pitch)
+
+    energy_db = np.concatenate(energy)
+    mask, segments, threshold = _speech_segments(energy_db)
+
+    return AudioFeatures(
+        sample_rate=sample_rate,
+        duration=len(samples) / sample_rate,
+        energy_db=energy_db,
+        mfcc=np.concatenate(cepstra),
+        pitch_hz=np.where(mask, np.concatenate(pitch), 0.0),
+        speech_mask=mask,
+        segments=segments,
+        nuclei=_count_nuclei(energy_db, mask, threshold),
+    )
+
+
+# =========================================================================
+# COMPARISON
+# =========================================================================
+
+def dtw_distance(a: 'np.ndarray', b: 'np.ndarray') -> float:
+    """
+    Mean Euclidean frame distance along the optimal DTW path.
+
+    Each row is vectorized: the diagonal/vertical steps are a plain minimum,
+    and the horizontal recurrence D[j] = min(T[j], D[j-1] + c[j]) is solved
+    with a cumulative sum + running minimum. Cost rows are computed one at
+    a time, so memory is O(len(b)), not O(len(a) * len(b)).
+    """
+    previous = np.concatenate(([0.0], np.full(len(b), np.inf)))
+    for frame in a:
+        row = np.sqrt(((b - frame) ** 2).sum(axis=1))
+        step = row + np.minimum(previous[:-1], previous[1:])
+        totals = np.cumsum(row)
+        current = totals + np.minimum.accumulate(step - totals)
+        previous = np.concatenate(([np.inf], current))
+    return float(previous[-1] / (len(a) + len(b)))
+
+
+def _normalized_cepstra(features: AudioFeatures) -> 'np.ndarray':
+    cepstra = features.speech_frames()[:, 1:].astype(np.float32)
+    return cepstra - cepstra.mean(axis=0)
+
+
+def _pitch_contour(features: AudioFeatures) -> Optional['np.ndarray']:
+    """Voiced pitch in semitones around its mean, resampled to PITCH_CONTOUR_POINTS."""
+    pitch = features.voiced_pitch()
+    if len(pitch) < MIN_VOICED_FRAMES:
+        return None
+    semitones = 12 * np.log2(pitch.astype(np.float64))
+    semitones -= semitones.mean()
+    positions = np.linspace(0, len(semitones) - 1, PITCH_CONTOUR_POINTS)
+    return np.interp(positions, np.arange(len(semitones)), semitones)
+
+
+def compare_features(features: AudioFeatures, reference: AudioFeatures) -> Dict:
+    """
+    Score a recording against reference features.
+
+    Returns:
+        {
+            'score': 0-100 weighted score,
+            'components': {'spectral': .., 'duration': .., 'pitch': .. or None},
+            'dtw_distance': mean cepstral distance,
+            'duration_ratio': speech duration / reference speech duration,
+        }
+    """
+    if not features.segments:
+        raise ScoringError('No speech detected in the recording')
+    if not reference.segments:
+        raise ScoringError('No speech detected in the reference audio')
+
+    distance = dtw_distance(_normalized_cepstra(features), _normalized_cepstra(reference))
+    ratio = features.speech_duration / reference.speech_duration
+
+    components = {
+        'spectral': 100 * math.exp(-distance / DTW_DISTANCE_SCALE),
+        'duration': 100 * math.exp(-abs(math.log(ratio)) / math.log(2)),
+        'pitch': None,
+    }
+
+    contour, reference_contour = _pitch_contour(features), _pitch_contour(reference)
+    if contour is not None and reference_contour is not None:
+        deviation = float(np.sqrt(np.mean((contour - reference_contour) ** 2)))
+        components['pitch'] = 100 * math.exp(-deviation / 6)    # 6 semitones RMS -> 37
+
+    available = {k: v for k, v in components.items() if v is not None}
+    weight = sum(SCORE_WEIGHTS[k] for k in available)
+    score = sum(SCORE_WEIGHTS[k] * v for k, v in available.items()) / weight
+
+    return {
+        'score': round(score, 1),
+        'components': {k: round(v, 1) if v is not None else None for k, v in components.items()},
+        'dtw_distance': round(distance, 3),
+        'duration_ratio': round(ratio, 3),
+    }
+
+
+def generate_scoring_feedback(result: Dict) -> str:
+    """Human-readable feedback for a scoring result."""
+    score = result['score']
+    components = result['components']
+    parts = []
+
+    if score >= 85:
+        parts.append("🎉 Xuất sắc! Phát âm rất giống mẫu.")
+    elif score >= 70:
+        parts.append("👍 Tốt! Phát âm khá giống mẫu.")
+    elif score >= 50:
+        parts.append("💪 Được! Còn cần luyện tập thêm.")
+    else:
+        parts.append("📖 Hãy nghe lại audio mẫu và thử lại.")
+
+    ratio = result['duration_ratio']
+    if ratio < 0.6:
+        parts.append("Bạn phát âm hơi ngắn. Hãy kéo dài âm hơn!")
+    elif ratio > 1.7:
+        parts.append("Bạn phát âm hơi dài. Thử nói gọn hơn!")
+
+    if components['pitch'] is not None and components['pitch'] < 50:
+        parts.append("Ngữ điệu khác với mẫu - chú ý lên xuống giọng.")
+
+    return " ".join(parts)
+
+
+# =========================================================================
+# PROVIDERS
+# =========================================================================
+
+class LocalPronunciationScorer:
+    """NumPy feature extraction + DTW, no network access."""
+
+    name = 'local'
+
+    def __init__(self, sample_rate: int = SCORING_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def extract(self, audio_file) -> AudioFeatures:
+        return extract_features(decode_audio(audio_file, self.sample_rate), self.sample_rate)
+
+    def score(self, audio_file, reference_file) -> Dict:
+        """
+        Score a recording against reference audio.
+
+        Args:
+            audio_file: User recording (Django File, file-like or path)
+            reference_file: Reference audio (Django File, file-like or path)
+                or precomputed AudioFeatures (see reference_features)
+
+        Returns:
+            {
+                'score': 0-100,
+                'feedback': str,
+                'provider': str,
+                'components': {...},
+                'recording': {...duration, speaking_rate, pitch...},
+                'reference': {...},
+            }
+        """
+        features = self.extract(audio_file)
+        reference = self.reference_features(reference_file)
+        result = compare_features(features, reference)
+        result.update({
+            'feedback': generate_scoring_feedback(result),
+            'provider': self.name,
+            'recording': features.summary(),
+            'reference': reference.summary(),
+        })
+        return result
+
+    def reference_features(self, reference_file) -> AudioFeatures:
+        """Features of the reference audio (precomputed features are used as-is)."""
+        if isinstance(reference_file, AudioFeatures):
+            return reference_file
+        return self.extract(reference_file)
+
+
+SCORING_PROVIDERS = {
+    'local': LocalPronunciationScorer,
+}
+
+
+def get_pronunciation_scorer() -> LocalPronunciationScorer:
+    """
+    Factory function to get the configured scoring provider.
+
+    Returns:
+        Scoring provider instance (see SCORING_PROVIDERS)
+    """
+    provider = getattr(settings, 'PRONUNCIATION_SCORING_PROVIDER', 'local')
+    try:
+        return SCORING_PROVIDERS[provider]()
+    except KeyError:
+        raise ValueError(f"Unsupported scoring provider: {provider}")
+
+
+def reference_audio_for(phoneme):
+    """
+    Reference AudioSource for a phoneme (preferred audio, then native/cached TTS).
+
+    Never generates audio: scoring must not depend on a TTS service.
+
+    Returns:
+        AudioSource instance or None
+    """
+    preferred = phoneme.preferred_audio_source
+    if preferred and preferred.audio_file:
+        return preferred
+
+    from .services.audio_service import PhonemeAudioService
+    return PhonemeAudioService().get_audio_for_phoneme(phoneme, auto_generate=False)
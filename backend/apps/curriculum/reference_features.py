@@ -0,0 +1,279 @@
+"""
+Reference Audio Feature Store
+
+Precomputed scoring features for reference audio, shared by every scorer
+worker:
+- Phoneme.preferred_audio_source / AudioVersion.audio_source (AudioSource)
+- MinimalPair.word_1_audio / word_2_audio
+
+Features:
+- Each reference file is decoded once (pronunciation_scoring.extract_features)
+- Key = SHA-256 of the audio bytes + FEATURE_VERSION, so identical audio is
+  stored once and a new recording never reuses stale features
+- One float16 .npy matrix per key: {root}/ab/<sha256>.<version>.npy,
+  written atomically (temp file + os.replace)
+- Read with np.load(mmap_mode='r'): workers share the pages in the OS cache
+- Phoneme -> key mapping lives in the Django cache and is dropped by
+  AudioVersion.activate()
+
+Matrix layout (float16, one row per 10 ms frame after a header row):
+    row 0:   [duration, nuclei, 0, ...]
+    row 1..: [energy_db, pitch_hz, speech, c0 .. c12]
+Cepstra are mean-normalized over the speech frames.
+
+Usage:
+    >>> from apps.curriculum.reference_features import get_reference_feature_store
+    >>> store = get_reference_feature_store()
+    >>> reference = store.for_phoneme(phoneme)
+    >>> scorer.score(recording.recording_file, reference)
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .pronunciation_scoring import (
+    MFCC_COUNT, SCORING_SAMPLE_RATE, AudioFeatures, decode_audio, extract_features, np,
+    reference_audio_for
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when extract_features() or the matrix layout changes
+FEATURE_VERSION = 'f1'
+
+COL_ENERGY, COL_PITCH, COL_SPEECH, COL_MFCC = 0, 1, 2, 3
+FEATURE_COLUMNS = COL_MFCC + MFCC_COUNT
+
+PHONEME_CACHE_TTL = 24 * 3600
+HASH_CHUNK_SIZE = 1 << 16
+
+
+def content_hash(audio_file) -> str:
+    """SHA-256 of a Django File, file-like object or path (streamed)."""
+    digest = hashlib.sha256()
+    if hasattr(audio_file, 'read'):
+        if getattr(audio_file, 'closed', False) and hasattr(audio_file, 'open'):
+            audio_file.open('rb')
+        audio_file.seek(0)
+        for chunk in iter(lambda: audio_file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        audio_file.seek(0)
+    else:
+        with open(audio_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def features_to_matrix(features: AudioFeatures) -> 'np.ndarray':
+    """Pack AudioFeatures into the float16 storage layout."""
+    matrix = np.zeros((features.frame_count + 1, FEATURE_COLUMNS), dtype=np.float32)
+    matrix[0, 0] = features.duration
+    matrix[0, 1] = features.nuclei
+
+    cepstra = features.mfcc
+    if features.speech_mask.any():
+        cepstra = cepstra - cepstra[features.speech_mask].mean(axis=0)
+
+    matrix[1:, COL_ENERGY] = features.energy_db
+    matrix[1:, COL_PITCH] = features.pitch_hz
+    matrix[1:, COL_SPEECH] = features.speech_mask
+    matrix[1:, COL_MFCC:] = cepstra
+    return matrix.astype(np.float16)
+
+
+def matrix_to_features(matrix: 'np.ndarray') -> AudioFeatures:
+    """
+    AudioFeatures backed by a (memory-mapped) storage matrix.
+
+    Energy, pitch and cepstra are views into the matrix; only the speech
+    mask is materialized.
+    """
+    frames = matrix[1:]
+    mask = frames[:, COL_SPEECH] > 0.5
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    segments = list(zip(
+        np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()
+    ))
+    return AudioFeatures(
+        sample_rate=SCORING_SAMPLE_RATE,
+        duration=float(matrix[0, 0]),
+        energy_db=frames[:, COL_ENERGY],
+        mfcc=frames[:, COL_MFCC:],
+        pitch_hz=frames[:, COL_PITCH],
+        speech_mask=mask,
+        segments=segments,
+        nuclei=int(matrix[0, 1]),
+    )
+
+
+def phoneme_cache_key(phoneme_id: int) -> str:
+    return f"reference_features:{FEATURE_VERSION}:phoneme:{phoneme_id}"
+
+
+def invalidate_phoneme_features(phoneme_id: int) -> None:
+    """Forget which features belong to a phoneme (its reference audio changed)."""
+    cache.delete(phoneme_cache_key(phoneme_id))
+
+
+class ReferenceFeatureStore:
+    """
+    Content-addressed float16 feature matrices for reference audio.
+    """
+
+    EXTENSION = '.npy'
+
+    # Open memory maps kept per process (content-addressed, never stale)
+    MAX_OPEN = 256
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        if root is None:
+            root = getattr(
+                settings,
+                'REFERENCE_FEATURE_ROOT',
+                os.path.join(settings.MEDIA_ROOT, 'reference_features')
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._open: 'OrderedDict[str, AudioFeatures]' = OrderedDict()
+
+    # -------------------------------------------------------------------------
+    # Content-addressed files
+    # -------------------------------------------------------------------------
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.{FEATURE_VERSION}{self.EXTENSION}"
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def load(self, key: str) -> Optional[AudioFeatures]:
+        """Memory-mapped features for a content hash (None if not computed yet)."""
+        features = self._open.get(key)
+        if features is not None:
+            self._open.move_to_end(key)
+            return features
+
+        path = self.path_for(key)
+        try:
+            matrix = np.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Corrupt feature file {path}: {e}")
+            return None
+
+        features = matrix_to_features(matrix)
+        self._open[key] = features
+        if len(self._open) > self.MAX_OPEN:
+            self._open.popitem(last=False)
+        return features
+
+    def save(self, key: str, features: AudioFeatures) -> Path:
+        """Write the feature matrix atomically (temp file + os.replace)."""
+        final = self.path_for(key)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp = final.parent / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                np.save(f, features_to_matrix(features))
+            os.replace(tmp, final)
+        except Exception:
+            if tmp.exists():
+                os.remove(tmp)
+            raise
+        return final
+
+    def get(self, audio_file, key: Optional[str] = None) -> Tuple[str, AudioFeatures]:
+        """
+        Features for an audio file, computed and stored on first use.
+
+        Args:
+            audio_file: Django File, file-like object or path
+            key: Known content hash (skips hashing)
+
+        Returns:
+            (content hash, AudioFeatures)
+        """
+        key = key or content_hash(audio_file)
+        features = self.load(key)
+        if features is None:
+            logger.info(f"Computing reference features {key[:12]}")
+            self.save(key, extract_features(decode_audio(audio_file)))
+            features = self.load(key)
+        return key, features
+
+    # -------------------------------------------------------------------------
+    # Model helpers
+    # -------------------------------------------------------------------------
+
+    def for_audio_source(self, audio_source) -> AudioFeatures:
+        """Features of an AudioSource (also used for AudioVersion.audio_source)."""
+        return self.get(audio_source.audio_file)[1]
+
+    def for_minimal_pair(self, pair) -> Tuple[Optional[AudioFeatures], Optional[AudioFeatures]]:
+        """Features of MinimalPair.word_1_audio / word_2_audio (None if missing)."""
+        return tuple(
+            self.get(audio)[1] if audio else None
+            for audio in (pair.word_1_audio, pair.word_2_audio)
+        )
+
+    def for_phoneme(self, phoneme, audio_source=None) -> Optional[AudioFeatures]:
+        """
+        Features of the phoneme's reference audio.
+
+        The phoneme -> (audio source, hash) mapping is cached, so a warm call
+        touches neither the database nor the audio file.
+
+        Args:
+            phoneme: Phoneme instance
+            audio_source: Reference AudioSource if already resolved
+
+        Returns:
+            AudioFeatures or None if the phoneme has no reference audio
+        """
+        cache_key = phoneme_cache_key(phoneme.id)
+        cached = cache.get(cache_key)
+        expected_id = audio_source.id if audio_source else phoneme.preferred_audio_source_id
+        if cached and expected_id in (None, cached[0]):
+            features = self.load(cached[1])
+            if features is not None:
+                return features
+
+        if audio_source is None:
+            audio_source = reference_audio_for(phoneme)
+            if audio_source is None:
+                return None
+
+        key, features = self.get(audio_source.audio_file)
+        cache.set(cache_key, (audio_source.id, key), PHONEME_CACHE_TTL)
+        return features
+
+
+
+# =========================================================================
+# SINGLETON
+# =========================================================================
+
+_reference_feature_store = None
+
+
+def get_reference_feature_store() -> ReferenceFeatureStore:
+    """
+    Get the shared ReferenceFeatureStore instance.
+
+    Returns:
+        ReferenceFeatureStore rooted at settings.REFERENCE_FEATURE_ROOT
+    """
+    global _reference_feature_store
+    if _reference_feature_store is None:
+        _reference_feature_store = ReferenceFeatureStore()
+    return _reference_feature_store
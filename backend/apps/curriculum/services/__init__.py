@@ -6,11 +6,19 @@ operations across multiple models and external APIs.
 Modules:
 - audio_service: PhonemeAudioService for audio management
 - tts_service: TTS generation and caching (future)
+- tts_batch: Concurrent, rate-limited batch TTS synthesis
+- minimal_pair_index: Minimal pair discovery over IPA transcriptions
 - cache_service: Cache management utilities (future)
 """
 
 from .audio_service import PhonemeAudioService
+from .minimal_pair_index import MinimalPairIndex, build_minimal_pair_index
+from .tts_batch import TTSBatchSynthesizer, TTSJob
 
 __all__ = [
     'PhonemeAudioService',
+    'MinimalPairIndex',
+    'build_minimal_pair_index',
+    'TTSBatchSynthesizer',
+    'TTSJob',
 ]
@@ -8,9 +8,11 @@ This service implements intelligent audio source selection:
 
 Features:
 - 4-tier fallback hierarchy with auto-generation
-- Django cache integration
+- Two-tier resolution cache (apps.curriculum.audio_resolution): in-process
+  LRU + shared cache of serializable descriptors, so a hit costs no query
 - Bulk operations
 - Performance metrics
+- Write-behind usage counters (no database write per playback)
 - Quality scoring
 - Edge TTS integration for on-demand generation
 """
@@ -27,6 +29,12 @@ from django.db.models import Q, Prefetch, Count, Avg
 from django.utils import timezone
 from ..models import PhonemeCategory
 from apps.curriculum.models import Phoneme, AudioSource, AudioCache
+from apps.curriculum.audio_resolution import (
+    audio_from_descriptor,
+    describe_audio,
+    get_resolution_cache,
+)
+from apps.curriculum.usage_counters import AUDIO_SOURCE, record_usage
 from .edge_tts_service import get_tts_service
 
 
@@ -45,14 +53,13 @@ class PhonemeAudioService:
         ...     print(f"URL: {audio.get_url()}")
     
     Cache Keys:
-        - phoneme_audio:{phoneme_id} -> AudioSource ID
-        - phoneme_audio_url:{phoneme_id} -> Audio URL
+        - phoneme_audio:{namespace}.{generation}:{phoneme_id}:{voice_id|*}
+          -> AudioSource descriptor (see apps.curriculum.audio_resolution)
     """
     
     # Cache TTL settings
     CACHE_TTL_PREFERRED = 3600  # 1 hour for preferred audio
     CACHE_TTL_FALLBACK = 1800   # 30 minutes for fallback
-    CACHE_TTL_URL = 600         # 10 minutes for URLs
     
     # Quality thresholds
     MIN_QUALITY_SCORE = 80  # Minimum acceptable quality
@@ -176,31 +183,23 @@ class PhonemeAudioService:
         Args:
             phoneme: Phoneme instance
             voice_id: Specific voice ID (optional)
-            use_cache: Use URL cache
+            use_cache: Use the resolution cache
         
         Returns:
             Audio file URL or None
         """
-        # Try URL cache first
+        # The cached descriptor carries the URL
         if use_cache and self.cache_enabled:
-            cache_key = self._get_url_cache_key(phoneme.id, voice_id)
-            url = cache.get(cache_key)
-            if url:
-                return url
+            descriptor = get_resolution_cache().get(phoneme.id, voice_id)
+            if descriptor:
+                return descriptor['url']
         
-        # Get audio source
+        # Get audio source (cached on the way)
         audio = self.get_audio_for_phoneme(phoneme, voice_id, use_cache=use_cache)
         if not audio:
             return None
         
-        url = audio.get_url()
-        
-        # Cache URL
-        if use_cache and self.cache_enabled and url:
-            cache_key = self._get_url_cache_key(phoneme.id, voice_id)
-            cache.set(cache_key, url, self.CACHE_TTL_URL)
-        
-        return url
+        return audio.get_url()
     
     # =========================================================================
     # BULK OPERATIONS
@@ -399,23 +398,29 @@ class PhonemeAudioService:
         """
         Clear all audio-related cache entries.
         
+        One namespace generation bump: shared entries are orphaned and
+        expire on their TTL.
+        
         Returns:
-            Number of cache entries cleared (approximate)
+            Number of in-process cache entries dropped
         """
         if not self.cache_enabled:
             return 0
         
-        # This is a simplified implementation
-        # In production, use cache.delete_many() with pattern matching
-        count = 0
-        phoneme_ids = Phoneme.objects.values_list('id', flat=True)
-        for phoneme_id in phoneme_ids:
-            if self._invalidate_cache(phoneme_id):
-                count += 1
+        count = get_resolution_cache().invalidate_all()
         
-        logger.info(f"Cleared {count} audio cache entries")
+        logger.info(f"Cleared audio cache ({count} in-process entries)")
         return count
     
+    def get_cache_stats(self) -> Dict:
+        """
+        Hit/miss metrics of this process's resolution cache.
+        
+        Returns:
+            dict: local_hits, shared_hits, misses, hit_rate, local_entries, ...
+        """
+        return get_resolution_cache().stats()
+    
     # =========================================================================
     # PRIVATE HELPER METHODS
     # =========================================================================
@@ -497,52 +502,30 @@ class PhonemeAudioService:
         return None
     
     def _increment_usage(self, audio: AudioSource) -> None:
-        """Increment usage counter for audio source."""
-        try:
-            if hasattr(audio, 'cache'):
-                audio.cache.increment_usage()
-            else:
-                # Create cache if not exists
-                AudioCache.objects.create(
-                    audio_source=audio,
-                    usage_count=1
-                )
-        except Exception as e:
-            logger.warning(f"Failed to increment usage for audio {audio.id}: {e}")
-    
-    # Cache key generators
-    
-    @staticmethod
-    def _get_cache_key(phoneme_id: int, voice_id: Optional[str] = None) -> str:
-        """Generate cache key for audio source."""
-        if voice_id:
-            return f"phoneme_audio:{phoneme_id}:{voice_id}"
-        return f"phoneme_audio:{phoneme_id}"
+        """
+        Count a playback of an audio source.
+        
+        Write-behind (apps.curriculum.usage_counters): an in-memory
+        increment, written to AudioCache in batches.
+        """
+        record_usage(AUDIO_SOURCE, audio.id)
     
-    @staticmethod
-    def _get_url_cache_key(phoneme_id: int, voice_id: Optional[str] = None) -> str:
-        """Generate cache key for audio URL."""
-        if voice_id:
-            return f"phoneme_audio_url:{phoneme_id}:{voice_id}"
-        return f"phoneme_audio_url:{phoneme_id}"
+    # Resolution cache
     
     def _get_from_cache(
         self,
         phoneme_id: int,
         voice_id: Optional[str] = None
     ) -> Optional[AudioSource]:
-        """Get audio source from cache."""
-        cache_key = self._get_cache_key(phoneme_id, voice_id)
-        audio_id = cache.get(cache_key)
-        
-        if audio_id:
-            try:
-                return AudioSource.objects.select_related('cache').get(id=audio_id)
-            except AudioSource.DoesNotExist:
-                # Cache is stale, delete it
-                cache.delete(cache_key)
+        """Get audio source from the resolution cache (no query)."""
+        descriptor = get_resolution_cache().get(phoneme_id, voice_id)
+        if not descriptor:
+            return None
         
-        return None
+        audio = audio_from_descriptor(descriptor)
+        if not self._is_audio_valid(audio, voice_id):
+            return None
+        return audio
     
     def _save_to_cache(
         self,
@@ -550,23 +533,18 @@ class PhonemeAudioService:
         audio: AudioSource,
         voice_id: Optional[str] = None
     ) -> None:
-        """Save audio source to cache."""
-        cache_key = self._get_cache_key(phoneme_id, voice_id)
+        """Save audio source descriptor to the resolution cache."""
+        if not self.cache_enabled:
+            return
         ttl = self.CACHE_TTL_PREFERRED if audio.is_native() else self.CACHE_TTL_FALLBACK
-        cache.set(cache_key, audio.id, ttl)
+        get_resolution_cache().set(phoneme_id, voice_id, describe_audio(audio), ttl)
     
     def _invalidate_cache(self, phoneme_id: int) -> bool:
-        """Invalidate all cache entries for a phoneme."""
+        """Invalidate all cache entries for a phoneme (every voice)."""
         if not self.cache_enabled:
             return False
         
-        # Delete both regular and voice-specific caches
-        cache.delete(self._get_cache_key(phoneme_id))
-        cache.delete(self._get_url_cache_key(phoneme_id))
-        
-        # Note: In production, also delete voice_id-specific caches
-        # This would require tracking all voice_ids or using Redis pattern matching
-        
+        get_resolution_cache().invalidate_phoneme(phoneme_id)
         return True
     
     # =========================================================================
@@ -602,6 +580,20 @@ class PhonemeAudioService:
                 speed_level="beginner"
             )
             
+            return self._create_generated_audio_source(phoneme, voice_key, audio_path)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate audio for /{phoneme.ipa_symbol}/: {e}")
+            return None
+    
+    def _create_generated_audio_source(
+        self,
+        phoneme: Phoneme,
+        voice_key: str,
+        audio_path: str
+    ) -> Optional[AudioSource]:
+        """Create AudioSource + AudioCache records for a generated audio file."""
+        try:
             # Create AudioSource record
             with transaction.atomic():
                 # Create audio source
@@ -637,7 +629,7 @@ class PhonemeAudioService:
             return audio_source
             
         except Exception as e:
-            logger.error(f"Failed to generate audio for /{phoneme.ipa_symbol}/: {e}")
+            logger.error(f"Failed to save generated audio for /{phoneme.ipa_symbol}/: {e}")
             return None
     
     def generate_sentence_audio(
@@ -743,22 +735,51 @@ class PhonemeAudioService:
     def bulk_generate_phoneme_audio(
         self,
         phonemes: List[Phoneme],
-        voice_key: str = "us_female_clear"
+        voice_key: str = "us_female_clear",
+        concurrency: Optional[int] = None,
+        progress_callback=None
     ) -> Dict[int, AudioSource]:
         """
         Bulk generate audio for multiple phonemes.
         
+        All phonemes are synthesized concurrently in one batch (single event
+        loop), then the AudioSource records are created.
+        
         Args:
             phonemes: List of phonemes
             voice_key: Voice to use
+            concurrency: Max in-flight TTS requests (default: settings)
+            progress_callback: Optional callback(done, total, result)
         
         Returns:
             Dict mapping phoneme_id -> AudioSource
         """
-        result = {}
+        tts_service = get_tts_service()
+        accent = "us" if "us_" in voice_key else "gb"
+        
+        jobs = {
+            phoneme.id: tts_service.build_word_pronunciation_job(
+                word=phoneme.ipa_symbol,
+                accent=accent,
+                repeat=2,
+                speed_level="beginner"
+            )
+            for phoneme in phonemes
+        }
         
+        summary = tts_service.generate_speech_batch_sync(
+            jobs.values(),
+            concurrency=concurrency,
+            progress_callback=progress_callback
+        )
+        paths = {r['job']: r['path'] for r in summary['results'] if r['success']}
+        
+        result = {}
         for phoneme in phonemes:
-            audio = self._generate_phoneme_audio(phoneme, voice_key)
+            audio_path = paths.get(jobs[phoneme.id])
+            if not audio_path:
+                continue
+            audio = self._create_generated_audio_source(phoneme, voice_key, audio_path)
             if audio:
                 result[phoneme.id] = audio
         
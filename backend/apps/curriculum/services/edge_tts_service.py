@@ -5,7 +5,7 @@ Based on HUONG_DAN_TICH_HOP.md
 Features:
 - Multiple English voice variants (US, UK, AU, CA, IN)
 - Speed adjustment based on student level
-- Voice caching to avoid regeneration
+- Voice caching to avoid regeneration (shared content-addressed AudioStore)
 - Flexible API for different use cases
 - Mock mode support for offline development
 """
@@ -16,7 +16,6 @@ import hashlib
 import logging
 import os
 import tempfile
-from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
@@ -24,6 +23,8 @@ from django.conf import settings
 from django.core.files import File
 from django.core.cache import cache
 
+from services.audio_store import AudioStore, get_audio_store, make_audio_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -185,13 +186,11 @@ class EnglishTTSService:
         Initialize Edge TTS Service.
         
         Args:
-            output_dir: Directory to store audio files (default: MEDIA_ROOT/tts_audio)
+            output_dir: Root of a private AudioStore (default: the shared
+                store at settings.AUDIO_STORE_ROOT)
         """
-        if output_dir is None:
-            output_dir = os.path.join(settings.MEDIA_ROOT, 'tts_audio')
-        
-        self.output_dir = output_dir
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        self.store = AudioStore(root=output_dir) if output_dir else get_audio_store()
+        self.output_dir = str(self.store.root)
         
         self.default_voice = getattr(settings, 'TTS_DEFAULT_VOICE_KEY', 'us_female_clear')
         self.default_speed_level = getattr(settings, 'TTS_DEFAULT_SPEED_LEVEL', 'intermediate')
@@ -219,7 +218,8 @@ class EnglishTTSService:
             voice_key: Voice key from VOICES dict (default: us_female_clear)
             speed_level: Student level (beginner/intermediate/advanced)
             pitch: Pitch adjustment (-20 to +20 Hz, 0 = default)
-            filename: Custom filename (without extension)
+            filename: Legacy custom filename (ignored - audio is stored
+                content-addressed in the shared AudioStore)
             use_cache: Check cache before generating
         
         Returns:
@@ -248,49 +248,59 @@ class EnglishTTSService:
         rate_str = f"{rate:+d}%"
         pitch_str = f"{pitch:+d}Hz"
         
-        # Generate filename
-        if filename is None:
-            text_hash = hashlib.md5(text.encode()).hexdigest()[:10]
-            filename = f"{voice_key}_{speed_level}_{text_hash}"
-        
-        output_path = os.path.join(self.output_dir, f"{filename}.mp3")
+        # Content-addressed lookup: one file per (engine, voice, rate, pitch, text)
+        engine = "mock" if get_mock_tts_mode() else "edge"
+        key = make_audio_key(text, voice_id, rate=rate_str, pitch=pitch_str, engine=engine)
         
         # Check cache
-        if use_cache and os.path.exists(output_path):
-            logger.info(f"✅ Using cached audio: {filename}.mp3")
-            return output_path
+        if use_cache:
+            cached_path = self.store.get(key)
+            if cached_path:
+                logger.info(f"✅ Using cached audio: {cached_path.name}")
+                return str(cached_path)
         
-        # Mock mode for offline development
-        if get_mock_tts_mode():
-            return await self._generate_mock_audio(text, voice_id, output_path)
+        temp_path = str(self.store.temp_path(key))
         
-        # Generate with Edge TTS
         try:
-            logger.info(f"🔊 Generating audio: '{text[:50]}...' with {voice_key} ({speed_level})")
+            # Mock mode for offline development
+            if engine == "mock":
+                await self._generate_mock_audio(text, voice_id, temp_path)
+            else:
+                # Generate with Edge TTS
+                logger.info(f"🔊 Generating audio: '{text[:50]}...' with {voice_key} ({speed_level})")
+                
+                communicate = edge_tts.Communicate(
+                    text=text,
+                    voice=voice_id,
+                    rate=rate_str,
+                    pitch=pitch_str
+                )
+                
+                await communicate.save(temp_path)
             
-            communicate = edge_tts.Communicate(
+            # Validate file
+            if not os.path.exists(temp_path):
+                raise Exception(f"Audio file not created: {temp_path}")
+            
+            output_path = self.store.commit(
+                key,
+                temp_path,
                 text=text,
                 voice=voice_id,
                 rate=rate_str,
-                pitch=pitch_str
+                pitch=pitch_str,
+                engine=engine
             )
             
-            await communicate.save(output_path)
-            
-            # Validate file
-            if not os.path.exists(output_path):
-                raise Exception(f"Audio file not created: {output_path}")
-            
             file_size = os.path.getsize(output_path)
-            logger.info(f"✅ Audio generated: {filename}.mp3 ({file_size} bytes)")
+            logger.info(f"✅ Audio generated: {output_path.name} ({file_size} bytes)")
             
-            return output_path
+            return str(output_path)
             
         except Exception as e:
             logger.error(f"Edge TTS generation failed: {e}")
             # Clean up failed file
-            if os.path.exists(output_path):
-                os.remove(output_path)
+            self.store.discard(temp_path)
             raise Exception(f"TTS generation failed: {e}")
     
     async def _generate_mock_audio(self, text: str, voice_id: str, output_path: str) -> str:
@@ -310,9 +320,9 @@ class EnglishTTSService:
             
             logger.info(f"[MOCK] Audio created: {output_path}")
             
-        except ImportError:
-            # Fallback: create empty MP3
-            logger.warning("[MOCK] pydub not available, creating empty file")
+        except (ImportError, OSError) as e:
+            # Fallback: create empty MP3 (pydub or ffmpeg not available)
+            logger.warning(f"[MOCK] pydub/ffmpeg not available ({e}), creating empty file")
             with open(output_path, 'wb') as f:
                 f.write(b'')  # Empty file for testing
         
@@ -341,6 +351,30 @@ class EnglishTTSService:
         Returns:
             Path to audio file
         """
+        job = self.build_word_pronunciation_job(word, accent, repeat, speed_level)
+        
+        return await self.generate_speech(
+            text=job.text,
+            voice_key=job.voice_key,
+            speed_level=job.speed_level,
+            filename=job.filename
+        )
+    
+    @staticmethod
+    def build_word_pronunciation_job(
+        word: str,
+        accent: str = "us",
+        repeat: int = 1,
+        speed_level: str = "beginner"
+    ):
+        """
+        Build the TTSJob used by generate_word_pronunciation.
+        
+        Lets batch callers produce exactly the same files (and cache hits)
+        as the single-word API.
+        """
+        from .tts_batch import TTSJob
+        
         # Select voice
         voice_key = "us_female_clear" if accent == "us" else "gb_female"
         
@@ -352,13 +386,11 @@ class EnglishTTSService:
         safe_word = re.sub(r'[<>:"/\\|?*]', '_', word.lower())
         safe_word = safe_word.replace(' ', '_')
         
-        filename = f"word_{safe_word}_{accent}_{repeat}x"
-        
-        return await self.generate_speech(
+        return TTSJob(
             text=text,
             voice_key=voice_key,
             speed_level=speed_level,
-            filename=filename
+            filename=f"word_{safe_word}_{accent}_{repeat}x"
         )
     
     async def generate_sentence_audio(
@@ -512,25 +544,56 @@ class EnglishTTSService:
     # SYNCHRONOUS WRAPPERS
     # =========================================================================
     
+    def _run(self, coroutine):
+        """Run a coroutine on a new event loop, then apply the queued index writes."""
+        try:
+            return asyncio.run(coroutine)
+        finally:
+            self.store.flush()
+    
     def generate_speech_sync(self, *args, **kwargs) -> str:
         """Synchronous wrapper for generate_speech."""
-        return asyncio.run(self.generate_speech(*args, **kwargs))
+        return self._run(self.generate_speech(*args, **kwargs))
     
     def generate_word_pronunciation_sync(self, *args, **kwargs) -> str:
         """Synchronous wrapper for generate_word_pronunciation."""
-        return asyncio.run(self.generate_word_pronunciation(*args, **kwargs))
+        return self._run(self.generate_word_pronunciation(*args, **kwargs))
     
     def generate_sentence_audio_sync(self, *args, **kwargs) -> str:
         """Synchronous wrapper for generate_sentence_audio."""
-        return asyncio.run(self.generate_sentence_audio(*args, **kwargs))
+        return self._run(self.generate_sentence_audio(*args, **kwargs))
     
     def generate_conversation_sync(self, *args, **kwargs) -> List[str]:
         """Synchronous wrapper for generate_conversation."""
-        return asyncio.run(self.generate_conversation(*args, **kwargs))
+        return self._run(self.generate_conversation(*args, **kwargs))
     
     def generate_flashcard_audio_sync(self, *args, **kwargs) -> Dict[str, str]:
         """Synchronous wrapper for generate_flashcard_audio."""
-        return asyncio.run(self.generate_flashcard_audio(*args, **kwargs))
+        return self._run(self.generate_flashcard_audio(*args, **kwargs))
+    
+    # =========================================================================
+    # BATCH GENERATION
+    # =========================================================================
+    
+    async def generate_speech_batch(self, jobs, **options) -> Dict:
+        """
+        Generate many utterances concurrently on the current event loop.
+        
+        Args:
+            jobs: Iterable of TTSJob (text, voice_key, speed_level, pitch, filename)
+            **options: TTSBatchSynthesizer options (concurrency, rate_per_voice,
+                max_retries, progress_callback, ...)
+        
+        Returns:
+            Batch summary dict (see TTSBatchSynthesizer.run)
+        """
+        from .tts_batch import TTSBatchSynthesizer
+        
+        return await TTSBatchSynthesizer(tts_service=self, **options).run(jobs)
+    
+    def generate_speech_batch_sync(self, jobs, **options) -> Dict:
+        """Synchronous wrapper for generate_speech_batch (single event loop)."""
+        return self._run(self.generate_speech_batch(jobs, **options))
     
     # =========================================================================
     # UTILITY METHODS
@@ -632,33 +695,12 @@ class EnglishTTSService:
     
     def cleanup_old_files(self, days: int = 7):
         """
-        Remove audio files older than specified days.
+        Remove audio files not accessed for the specified number of days.
         
         Args:
-            days: Keep files newer than this many days
+            days: Keep files accessed more recently than this many days
         """
-        from datetime import datetime, timedelta
-        
-        cutoff_time = datetime.now() - timedelta(days=days)
-        removed_count = 0
-        
-        for filename in os.listdir(self.output_dir):
-            filepath = os.path.join(self.output_dir, filename)
-            
-            if not os.path.isfile(filepath):
-                continue
-            
-            # Check file age
-            file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-            
-            if file_time < cutoff_time:
-                try:
-                    os.remove(filepath)
-                    removed_count += 1
-                    logger.info(f"Removed old audio: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to remove {filename}: {e}")
-        
+        removed_count = self.store.cleanup(max_age_days=days)
         logger.info(f"Cleanup complete: {removed_count} files removed")
 
 
@@ -0,0 +1,231 @@
+"""
+Minimal pair discovery over IPA transcriptions.
+
+Two words form a minimal pair when their transcriptions differ in exactly
+one phoneme slot (ship /ʃɪp/ - sheep /ʃiːp/). Instead of comparing every
+word of phoneme A with every word of phoneme B, each transcription is
+filed under one key per slot with that slot masked:
+
+    /ʃɪp/ -> (*, ɪ, p)  (ʃ, *, p)  (ʃ, ɪ, *)
+
+Words sharing a key differ only in the masked slot, so all minimal pairs
+for all phoneme contrasts fall out of one linear pass over the buckets.
+
+Features:
+- Transcriptions segmented into phonemes by longest match against the
+  Phoneme inventory (iː, tʃ, eɪ ... are one slot); stress marks, slashes
+  and syllable dots ignored
+- Sources: PhonemeWord.ipa_transcription and Word.ipa (deduplicated by
+  spelling + transcription)
+- Incremental: add() files a new word and returns only the pairs it creates
+- Each pair reports the contrasting phonemes and the slot position
+  (index and initial/medial/final)
+
+Usage:
+    from apps.curriculum.services.minimal_pair_index import build_minimal_pair_index
+
+    index = build_minimal_pair_index()
+    for pair in index.pairs(contrast=('ɪ', 'iː')):
+        print(pair.word_1, pair.word_2, pair.position_label)
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MASK = '*'
+
+# Characters that carry no phoneme (delimiters, stress, syllable breaks, linking)
+IGNORED_IPA_CHARS = set('/[]()ˈˌ.\'‿ -')
+IPA_REPLACEMENTS = {
+    ':': 'ː',   # ASCII colon used for length
+    'g': 'ɡ',   # ASCII g vs IPA script g
+    'ʧ': 'tʃ',
+    'ʤ': 'dʒ',
+}
+
+
+@dataclass(frozen=True)
+class IndexedWord:
+    """A transcribed word in the index."""
+
+    word: str
+    ipa: str
+    phonemes: Tuple[str, ...]
+    meaning_vi: str = ''
+    source: str = ''
+
+
+@dataclass(frozen=True)
+class MinimalPairMatch:
+    """Two words differing in one phoneme slot."""
+
+    word_1: IndexedWord
+    word_2: IndexedWord
+    phoneme_1: str
+    phoneme_2: str
+    position: int
+
+    @property
+    def contrast(self) -> Tuple[str, str]:
+        return (self.phoneme_1, self.phoneme_2)
+
+    @property
+    def position_label(self) -> str:
+        """PhonemeWord.POSITION_CHOICES value of the contrasting slot."""
+        if self.position == 0:
+            return 'initial'
+        if self.position == len(self.word_1.phonemes) - 1:
+            return 'final'
+        return 'medial'
+
+
+def normalize_ipa(transcription: str) -> str:
+    """Strip delimiters and stress marks, unify ASCII look-alikes."""
+    text = ''.join(IPA_REPLACEMENTS.get(char, char) for char in (transcription or '').strip())
+    return ''.join(char for char in text if char not in IGNORED_IPA_CHARS)
+
+
+class MinimalPairIndex:
+    """
+    Deletion-neighbourhood index ("one slot masked" keys) of transcriptions.
+    """
+
+    def __init__(self, inventory: Iterable[str] = ()):
+        """
+        Args:
+            inventory: Phoneme IPA symbols used to segment transcriptions
+                (multi-character symbols become one slot)
+        """
+        symbols = {normalize_ipa(symbol) for symbol in inventory}
+        symbols.discard('')
+        self.inventory = symbols
+        self._max_symbol = max((len(symbol) for symbol in symbols), default=1)
+        self._buckets: Dict[Tuple[str, ...], Dict[str, List[IndexedWord]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def segment(self, transcription: str) -> Tuple[str, ...]:
+        """Split a transcription into phoneme slots (longest inventory match)."""
+        text = normalize_ipa(transcription)
+        phonemes = []
+        i = 0
+        while i < len(text):
+            for size in range(min(self._max_symbol, len(text) - i), 0, -1):
+                if text[i:i + size] in self.inventory:
+                    break
+            else:
+                size = 1    # Unknown symbol: still a slot of its own
+            phonemes.append(text[i:i + size])
+            i += size
+        return tuple(phonemes)
+
+    @staticmethod
+    def _keys(phonemes: Tuple[str, ...]):
+        for position in range(len(phonemes)):
+            yield position, phonemes[:position] + (MASK,) + phonemes[position + 1:]
+
+    def add(self, word: str, ipa: str, meaning_vi: str = '', source: str = '') -> List[MinimalPairMatch]:
+        """
+        File one word; return the minimal pairs it forms with indexed words.
+
+        Args:
+            word: Spelling
+            ipa: IPA transcription
+            meaning_vi: Vietnamese meaning (carried into the pair)
+            source: Free-form origin label (e.g. 'phoneme_word:12')
+
+        Returns:
+            New MinimalPairMatch list (empty for duplicates and empty transcriptions)
+        """
+        phonemes = self.segment(ipa)
+        identity = (word.strip().lower(), phonemes)
+        if not phonemes or identity in self._seen:
+            return []
+        self._seen.add(identity)
+
+        entry = IndexedWord(word.strip(), ipa.strip(), phonemes, meaning_vi or '', source)
+        matches = []
+        for position, key in self._keys(phonemes):
+            bucket = self._buckets[key]
+            slot = phonemes[position]
+            for other_slot, others in bucket.items():
+                if other_slot == slot:
+                    continue
+                for other in others:
+                    if other.word.lower() != identity[0]:
+                        matches.append(MinimalPairMatch(other, entry, other_slot, slot, position))
+            bucket[slot].append(entry)
+        return matches
+
+    def pairs(self, contrast: Optional[Tuple[str, str]] = None) -> List[MinimalPairMatch]:
+        """
+        All minimal pairs in the index (one pass over the buckets).
+
+        Args:
+            contrast: Only pairs of these two phonemes, in either order;
+                word_1 then carries contrast[0]
+
+        Returns:
+            MinimalPairMatch list, phonemes of each pair in sorted order
+            unless a contrast is given
+        """
+        wanted = None
+        if contrast:
+            wanted = tuple(normalize_ipa(symbol) for symbol in contrast)
+
+        matches = []
+        for key, bucket in self._buckets.items():
+            if len(bucket) < 2:
+                continue
+            position = key.index(MASK)
+            for slot_1, slot_2 in combinations(sorted(bucket), 2):
+                if wanted:
+                    if (slot_2, slot_1) == wanted:
+                        slot_1, slot_2 = slot_2, slot_1
+                    elif (slot_1, slot_2) != wanted:
+                        continue
+                for word_1 in bucket[slot_1]:
+                    for word_2 in bucket[slot_2]:
+                        if word_1.word.lower() != word_2.word.lower():
+                            matches.append(MinimalPairMatch(word_1, word_2, slot_1, slot_2, position))
+        return matches
+
+
+def build_minimal_pair_index(include_vocabulary: bool = True) -> MinimalPairIndex:
+    """
+    Index every PhonemeWord (and Word.ipa) transcription.
+
+    Three queries: phoneme inventory, phoneme words, vocabulary words.
+
+    Args:
+        include_vocabulary: Also index vocabulary Word.ipa entries
+
+    Returns:
+        MinimalPairIndex
+    """
+    from apps.curriculum.models import Phoneme, PhonemeWord
+
+    index = MinimalPairIndex(Phoneme.objects.values_list('ipa_symbol', flat=True))
+
+    rows = PhonemeWord.objects.order_by().values_list('id', 'word', 'ipa_transcription', 'meaning_vi')
+    for word_id, word, ipa, meaning_vi in rows.iterator():
+        index.add(word, ipa, meaning_vi, source=f'phoneme_word:{word_id}')
+
+    if include_vocabulary:
+        from apps.vocabulary.models import Word
+
+        rows = Word.objects.exclude(ipa='').order_by().values_list('id', 'text', 'ipa', 'meaning_vi')
+        for word_id, word, ipa, meaning_vi in rows.iterator():
+            index.add(word, ipa, meaning_vi, source=f'word:{word_id}')
+
+    logger.info(f"Built minimal pair index: {len(index)} transcriptions")
+    return index
@@ -0,0 +1,282 @@
+"""
+Batch TTS synthesis engine.
+
+Runs thousands of synthesis jobs on a single event loop instead of one
+``asyncio.run`` per utterance (which is what the ``*_sync`` wrappers of
+EnglishTTSService do).
+
+Features:
+- Bounded concurrency (asyncio.Semaphore), held only for the request
+  itself: jobs waiting on a rate limit or a retry backoff free their slot
+- Per-voice rate limits (minimum spacing between requests to the same voice)
+- Retry with exponential backoff + jitter for transient Edge TTS failures
+- Progress callback after every finished job
+- De-duplication of identical jobs inside one batch
+- Mock mode path with simulated network latency for offline benchmarking
+
+Usage:
+    >>> from apps.curriculum.services.tts_batch import TTSJob, TTSBatchSynthesizer
+    >>> jobs = [TTSJob(text=w, voice_key="us_female_clear") for w in words]
+    >>> summary = TTSBatchSynthesizer(concurrency=16).run_sync(jobs)
+    >>> print(summary['successful'], summary['jobs_per_second'])
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from services.audio_store import get_audio_store
+
+from .edge_tts_service import EnglishTTSService, get_mock_tts_mode, get_tts_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TTSJob:
+    """One utterance to synthesize (hashable, so duplicates collapse)."""
+
+    text: str
+    voice_key: Optional[str] = None
+    speed_level: Optional[str] = None
+    pitch: int = 0
+    filename: Optional[str] = None
+
+
+ProgressCallback = Callable[[int, int, Dict], None]
+SynthesizeFunc = Callable[[TTSJob], Awaitable[str]]
+
+
+class VoiceRateLimiter:
+    """
+    Per-voice request spacing.
+
+    Each voice gets at most ``rate`` requests per second; requests for
+    different voices never wait on each other.
+    """
+
+    def __init__(self, rate: float, overrides: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.overrides = overrides or {}
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _interval(self, voice_key: str) -> float:
+        rate = self.overrides.get(voice_key, self.rate)
+        return 1.0 / rate if rate and rate > 0 else 0.0
+
+    async def acquire(self, voice_key: str) -> None:
+        """Wait until the next request slot for ``voice_key`` is free."""
+        interval = self._interval(voice_key)
+        if not interval:
+            return
+
+        lock = self._locks.setdefault(voice_key, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(voice_key, now))
+            self._next_slot[voice_key] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class TTSBatchSynthesizer:
+    """
+    Concurrent, rate-limited batch synthesis on one event loop.
+
+    Args:
+        tts_service: EnglishTTSService used for the default synthesize path
+        concurrency: Maximum number of in-flight synthesis requests
+        rate_per_voice: Requests per second allowed for each voice (0 = no limit)
+        rate_overrides: Per-voice rate overrides, e.g. {"gb_male": 2}
+        max_retries: Retries per job after the first attempt
+        backoff_base: Base delay in seconds (doubles every retry)
+        progress_callback: Called as ``callback(done, total, result)``
+        synthesize: Optional coroutine ``(job) -> path`` replacing the default
+        mock_latency: Simulated request latency (seconds) in mock mode
+    """
+
+    def __init__(
+        self,
+        tts_service: Optional[EnglishTTSService] = None,
+        concurrency: Optional[int] = None,
+        rate_per_voice: Optional[float] = None,
+        rate_overrides: Optional[Dict[str, float]] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        progress_callback: Optional[ProgressCallback] = None,
+        synthesize: Optional[SynthesizeFunc] = None,
+        mock_latency: Optional[float] = None,
+    ):
+        self.tts_service = tts_service
+        self.concurrency = concurrency or getattr(settings, 'TTS_BATCH_CONCURRENCY', 8)
+        if rate_per_voice is None:
+            rate_per_voice = getattr(settings, 'TTS_BATCH_RATE_PER_VOICE', 5)
+        self.rate_limiter = VoiceRateLimiter(rate_per_voice, rate_overrides)
+        if max_retries is None:
+            max_retries = getattr(settings, 'TTS_BATCH_MAX_RETRIES', 3)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.progress_callback = progress_callback
+        self._synthesize = synthesize
+        if mock_latency is None:
+            mock_latency = getattr(settings, 'TTS_BATCH_MOCK_LATENCY', 0.2)
+        self.mock_latency = mock_latency
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    async def run(self, jobs: Iterable[TTSJob]) -> Dict:
+        """
+        Synthesize all jobs and return a summary.
+
+        Returns:
+            dict: {
+                'total': int,            # unique jobs
+                'successful': int,
+                'failed': int,
+                'retries': int,
+                'elapsed_seconds': float,
+                'jobs_per_second': float,
+                'results': [{'job': TTSJob, 'success': bool, 'path': str,
+                             'attempts': int, 'error': str}, ...]
+            }
+        """
+        unique_jobs = list(dict.fromkeys(jobs))
+        total = len(unique_jobs)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+        started = time.monotonic()
+
+        if self._synthesize is None and self.tts_service is None:
+            self.tts_service = get_tts_service()
+        mock_mode = self._synthesize is None and get_mock_tts_mode()
+
+        async def worker(job: TTSJob) -> Dict:
+            nonlocal done
+            result = await self._run_job(job, mock_mode, semaphore)
+            done += 1
+            if self.progress_callback:
+                try:
+                    self.progress_callback(done, total, result)
+                except Exception as e:
+                    logger.warning(f"TTS batch progress callback failed: {e}")
+            return result
+
+        logger.info(
+            f"🔊 TTS batch: {total} jobs (concurrency={self.concurrency}, mock={mock_mode})"
+        )
+        results = await asyncio.gather(*(worker(job) for job in unique_jobs))
+
+        elapsed = time.monotonic() - started
+        successful = sum(1 for r in results if r['success'])
+        summary = {
+            'total': total,
+            'successful': successful,
+            'failed': total - successful,
+            'retries': sum(r['attempts'] - 1 for r in results),
+            'elapsed_seconds': round(elapsed, 3),
+            'jobs_per_second': round(total / elapsed, 2) if elapsed > 0 else float(total),
+            'results': results,
+        }
+
+        logger.info(
+            f"✅ TTS batch complete: {successful}/{total} successful "
+            f"in {summary['elapsed_seconds']}s ({summary['jobs_per_second']} jobs/s)"
+        )
+        return summary
+
+    def run_sync(self, jobs: Iterable[TTSJob]) -> Dict:
+        """Synchronous wrapper: one event loop for the whole batch."""
+        try:
+            return asyncio.run(self.run(jobs))
+        finally:
+            get_audio_store().flush()    # Index writes queued by commits on the loop
+
+    # =========================================================================
+    # PRIVATE HELPERS
+    # =========================================================================
+
+    async def _run_job(self, job: TTSJob, mock_mode: bool, semaphore: asyncio.Semaphore) -> Dict:
+        """
+        Run one job with rate limiting and retry/backoff.
+
+        The concurrency slot is taken after the rate-limit wait and given
+        back before a backoff sleep, so throttled jobs don't hold it.
+        """
+        voice_key = job.voice_key or (
+            self.tts_service.default_voice if self.tts_service else 'default'
+        )
+        attempts = 0
+        last_error = None
+
+        while attempts <= self.max_retries:
+            attempts += 1
+            await self.rate_limiter.acquire(voice_key)
+            try:
+                async with semaphore:
+                    if mock_mode and self.mock_latency:
+                        # Simulate the Edge TTS round trip so batches can be
+                        # benchmarked offline
+                        await asyncio.sleep(self.mock_latency)
+                    path = await self._call_synthesize(job)
+                return {
+                    'job': job,
+                    'success': True,
+                    'path': path,
+                    'attempts': attempts,
+                    'error': None,
+                }
+            except ValueError as e:
+                # Invalid input (e.g. empty text) - retrying will not help
+                last_error = e
+                break
+            except Exception as e:
+                last_error = e
+                if attempts > self.max_retries:
+                    break
+                delay = self.backoff_base * (2 ** (attempts - 1))
+                delay += random.uniform(0, self.backoff_base)
+                logger.warning(
+                    f"TTS job failed ('{job.text[:30]}', attempt {attempts}): {e} "
+                    f"- retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+        logger.error(f"TTS job gave up after {attempts} attempts: '{job.text[:30]}': {last_error}")
+        return {
+            'job': job,
+            'success': False,
+            'path': None,
+            'attempts': attempts,
+            'error': str(last_error),
+        }
+
+    async def _call_synthesize(self, job: TTSJob) -> str:
+        if self._synthesize is not None:
+            return await self._synthesize(job)
+        return await self.tts_service.generate_speech(
+            text=job.text,
+            voice_key=job.voice_key,
+            speed_level=job.speed_level,
+            pitch=job.pitch,
+            filename=job.filename,
+        )
+
+
+def synthesize_batch(jobs: List[TTSJob], **kwargs) -> Dict:
+    """
+    Convenience function for synchronous callers.
+
+    Usage:
+        >>> summary = synthesize_batch(jobs, concurrency=16)
+    """
+    return TTSBatchSynthesizer(**kwargs).run_sync(jobs)
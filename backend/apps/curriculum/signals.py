@@ -0,0 +1,46 @@
+"""
+Curriculum signals.
+
+Stage, lesson and prerequisite edits make the cached lesson unlock graph
+stale (lesson_unlocks) once they commit, so a request can't rebuild and
+cache the old graph under the new version meanwhile; audio source and phoneme edits make the phoneme's
+cached audio resolution stale (audio_resolution).
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .audio_resolution import invalidate_phoneme_audio
+from .lesson_unlocks import invalidate_lesson_graph
+from .models import AudioSource, CurriculumStage, Phoneme, PronunciationLesson
+
+
+@receiver(post_save, sender=CurriculumStage)
+@receiver(post_save, sender=PronunciationLesson)
+@receiver(post_delete, sender=CurriculumStage)
+@receiver(post_delete, sender=PronunciationLesson)
+def invalidate_unlock_graph(sender, instance, **kwargs):
+    """Bump the lesson unlock graph version."""
+    transaction.on_commit(invalidate_lesson_graph)
+
+
+@receiver(m2m_changed, sender=CurriculumStage.required_previous_stages.through)
+@receiver(m2m_changed, sender=PronunciationLesson.prerequisites.through)
+def invalidate_unlock_graph_prerequisites(sender, action, **kwargs):
+    """Prerequisites added, removed or cleared."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_lesson_graph)
+
+
+@receiver(post_save, sender=AudioSource)
+@receiver(post_delete, sender=AudioSource)
+def invalidate_audio_resolution(sender, instance, **kwargs):
+    """New, changed or deleted audio: re-resolve the phoneme's audio."""
+    invalidate_phoneme_audio(instance.phoneme_id)
+
+
+@receiver(post_save, sender=Phoneme)
+def invalidate_phoneme_audio_resolution(sender, instance, **kwargs):
+    """Preferred audio source may have changed."""
+    invalidate_phoneme_audio(instance.id)
@@ -14,9 +14,10 @@ Supported Providers:
 import io
 import logging
 from typing import Dict, List, Optional
-from difflib import SequenceMatcher
 from django.conf import settings
 
+from .word_alignment import align_words
+
 logger = logging.getLogger(__name__)
 
 # Import phoneme analyzer for Phase 5.2
@@ -157,8 +158,13 @@ class SpeechToTextService:
                 words.append(word_data)
                 total_duration = max(total_duration, word_data['end_time'])
             
-            # Calculate accuracy
-            accuracy = self._calculate_accuracy(expected_text, alternative.transcript)
+            # Align expected vs detected words (accuracy + per-word errors)
+            alignment = align_words(
+                expected_text.split(),
+                [w['word'] for w in words],
+                [w['confidence'] for w in words]
+            )
+            accuracy = alignment.accuracy
             
             # Calculate pronunciation score from word confidences
             if words:
@@ -182,6 +188,7 @@ class SpeechToTextService:
                 'words_detected': words_detected,
                 'words_expected': words_expected,
                 'speed': speed,
+                'word_errors': alignment.error_list(),
             }
             
         except Exception as e:
@@ -231,6 +238,11 @@ class SpeechToTextService:
         
         # Generate transcript
         transcript = ' '.join(w['word'] for w in words)
+        alignment = align_words(
+            words_expected,
+            [w['word'] for w in words],
+            [w['confidence'] for w in words]
+        )
         
         logger.info(f"Mock STT - Detected {words_detected}/{num_words} words, Accuracy: {accuracy:.1f}%")
         
@@ -243,34 +255,14 @@ class SpeechToTextService:
             'words_detected': words_detected,
             'words_expected': num_words,
             'speed': speed,
+            'word_errors': alignment.error_list(),
         }
     
-    def _calculate_accuracy(self, expected: str, detected: str) -> float:
-        """
-        Calculate text matching accuracy using SequenceMatcher.
-        
-        Args:
-            expected: Expected text
-            detected: Detected text from STT
-        
-        Returns:
-            Accuracy percentage (0-100)
-        """
-        # Normalize texts
-        expected_words = expected.lower().split()
-        detected_words = detected.lower().split()
-        
-        # Use SequenceMatcher for fuzzy matching
-        matcher = SequenceMatcher(None, expected_words, detected_words)
-        similarity = matcher.ratio()
-        
-        return similarity * 100
-    
     def _empty_result(self, expected_text: str) -> Dict:
         """
         Return empty result when no speech detected.
         """
-        num_words = len(expected_text.split())
+        expected_words = expected_text.split()
         
         return {
             'transcript': '',
@@ -279,8 +271,9 @@ class SpeechToTextService:
             'pronunciation_score': 0,
             'duration': 0,
             'words_detected': 0,
-            'words_expected': num_words,
+            'words_expected': len(expected_words),
             'speed': 0,
+            'word_errors': align_words(expected_words, []).error_list(),
         }
 
 
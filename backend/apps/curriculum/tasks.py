@@ -3,8 +3,11 @@ Celery tasks for English Study Platform.
 
 Tasks:
 - generate_phoneme_audio: Generate TTS audio for a single phoneme
-- generate_audio_batch: Generate audio for multiple phonemes
-- clean_expired_audio_cache: Remove expired TTS audio files
+- generate_audio_batch: Start a chunked batch run for multiple phonemes
+- process_audio_batch_chunk / finalize_audio_batch: Chord of a batch run
+  (see apps.curriculum.audio_batches)
+- clean_expired_audio_cache: Remove expired TTS audio files (services.audio_gc)
+- flush_audio_usage_counters: Write buffered audio play counts
 - optimize_audio_files: Compress and optimize audio files
 """
 
@@ -13,19 +16,92 @@ import logging
 from datetime import timedelta
 from pathlib import Path
 
-from celery import shared_task, group, chord
+from celery import shared_task
 from django.conf import settings
 from django.core.files import File
 from django.utils import timezone
 from django.db import transaction
 
 from apps.curriculum.models import Phoneme, AudioSource, AudioCache
+from apps.curriculum.services.tts_batch import TTSBatchSynthesizer, TTSJob
 from apps.curriculum.services.tts_service import TTSService
 from utils.audio_utils import get_audio_duration, optimize_audio
 
 logger = logging.getLogger(__name__)
 
 
+def save_phoneme_tts_audio(phoneme, voice_id: str, temp_audio_path: str, task_id: str = None):
+    """
+    Optimize a synthesized file and store it as the phoneme's TTS AudioSource.
+    
+    Args:
+        phoneme: Phoneme instance
+        voice_id: TTS voice the file was synthesized with
+        temp_audio_path: Synthesized file (removed afterwards)
+        task_id: Celery task ID recorded in the metadata
+    
+    Returns:
+        AudioSource
+    """
+    # Optimize audio
+    optimized_path = optimize_audio(
+        temp_audio_path,
+        bitrate=settings.AUDIO_BITRATE,
+        sample_rate=settings.AUDIO_SAMPLE_RATE
+    )
+    
+    # Get audio duration
+    duration = get_audio_duration(optimized_path)
+    
+    # Save to database
+    with transaction.atomic():
+        # Create or update AudioSource
+        audio_source, created = AudioSource.objects.update_or_create(
+            phoneme=phoneme,
+            source_type='tts',
+            voice_id=voice_id,
+            defaults={
+                'language': 'en-US',
+                'audio_duration': duration,
+                'cached_until': timezone.now() + timedelta(days=settings.TTS_CACHE_DAYS),
+                'metadata': {
+                    'tts_rate': settings.TTS_RATE,
+                    'tts_volume': settings.TTS_VOLUME,
+                    'generated_by': 'celery_task',
+                    'task_id': task_id
+                }
+            }
+        )
+        
+        # Save audio file
+        # Use phoneme ID instead of IPA symbol to avoid special character issues
+        file_name = f"phoneme_{phoneme.id}_{voice_id.replace('-', '_')}.mp3"
+        with open(optimized_path, 'rb') as f:
+            audio_source.audio_file.save(file_name, File(f), save=True)
+        
+        # Create cache record
+        file_size = os.path.getsize(optimized_path)
+        AudioCache.objects.update_or_create(
+            audio_source=audio_source,
+            defaults={
+                'file_size': file_size,
+                'usage_count': 0
+            }
+        )
+    
+    # Clean up temp files
+    if os.path.exists(temp_audio_path):
+        os.remove(temp_audio_path)
+    if optimized_path != temp_audio_path and os.path.exists(optimized_path):
+        os.remove(optimized_path)
+    
+    logger.info(
+        f"✅ TTS generated successfully for /{phoneme.ipa_symbol}/ "
+        f"(AudioSource ID: {audio_source.id})"
+    )
+    return audio_source
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def generate_phoneme_audio(
     self,
@@ -100,61 +176,8 @@ def generate_phoneme_audio(
             # Retry with exponential backoff for transient errors
             raise self.retry(exc=audio_error, countdown=60)
         
-        # Optimize audio
-        optimized_path = optimize_audio(
-            temp_audio_path,
-            bitrate=settings.AUDIO_BITRATE,
-            sample_rate=settings.AUDIO_SAMPLE_RATE
-        )
-        
-        # Get audio duration
-        duration = get_audio_duration(optimized_path)
-        
-        # Save to database
-        with transaction.atomic():
-            # Create or update AudioSource
-            audio_source, created = AudioSource.objects.update_or_create(
-                phoneme=phoneme,
-                source_type='tts',
-                voice_id=voice_id,
-                defaults={
-                    'language': 'en-US',
-                    'audio_duration': duration,
-                    'cached_until': timezone.now() + timedelta(days=settings.TTS_CACHE_DAYS),
-                    'metadata': {
-                        'tts_rate': settings.TTS_RATE,
-                        'tts_volume': settings.TTS_VOLUME,
-                        'generated_by': 'celery_task',
-                        'task_id': self.request.id
-                    }
-                }
-            )
-            
-            # Save audio file
-            # Use phoneme ID instead of IPA symbol to avoid special character issues
-            file_name = f"phoneme_{phoneme.id}_{voice_id.replace('-', '_')}.mp3"
-            with open(optimized_path, 'rb') as f:
-                audio_source.audio_file.save(file_name, File(f), save=True)
-            
-            # Create cache record
-            file_size = os.path.getsize(optimized_path)
-            AudioCache.objects.update_or_create(
-                audio_source=audio_source,
-                defaults={
-                    'file_size': file_size,
-                    'usage_count': 0
-                }
-            )
-        
-        # Clean up temp files
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
-        if optimized_path != temp_audio_path and os.path.exists(optimized_path):
-            os.remove(optimized_path)
-        
-        logger.info(
-            f"✅ TTS generated successfully for /{phoneme.ipa_symbol}/ "
-            f"(AudioSource ID: {audio_source.id})"
+        audio_source = save_phoneme_tts_audio(
+            phoneme, voice_id, temp_audio_path, task_id=self.request.id
         )
         
         return {
@@ -172,47 +195,30 @@ def generate_phoneme_audio(
 
 
 @shared_task
-def generate_audio_batch(phoneme_ids: list, voice_id: str = None):
+def generate_audio_batch(phoneme_ids: list, voice_id: str = None, force_regenerate: bool = False):
     """
-    Generate TTS audio for multiple phonemes in parallel.
+    Start a chunked batch run generating TTS audio for multiple phonemes.
+    
+    Returns as soon as the chunks are queued; the chord callback
+    (finalize_audio_batch) closes the AudioBatchRun.
     
     Args:
         phoneme_ids: List of phoneme IDs
         voice_id: Voice to use for all phonemes
+        force_regenerate: Regenerate even if cached audio exists
     
     Returns:
-        dict: Summary of batch generation
+        dict: Summary of the batch run (final when tasks run eagerly)
     """
-    logger.info(f"Starting batch TTS generation for {len(phoneme_ids)} phonemes")
+    from apps.curriculum.audio_batches import run_summary, start_audio_batch
     
-    # Create task group for parallel execution
-    job = group(
-        generate_phoneme_audio.s(phoneme_id, voice_id)
-        for phoneme_id in phoneme_ids
+    run = start_audio_batch(
+        'phoneme_audio',
+        phoneme_ids,
+        {'voice_id': voice_id or settings.TTS_DEFAULT_VOICE, 'force_regenerate': force_regenerate}
     )
-    
-    # Execute and wait for results
-    result = job.apply_async()
-    results = result.get()
-    
-    # Summarize results
-    successful = sum(1 for r in results if r['success'])
-    failed = len(results) - successful
-    
-    summary = {
-        'total': len(phoneme_ids),
-        'successful': successful,
-        'failed': failed,
-        'voice_id': voice_id,
-        'results': results
-    }
-    
-    logger.info(
-        f"Batch TTS generation completed: "
-        f"{successful}/{len(phoneme_ids)} successful, {failed} failed"
-    )
-    
-    return summary
+    run.refresh_from_db()
+    return run_summary(run)
 
 
 @shared_task
@@ -222,10 +228,12 @@ def generate_missing_audio_batch():
     
     Runs daily via Celery Beat.
     """
+    from apps.curriculum.audio_batches import start_audio_batch
+    
     # Get phonemes without audio
-    phonemes_without_audio = Phoneme.objects.filter(
+    phonemes_without_audio = list(Phoneme.objects.filter(
         audio_sources__isnull=True
-    ).values_list('id', flat=True)
+    ).values_list('id', flat=True))
     
     count = len(phonemes_without_audio)
     
@@ -235,48 +243,158 @@ def generate_missing_audio_batch():
     
     logger.info(f"Found {count} phonemes without audio, generating TTS...")
     
-    # Generate audio in batch
-    result = generate_audio_batch(list(phonemes_without_audio))
+    # Queue a batch run (never wait on it from inside a task)
+    run = start_audio_batch(
+        'phoneme_audio', phonemes_without_audio, {'voice_id': settings.TTS_DEFAULT_VOICE}
+    )
     
-    return result
+    return {'queued': count, 'batch_run_id': run.id}
 
 
-@shared_task
-def clean_expired_audio_cache():
+def synthesize_phoneme_chunk(phoneme_ids: list, params: dict) -> dict:
     """
-    Remove expired TTS audio files from storage.
+    Batch run handler: synthesize the audio of a chunk of phonemes concurrently.
     
-    Runs daily via Celery Beat.
+    Args:
+        phoneme_ids: Phoneme IDs of the chunk
+        params: {'voice_id': str, 'force_regenerate': bool, 'concurrency': int}
+    
+    Returns:
+        dict: {'succeeded', 'failed', 'skipped', 'failures': [{'item', 'error'}]}
     """
-    # Find expired TTS audio
-    expired_audio = AudioSource.objects.filter(
-        source_type='tts',
-        cached_until__lt=timezone.now()
-    )
+    voice_id = params.get('voice_id') or settings.TTS_DEFAULT_VOICE
+    phonemes = Phoneme.objects.in_bulk(phoneme_ids)
     
-    count = expired_audio.count()
+    fresh = set()
+    if not params.get('force_regenerate'):
+        fresh = set(AudioSource.objects.filter(
+            phoneme_id__in=phoneme_ids,
+            source_type='tts',
+            cached_until__gt=timezone.now()
+        ).values_list('phoneme_id', flat=True))
     
-    if count == 0:
-        logger.info("No expired audio to clean")
-        return {'cleaned': 0}
+    failures = [
+        {'item': phoneme_id, 'error': 'Phoneme not found'}
+        for phoneme_id in phoneme_ids if phoneme_id not in phonemes
+    ]
+    # filename keeps phonemes with the same text as separate jobs
+    jobs = {
+        TTSJob(
+            text=phoneme.vietnamese_approx or phoneme.ipa_symbol,
+            voice_key=voice_id,
+            filename=f"phoneme_{phoneme.id}"
+        ): phoneme
+        for phoneme_id, phoneme in phonemes.items() if phoneme_id not in fresh
+    }
     
-    logger.info(f"Cleaning {count} expired TTS audio files...")
+    tts_service = TTSService()
     
-    # Delete files and records
-    for audio in expired_audio:
-        # Delete physical file
-        if audio.audio_file:
-            audio.audio_file.delete(save=False)
-        
-        # Delete cache record
+    async def synthesize(job):
+        return await tts_service.generate_audio(text=job.text, voice=job.voice_key)
+    
+    batch = TTSBatchSynthesizer(
+        concurrency=params.get('concurrency'), synthesize=synthesize
+    ).run_sync(jobs)
+    
+    succeeded = 0
+    for result in batch['results']:
+        phoneme = jobs[result['job']]
+        if not result['success']:
+            failures.append({'item': phoneme.id, 'error': result['error']})
+            continue
         try:
-            audio.cache.delete()
-        except AudioCache.DoesNotExist:
-            pass
-        
-        # Delete audio source
-        audio.delete()
+            save_phoneme_tts_audio(phoneme, voice_id, result['path'])
+            succeeded += 1
+        except Exception as e:
+            logger.error(f"❌ Saving TTS audio failed for phoneme {phoneme.id}: {e}")
+            failures.append({'item': phoneme.id, 'error': str(e)})
+    
+    return {
+        'succeeded': succeeded,
+        'failed': len(failures),
+        'skipped': len(fresh & set(phonemes)),
+        'failures': failures,
+    }
+
+
+@shared_task(acks_late=True)
+def process_audio_batch_chunk(run_id: int, chunk_index: int):
+    """
+    Synthesize one chunk of a batch run (header task of the run's chord).
+    
+    Args:
+        run_id: AudioBatchRun ID
+        chunk_index: Chunk to process
+    
+    Returns:
+        dict: Chunk summary
+    """
+    from apps.curriculum.audio_batches import process_chunk
+    
+    return process_chunk(run_id, chunk_index)
+
+
+@shared_task
+def finalize_audio_batch(run_id: int):
+    """
+    Chord callback: close a batch run (status, elapsed time, items/second).
+    
+    Args:
+        run_id: AudioBatchRun ID
+    
+    Returns:
+        dict: Summary of the batch run
+    """
+    from apps.curriculum.audio_batches import finalize_run
+    
+    return finalize_run(run_id)
+
+
+@shared_task
+def resume_audio_batch_run(run_id: int):
+    """
+    Re-dispatch the chunks of a batch run that were never recorded.
+    
+    Args:
+        run_id: AudioBatchRun ID
+    
+    Returns:
+        dict: {'batch_run_id': int, 'task_id': str|None}
+    """
+    from apps.curriculum.audio_batches import resume_audio_batch
+    
+    return {'batch_run_id': run_id, 'task_id': resume_audio_batch(run_id)}
+
+
+@shared_task
+def flush_audio_usage_counters():
+    """
+    Write buffered audio play counts to the database.
+    
+    Runs every minute via Celery Beat (see apps.curriculum.usage_counters).
+    
+    Returns:
+        dict: Rows flushed and updated per model
+    """
+    from apps.curriculum.usage_counters import flush_usage_counters
+    
+    return flush_usage_counters()
+
+
+@shared_task
+def clean_expired_audio_cache():
+    """
+    Remove expired TTS AudioSources and their files (set-based, see
+    services.audio_gc). Expired audio played recently is renewed instead.
+    
+    Runs daily via Celery Beat.
+    
+    Returns:
+        dict: GC report of the audio_sources pool, 'cleaned' = rows deleted
+    """
+    from services.audio_gc import run_audio_gc
     
-    logger.info(f"✅ Cleaned {count} expired audio files")
+    report = run_audio_gc(pools=('audio_sources',))
+    pool = report['pools']['audio_sources']
     
-    return {'cleaned': count}
+    return {'cleaned': pool['rows_deleted'], **pool}
@@ -3,12 +3,14 @@ Template Views for Curriculum App - Pronunciation Lessons.
 """
 
 import json
+from collections import defaultdict
 from django.views.generic import TemplateView, DetailView, ListView
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
 from django.db.models import Q
 
 from apps.users.middleware import JWTRequiredMixin
+from .lesson_unlocks import UNRESOLVED_ACCESS, resolve_lesson_access
 from .models import (
     PronunciationLesson, Phoneme, PhonemeCategory, 
     PhonemeWord, MinimalPair, TongueTwister
@@ -37,19 +39,28 @@ class PronunciationLibraryView(TemplateView):
         from .models import CurriculumStage
         stages = CurriculumStage.objects.filter(
             is_active=True
-        ).prefetch_related(
-            'lessons__phonemes',
-            'lessons__stage'
         ).order_by('order', 'number')
         
+        # Published lessons of all stages in one query, grouped by stage
+        lessons_by_stage = defaultdict(list)
+        published = PronunciationLesson.objects.filter(
+            status='published',
+            stage__is_active=True
+        ).prefetch_related('phonemes').order_by('part_number', 'unit_number', 'order')
+        for lesson in published:
+            lessons_by_stage[lesson.stage_id].append(lesson)
+        
+        # Access + progress of every lesson: cached graph + one progress query
+        access = resolve_lesson_access(user, [lesson.id for lesson in published])
+        
         # Prepare stage data with progress
         stages_data = []
         total_lessons = 0
         completed_lessons = 0
         
         for stage in stages:
-            lessons = stage.lessons.filter(status='published').order_by('part_number', 'unit_number', 'order')
-            stage_lessons_count = lessons.count()
+            lessons = lessons_by_stage.get(stage.id, [])
+            stage_lessons_count = len(lessons)
             total_lessons += stage_lessons_count
             
             # Calculate stage progress
@@ -57,18 +68,17 @@ class PronunciationLibraryView(TemplateView):
             lessons_with_access = []
             
             for lesson in lessons:
-                can_access, reason = lesson.can_access(user)
-                progress = lesson.get_user_progress(user)
+                lesson_access = access.get(lesson.id, UNRESOLVED_ACCESS)
                 
                 lessons_with_access.append({
                     'lesson': lesson,
-                    'can_access': can_access,
-                    'lock_reason': reason if not can_access else None,
-                    'progress': progress,
-                    'is_completed': progress >= 100
+                    'can_access': lesson_access['can_access'],
+                    'lock_reason': lesson_access['lock_reason'],
+                    'progress': lesson_access['progress'],
+                    'is_completed': lesson_access['is_completed']
                 })
                 
-                if progress >= 100:
+                if lesson_access['is_completed']:
                     stage_completed += 1
                     completed_lessons += 1
             
@@ -0,0 +1,393 @@
+"""
+Write-Behind Audio Usage Counters
+
+Play counts of phoneme audio (AudioCache.usage_count / last_accessed_at,
+keyed by AudioSource) and AudioVersion.usage_count without a database
+write per playback.
+
+Features:
+- record_usage() is an in-memory increment under a lock
+- Each process spills its buffer once it holds AUDIO_USAGE_MAX_PENDING
+  rows, or AUDIO_USAGE_FLUSH_SECONDS after its first pending count (a
+  daemon timer, so an idle process doesn't sit on its counts):
+    * shared cache backend (Redis/Memcached): cache.incr per row, written
+      to the database by the periodic flush_audio_usage_counters task;
+      each spill also appends its rows to a dirty log in the cache, so
+      the flush reads only the counters that changed
+    * process-local cache (LocMemCache, tests): straight to the database
+- Database writes are one UPDATE ... SET usage_count = usage_count + CASE
+  per model and AUDIO_USAGE_FLUSH_BATCH rows; missing AudioCache rows are
+  created first (bulk_create), so no increment is dropped
+- Buffered counts are put back if a write fails, and drained on graceful
+  shutdown (atexit, Celery worker_process_shutdown)
+
+Usage:
+    from apps.curriculum.usage_counters import AUDIO_SOURCE, record_usage
+
+    record_usage(AUDIO_SOURCE, audio.id)
+
+    flush_usage_counters()      # Celery Beat: flush_audio_usage_counters
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from services.cache_versions import incr_counter
+
+logger = logging.getLogger(__name__)
+
+AUDIO_SOURCE = 'audio_source'      # AudioCache row of an AudioSource
+AUDIO_VERSION = 'audio_version'
+KINDS = (AUDIO_SOURCE, AUDIO_VERSION)
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+SHARED_KEY_CHUNK = 500
+
+# Dirty log: spill n is stored under DIRTY_KEY.{n}, n from DIRTY_SEQ_KEY;
+# DIRTY_STATE_KEY holds (last spill flushed, unfilled spill seen last flush)
+DIRTY_SEQ_KEY = 'audio_usage:dirty:seq'
+DIRTY_STATE_KEY = 'audio_usage:dirty:state'
+DIRTY_TTL = 24 * 3600
+
+
+def _shared_key(kind: str, pk: int) -> str:
+    return f"audio_usage:{kind}:{pk}"
+
+
+def _dirty_key(n: int) -> str:
+    return f"audio_usage:dirty:{n}"
+
+
+def uses_shared_cache() -> bool:
+    """Spill to the cache backend (True) or to the database (False)."""
+    shared = getattr(settings, 'AUDIO_USAGE_SHARED_CACHE', None)
+    if shared is not None:
+        return shared
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+class UsageCounterBuffer:
+    """
+    Per-process pending increments: {(kind, pk): count}.
+
+    Args:
+        on_due: Called from a daemon timer AUDIO_USAGE_FLUSH_SECONDS after
+            the first pending count (None = only spilled by size)
+    """
+
+    def __init__(self, on_due: Optional[Callable[[], object]] = None):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._since: Optional[float] = None
+        self._on_due = on_due
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, kind: str, pk: int, count: int = 1) -> bool:
+        """Buffer an increment; True when the buffer is due for a spill."""
+        with self._lock:
+            self._counts[(kind, pk)] += count
+            if self._since is None:
+                self._start()
+            age = time.monotonic() - self._since
+            size = len(self._counts)
+        return (
+            age >= getattr(settings, 'AUDIO_USAGE_FLUSH_SECONDS', 30)
+            or size >= getattr(settings, 'AUDIO_USAGE_MAX_PENDING', 1000)
+        )
+
+    def drain(self) -> Dict[str, Dict[int, int]]:
+        """Take every pending increment, grouped by kind."""
+        with self._lock:
+            counts, self._counts, self._since = self._counts, Counter(), None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        deltas = {}
+        for (kind, pk), count in counts.items():
+            deltas.setdefault(kind, {})[pk] = count
+        return deltas
+
+    def restore(self, deltas: Dict[str, Dict[int, int]]) -> None:
+        """Put drained increments back (write failed)."""
+        with self._lock:
+            for kind, rows in deltas.items():
+                for pk, count in rows.items():
+                    self._counts[(kind, pk)] += count
+            if self._counts and self._since is None:
+                self._start()
+
+    def _start(self) -> None:
+        """First pending count (lock held): start the age clock and timer."""
+        self._since = time.monotonic()
+        if self._on_due is None:
+            return
+        self._timer = threading.Timer(getattr(settings, 'AUDIO_USAGE_FLUSH_SECONDS', 30), self._on_due)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+def _spill_on_timer() -> None:
+    """Timer thread: spill, then release the thread's database connection."""
+    from django.db import connections
+
+    try:
+        spill_usage_buffer()
+    finally:
+        connections.close_all()
+
+
+_buffer = UsageCounterBuffer(on_due=_spill_on_timer)
+
+
+def get_usage_buffer() -> UsageCounterBuffer:
+    return _buffer
+
+
+# =========================================================================
+# RECORD
+# =========================================================================
+
+def record_usage(kind: str, pk: int, count: int = 1) -> None:
+    """
+    Count a playback (in memory; spilled when the buffer is due).
+
+    Args:
+        kind: AUDIO_SOURCE (AudioSource ID) or AUDIO_VERSION (AudioVersion ID)
+        pk: Row ID
+        count: Increment
+    """
+    if pk is None:
+        return
+    if _buffer.add(kind, pk, count):
+        spill_usage_buffer()
+
+
+def spill_usage_buffer() -> int:
+    """
+    Move this process's buffer to the shared cache or the database.
+
+    Returns:
+        Rows spilled (0 if the write failed and the counts were put back)
+    """
+    deltas = _buffer.drain()
+    if not deltas:
+        return 0
+    try:
+        if uses_shared_cache():
+            for kind, rows in deltas.items():
+                for pk, count in rows.items():
+                    key = _shared_key(kind, pk)
+                    # add() creates the counter; incr() is atomic afterwards
+                    if not cache.add(key, count, None):
+                        cache.incr(key, count)
+            # Counters first, then the log entry naming them
+            cache.set(
+                _dirty_key(incr_counter(DIRTY_SEQ_KEY)),
+                {kind: list(rows) for kind, rows in deltas.items()},
+                DIRTY_TTL,
+            )
+        else:
+            apply_usage_deltas(deltas)
+    except Exception as e:
+        _buffer.restore(deltas)
+        logger.warning(f"Audio usage spill failed, kept in memory: {e}")
+        return 0
+    return sum(len(rows) for rows in deltas.values())
+
+
+# =========================================================================
+# DATABASE
+# =========================================================================
+
+def _case(field: str, rows: Dict[int, int]) -> Case:
+    return Case(
+        *[When(**{field: pk}, then=Value(count)) for pk, count in rows.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def apply_usage_deltas(deltas: Dict[str, Dict[int, int]]) -> Dict[str, int]:
+    """
+    Add counts to the database: one UPDATE ... CASE per model and batch.
+
+    Args:
+        deltas: {kind: {pk: count}}
+
+    Returns:
+        {kind: rows updated}
+    """
+    from .models import AudioCache, AudioSource, AudioVersion
+
+    batch_size = getattr(settings, 'AUDIO_USAGE_FLUSH_BATCH', 500)
+    now = timezone.now()
+    updated = {kind: 0 for kind in KINDS}
+
+    with transaction.atomic():
+        rows = deltas.get(AUDIO_SOURCE, {})
+        if rows:
+            # Sources played before they had a cache row (deleted sources drop out)
+            missing = set(rows) - set(
+                AudioCache.objects.filter(audio_source_id__in=rows).values_list('audio_source_id', flat=True)
+            )
+            if missing:
+                AudioCache.objects.bulk_create(
+                    [
+                        AudioCache(audio_source_id=pk, usage_count=0)
+                        for pk in AudioSource.objects.filter(id__in=missing).values_list('id', flat=True)
+                    ],
+                    ignore_conflicts=True,
+                )
+        for pks in _batches(list(rows), batch_size):
+            batch = {pk: rows[pk] for pk in pks}
+            updated[AUDIO_SOURCE] += AudioCache.objects.filter(audio_source_id__in=batch).update(
+                usage_count=F('usage_count') + _case('audio_source_id', batch),
+                last_accessed_at=now,
+            )
+
+        rows = deltas.get(AUDIO_VERSION, {})
+        for pks in _batches(list(rows), batch_size):
+            batch = {pk: rows[pk] for pk in pks}
+            updated[AUDIO_VERSION] += AudioVersion.objects.filter(id__in=batch).update(
+                usage_count=F('usage_count') + _case('id', batch)
+            )
+    return updated
+
+
+def _batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _collect_shared(kind: str, pks: Iterable[int]) -> Dict[int, int]:
+    """Non-zero shared counters of the given rows."""
+    found = {}
+    pks = list(pks)
+    for chunk in _batches(pks, SHARED_KEY_CHUNK):
+        values = cache.get_many([_shared_key(kind, pk) for pk in chunk])
+        for pk in chunk:
+            count = values.get(_shared_key(kind, pk))
+            if count:
+                found[pk] = count
+    return found
+
+
+def _pop_dirty() -> Tuple[Dict[str, Set[int]], Callable[[], None]]:
+    """
+    Rows named by the spills logged since the last flush.
+
+    A spill whose number is taken but whose entry isn't written yet is
+    waited for one flush, then skipped. Re-reading an entry is harmless:
+    counters already written are 0 after their decrement.
+
+    Returns:
+        ({kind: {pk, ...}}, commit): call commit() once the counts are
+        written to drop the entries read
+    """
+    last = cache.get(DIRTY_SEQ_KEY, 0)
+    flushed, unfilled = cache.get(DIRTY_STATE_KEY, (0, None))
+    if last < flushed:
+        # Sequence evicted and restarted
+        flushed, unfilled = 0, None
+
+    numbers = list(range(flushed + 1, last + 1))
+    entries = {}
+    for chunk in _batches(numbers, SHARED_KEY_CHUNK):
+        entries.update(cache.get_many([_dirty_key(n) for n in chunk]))
+
+    dirty: Dict[str, Set[int]] = {kind: set() for kind in KINDS}
+    for entry in entries.values():
+        for kind, pks in entry.items():
+            dirty.setdefault(kind, set()).update(pks)
+
+    gap = next((n for n in numbers if _dirty_key(n) not in entries and n != unfilled), None)
+    state = (gap - 1, gap) if gap is not None else (last, None)
+
+    def commit():
+        read = [key for key in entries if int(key.rsplit(':', 1)[1]) <= state[0]]
+        cache.delete_many(read)
+        cache.set(DIRTY_STATE_KEY, state, None)
+
+    return dirty, commit
+
+
+# =========================================================================
+# FLUSH
+# =========================================================================
+
+def flush_usage_counters() -> Dict:
+    """
+    Write every buffered count to the database.
+
+    This process's buffer first, then (shared cache) the counters spilled
+    by all processes, found through the dirty log rather than by reading
+    a counter per row. Shared counters are decremented by what was written
+    only after the write committed, so increments racing the flush are kept.
+
+    Returns:
+        dict: {'local': rows, 'shared': rows, 'updated': {kind: rows}}
+    """
+    local = _buffer.drain()
+    try:
+        updated = apply_usage_deltas(local) if local else {kind: 0 for kind in KINDS}
+    except Exception:
+        _buffer.restore(local)
+        raise
+
+    shared_rows = 0
+    if uses_shared_cache():
+        dirty, commit = _pop_dirty()
+        shared = {kind: _collect_shared(kind, sorted(pks)) for kind, pks in dirty.items()}
+        if any(shared.values()):
+            for kind, count in apply_usage_deltas(shared).items():
+                updated[kind] += count
+            for kind, rows in shared.items():
+                for pk, count in rows.items():
+                    cache.decr(_shared_key(kind, pk), count)
+                shared_rows += len(rows)
+        commit()
+
+    result = {
+        'local': sum(len(rows) for rows in local.values()),
+        'shared': shared_rows,
+        'updated': updated,
+    }
+    if result['local'] or result['shared']:
+        logger.info(f"🔢 Flushed audio usage counters: {result}")
+    return result
+
+
+def _flush_on_shutdown(*args, **kwargs):
+    """Graceful shutdown: don't lose what is still in memory."""
+    if len(_buffer):
+        try:
+            spill_usage_buffer()
+        except Exception as e:
+            logger.error(f"❌ Audio usage counters lost on shutdown: {e}")
+
+
+def install_shutdown_hooks() -> None:
+    """Called from CurriculumConfig.ready()."""
+    atexit.register(_flush_on_shutdown)
+    try:
+        from celery.signals import worker_process_shutdown
+    except ImportError:
+        return
+    worker_process_shutdown.connect(_flush_on_shutdown, weak=False)
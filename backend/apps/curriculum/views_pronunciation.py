@@ -16,8 +16,9 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Prefetch, Q
 
+from .lesson_unlocks import resolve_lesson_access
 from .models import (
     PronunciationLesson, 
     Phoneme, 
@@ -34,7 +35,7 @@ from apps.users.models import (
 
 class PronunciationLessonListView(APIView):
     """
-    List all pronunciation lessons with user progress.
+    List all pronunciation lessons with user progress and unlock state.
     
     GET /api/v1/pronunciation/lessons/
     Query params:
@@ -44,7 +45,9 @@ class PronunciationLessonListView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        lessons = PronunciationLesson.objects.filter(status='published')
+        lessons = PronunciationLesson.objects.filter(status='published').prefetch_related(
+            Prefetch('phonemes', queryset=Phoneme.objects.only('id', 'ipa_symbol', 'vietnamese_approx'))
+        )
         
         # Filter by part
         part = request.query_params.get('part')
@@ -66,9 +69,16 @@ class PronunciationLessonListView(APIView):
                     'completed_at': p.completed_at.isoformat() if p.completed_at else None,
                 }
         
+        # Unlock state of every lesson (cached prerequisite graph)
+        access = resolve_lesson_access(request.user)
+        
         result = []
         for lesson in lessons:
-            phonemes_list = list(lesson.phonemes.values('id', 'ipa_symbol', 'vietnamese_approx'))
+            phonemes_list = [
+                {'id': p.id, 'ipa_symbol': p.ipa_symbol, 'vietnamese_approx': p.vietnamese_approx}
+                for p in lesson.phonemes.all()
+            ]
+            lesson_access = access.get(lesson.id, {})
             
             result.append({
                 'id': lesson.id,
@@ -86,6 +96,9 @@ class PronunciationLessonListView(APIView):
                 'phonemes': phonemes_list,
                 'objectives': lesson.objectives,
                 'user_progress': user_progress.get(lesson.id, None),
+                'can_access': lesson_access.get('can_access', True),
+                'lock_reason': lesson_access.get('lock_reason'),
+                'progress': lesson_access.get('progress', 0),
             })
         
         return Response({
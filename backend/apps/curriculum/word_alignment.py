@@ -0,0 +1,215 @@
+"""
+Word-level alignment of expected text against recognized (STT) words.
+
+One Levenshtein pass (O(n·m) time, two cost rows + a byte backtrace matrix)
+yields both the accuracy figure and the per-word error list, so an inserted
+or dropped word only affects itself instead of shifting every later
+comparison.
+
+Shared by:
+- SpeechToTextService (accuracy + word errors)
+- PhonemeAnalyzer (problem phonemes only for misaligned words)
+
+Usage:
+    >>> from apps.curriculum.word_alignment import align_words
+    >>> alignment = align_words("she sells sea shells".split(), ["she", "shells"], [0.9, 0.8])
+    >>> alignment.accuracy, [w.op for w in alignment.errors]
+    (66.66..., ['deletion', 'deletion'])
+"""
+
+import string
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+OP_MATCH = 'match'
+OP_SUBSTITUTION = 'substitution'
+OP_INSERTION = 'insertion'      # Detected word not in the expected text
+OP_DELETION = 'deletion'        # Expected word that was not detected
+
+# Backtrace codes (one byte per DP cell)
+_MATCH, _SUBSTITUTION, _DELETION, _INSERTION = 0, 1, 2, 3
+
+# Edit costs: a substitution is cheaper than deletion + insertion, but two
+# substitutions cost more than keeping one extra exact match
+SUBSTITUTION_COST = 1.5
+DELETION_COST = 1.0
+INSERTION_COST = 1.0
+
+# Floor for the confidence-weighted insertion cost (deletion + weighted
+# insertion never undercuts a substitution)
+MIN_INSERTION_COST = SUBSTITUTION_COST - DELETION_COST
+
+_STRIP = string.punctuation.replace("'", '') + '“”‘’'
+
+
+@dataclass(frozen=True)
+class AlignedWord:
+    """One step of the alignment (indexes are None for the missing side)."""
+
+    op: str
+    expected_index: Optional[int]
+    detected_index: Optional[int]
+    expected: Optional[str]
+    detected: Optional[str]
+    confidence: Optional[float] = None
+
+    def as_dict(self) -> Dict:
+        return {
+            'op': self.op,
+            'expected_index': self.expected_index,
+            'detected_index': self.detected_index,
+            'expected': self.expected,
+            'detected': self.detected,
+            'confidence': self.confidence,
+        }
+
+
+@dataclass(frozen=True)
+class WordAlignment:
+    """Alignment result with edit counts."""
+
+    words: List[AlignedWord]
+    expected_count: int
+    detected_count: int
+    matches: int
+    substitutions: int
+    insertions: int
+    deletions: int
+
+    @property
+    def accuracy(self) -> float:
+        """
+        Similarity percentage, 2·matches / (expected + detected) · 100
+        (the same ratio difflib.SequenceMatcher reports).
+        """
+        total = self.expected_count + self.detected_count
+        if total == 0:
+            return 100.0
+        return 2.0 * self.matches / total * 100
+
+    @property
+    def errors(self) -> List[AlignedWord]:
+        """Substitutions, insertions and deletions in text order."""
+        return [word for word in self.words if word.op != OP_MATCH]
+
+    def error_list(self) -> List[Dict]:
+        """JSON-friendly per-word error list."""
+        return [word.as_dict() for word in self.errors]
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase and strip surrounding punctuation (keeps apostrophes)."""
+    return word.lower().strip(_STRIP)
+
+
+def align_words(
+    expected_words: Sequence[str],
+    detected_words: Sequence[str],
+    confidences: Optional[Sequence[float]] = None,
+    weight_by_confidence: bool = True
+) -> WordAlignment:
+    """
+    Align expected words with detected words (minimum edit distance).
+
+    Deletions cost 1 and substitutions 1.5, so the alignment keeps as many
+    exact matches as possible. Insertions cost 1, or the word's STT
+    confidence when weighting is on (floored at MIN_INSERTION_COST), so a
+    low-confidence extra word is treated as noise rather than pulling the
+    alignment out of step. Ties prefer match/substitution, then deletion.
+
+    Args:
+        expected_words: Expected words (original spelling kept in the result)
+        detected_words: Words recognized by STT
+        confidences: STT confidence per detected word (optional)
+        weight_by_confidence: Use confidences for the insertion cost
+
+    Returns:
+        WordAlignment
+    """
+    expected = [normalize_word(word) for word in expected_words]
+    detected = [normalize_word(word) for word in detected_words]
+    n, m = len(expected), len(detected)
+    width = m + 1
+
+    confidences = list(confidences or [])
+    if weight_by_confidence and confidences:
+        insert_costs = [
+            max(MIN_INSERTION_COST, min(INSERTION_COST, confidences[j]))
+            if j < len(confidences) else INSERTION_COST
+            for j in range(m)
+        ]
+    else:
+        insert_costs = [INSERTION_COST] * m
+
+    back = bytearray(width * (n + 1))
+    previous = [0.0] * width
+    current = [0.0] * width
+
+    for j in range(1, width):
+        previous[j] = previous[j - 1] + insert_costs[j - 1]
+        back[j] = _INSERTION
+
+    for i in range(1, n + 1):
+        word = expected[i - 1]
+        row = i * width
+        current[0] = i * DELETION_COST
+        back[row] = _DELETION
+
+        for j in range(1, width):
+            if word == detected[j - 1]:
+                best = previous[j - 1]
+                op = _MATCH
+            else:
+                best = previous[j - 1] + SUBSTITUTION_COST
+                op = _SUBSTITUTION
+
+            cost = previous[j] + DELETION_COST
+            if cost < best:
+                best = cost
+                op = _DELETION
+
+            cost = current[j - 1] + insert_costs[j - 1]
+            if cost < best:
+                best = cost
+                op = _INSERTION
+
+            current[j] = best
+            back[row + j] = op
+
+        previous, current = current, previous
+
+    # Backtrace from the bottom-right corner
+    steps = []
+    counts = [0, 0, 0, 0]
+    i, j = n, m
+    while i or j:
+        op = back[i * width + j]
+        counts[op] += 1
+        if op == _DELETION:
+            i -= 1
+            steps.append(AlignedWord(OP_DELETION, i, None, expected_words[i], None))
+        elif op == _INSERTION:
+            j -= 1
+            steps.append(AlignedWord(
+                OP_INSERTION, None, j, None, detected_words[j],
+                confidences[j] if j < len(confidences) else None
+            ))
+        else:
+            i -= 1
+            j -= 1
+            steps.append(AlignedWord(
+                OP_MATCH if op == _MATCH else OP_SUBSTITUTION,
+                i, j, expected_words[i], detected_words[j],
+                confidences[j] if j < len(confidences) else None
+            ))
+    steps.reverse()
+
+    return WordAlignment(
+        words=steps,
+        expected_count=n,
+        detected_count=m,
+        matches=counts[_MATCH],
+        substitutions=counts[_SUBSTITUTION],
+        insertions=counts[_INSERTION],
+        deletions=counts[_DELETION],
+    )
@@ -344,7 +344,7 @@ class ProductionRecordingAdmin(admin.ModelAdmin):
             'fields': ('user', 'phoneme', 'recording_file', 'duration_seconds')
         }),
         ('Assessment', {
-            'fields': ('self_assessment_score', 'ai_score', 'ai_feedback')
+            'fields': ('self_assessment_score', 'ai_score', 'ai_feedback', 'scoring_status', 'scored_at', 'ai_metrics')
         }),
         ('Metadata', {
             'fields': ('is_best', 'notes', 'mime_type', 'file_size_bytes', 'created_at')
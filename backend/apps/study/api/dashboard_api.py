@@ -18,6 +18,7 @@ from datetime import timedelta
 from apps.study.models import DiscriminationSession, DiscriminationAttempt, ProductionRecording
 from apps.users.models import UserPhonemeProgress
 from apps.curriculum.models import Phoneme
+from services.progress_timeseries import BUCKET_DAY, BUCKETS, get_time_series
 
 
 @api_view(['GET'])
@@ -92,12 +93,13 @@ def get_dashboard_stats(request):
         'total_phonemes': Phoneme.objects.filter(is_active=True).count(),
         'practiced_phonemes': phoneme_progress.count(),
         'mastered_phonemes': phoneme_progress.filter(
-            discrimination_accuracy__gte=80,
+            discrimination_accuracy__gte=0.8,
             production_practice_count__gte=5
         ).count(),
-        'avg_discrimination_accuracy': phoneme_progress.aggregate(
+        # Stored as 0-1, reported as a percentage
+        'avg_discrimination_accuracy': (phoneme_progress.aggregate(
             avg=Avg('discrimination_accuracy')
-        )['avg'] or 0,
+        )['avg'] or 0) * 100,
         'avg_production_count': phoneme_progress.aggregate(
             avg=Avg('production_practice_count')
         )['avg'] or 0
@@ -173,8 +175,8 @@ def get_recommendations(request):
         # Add weak phonemes
         for progress in weak_phonemes:
             reason = []
-            if progress.discrimination_accuracy < 75:
-                reason.append(f'Độ chính xác phân biệt thấp ({progress.discrimination_accuracy:.0f}%)')
+            if progress.discrimination_accuracy < 0.75:
+                reason.append(f'Độ chính xác phân biệt thấp ({progress.discrimination_accuracy:.0%})')
             if progress.production_practice_count < 5:
                 reason.append(f'Ít bản ghi ({progress.production_practice_count})')
             
@@ -186,9 +188,9 @@ def get_recommendations(request):
                     'description_vi': progress.phoneme.description_vi
                 },
                 'reason': ' • '.join(reason) if reason else 'Cần luyện thêm',
-                'discrimination_accuracy': progress.discrimination_accuracy,
+                'discrimination_accuracy': progress.discrimination_accuracy * 100,
                 'production_count': progress.production_practice_count,
-                'priority': 'high' if progress.discrimination_accuracy < 60 else 'medium'
+                'priority': 'high' if progress.discrimination_accuracy < 0.6 else 'medium'
             })
         
         # Add unpracticed
@@ -209,8 +211,8 @@ def get_recommendations(request):
         recommendations = []
         for progress in weak_phonemes:
             reason = []
-            if progress.discrimination_accuracy < 75:
-                reason.append(f'Độ chính xác {progress.discrimination_accuracy:.0f}%')
+            if progress.discrimination_accuracy < 0.75:
+                reason.append(f'Độ chính xác {progress.discrimination_accuracy:.0%}')
             if progress.production_practice_count < 5:
                 reason.append(f'{progress.production_practice_count} bản ghi')
             
@@ -222,9 +224,9 @@ def get_recommendations(request):
                     'description_vi': progress.phoneme.description_vi
                 },
                 'reason': ' • '.join(reason) if reason else 'Cần luyện thêm',
-                'discrimination_accuracy': progress.discrimination_accuracy,
+                'discrimination_accuracy': progress.discrimination_accuracy * 100,
                 'production_count': progress.production_practice_count,
-                'priority': 'high' if progress.discrimination_accuracy < 60 else 'medium'
+                'priority': 'high' if progress.discrimination_accuracy < 0.6 else 'medium'
             })
     
     return Response({
@@ -322,14 +324,18 @@ def get_progress_chart_data(request):
     
     Query params:
     - period (str): '7days', '30days', '90days' (default: 30days)
+    - bucket (str): 'day' or 'week' (default: day)
     
     Returns:
-    - labels: Date labels for X-axis
-    - discrimination_data: Daily discrimination accuracy
-    - production_data: Daily recording counts
+    - labels: Date labels for X-axis (last day/week = today)
+    - discrimination_data: Discrimination accuracy per bucket
+    - production_data: Recording counts per bucket
     """
     user = request.user
     period = request.query_params.get('period', '30days')
+    bucket = request.query_params.get('bucket', BUCKET_DAY)
+    if bucket not in BUCKETS:
+        bucket = BUCKET_DAY
     
     # Determine date range
     if period == '7days':
@@ -339,38 +345,13 @@ def get_progress_chart_data(request):
     else:
         days = 30
     
-    start_date = now() - timedelta(days=days)
-    
-    # Generate date labels
-    labels = []
-    discrimination_data = []
-    production_data = []
+    # One grouped query per metric (cached, zero-filled)
+    discrimination = get_time_series(user, 'discrimination_accuracy', days, bucket)
+    production = get_time_series(user, 'production_recordings', days, bucket)
     
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        next_date = date + timedelta(days=1)
-        
-        labels.append(date.strftime('%m/%d'))
-        
-        # Discrimination accuracy for this day
-        day_sessions = DiscriminationSession.objects.filter(
-            user=user,
-            status='completed',
-            completed_at__gte=date,
-            completed_at__lt=next_date
-        )
-        
-        avg_accuracy = day_sessions.aggregate(avg=Avg('accuracy'))['avg']
-        discrimination_data.append(round(avg_accuracy, 1) if avg_accuracy else 0)
-        
-        # Production recordings for this day
-        day_recordings = ProductionRecording.objects.filter(
-            user=user,
-            created_at__gte=date,
-            created_at__lt=next_date
-        ).count()
-        
-        production_data.append(day_recordings)
+    labels = discrimination['labels']
+    discrimination_data = discrimination['values']['accuracy']
+    production_data = production['values']['count']
     
     return Response({
         'success': True,
@@ -394,6 +375,7 @@ def get_progress_chart_data(request):
                     'yAxisID': 'y1'
                 }
             ],
-            'period': period
+            'period': period,
+            'bucket': bucket
         }
     })
@@ -3,10 +3,12 @@ API views for Discrimination Practice (Days 6-7).
 Handles quiz session creation, answer submission, and results.
 """
 
+import json
 import uuid
 import random
 from datetime import timedelta
 
+from django.db import transaction
 from django.utils import timezone
 from django.db.models import Avg, Count, F
 from rest_framework import status
@@ -17,6 +19,8 @@ from rest_framework.response import Response
 from apps.curriculum.models import MinimalPair, Phoneme
 from apps.users.models import UserPhonemeProgress
 from ..models import DiscriminationSession, DiscriminationAttempt
+from ..quiz_engine import QUESTIONS_PER_SESSION, get_quiz_engine
+from ..tasks import queue_quiz_pregeneration
 
 
 @api_view(['POST'])
@@ -24,48 +28,20 @@ from ..models import DiscriminationSession, DiscriminationAttempt
 def start_session(request):
     """
     Start a new discrimination quiz session.
-    Generates 10 random questions from minimal pairs.
+    Generates 10 questions from minimal pairs, drawn by the quiz engine
+    (weighted by the user's phoneme accuracy and recency).
     
     POST /api/v1/discrimination/sessions/start/
     Response: {session_id, total_questions, time_limit, questions[]}
     """
     user = request.user
     
-    # Create session with UUID
-    session_id = str(uuid.uuid4())
-    session = DiscriminationSession.objects.create(
-        user=user,
-        session_id=session_id,
-        total_questions=10,
-        time_limit_seconds=300  # 5 minutes
-    )
-    
-    # Get random minimal pairs (prefer user's weak phonemes)
-    minimal_pairs = MinimalPair.objects.filter(
-        word_1_audio__isnull=False,
-        word_2_audio__isnull=False
-    ).select_related('phoneme_1', 'phoneme_2')
-    
-    # Prefer pairs with low user accuracy
-    user_progress = UserPhonemeProgress.objects.filter(
-        user=user,
-        discrimination_accuracy__lt=75.0
-    ).values_list('phoneme_id', flat=True)
-    
-    if user_progress:
-        # Prioritize weak phonemes
-        weak_pairs = minimal_pairs.filter(
-            phoneme_1__in=user_progress
-        ) | minimal_pairs.filter(
-            phoneme_2__in=user_progress
-        )
-        if weak_pairs.count() >= 10:
-            minimal_pairs = weak_pairs
+    # Weighted draw of minimal pairs (weak / long-unpracticed phonemes first)
+    pair_ids = get_quiz_engine().next_session(user, QUESTIONS_PER_SESSION)
+    pairs_by_id = MinimalPair.objects.select_related('phoneme_1', 'phoneme_2').in_bulk(pair_ids)
+    selected_pairs = [pairs_by_id[pair_id] for pair_id in pair_ids if pair_id in pairs_by_id]
     
-    # Sample 10 random pairs
-    selected_pairs = list(minimal_pairs.order_by('?')[:10])
-    
-    if len(selected_pairs) < 10:
+    if len(selected_pairs) < QUESTIONS_PER_SESSION:
         return Response({
             'success': False,
             'error': 'Not enough minimal pairs with audio available'
@@ -96,28 +72,34 @@ def start_session(request):
             'phoneme_1': {
                 'id': pair.phoneme_1.id,
                 'ipa_symbol': pair.phoneme_1.ipa_symbol,
-                'name_vi': pair.phoneme_1.name_vi
+                'vietnamese_approx': pair.phoneme_1.vietnamese_approx
             },
             'phoneme_2': {
                 'id': pair.phoneme_2.id,
                 'ipa_symbol': pair.phoneme_2.ipa_symbol,
-                'name_vi': pair.phoneme_2.name_vi
+                'vietnamese_approx': pair.phoneme_2.vietnamese_approx
             },
             'difficulty': pair.difficulty,
             'difference_note': pair.difference_note_vi or pair.difference_note
         }
         questions.append(question)
     
-    # Store question cache in session notes (as JSON string)
-    import json
-    session.notes = json.dumps(question_cache)
-    session.save(update_fields=['notes'])
+    # Create session with UUID; the question cache (correct answers for
+    # validation) is stored in the session notes as a JSON string
+    session_id = str(uuid.uuid4())
+    session = DiscriminationSession.objects.create(
+        user=user,
+        session_id=session_id,
+        total_questions=QUESTIONS_PER_SESSION,
+        time_limit_seconds=300,  # 5 minutes
+        notes=json.dumps(question_cache)
+    )
     
     return Response({
         'success': True,
         'session': {
             'session_id': session_id,
-            'total_questions': 10,
+            'total_questions': QUESTIONS_PER_SESSION,
             'time_limit_seconds': 300,
             'started_at': session.started_at.isoformat()
         },
@@ -290,7 +272,8 @@ def complete_session(request, session_id):
     # Update UserPhonemeProgress
     progress_updated = []
     for phoneme_id, stats in phoneme_stats.items():
-        accuracy = (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0
+        # Stored as a 0-1 fraction, like UserPhonemeProgress.update_discrimination_progress()
+        accuracy = (stats['correct'] / stats['total']) if stats['total'] > 0 else 0
         
         progress, created = UserPhonemeProgress.objects.get_or_create(
             user=user,
@@ -309,10 +292,14 @@ def complete_session(request, session_id):
             progress_updated.append({
                 'phoneme_id': phoneme_id,
                 'phoneme_symbol': progress.phoneme.ipa_symbol,
-                'old_accuracy': old_accuracy,
-                'new_accuracy': new_accuracy
+                'old_accuracy': old_accuracy * 100,
+                'new_accuracy': new_accuracy * 100
             })
     
+    # Draw the next quiz in the background with the updated progress
+    session_pair_ids = list({attempt.minimal_pair_id for attempt in attempts})
+    transaction.on_commit(lambda: queue_quiz_pregeneration(user.id, session_pair_ids))
+    
     # Check for achievements (future feature)
     achievements_earned = []
     
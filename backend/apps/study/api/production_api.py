@@ -15,12 +15,15 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Avg, Count, Max
 from django.core.files.base import ContentFile
 import os
 import uuid
 
 from ..models import ProductionRecording
+from ..tasks import queue_recording_scoring
 from apps.curriculum.models import Phoneme
 
 
@@ -40,7 +43,8 @@ def upload_recording(request):
     - self_assessment_score (int, optional): 1-5 stars
     
     Returns:
-    - recording: Created recording object
+    - recording: Created recording object (scoring_status 'pending'; ai_score
+      is attached asynchronously by the scoring worker)
     """
     user = request.user
     
@@ -113,26 +117,31 @@ def upload_recording(request):
         is_best=False  # Will be updated if user marks it later
     )
     
+    # Score in the background (worker pool) once the row is committed
+    if getattr(settings, 'PRONUNCIATION_AUTO_SCORE', True):
+        recording_id = recording.id
+        transaction.on_commit(lambda: queue_recording_scoring(recording_id))
+    
     # Update user progress
     from apps.users.models import UserPhonemeProgress
     progress, created = UserPhonemeProgress.objects.get_or_create(
         user=user,
         phoneme=phoneme,
         defaults={
-            'production_practiced': True,
-            'production_practice_count': 1,
-            'last_production_practice': recording.created_at
+            'production_attempts': 1,
+            'production_started_at': recording.created_at,
+            'last_practiced_at': recording.created_at
         }
     )
     
     if not created:
-        progress.production_practiced = True
-        progress.production_practice_count += 1
-        progress.last_production_practice = recording.created_at
+        progress.production_attempts += 1
+        progress.production_started_at = progress.production_started_at or recording.created_at
+        progress.last_practiced_at = recording.created_at
         progress.save(update_fields=[
-            'production_practiced',
-            'production_practice_count',
-            'last_production_practice'
+            'production_attempts',
+            'production_started_at',
+            'last_practiced_at'
         ])
     
     return Response({
@@ -144,18 +153,19 @@ def upload_recording(request):
                 'phoneme': {
                     'id': phoneme.id,
                     'ipa_symbol': phoneme.ipa_symbol,
-                    'name_vi': phoneme.name_vi
+                    'vietnamese_approx': phoneme.vietnamese_approx
                 },
                 'recording_url': request.build_absolute_uri(recording.recording_file.url),
                 'duration_seconds': recording.duration_seconds,
                 'file_size_bytes': recording.file_size_bytes,
                 'self_assessment_score': recording.self_assessment_score,
+                'scoring_status': recording.scoring_status,
                 'is_best': recording.is_best,
                 'created_at': recording.created_at.isoformat(),
             },
             'progress': {
-                'practice_count': progress.production_practice_count,
-                'last_practice': progress.last_production_practice.isoformat()
+                'practice_count': progress.production_attempts,
+                'last_practice': progress.last_practiced_at.isoformat()
             }
         }
     }, status=status.HTTP_201_CREATED)
@@ -226,6 +236,8 @@ def list_recordings(request):
             'duration_seconds': recording.duration_seconds,
             'file_size_bytes': recording.file_size_bytes,
             'self_assessment_score': recording.self_assessment_score,
+            'ai_score': recording.ai_score,
+            'scoring_status': recording.scoring_status,
             'is_best': recording.is_best,
             'created_at': recording.created_at.isoformat(),
         })
@@ -280,6 +292,9 @@ def get_recording_detail(request, recording_id):
                 'file_size_bytes': recording.file_size_bytes,
                 'self_assessment_score': recording.self_assessment_score,
                 'ai_score': recording.ai_score,
+                'ai_feedback': recording.ai_feedback,
+                'ai_metrics': recording.ai_metrics,
+                'scoring_status': recording.scoring_status,
                 'is_best': recording.is_best,
                 'created_at': recording.created_at.isoformat(),
                 'updated_at': recording.updated_at.isoformat(),
@@ -425,6 +440,8 @@ def get_phoneme_recordings(request, phoneme_id):
             'recording_url': request.build_absolute_uri(recording.recording_file.url),
             'duration_seconds': recording.duration_seconds,
             'self_assessment_score': recording.self_assessment_score,
+            'ai_score': recording.ai_score,
+            'scoring_status': recording.scoring_status,
             'is_best': recording.is_best,
             'created_at': recording.created_at.isoformat(),
         })
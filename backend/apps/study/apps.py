@@ -11,3 +11,6 @@ class StudyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.study'
     verbose_name = 'Study & Progress Tracking'
+    
+    def ready(self):
+        import apps.study.signals  # noqa
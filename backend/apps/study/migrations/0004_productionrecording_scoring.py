@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0003_discriminationsession_discriminationattempt_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productionrecording",
+            name="ai_metrics",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Score components, duration, speaking rate and pitch of recording/reference",
+                verbose_name="Chỉ số phân tích",
+            ),
+        ),
+        migrations.AddField(
+            model_name="productionrecording",
+            name="scored_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Thời điểm chấm điểm"
+            ),
+        ),
+        migrations.AddField(
+            model_name="productionrecording",
+            name="scoring_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("skipped", "Skipped (no reference audio)"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=20,
+                verbose_name="Trạng thái chấm điểm",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productionrecording",
+            name="ai_feedback",
+            field=models.TextField(
+                blank=True,
+                help_text="Automatic pronunciation feedback",
+                verbose_name="Phản hồi từ AI",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productionrecording",
+            name="ai_score",
+            field=models.FloatField(
+                blank=True,
+                help_text="Automatic pronunciation score vs reference audio (0-100)",
+                null=True,
+                verbose_name="Điểm AI (0-100)",
+            ),
+        ),
+    ]
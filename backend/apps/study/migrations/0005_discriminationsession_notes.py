@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("study", "0004_productionrecording_scoring"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="discriminationsession",
+            name="notes",
+            field=models.TextField(
+                blank=True, default="", verbose_name="Đáp án câu hỏi (JSON)"
+            ),
+        ),
+    ]
@@ -797,6 +797,13 @@ class DiscriminationSession(models.Model):
         verbose_name='Trạng thái'
     )
     
+    # Correct answers of the generated questions (JSON), checked on submit
+    notes = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='Đáp án câu hỏi (JSON)'
+    )
+    
     class Meta:
         db_table = 'discrimination_sessions'
         ordering = ['-started_at']
@@ -923,7 +930,7 @@ class DiscriminationAttempt(models.Model):
 class ProductionRecording(models.Model):
     """
     Stores audio recording of user's pronunciation attempt.
-    Includes self-assessment and future AI scoring capability.
+    Includes self-assessment and automatic scoring against the reference audio.
     """
     RATING_CHOICES = [
         (1, '1 Star - Need more practice'),
@@ -932,7 +939,15 @@ class ProductionRecording(models.Model):
         (4, '4 Stars - Very good'),
         (5, '5 Stars - Native-like'),
     ]
-    
+
+    SCORING_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped (no reference audio)'),
+    ]
+
     # Foreign Keys
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -978,14 +993,32 @@ class ProductionRecording(models.Model):
     ai_score = models.FloatField(
         null=True,
         blank=True,
-        help_text='AI pronunciation analysis score (0-100). Future feature.',
+        help_text='Automatic pronunciation score vs reference audio (0-100)',
         verbose_name='Điểm AI (0-100)'
     )
     ai_feedback = models.TextField(
         blank=True,
-        help_text='AI-generated pronunciation feedback. Future feature.',
+        help_text='Automatic pronunciation feedback',
         verbose_name='Phản hồi từ AI'
     )
+    ai_metrics = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Score components, duration, speaking rate and pitch of recording/reference',
+        verbose_name='Chỉ số phân tích'
+    )
+    scoring_status = models.CharField(
+        max_length=20,
+        choices=SCORING_STATUS_CHOICES,
+        default='pending',
+        db_index=True,
+        verbose_name='Trạng thái chấm điểm'
+    )
+    scored_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Thời điểm chấm điểm'
+    )
     
     # Metadata
     is_best = models.BooleanField(
@@ -0,0 +1,267 @@
+"""
+Discrimination Quiz Generation Engine
+
+Picks the minimal pairs of a discrimination quiz
+(apps/study/api/discrimination_api.start_session).
+
+Features:
+- Catalogue of eligible pair IDs (both audios present) grouped by phoneme,
+  built with one query and kept in the Django cache + process memory under
+  a version number bumped when a MinimalPair changes (apps/study/signals.py);
+  a catalogue older than CATALOGUE_MAX_AGE is rebuilt whatever the version,
+  so a bump missed by this process (per-process cache) is picked up
+- Per-phoneme weights from UserPhonemeProgress: low discrimination accuracy
+  and long time since last practice raise the weight; unpracticed phonemes
+  get a neutral accuracy and the full recency boost
+- Weighted sampling without replacement (Efraimidis-Spirakis: largest
+  random() ** (1 / weight) keys), O(n log k), no ORDER BY RANDOM()
+- The next session can be pre-generated in the background
+  (tasks.pregenerate_discrimination_quiz) so quiz start only fetches pairs
+
+Usage:
+    from apps.study.quiz_engine import get_quiz_engine
+
+    pair_ids = get_quiz_engine().next_session(user)
+"""
+
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from services.cache_versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS_PER_SESSION = 10
+
+# Phoneme weight = (MIN_WEIGHT + 1 - accuracy) * (1 + RECENCY_BOOST * staleness)
+MIN_WEIGHT = 0.1            # Mastered phonemes still come up now and then
+DEFAULT_ACCURACY = 0.5      # Phonemes the user has not practiced yet
+RECENCY_BOOST = 1.0         # Weight multiplier reached after RECENCY_WINDOW_DAYS
+RECENCY_WINDOW_DAYS = 14
+
+CATALOGUE_VERSION_KEY = 'quiz_engine:catalogue:version'
+CATALOGUE_TTL = 24 * 3600
+CATALOGUE_MAX_AGE = 300     # Seconds a built catalogue is used, in any tier
+
+
+@dataclass
+class PairCatalogue:
+    """Eligible minimal pairs: pair -> phonemes and phoneme -> pairs."""
+
+    version: int
+    built_at: float = field(default_factory=time.time)
+    pair_phonemes: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+    by_phoneme: Dict[int, List[int]] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.pair_phonemes)
+
+
+# =========================================================================
+# CATALOGUE
+# =========================================================================
+
+def get_catalogue_version() -> int:
+    return get_version(CATALOGUE_VERSION_KEY)
+
+
+def invalidate_pair_catalogue() -> None:
+    """New catalogue version (a MinimalPair was added, changed or deleted)."""
+    bump_version(CATALOGUE_VERSION_KEY)
+
+
+def _catalogue_key(version: int) -> str:
+    return f"quiz_engine:catalogue:{version}"
+
+
+def build_pair_catalogue(version: int = 0) -> PairCatalogue:
+    """One query over minimal pairs that have both audio files."""
+    from apps.curriculum.models import MinimalPair
+
+    rows = MinimalPair.objects.filter(
+        word_1_audio__isnull=False,
+        word_2_audio__isnull=False
+    ).exclude(word_1_audio='').exclude(word_2_audio='').order_by().values_list(
+        'id', 'phoneme_1_id', 'phoneme_2_id'
+    )
+
+    catalogue = PairCatalogue(version=version)
+    for pair_id, phoneme_1, phoneme_2 in rows:
+        catalogue.pair_phonemes[pair_id] = (phoneme_1, phoneme_2)
+        catalogue.by_phoneme.setdefault(phoneme_1, []).append(pair_id)
+        if phoneme_2 != phoneme_1:
+            catalogue.by_phoneme.setdefault(phoneme_2, []).append(pair_id)
+    return catalogue
+
+
+# =========================================================================
+# ENGINE
+# =========================================================================
+
+class QuizEngine:
+    """
+    Weighted random selection of minimal pairs for discrimination quizzes.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self._catalogue: Optional[PairCatalogue] = None
+
+    def catalogue(self) -> PairCatalogue:
+        """Current catalogue: process memory, then Django cache, then database."""
+        version = get_catalogue_version()
+        if self._is_current(self._catalogue, version):
+            return self._catalogue
+
+        catalogue = cache.get(_catalogue_key(version))
+        if not self._is_current(catalogue, version):
+            catalogue = build_pair_catalogue(version)
+            cache.set(_catalogue_key(version), catalogue, CATALOGUE_TTL)
+            logger.info(f"Built quiz pair catalogue v{version}: {len(catalogue)} pairs")
+
+        self._catalogue = catalogue
+        return catalogue
+
+    @staticmethod
+    def _is_current(catalogue: Optional[PairCatalogue], version: int) -> bool:
+        return (
+            catalogue is not None
+            and catalogue.version == version
+            and time.time() - catalogue.built_at < CATALOGUE_MAX_AGE
+        )
+
+    def phoneme_weights(self, user) -> Dict[int, float]:
+        """
+        Sampling weight per practiced phoneme (one query).
+
+        Returns:
+            {phoneme_id: weight}; unpracticed phonemes use default_weight()
+        """
+        from apps.users.models import UserPhonemeProgress
+
+        now = timezone.now()
+        rows = UserPhonemeProgress.objects.filter(user=user).values_list(
+            'phoneme_id', 'discrimination_accuracy', 'discrimination_attempts', 'last_practiced_at'
+        )
+
+        weights = {}
+        for phoneme_id, accuracy, attempts, last_practiced_at in rows:
+            if not attempts and not accuracy:
+                accuracy = DEFAULT_ACCURACY
+            if last_practiced_at is None:
+                staleness = 1.0
+            else:
+                staleness = min((now - last_practiced_at).days / RECENCY_WINDOW_DAYS, 1.0)
+            weights[phoneme_id] = self._weight(accuracy, staleness)
+        return weights
+
+    @staticmethod
+    def _weight(accuracy: float, staleness: float) -> float:
+        accuracy = min(max(accuracy, 0.0), 1.0)
+        return (MIN_WEIGHT + 1 - accuracy) * (1 + RECENCY_BOOST * staleness)
+
+    def default_weight(self) -> float:
+        return self._weight(DEFAULT_ACCURACY, 1.0)
+
+    def sample(
+        self,
+        catalogue: PairCatalogue,
+        phoneme_weights: Dict[int, float],
+        k: int = QUESTIONS_PER_SESSION,
+        exclude: Tuple[int, ...] = ()
+    ) -> List[int]:
+        """
+        Draw up to k distinct pair IDs, weighted by their weaker phoneme.
+
+        Args:
+            catalogue: PairCatalogue
+            phoneme_weights: {phoneme_id: weight} (see phoneme_weights)
+            k: Number of pairs
+            exclude: Pair IDs not to draw (e.g. the previous session)
+
+        Returns:
+            Pair IDs, highest sampling key first
+        """
+        default = self.default_weight()
+        excluded = set(exclude)
+        random_value = self.rng.random
+
+        keys, fallback = [], []
+        for pair_id, (phoneme_1, phoneme_2) in catalogue.pair_phonemes.items():
+            weight = max(
+                phoneme_weights.get(phoneme_1, default),
+                phoneme_weights.get(phoneme_2, default)
+            )
+            item = (random_value() ** (1.0 / weight), pair_id)
+            (fallback if pair_id in excluded else keys).append(item)
+
+        selected = heapq.nlargest(k, keys)
+        if len(selected) < k:
+            # Small catalogue: top up with excluded pairs
+            selected += heapq.nlargest(k - len(selected), fallback)
+        return [pair_id for _, pair_id in selected]
+
+    # -------------------------------------------------------------------------
+    # Sessions
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _next_key(user_id: int) -> str:
+        return f"quiz_engine:next:{user_id}"
+
+    def generate(self, user, k: int = QUESTIONS_PER_SESSION, exclude: Tuple[int, ...] = ()) -> List[int]:
+        """Pair IDs for a new session (catalogue + one progress query)."""
+        return self.sample(self.catalogue(), self.phoneme_weights(user), k, exclude)
+
+    def pregenerate(self, user, k: int = QUESTIONS_PER_SESSION, exclude: Tuple[int, ...] = ()) -> List[int]:
+        """Generate and store the user's next session (background task)."""
+        pair_ids = self.generate(user, k, exclude)
+        cache.set(
+            self._next_key(user.id),
+            {'version': get_catalogue_version(), 'pair_ids': pair_ids},
+            getattr(settings, 'QUIZ_PREGENERATED_TTL', 3600)
+        )
+        return pair_ids
+
+    def next_session(self, user, k: int = QUESTIONS_PER_SESSION) -> List[int]:
+        """
+        Pair IDs for the user's next quiz.
+
+        Uses the pre-generated session if it matches the current catalogue
+        version, otherwise generates one now.
+        """
+        key = self._next_key(user.id)
+        pregenerated = cache.get(key)
+        if pregenerated is not None:
+            cache.delete(key)
+            if pregenerated['version'] == get_catalogue_version() and len(pregenerated['pair_ids']) >= k:
+                return pregenerated['pair_ids'][:k]
+        return self.generate(user, k)
+
+
+# =========================================================================
+# SINGLETON
+# =========================================================================
+
+_quiz_engine = None
+
+
+def get_quiz_engine() -> QuizEngine:
+    """
+    Get the shared QuizEngine instance.
+
+    Returns:
+        QuizEngine (catalogue memoized per process)
+    """
+    global _quiz_engine
+    if _quiz_engine is None:
+        _quiz_engine = QuizEngine()
+    return _quiz_engine
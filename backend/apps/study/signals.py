@@ -0,0 +1,33 @@
+"""
+Study signals for cached progress charts and quiz generation.
+
+New discrimination sessions, production recordings and phoneme attempts
+make the user's cached time series stale (services.progress_timeseries).
+Minimal pair changes make the quiz pair catalogue stale (quiz_engine).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.curriculum.models import MinimalPair, PhonemeAttempt
+from services.progress_timeseries import invalidate_user_series
+
+from .models import DiscriminationSession, ProductionRecording
+from .quiz_engine import invalidate_pair_catalogue
+
+
+@receiver(post_save, sender=DiscriminationSession)
+@receiver(post_save, sender=ProductionRecording)
+@receiver(post_save, sender=PhonemeAttempt)
+@receiver(post_delete, sender=ProductionRecording)
+@receiver(post_delete, sender=PhonemeAttempt)
+def invalidate_progress_series(sender, instance, **kwargs):
+    """Bump the user's time-series generation."""
+    invalidate_user_series(instance.user_id)
+
+
+@receiver(post_save, sender=MinimalPair)
+@receiver(post_delete, sender=MinimalPair)
+def invalidate_quiz_catalogue(sender, instance, **kwargs):
+    """Bump the quiz pair catalogue version."""
+    invalidate_pair_catalogue()
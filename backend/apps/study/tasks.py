@@ -0,0 +1,167 @@
+"""
+Celery tasks for the study app.
+
+Tasks:
+- score_production_recording: Score a pronunciation recording against the
+  phoneme's reference audio (local, offline scorer)
+- pregenerate_discrimination_quiz: Draw the user's next discrimination quiz
+  after a session is completed (quiz_engine)
+
+Scoring is CPU-bound and routed to the 'scoring' queue, so it runs in its own
+worker pool without blocking TTS or maintenance workers:
+
+    celery -A config worker -Q scoring -c 4 -l info
+"""
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from apps.curriculum.pronunciation_scoring import (
+    ScoringError, get_pronunciation_scorer, reference_audio_for
+)
+from apps.curriculum.reference_features import get_reference_feature_store
+from services.progress_timeseries import invalidate_user_series
+from .models import ProductionRecording
+from .quiz_engine import get_quiz_engine
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def score_production_recording(self, recording_id: int):
+    """
+    Score a ProductionRecording and store ai_score / ai_feedback / ai_metrics.
+
+    Args:
+        recording_id: ID of the recording
+
+    Returns:
+        dict: {
+            'success': bool,
+            'recording_id': int,
+            'status': scoring_status,
+            'score': float or None,
+            'message': str
+        }
+    """
+    recording = ProductionRecording.objects.select_related(
+        'phoneme__preferred_audio_source'
+    ).filter(id=recording_id).first()
+    if recording is None:
+        return {
+            'success': False,
+            'recording_id': recording_id,
+            'status': None,
+            'score': None,
+            'message': 'Recording not found'
+        }
+
+    def finish(status, message, **fields):
+        fields.update(scoring_status=status, scored_at=timezone.now())
+        ProductionRecording.objects.filter(id=recording_id).update(**fields)
+        invalidate_user_series(recording.user_id)
+        return {
+            'success': status == 'completed',
+            'recording_id': recording_id,
+            'status': status,
+            'score': fields.get('ai_score'),
+            'message': message
+        }
+
+    reference = reference_audio_for(recording.phoneme)
+    if reference is None:
+        logger.info(f"No reference audio for /{recording.phoneme.ipa_symbol}/, skipping recording {recording_id}")
+        return finish('skipped', 'No reference audio for phoneme')
+
+    ProductionRecording.objects.filter(id=recording_id).update(scoring_status='processing')
+
+    try:
+        reference_features = get_reference_feature_store().for_phoneme(recording.phoneme, reference)
+        result = get_pronunciation_scorer().score(recording.recording_file, reference_features)
+    except ScoringError as e:
+        logger.warning(f"Scoring failed for recording {recording_id}: {e}")
+        return finish('failed', str(e), ai_metrics={'error': str(e)})
+    except Exception as e:
+        logger.error(f"Scoring error for recording {recording_id}: {e}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        return finish('failed', str(e), ai_metrics={'error': str(e)})
+
+    # Best production score on the phoneme progress (stored as 0-1), with
+    # the mastery transition; save() so progress signals run
+    from apps.users.models import UserPhonemeProgress
+    with transaction.atomic():
+        progress = UserPhonemeProgress.objects.select_for_update().filter(
+            user_id=recording.user_id,
+            phoneme_id=recording.phoneme_id
+        ).first()
+        changed = progress.apply_production_score(result['score'] / 100) if progress else []
+        if changed:
+            progress.save(update_fields=changed + ['updated_at'])
+
+    feedback = result.pop('feedback')
+    return finish(
+        'completed',
+        f"Scored {result['score']}",
+        ai_score=result['score'],
+        ai_feedback=feedback,
+        ai_metrics=dict(result, reference_audio_id=reference.id),
+    )
+
+
+def queue_recording_scoring(recording_id: int) -> bool:
+    """
+    Queue scoring for a recording (call from transaction.on_commit).
+
+    A broker outage must not fail the upload: the recording stays 'pending'
+    and can be re-queued later.
+
+    Returns:
+        True if the task was queued
+    """
+    try:
+        score_production_recording.delay(recording_id)
+        return True
+    except Exception as e:
+        logger.error(f"Could not queue scoring for recording {recording_id}: {e}")
+        return False
+
+
+@shared_task
+def pregenerate_discrimination_quiz(user_id: int, exclude_pair_ids=None):
+    """
+    Pre-generate the user's next discrimination quiz.
+
+    Args:
+        user_id: ID of the user
+        exclude_pair_ids: Pairs of the session just completed (drawn last)
+
+    Returns:
+        dict: {'success': bool, 'user_id': int, 'pair_ids': list}
+    """
+    from django.contrib.auth import get_user_model
+
+    user = get_user_model().objects.filter(id=user_id).first()
+    if user is None:
+        return {'success': False, 'user_id': user_id, 'pair_ids': []}
+
+    pair_ids = get_quiz_engine().pregenerate(user, exclude=tuple(exclude_pair_ids or ()))
+    return {'success': True, 'user_id': user_id, 'pair_ids': pair_ids}
+
+
+def queue_quiz_pregeneration(user_id: int, exclude_pair_ids=None) -> bool:
+    """
+    Queue pre-generation of the next quiz (call from transaction.on_commit).
+
+    Returns:
+        True if the task was queued
+    """
+    try:
+        pregenerate_discrimination_quiz.delay(user_id, list(exclude_pair_ids or ()))
+        return True
+    except Exception as e:
+        logger.error(f"Could not queue quiz pre-generation for user {user_id}: {e}")
+        return False
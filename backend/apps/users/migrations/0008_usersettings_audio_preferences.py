@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_tonguetwisterattempt"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usersettings",
+            name="audio_speed",
+            field=models.CharField(
+                choices=[
+                    ("slow", "Chậm"),
+                    ("normal", "Bình thường"),
+                    ("fast", "Nhanh"),
+                ],
+                default="normal",
+                max_length=10,
+                verbose_name="Tốc độ đọc",
+            ),
+        ),
+        migrations.AddField(
+            model_name="usersettings",
+            name="audio_voice",
+            field=models.CharField(
+                choices=[
+                    ("us_male", "Giọng Mỹ (nam)"),
+                    ("us_female", "Giọng Mỹ (nữ)"),
+                    ("uk_male", "Giọng Anh (nam)"),
+                    ("uk_female", "Giọng Anh (nữ)"),
+                ],
+                default="us_male",
+                max_length=20,
+                verbose_name="Giọng đọc",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def percentages_to_fractions(apps, schema_editor):
+    """complete_session() used to store 0-100; the field is 0-1 everywhere else."""
+    UserPhonemeProgress = apps.get_model('users', 'UserPhonemeProgress')
+    UserPhonemeProgress.objects.filter(discrimination_accuracy__gt=1).update(
+        discrimination_accuracy=F('discrimination_accuracy') / 100
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_usersettings_audio_preferences"),
+    ]
+
+    operations = [
+        migrations.RunPython(percentages_to_fractions, migrations.RunPython.noop),
+    ]
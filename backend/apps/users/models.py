@@ -262,6 +262,18 @@ class UserSettings(models.Model):
     """
     User preferences and settings.
     """
+    AUDIO_VOICE_CHOICES = [
+        ('us_male', _('Giọng Mỹ (nam)')),
+        ('us_female', _('Giọng Mỹ (nữ)')),
+        ('uk_male', _('Giọng Anh (nam)')),
+        ('uk_female', _('Giọng Anh (nữ)')),
+    ]
+    AUDIO_SPEED_CHOICES = [
+        ('slow', _('Chậm')),
+        ('normal', _('Bình thường')),
+        ('fast', _('Nhanh')),
+    ]
+    
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -313,6 +325,20 @@ class UserSettings(models.Model):
         verbose_name=_('Số thẻ mỗi phiên')
     )
     
+    # Flashcard audio preferences (services.tts_flashcard_service voices/speeds)
+    audio_voice = models.CharField(
+        max_length=20,
+        choices=AUDIO_VOICE_CHOICES,
+        default='us_male',
+        verbose_name=_('Giọng đọc')
+    )
+    audio_speed = models.CharField(
+        max_length=10,
+        choices=AUDIO_SPEED_CHOICES,
+        default='normal',
+        verbose_name=_('Tốc độ đọc')
+    )
+    
     # UI preferences
     dark_mode = models.BooleanField(
         default=False,
@@ -1043,19 +1069,36 @@ class UserPhonemeProgress(models.Model):
     def update_production_progress(self, score):
         """Update production progress after a recording attempt."""
         self.production_attempts += 1
-        if score > self.production_best_score:
-            self.production_best_score = score
+        self.apply_production_score(score)
         
         self.last_practiced_at = timezone.now()
         
+        self.save()
+    
+    def apply_production_score(self, score):
+        """
+        Keep the best production score and apply the mastery transition.
+        
+        Does not count an attempt or save (a scored recording was already
+        counted when it was submitted).
+        
+        Returns:
+            list: Changed field names (empty if nothing changed)
+        """
+        changed = []
+        if score > self.production_best_score:
+            self.production_best_score = score
+            changed.append('production_best_score')
+        
         # Check if mastered (80%+ on both discrimination and production)
         if self.discrimination_accuracy >= 0.8 and self.production_best_score >= 0.8:
             if self.current_stage != 'mastered':
                 self.current_stage = 'mastered'
                 self.mastered_at = timezone.now()
                 self.mastery_level = 5
+                changed += ['current_stage', 'mastered_at', 'mastery_level']
         
-        self.save()
+        return changed
     
     def get_stage_display_vi(self):
         """Get Vietnamese display name for current stage."""
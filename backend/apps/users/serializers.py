@@ -37,7 +37,7 @@ class UserSettingsSerializer(serializers.ModelSerializer):
             'id', 'email_notifications', 'push_notifications',
             'study_reminders', 'reminder_time', 'weekly_report',
             'sound_effects', 'auto_play_audio', 'show_ipa', 'show_example',
-            'cards_per_session', 'dark_mode', 'language',
+            'cards_per_session', 'audio_voice', 'audio_speed', 'dark_mode', 'language',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
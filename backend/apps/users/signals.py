@@ -1,11 +1,18 @@
 """
 User signals for auto-creating profile and settings.
+
+Phoneme and lesson progress changes drop the cached error heatmap
+(apps.curriculum.error_heatmap).
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import User, UserProfile, UserSettings
+from apps.curriculum.error_heatmap import invalidate_error_heatmap
+
+from .models import (
+    User, UserPhonemeProgress, UserProfile, UserPronunciationLessonProgress, UserSettings
+)
 
 
 @receiver(post_save, sender=User)
@@ -20,3 +27,12 @@ def create_user_settings(sender, instance, created, **kwargs):
     """Auto-create UserSettings when User is created."""
     if created:
         UserSettings.objects.create(user=instance)
+
+
+@receiver(post_save, sender=UserPhonemeProgress)
+@receiver(post_save, sender=UserPronunciationLessonProgress)
+@receiver(post_delete, sender=UserPhonemeProgress)
+@receiver(post_delete, sender=UserPronunciationLessonProgress)
+def invalidate_user_error_heatmap(sender, instance, **kwargs):
+    """Discrimination/production or lesson progress changed: rebuild the heatmap on next view."""
+    invalidate_error_heatmap(instance.user_id)
@@ -13,10 +13,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count, Avg, Sum, Q, Max
 from datetime import timedelta
 
 from ..models import Word, FlashcardDeck, Flashcard, UserFlashcardProgress, StudySession
+from ..models_achievement import apply_review_events, review_snapshot
+from ..models_study_tracking import DeckStudyHistory, card_state
 from ..serializers import (
     WordSerializer, WordDetailSerializer,
     FlashcardDeckListSerializer, FlashcardDeckDetailSerializer,
@@ -24,6 +27,9 @@ from ..serializers import (
     ReviewFlashcardSerializer, StudySessionSerializer,
     StudyStatsSerializer
 )
+from ..utils_flashcard import (
+    due_progress_queryset, new_cards_queryset, sample_new_cards, study_seed
+)
 
 
 class WordViewSet(viewsets.ReadOnlyModelViewSet):
@@ -107,34 +113,16 @@ class FlashcardDeckViewSet(viewsets.ReadOnlyModelViewSet):
         deck = self.get_object()
         user = request.user
         
-        # Get all flashcards in deck
-        all_cards = deck.flashcards.all()
-        
-        # Get user's progress for these cards
-        progress_map = {
-            p.flashcard_id: p 
-            for p in UserFlashcardProgress.objects.filter(
-                user=user,
-                flashcard__deck=deck
-            )
-        }
-        
-        # Separate into new and due cards
-        new_cards = []
-        due_cards = []
-        
-        for card in all_cards:
-            progress = progress_map.get(card.id)
-            
-            if not progress:
-                # New card (never seen)
-                new_cards.append(card)
-            elif progress.is_due:
-                # Due for review
-                due_cards.append(card)
+        # Due queue + never-studied cards of this deck (shared with the
+        # flashcard study flow, no per-card Python loop)
+        due_progress = due_progress_queryset(user, deck_id=deck.id)
+        new_cards = new_cards_queryset(user, deck_id=deck.id)
         
         # Limit to 20 cards: 5 new + 15 due (or whatever's available)
-        study_cards = due_cards[:15] + new_cards[:5]
+        due_cards = [
+            p.flashcard for p in due_progress.select_related('flashcard__word')[:15]
+        ]
+        study_cards = due_cards + sample_new_cards(new_cards, 5, study_seed(user))
         study_cards = study_cards[:20]  # Hard limit
         
         serializer = FlashcardSerializer(study_cards, many=True)
@@ -142,8 +130,8 @@ class FlashcardDeckViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({
             'deck': FlashcardDeckListSerializer(deck).data,
             'cards': serializer.data,
-            'total_new': len(new_cards),
-            'total_due': len(due_cards),
+            'total_new': new_cards.count(),
+            'total_due': due_progress.count(),
             'cards_in_session': len(study_cards),
         })
 
@@ -153,6 +141,7 @@ class FlashcardProgressViewSet(viewsets.ModelViewSet):
     API endpoints for user's flashcard progress
     
     List user's progress: GET /api/vocabulary/progress/
+    Start/edit/reset a card: POST, PATCH, DELETE /api/vocabulary/progress/[{id}/]
     Review a card: POST /api/vocabulary/progress/{id}/review/
         Body: {"quality": 4}  (0-5 rating)
     """
@@ -162,7 +151,41 @@ class FlashcardProgressViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Only show current user's progress"""
-        return UserFlashcardProgress.objects.filter(user=self.request.user)
+        return UserFlashcardProgress.objects.filter(
+            user=self.request.user
+        ).select_related('flashcard__word')
+    
+    # Create/update/destroy keep the deck summaries in step, like review()
+    
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            progress = serializer.save(user=self.request.user, next_review_date=timezone.now())
+            DeckStudyHistory.apply_card_changes(
+                self.request.user,
+                [(progress.flashcard.deck_id, card_state(None), card_state(progress))]
+            )
+    
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            deck_before = serializer.instance.flashcard.deck_id
+            state_before = card_state(serializer.instance)
+            progress = serializer.save()
+            # Same deck: the two changes net out to one delta
+            DeckStudyHistory.apply_card_changes(
+                self.request.user,
+                [
+                    (deck_before, state_before, card_state(None)),
+                    (progress.flashcard.deck_id, card_state(None), card_state(progress)),
+                ]
+            )
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            DeckStudyHistory.apply_card_changes(
+                self.request.user,
+                [(instance.flashcard.deck_id, card_state(instance), card_state(None))]
+            )
+            instance.delete()
     
     @action(detail=True, methods=['post'])
     def review(self, request, pk=None):
@@ -181,8 +204,24 @@ class FlashcardProgressViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             quality = serializer.validated_data['quality']
             
-            # Calculate next review using SM-2 algorithm
-            progress.calculate_next_review(quality)
+            with transaction.atomic():
+                before = review_snapshot(progress)
+                state_before = card_state(progress)
+                
+                # Calculate next review using SM-2 algorithm
+                progress.calculate_next_review(quality)
+                
+                # Keep achievement counters and deck summary in step
+                flashcard = progress.flashcard
+                level = flashcard.word.cefr_level if flashcard.word_id else None
+                apply_review_events(
+                    request.user,
+                    [(before, progress, level)]
+                )
+                DeckStudyHistory.apply_card_changes(
+                    request.user,
+                    [(progress.flashcard.deck_id, state_before, card_state(progress))]
+                )
             
             # Return updated progress
             return Response(
@@ -6,3 +6,6 @@ class VocabularyConfig(AppConfig):
     name = 'apps.vocabulary'
     verbose_name = 'Vocabulary & Flashcards'
 
+
+    def ready(self):
+        import apps.vocabulary.signals  # noqa
@@ -0,0 +1,286 @@
+"""
+Ahead-of-Time Flashcard Audio Warm-up
+
+Pre-synthesizes the audio of the cards users are about to study, so
+FlashcardAudioViewSet.stream() does not have to generate it on first
+playback (nightly Celery task: tasks.warm_upcoming_study_audio).
+
+Which cards:
+- Due reviews: learning cards whose SM-2 next_review_date falls before the
+  end of the window (overdue included), for users active recently
+- New cards: for each deck an active user studies, the exact cards
+  sample_new_card_ids() will offer on the window's days (same study_seed);
+  candidate lists are built from two queries, not one per user, deck and day
+
+Which audio:
+- Every card in the user's UserSettings voice/speed and in the default
+  variant (us_male/normal) the study serializers link to
+- Targets are deduplicated by (word, voice, speed) across all users
+
+Pipeline:
+- Missing audio is found with one store index query per variant
+  (FlashcardTTSService.build_audio_index)
+- Missing words go through FlashcardTTSService.generate_batch()
+  (bounded concurrency, per-voice rate limit, retries)
+- Coverage metrics are logged, returned and cached (LAST_RUN_CACHE_KEY),
+  together with the on-the-fly generations (cold misses) counted by the
+  stream endpoint
+
+Usage:
+    from apps.vocabulary.audio_warmup import run_audio_warmup
+
+    metrics = run_audio_warmup(window_hours=24)
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from services.cache_versions import incr_counter
+
+from .models import Flashcard, UserFlashcardProgress
+from .utils_flashcard import sample_candidate_ids, study_seed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANT = ('us_male', 'normal')
+
+LAST_RUN_CACHE_KEY = 'audio_warmup:last_run'
+COLD_MISS_TTL = 8 * 24 * 3600
+
+Variant = Tuple[str, str]
+
+
+# =========================================================================
+# COLD MISS COUNTER
+# =========================================================================
+
+def _cold_miss_key(day: date) -> str:
+    return f"audio_warmup:cold_misses:{day.isoformat()}"
+
+
+def record_cold_miss() -> None:
+    """Count one on-the-fly synthesis (audio missing at playback time)."""
+    incr_counter(_cold_miss_key(timezone.localdate()), timeout=COLD_MISS_TTL)
+
+
+def get_cold_misses(day: Optional[date] = None) -> int:
+    return cache.get(_cold_miss_key(day or timezone.localdate()), 0)
+
+
+# =========================================================================
+# PLANNING
+# =========================================================================
+
+def _window_days(now, window_end):
+    """Dates whose study_seed() applies during the window."""
+    days = []
+    day = now.date()
+    while day <= window_end.date():
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def plan_audio_warmup(
+    now=None,
+    window_hours: Optional[int] = None,
+    new_cards_per_deck: Optional[int] = None
+) -> Dict:
+    """
+    Words to have audio for before the next window of study sessions.
+
+    Args:
+        now: Reference time (default: now)
+        window_hours: Look-ahead (default: settings.AUDIO_WARMUP_WINDOW_HOURS)
+        new_cards_per_deck: New cards per user and deck (default: the
+            user's cards_per_session, or settings.AUDIO_WARMUP_NEW_CARDS_PER_DECK)
+
+    Returns:
+        {
+            'targets': {(voice, speed): {word, ...}},
+            'users': int,
+            'due_cards': int,
+            'new_cards': int,
+        }
+    """
+    now = now or timezone.now()
+    if window_hours is None:
+        window_hours = getattr(settings, 'AUDIO_WARMUP_WINDOW_HOURS', 24)
+    if new_cards_per_deck is None:
+        new_cards_per_deck = getattr(settings, 'AUDIO_WARMUP_NEW_CARDS_PER_DECK', None)
+    active_days = getattr(settings, 'AUDIO_WARMUP_ACTIVE_DAYS', 14)
+    window_end = now + timedelta(hours=window_hours)
+
+    # Active users and the decks they study (one grouped query)
+    active = UserFlashcardProgress.objects.filter(
+        last_reviewed_at__gte=now - timedelta(days=active_days)
+    ).values_list('user_id', 'flashcard__deck_id').distinct().order_by()
+    decks_by_user: Dict[int, Set[int]] = defaultdict(set)
+    for user_id, deck_id in active:
+        decks_by_user[user_id].add(deck_id)
+
+    users = {
+        user.id: user
+        for user in get_user_model().objects.filter(id__in=decks_by_user).select_related('settings')
+    }
+
+    def variants(user) -> Set[Variant]:
+        user_settings = getattr(user, 'settings', None)
+        if user_settings is None:
+            return {DEFAULT_VARIANT}
+        return {DEFAULT_VARIANT, (user_settings.audio_voice, user_settings.audio_speed)}
+
+    targets: Dict[Variant, Set[str]] = defaultdict(set)
+
+    # 1. Due reviews in the window (one query)
+    due = UserFlashcardProgress.objects.filter(
+        user_id__in=list(users),
+        is_learning=True,
+        next_review_date__lte=window_end,
+        flashcard__word__isnull=False
+    ).values_list('user_id', 'flashcard__word__text').order_by()
+    due_cards = 0
+    for user_id, word in due:
+        due_cards += 1
+        for variant in variants(users[user_id]):
+            targets[variant].add(word)
+
+    # 2. New cards each user will be offered on the window's days: each
+    # deck's cards and the users' studied cards are fetched once (two
+    # queries), then every (user, deck) candidate list is sampled per day
+    days = _window_days(now, window_end)
+    deck_ids = set().union(*decks_by_user.values()) if decks_by_user else set()
+    deck_cards: Dict[int, Set[int]] = defaultdict(set)
+    words: Dict[int, str] = {}
+    for deck_id, card_id, word in Flashcard.objects.filter(
+        deck_id__in=deck_ids
+    ).values_list('deck_id', 'id', 'word__text').order_by():
+        deck_cards[deck_id].add(card_id)
+        words[card_id] = word
+
+    studied: Dict[int, Set[int]] = defaultdict(set)
+    for user_id, card_id in UserFlashcardProgress.objects.filter(
+        user_id__in=list(users), flashcard__deck_id__in=deck_ids
+    ).values_list('user_id', 'flashcard_id').order_by():
+        studied[user_id].add(card_id)
+
+    new_card_users: Dict[int, Set[int]] = defaultdict(set)
+    for user_id, user_deck_ids in decks_by_user.items():
+        user = users.get(user_id)
+        if user is None:
+            continue
+        limit = new_cards_per_deck or getattr(getattr(user, 'settings', None), 'cards_per_session', 20)
+        for deck_id in user_deck_ids:
+            # Same candidates as new_cards_queryset(user, deck_id=deck_id)
+            candidate_ids = deck_cards[deck_id] - studied[user_id]
+            for day in days:
+                for card_id in sample_candidate_ids(candidate_ids, limit, study_seed(user, day)):
+                    new_card_users[card_id].add(user_id)
+
+    for card_id, user_ids in new_card_users.items():
+        if words[card_id] is None:
+            continue    # Card without a word: sampled like the session does, but has no audio
+        for user_id in user_ids:
+            for variant in variants(users[user_id]):
+                targets[variant].add(words[card_id])
+
+    return {
+        'targets': dict(targets),
+        'users': len(users),
+        'due_cards': due_cards,
+        'new_cards': len(new_card_users),
+    }
+
+
+# =========================================================================
+# PIPELINE
+# =========================================================================
+
+def run_audio_warmup(
+    window_hours: Optional[int] = None,
+    new_cards_per_deck: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    dry_run: bool = False,
+    now=None
+) -> Dict:
+    """
+    Pre-synthesize missing audio for upcoming study sessions.
+
+    Args:
+        window_hours: Look-ahead (default: settings.AUDIO_WARMUP_WINDOW_HOURS)
+        new_cards_per_deck: See plan_audio_warmup()
+        concurrency: Max in-flight TTS requests (default:
+            settings.AUDIO_WARMUP_CONCURRENCY, then TTS_BATCH_CONCURRENCY)
+        dry_run: Only measure coverage, synthesize nothing
+        now: Reference time (default: now)
+
+    Returns:
+        Coverage metrics dict (also cached under LAST_RUN_CACHE_KEY)
+    """
+    from services.tts_flashcard_service import get_tts_service
+
+    started = time.monotonic()
+    if concurrency is None:
+        concurrency = getattr(settings, 'AUDIO_WARMUP_CONCURRENCY', None)
+
+    plan = plan_audio_warmup(now, window_hours, new_cards_per_deck)
+    tts_service = get_tts_service()
+
+    metrics = {
+        'window_hours': window_hours or getattr(settings, 'AUDIO_WARMUP_WINDOW_HOURS', 24),
+        'users': plan['users'],
+        'due_cards': plan['due_cards'],
+        'new_cards': plan['new_cards'],
+        'targets': 0,
+        'cached': 0,
+        'generated': 0,
+        'failed': 0,
+        'variants': {},
+    }
+
+    for (voice, speed), words in sorted(plan['targets'].items()):
+        index = tts_service.build_audio_index(words, voices=[voice], speeds=[speed])
+        missing = sorted(word for word in words if index.url(word, voice, speed) is None)
+
+        generated = failed = 0
+        if missing and not dry_run:
+            summary = tts_service.generate_batch(missing, voice, speed, concurrency=concurrency)
+            generated, failed = summary['success'], summary['failed']
+
+        metrics['variants'][f"{voice}_{speed}"] = {
+            'targets': len(words),
+            'cached': len(words) - len(missing),
+            'generated': generated,
+            'failed': failed,
+        }
+        metrics['targets'] += len(words)
+        metrics['cached'] += len(words) - len(missing)
+        metrics['generated'] += generated
+        metrics['failed'] += failed
+
+    targets = metrics['targets']
+    metrics['coverage_before'] = round(metrics['cached'] / targets * 100, 1) if targets else 100.0
+    metrics['coverage_after'] = (
+        round((metrics['cached'] + metrics['generated']) / targets * 100, 1) if targets else 100.0
+    )
+    metrics['cold_misses_yesterday'] = get_cold_misses(timezone.localdate() - timedelta(days=1))
+    metrics['elapsed_seconds'] = round(time.monotonic() - started, 2)
+    metrics['finished_at'] = timezone.now().isoformat()
+
+    if not dry_run:
+        cache.set(LAST_RUN_CACHE_KEY, metrics, None)
+    logger.info(
+        f"🔥 Audio warm-up: {targets} targets for {metrics['users']} users, "
+        f"coverage {metrics['coverage_before']}% -> {metrics['coverage_after']}% "
+        f"({metrics['generated']} generated, {metrics['failed']} failed, "
+        f"{metrics['cold_misses_yesterday']} cold misses yesterday)"
+    )
+    return metrics
@@ -0,0 +1,408 @@
+"""
+Streaming Vocabulary Importer
+
+Set-based import of the Oxford word lists into Word and of words into
+flashcard decks, replacing the per-row get_or_create/save() loops.
+
+Sources:
+- Oxford 3000/5000 lists (The_Oxford_5000.csv): one "word pos level" line
+  per entry, e.g. "account n. B1, v. B2" (iter_oxford_rows)
+- Level dictionaries (dictionary/A1.csv ...): "text","pos","ipa","meaning_vi"
+  rows (iter_dictionary_rows)
+
+Pipeline:
+- Rows are parsed lazily and consumed in chunks (VOCABULARY_IMPORT_CHUNK_SIZE)
+- Existing (text, pos, cefr_level) keys are preloaded into a set once, so
+  telling new rows from existing ones costs no query
+- Each chunk is written in one transaction: one bulk_create for the new
+  rows, or bulk_create(update_conflicts=True) when existing rows get
+  refreshed fields (e.g. ipa, meaning_vi)
+- Flashcards are synced per deck the same way: one query for the deck's
+  cards, bulk_create for missing words, bulk_update for changed texts
+- Throughput (rows/second) is reported in the returned stats
+
+Usage:
+    from apps.vocabulary.importers import VocabularyImporter, iter_oxford_rows
+
+    stats = VocabularyImporter().run(iter_oxford_rows('The_Oxford_5000.csv'))
+    print(f"{stats['rows_per_second']} rows/s")
+"""
+
+import csv
+import logging
+import re
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Flashcard, Word
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+WORD_KEY_FIELDS = ('text', 'pos', 'cefr_level')
+
+# Oxford list abbreviations -> Word.pos
+OXFORD_POS_MAP = {
+    'n.': 'noun',
+    'v.': 'verb',
+    'adj.': 'adjective',
+    'adv.': 'adverb',
+    'prep.': 'preposition',
+    'pron.': 'pronoun',
+    'conj.': 'conjunction',
+    'det.': 'determiner',
+    'modal v.': 'modal verb',
+    'auxiliary v.': 'auxiliary verb',
+    'exclam.': 'exclamation',
+    'number': 'number',
+    'indefinite article': 'article',
+}
+
+# Level dictionary abbreviations -> Word.pos (matched as prefixes)
+DICTIONARY_POS_MAP = {
+    'n': 'noun',
+    'v': 'verb',
+    'adj': 'adjective',
+    'adv': 'adverb',
+    'prep': 'preposition',
+    'conj': 'conjunction',
+    'pron': 'pronoun',
+    'det': 'determiner',
+    'exclam': 'exclamation',
+    'modal': 'modal verb',
+    'auxiliary': 'auxiliary verb',
+    'number': 'number',
+}
+
+FULL_POS = {
+    'noun', 'verb', 'adjective', 'adverb', 'preposition',
+    'conjunction', 'pronoun', 'determiner', 'exclamation',
+}
+
+WordKey = Tuple[str, str, str]
+
+
+def word_key(row: Dict) -> WordKey:
+    return tuple(row[field] for field in WORD_KEY_FIELDS)
+
+
+# =========================================================================
+# PARSING
+# =========================================================================
+
+def parse_oxford_line(line: str):
+    """
+    Parse one line of the Oxford 3000/5000 list.
+
+    Formats:
+    1. "about prep., adv. A1" -> [('about', 'prep.', 'A1'), ('about', 'adv.', 'A1')]
+    2. "account n. B1, v. B2" -> [('account', 'n.', 'B1'), ('account', 'v.', 'B2')]
+    3. "a,an indefinite article A1" -> [('a', 'indefinite article', 'A1'), ('an', 'indefinite article', 'A1')]
+    4. "abandon v. B2" -> [('abandon', 'v.', 'B2')]
+    5. "all det., pron. A1, adv. A2" -> [('all', 'det.', 'A1'), ('all', 'pron.', 'A1'), ('all', 'adv.', 'A2')]
+
+    Returns:
+        list of (word, pos, level) tuples
+    """
+    parts = line.strip().split()
+    if len(parts) < 2:
+        return []
+
+    # First part is the word(s): "a,an" -> multiple words
+    words = [w.strip() for w in parts[0].rstrip(',').split(',')]
+
+    # Rest is pos and level info: accumulate POS until a level is reached
+    pos_level_pairs = []
+    accumulated_pos = []
+    for segment in (s.strip() for s in ' '.join(parts[1:]).split(',')):
+        level_match = re.search(r'\b([ABC][12])\b', segment)
+        if level_match:
+            pos_part = segment[:level_match.start()].strip()
+            if pos_part:
+                accumulated_pos.append(pos_part)
+            for pos in accumulated_pos:
+                pos_level_pairs.append((pos, level_match.group(1)))
+            accumulated_pos = []
+        else:
+            accumulated_pos.append(segment)
+
+    return [(word, pos, level) for word in words for pos, level in pos_level_pairs]
+
+
+def parse_dictionary_pos(pos_text: str) -> str:
+    """
+    Normalize a level dictionary POS.
+
+    Examples:
+    - "n" -> "noun"
+    - "adj" -> "adjective"
+    - "preposition, adverb" -> "preposition" (first one)
+    - "(money) n" -> "noun"
+    """
+    if not pos_text:
+        return 'other'
+
+    pos_text = re.sub(r'\([^)]*\)', '', pos_text.strip()).strip()
+    pos_text = pos_text.split(',')[0].strip()
+    pos_text = pos_text.split('/')[0].strip()
+
+    pos_lower = pos_text.lower()
+    for abbr, full in DICTIONARY_POS_MAP.items():
+        if pos_lower.startswith(abbr):
+            return full
+    if pos_lower in FULL_POS:
+        return pos_lower
+    return pos_text or 'other'
+
+
+def iter_oxford_rows(path, level_filter: str = '', on_error: Optional[Callable] = None) -> Iterator[Dict]:
+    """
+    Stream Word rows from an Oxford 3000/5000 list.
+
+    Args:
+        path: CSV/text file, one entry per line
+        level_filter: Only this CEFR level (optional)
+        on_error: Called with (line_num, line) for unparsable lines
+
+    Yields:
+        {'text', 'pos', 'cefr_level'}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            parsed = parse_oxford_line(line)
+            if not parsed and on_error:
+                on_error(line_num, line)
+
+            for text, pos, cefr_level in parsed:
+                text = text.lower().strip()
+                cefr_level = cefr_level.strip().upper()
+                if level_filter and cefr_level != level_filter:
+                    continue
+                if not text or not cefr_level:
+                    continue
+                pos = pos.strip()
+                yield {'text': text, 'pos': OXFORD_POS_MAP.get(pos, pos), 'cefr_level': cefr_level}
+
+
+def iter_dictionary_rows(path, cefr_level: str, on_skip: Optional[Callable] = None) -> Iterator[Dict]:
+    """
+    Stream Word rows from a level dictionary ("text","pos","ipa","meaning_vi").
+
+    Args:
+        path: CSV file of one CEFR level
+        cefr_level: Level of every row
+        on_skip: Called with (row_num, row) for rejected rows
+
+    Yields:
+        {'text', 'pos', 'cefr_level', 'ipa', 'meaning_vi'}
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row_num, row in enumerate(csv.reader(f), start=1):
+            if not row or len(row) < 4:
+                continue
+
+            text, pos_raw, ipa, meaning_vi = (value.strip() for value in row[:4])
+
+            # Header-like first row
+            if text.lower() in ['about', '©'] and row_num == 1:
+                continue
+
+            # Empty, copyright and malformed entries
+            if (not text or not meaning_vi or '©' in text or 'Oxford' in text
+                    or text.startswith('#') or meaning_vi.startswith('#')):
+                if on_skip:
+                    on_skip(row_num, row)
+                continue
+
+            yield {
+                'text': text,
+                'pos': parse_dictionary_pos(pos_raw),
+                'cefr_level': cefr_level,
+                'ipa': ipa,
+                'meaning_vi': meaning_vi,
+            }
+
+
+# =========================================================================
+# WORD IMPORT
+# =========================================================================
+
+class VocabularyImporter:
+    """
+    Chunked, set-based Word import.
+
+    New rows are inserted; rows whose key already exists are either skipped
+    or, when update_fields is given, have those fields overwritten.
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        update_fields: Sequence[str] = (),
+        rank_new_words: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        Args:
+            chunk_size: Rows per transaction (default: settings.VOCABULARY_IMPORT_CHUNK_SIZE)
+            update_fields: Word fields refreshed on existing rows (e.g. ('ipa', 'meaning_vi'))
+            rank_new_words: Set frequency_rank of new words to their import order
+            progress: Called with the running stats after each chunk
+        """
+        self.chunk_size = chunk_size or getattr(settings, 'VOCABULARY_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+        self.update_fields = list(update_fields)
+        self.rank_new_words = rank_new_words
+        self.progress = progress
+        self._keys = None
+
+    def load_keys(self) -> set:
+        """Existing (text, pos, cefr_level) keys (one query)."""
+        return set(Word.objects.order_by().values_list(*WORD_KEY_FIELDS))
+
+    @property
+    def keys(self) -> set:
+        if self._keys is None:
+            self._keys = self.load_keys()
+        return self._keys
+
+    def run(self, rows: Iterable[Dict]) -> Dict:
+        """
+        Import Word rows.
+
+        Args:
+            rows: Iterable of Word field dicts containing text, pos and cefr_level
+
+        Returns:
+            {
+                'rows': int,
+                'created': int,
+                'updated': int,
+                'skipped': int,
+                'chunks': int,
+                'elapsed_seconds': float,
+                'rows_per_second': float,
+            }
+        """
+        started = time.monotonic()
+        stats = {'rows': 0, 'created': 0, 'updated': 0, 'skipped': 0, 'chunks': 0}
+        keys = self.keys
+
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._write_chunk(chunk, keys, stats)
+            stats['chunks'] += 1
+            stats['rows'] += len(chunk)
+            if self.progress:
+                self.progress(dict(stats, elapsed_seconds=round(time.monotonic() - started, 2)))
+
+        elapsed = time.monotonic() - started
+        stats['elapsed_seconds'] = round(elapsed, 2)
+        stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed else float(stats['rows'])
+        logger.info(
+            f"📥 Vocabulary import: {stats['rows']} rows in {stats['chunks']} chunks "
+            f"({stats['created']} created, {stats['updated']} updated, {stats['skipped']} skipped, "
+            f"{stats['rows_per_second']} rows/s)"
+        )
+        return stats
+
+    def _write_chunk(self, chunk, keys: set, stats: Dict) -> None:
+        # Deduplicate by key (last row wins) and split new from existing
+        pending: Dict[WordKey, Dict] = {}
+        new_keys = set()
+        for row in chunk:
+            key = word_key(row)
+            if key in keys or key in pending:
+                if self.update_fields:
+                    stats['updated'] += 1
+                else:
+                    stats['skipped'] += 1
+                    continue
+            else:
+                new_keys.add(key)
+                stats['created'] += 1
+                if self.rank_new_words:
+                    row = dict(row, frequency_rank=stats['created'])
+            if key in pending and 'frequency_rank' in pending[key]:
+                row = dict(row, frequency_rank=pending[key]['frequency_rank'])
+            pending[key] = row
+
+        if not pending:
+            return
+
+        words = [Word(**row) for row in pending.values()]
+        with transaction.atomic():
+            if self.update_fields:
+                Word.objects.bulk_create(
+                    words,
+                    batch_size=self.chunk_size,
+                    update_conflicts=True,
+                    unique_fields=list(WORD_KEY_FIELDS),
+                    update_fields=self.update_fields + ['updated_at'],
+                )
+            else:
+                Word.objects.bulk_create(words, batch_size=self.chunk_size, ignore_conflicts=True)
+        keys |= new_keys
+
+
+# =========================================================================
+# FLASHCARDS
+# =========================================================================
+
+def sync_deck_flashcards(deck, words, build_card: Callable, update_fields: Sequence[str] = ()) -> Dict:
+    """
+    Set-based flashcard creation for one deck.
+
+    Args:
+        deck: FlashcardDeck
+        words: Iterable of Word instances (e.g. a QuerySet)
+        build_card: word -> dict of Flashcard field values
+        update_fields: Flashcard fields refreshed on existing cards when changed
+
+    Returns:
+        {'created': int, 'updated': int, 'total': int}
+    """
+    from .models_study_tracking import DeckStudyHistory
+
+    update_fields = list(update_fields)
+    existing = {
+        card.word_id: card
+        for card in Flashcard.objects.filter(deck=deck).only('id', 'word_id', *update_fields)
+    }
+
+    to_create, to_update = [], []
+    total = 0
+    for word in words:
+        total += 1
+        values = build_card(word)
+        card = existing.get(word.id)
+        if card is None:
+            to_create.append(Flashcard(word=word, deck=deck, **values))
+            continue
+        changed = [field for field in update_fields if getattr(card, field) != values[field]]
+        if changed:
+            for field in update_fields:
+                setattr(card, field, values[field])
+            to_update.append(card)
+
+    batch_size = getattr(settings, 'VOCABULARY_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    with transaction.atomic():
+        if to_create:
+            Flashcard.objects.bulk_create(to_create, batch_size=batch_size, ignore_conflicts=True)
+            # bulk_create() skips the post_save signal that keeps deck summaries current
+            DeckStudyHistory.reconcile(DeckStudyHistory.objects.filter(deck_id=deck.id))
+        if to_update:
+            Flashcard.objects.bulk_update(to_update, update_fields, batch_size=batch_size)
+
+    return {'created': len(to_create), 'updated': len(to_update), 'total': total}
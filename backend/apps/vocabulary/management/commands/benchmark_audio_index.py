@@ -0,0 +1,127 @@
+"""
+Management command to benchmark audio URL resolution for flashcard payloads.
+
+Compares the per-word lookup (FlashcardTTSService.get_audio_url once per
+voice/speed, a stat() each) with the batched AudioAvailabilityIndex used by
+the flashcard serializers, on a throw-away audio store.
+
+Usage:
+    python manage.py benchmark_audio_index
+    python manage.py benchmark_audio_index --cards 20 200 1000 --coverage 0.5
+"""
+
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from services.audio_store import AudioStore
+from services.tts_flashcard_service import FlashcardTTSService
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-word vs batched audio URL resolution for flashcard payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cards',
+            type=int,
+            nargs='+',
+            default=[20, 200],
+            help='Payload sizes (number of cards)'
+        )
+        parser.add_argument(
+            '--coverage',
+            type=float,
+            default=0.5,
+            help='Fraction of word/voice/speed variants that exist on disk'
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+
+    def handle(self, *args, **options):
+        media_root = Path(tempfile.mkdtemp(prefix='audio_index_bench_'))
+        try:
+            # The store index lives in the database: roll the throw-away rows back
+            with override_settings(MEDIA_ROOT=str(media_root), MEDIA_URL='/media/'), transaction.atomic():
+                self._run(media_root, options)
+                transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def _run(self, media_root, options):
+        service = FlashcardTTSService()
+        service.store = AudioStore(root=media_root / 'audio_store')
+        service.audio_dir = media_root / 'flashcard_audio'
+
+        max_cards = max(options['cards'])
+        words = [f"word{i}" for i in range(max_cards)]
+        created = self._populate(service, words, options['coverage'])
+
+        self.stdout.write(self.style.SUCCESS('\n🎧 Audio URL Resolution Benchmark'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(f'Variants per word: {len(service.VOICES) * len(service.SPEEDS)} (+1 default)')
+        self.stdout.write(f'Audio files on disk: {created} ({options["coverage"]:.0%} coverage)')
+        self.stdout.write('')
+
+        for count in options['cards']:
+            payload = words[:count]
+            per_word = self._best(lambda: self._resolve_per_word(service, payload), options['repeat'])
+            batched = self._best(lambda: self._resolve_batched(service, payload), options['repeat'])
+
+            assert self._resolve_per_word(service, payload) == self._resolve_batched(service, payload)
+
+            speedup = per_word / batched if batched else float('inf')
+            self.stdout.write(
+                f'{count:>5} cards: per-word {per_word * 1000:8.2f} ms '
+                f'({count * 13} lookups) | batched {batched * 1000:8.2f} ms | {speedup:5.1f}x'
+            )
+
+        self.stdout.write('=' * 60)
+
+    def _populate(self, service, words, coverage):
+        rng = random.Random(42)
+        created = 0
+        for word in words:
+            for voice in service.VOICES:
+                for speed in service.SPEEDS:
+                    if rng.random() >= coverage:
+                        continue
+                    key = service.get_store_key(word, voice, speed)
+                    tmp = service.store.temp_path(key)
+                    tmp.write_bytes(b'ID3')
+                    service.store.commit(key, tmp)
+                    created += 1
+        return created
+
+    @staticmethod
+    def _best(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _resolve_per_word(service, words):
+        """What WordSerializer did before: 1 + 12 get_audio_url calls per word."""
+        result = {}
+        for word in words:
+            urls = {}
+            for voice_id, voice_code in service.VOICES.items():
+                for speed in service.SPEEDS:
+                    url = service.get_audio_url(word, voice_code, speed)
+                    if url:
+                        urls[f"{voice_id}_{speed}"] = url
+            result[word] = (service.get_audio_url(word, 'us_male', 'normal'), urls)
+        return result
+
+    @staticmethod
+    def _resolve_batched(service, words):
+        index = service.build_audio_index(words)
+        return {word: (index.url(word), index.urls(word)) for word in words}
@@ -0,0 +1,175 @@
+"""
+Management command to benchmark due-card / new-card selection at scale.
+
+Generates a throw-away fixture (decks, cards and 100k UserFlashcardProgress
+rows spread over several users), times the previous selection queries
+against the shared due queue (utils_flashcard), then rolls everything back.
+
+Usage:
+    python manage.py benchmark_due_queue
+    python manage.py benchmark_due_queue --progress-rows 100000 --users 20 --deck-size 1000
+    python manage.py benchmark_due_queue --keep   # leave the fixture in the DB
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.vocabulary.models import Flashcard, FlashcardDeck, UserFlashcardProgress, Word
+from apps.vocabulary.utils_flashcard import (
+    due_progress_queryset, get_cards_for_study, new_cards_queryset,
+    sample_new_cards, study_seed
+)
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Raised to discard the fixture after measuring."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark flashcard due-queue selection on a generated 100k-row fixture'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--progress-rows', type=int, default=100000, help='UserFlashcardProgress rows')
+        parser.add_argument('--users', type=int, default=20, help='Users sharing the progress rows')
+        parser.add_argument('--decks', type=int, default=6, help='Number of decks')
+        parser.add_argument('--deck-size', type=int, default=1000, help='Cards per deck')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated fixture')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user, deck = self._build_fixture(options)
+                self._measure(user, deck, options['repeat'])
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write('Fixture rolled back.')
+
+    # =========================================================================
+    # FIXTURE
+    # =========================================================================
+
+    def _build_fixture(self, options):
+        rng = random.Random(7)
+        now = timezone.now()
+        started = time.perf_counter()
+        tag = f"dq{int(time.time())}"
+
+        owner = User.objects.create_user(username=f'{tag}_owner', email=f'{tag}_owner@example.com')
+        decks = []
+        cards = []
+        for d in range(options['decks']):
+            deck = FlashcardDeck.objects.create(
+                name=f'{tag} deck {d}', level='B1', created_by=owner, is_public=True
+            )
+            words = Word.objects.bulk_create([
+                Word(text=f'{tag}w{d}_{i}', pos='noun', cefr_level='B1', meaning_vi='x')
+                for i in range(options['deck_size'])
+            ])
+            cards += Flashcard.objects.bulk_create([
+                Flashcard(deck=deck, word=word, front_text=word.text, back_text='x')
+                for word in words
+            ])
+            decks.append(deck)
+
+        users = [
+            User.objects.create_user(
+                username=f'{tag}_u{u}', email=f'{tag}_u{u}@example.com', current_level='B1'
+            )
+            for u in range(options['users'])
+        ]
+        per_user = min(options['progress_rows'] // len(users), len(cards))
+        rows = []
+        for user in users:
+            for card in rng.sample(cards, per_user):
+                is_learning = rng.random() < 0.8
+                rows.append(UserFlashcardProgress(
+                    user=user,
+                    flashcard=card,
+                    next_review_date=now + timedelta(days=rng.randint(-30, 30)),
+                    is_learning=is_learning,
+                    is_mastered=not is_learning,
+                    easiness_factor=round(rng.uniform(1.3, 2.5), 2),
+                ))
+        UserFlashcardProgress.objects.bulk_create(rows, batch_size=5000)
+
+        self.stdout.write(self.style.SUCCESS('\n📚 Due Queue Benchmark'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(
+            f'Fixture: {len(cards)} cards in {len(decks)} decks, {len(rows)} progress rows '
+            f'({per_user} per user, {len(users)} users) in {time.perf_counter() - started:.1f}s'
+        )
+        self.stdout.write('')
+        return users[0], decks[0]
+
+    # =========================================================================
+    # MEASUREMENTS
+    # =========================================================================
+
+    def _measure(self, user, deck, repeat):
+        cases = [
+            ('session start (level)', self._legacy_cards_for_study, lambda: get_cards_for_study(user, level='B1')),
+            ('deck study endpoint', self._legacy_deck_study, lambda: self._deck_study(user, deck)),
+        ]
+        for name, legacy, current in cases:
+            before = self._best(lambda: legacy(user, deck), repeat)
+            after = self._best(current, repeat)
+            self.stdout.write(
+                f'{name:<24} before {before * 1000:8.1f} ms | after {after * 1000:8.1f} ms '
+                f'| {before / after if after else float("inf"):5.1f}x'
+            )
+        self.stdout.write('=' * 60)
+
+    @staticmethod
+    def _best(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _deck_study(user, deck):
+        due_progress = due_progress_queryset(user, deck_id=deck.id)
+        new_cards = new_cards_queryset(user, deck_id=deck.id)
+        cards = [p.flashcard for p in due_progress.select_related('flashcard__word')[:15]]
+        cards += sample_new_cards(new_cards, 5, study_seed(user))
+        return cards, new_cards.count(), due_progress.count()
+
+    @staticmethod
+    def _legacy_cards_for_study(user, deck, limit=20):
+        """Previous get_cards_for_study(): exclude(id__in=...) + order_by('?')."""
+        due = UserFlashcardProgress.objects.filter(
+            user=user, next_review_date__lte=timezone.now(), is_learning=True
+        ).select_related('flashcard__word').filter(flashcard__word__cefr_level='B1')
+        studied = UserFlashcardProgress.objects.filter(user=user).values_list('flashcard_id', flat=True)
+        new_cards = Flashcard.objects.exclude(id__in=studied).select_related('word', 'deck')
+        new_cards = new_cards.filter(deck__level='B1')
+        due_cards = [p.flashcard for p in due[:int(limit * 0.7)]]
+        return due_cards + list(new_cards.order_by('?')[:limit - len(due_cards)])
+
+    @staticmethod
+    def _legacy_deck_study(user, deck):
+        """Previous FlashcardDeckViewSet.study(): Python loop over every card."""
+        progress_map = {
+            p.flashcard_id: p
+            for p in UserFlashcardProgress.objects.filter(user=user, flashcard__deck=deck)
+        }
+        new_cards, due_cards = [], []
+        for card in deck.flashcards.all():
+            progress = progress_map.get(card.id)
+            if not progress:
+                new_cards.append(card)
+            elif progress.is_due:
+                due_cards.append(card)
+        return due_cards[:15] + new_cards[:5], len(new_cards), len(due_cards)
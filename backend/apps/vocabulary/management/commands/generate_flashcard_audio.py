@@ -5,6 +5,7 @@ Usage:
     python manage.py generate_flashcard_audio --voice us_male --speed normal --limit 100
     python manage.py generate_flashcard_audio --level A1 --voice us_female
     python manage.py generate_flashcard_audio --all
+    python manage.py generate_flashcard_audio --all --concurrency 16
 """
 
 from django.core.management.base import BaseCommand
@@ -58,6 +59,13 @@ class Command(BaseCommand):
             action='store_true',
             help='Force regeneration even if audio exists'
         )
+        
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Maximum number of concurrent TTS requests'
+        )
     
     def handle(self, *args, **options):
         voice = options['voice']
@@ -66,6 +74,7 @@ class Command(BaseCommand):
         limit = options.get('limit')
         generate_all = options['all']
         force = options['force']
+        concurrency = options['concurrency']
         
         # Get TTS service
         tts_service = get_tts_service()
@@ -91,57 +100,34 @@ class Command(BaseCommand):
             self.stdout.write(f'Level: {level}')
         self.stdout.write(f'Total words: {total_words}')
         self.stdout.write(f'Force regenerate: {force}')
+        self.stdout.write(f'Concurrency: {concurrency}')
         self.stdout.write(f'='*60)
         
-        # Generate audio
-        success_count = 0
-        failed_count = 0
-        skipped_count = 0
+        # Generate audio (concurrently, single event loop)
         start_time = time.time()
+        words = list(queryset.values_list('text', flat=True))
         
-        for i, word in enumerate(queryset, 1):
-            # Check if audio exists
-            if not force:
-                existing_url = tts_service.get_audio_url(
-                    word.text,
-                    tts_service.VOICES[voice],
-                    speed
-                )
-                if existing_url:
-                    skipped_count += 1
-                    if i % 50 == 0:
-                        self.stdout.write(f'Progress: {i}/{total_words} ({skipped_count} skipped)')
-                    continue
-            
-            # Generate audio
-            try:
-                audio_url = tts_service.generate_audio(
-                    word.text,
-                    voice,
-                    speed,
-                    force_regenerate=force
-                )
-                
-                if audio_url:
-                    success_count += 1
-                    self.stdout.write(
-                        f'✓ [{i}/{total_words}] {word.text} -> {audio_url}'
-                    )
-                else:
-                    failed_count += 1
-                    self.stdout.write(
-                        self.style.WARNING(f'✗ [{i}/{total_words}] {word.text} - Failed')
-                    )
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                failed_count += 1
+        def report_progress(done, total, result):
+            word = result['job'].text
+            if result['success']:
+                self.stdout.write(f'✓ [{done}/{total}] {word}')
+            else:
                 self.stdout.write(
-                    self.style.ERROR(f'✗ [{i}/{total_words}] {word.text} - Error: {e}')
+                    self.style.WARNING(f'✗ [{done}/{total}] {word} - {result["error"]}')
                 )
         
+        summary = tts_service.generate_batch(
+            words,
+            voice,
+            speed,
+            force_regenerate=force,
+            concurrency=concurrency,
+            progress_callback=report_progress
+        )
+        success_count = summary['success']
+        failed_count = summary['failed']
+        skipped_count = summary['skipped']
+        
         # Summary
         elapsed_time = time.time() - start_time
         
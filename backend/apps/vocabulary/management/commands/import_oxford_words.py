@@ -1,19 +1,27 @@
 """
 Management command to import Oxford 3000/5000 words and create flashcard decks.
 
+Words are streamed through apps.vocabulary.importers: chunked parsing,
+preloaded existing keys and one bulk write per chunk.
+
 Usage:
     python manage.py import_oxford_words --csv=path/to/oxford.csv --level=A1
+    python manage.py import_oxford_words --csv=The_Oxford_5000.csv --dictionary=dictionary/
 
 Options:
     --csv: Path to CSV file (optional, will create sample data if not provided)
+    --dictionary: Directory of level dictionaries (A1.csv ... C1.csv) adding IPA and meanings
     --level: CEFR level (A1, A2, B1, B2, C1)
+    --chunk-size: Rows per transaction
     --create-decks: Create flashcard decks automatically
 """
 
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from apps.vocabulary.importers import (
+    VocabularyImporter, iter_dictionary_rows, iter_oxford_rows, parse_oxford_line
+)
 from apps.vocabulary.models import Word, FlashcardDeck, Flashcard
-import csv
 import os
 
 User = get_user_model()
@@ -28,6 +36,17 @@ class Command(BaseCommand):
             type=str,
             help='Path to CSV file with words (word,pos,level,meaning_vi,example_en)',
         )
+        parser.add_argument(
+            '--dictionary',
+            type=str,
+            help='Directory with level dictionaries A1.csv ... C1.csv (text,pos,ipa,meaning_vi)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Rows per transaction (default: VOCABULARY_IMPORT_CHUNK_SIZE)',
+        )
         parser.add_argument(
             '--level',
             type=str,
@@ -51,24 +70,32 @@ class Command(BaseCommand):
             return
 
         csv_file = options.get('csv')
+        dictionary_dir = options.get('dictionary')
         level_filter = options.get('level')
         create_decks = options.get('create_decks')
+        chunk_size = options.get('chunk_size')
 
-        if not csv_file:
+        if not csv_file and not dictionary_dir:
             self.stdout.write(self.style.ERROR(
                 'Please provide --csv path or use --sample for demo data'
             ))
             return
 
-        if not os.path.exists(csv_file):
+        if csv_file and not os.path.exists(csv_file):
             raise CommandError(f'CSV file not found: {csv_file}')
 
+        if dictionary_dir and not os.path.isdir(dictionary_dir):
+            raise CommandError(f'Dictionary directory not found: {dictionary_dir}')
+
         # Import words
-        imported_count = self.import_words_from_csv(csv_file, level_filter)
-        
-        self.stdout.write(self.style.SUCCESS(
-            f'Successfully imported {imported_count} words'
-        ))
+        if csv_file:
+            imported_count = self.import_words_from_csv(csv_file, level_filter, chunk_size)
+            self.stdout.write(self.style.SUCCESS(
+                f'Successfully imported {imported_count} words'
+            ))
+
+        if dictionary_dir:
+            self.import_dictionaries(dictionary_dir, level_filter, chunk_size)
 
         # Create decks if requested
         if create_decks:
@@ -76,71 +103,30 @@ class Command(BaseCommand):
 
     def parse_oxford_line(self, line):
         """
-        Parse Oxford CSV line format.
-        
-        Formats:
-        1. "about prep., adv. A1" -> [('about', 'prep.', 'A1'), ('about', 'adv.', 'A1')]
-        2. "account n. B1, v. B2" -> [('account', 'n.', 'B1'), ('account', 'v.', 'B2')]
-        3. "a,an indefinite article A1" -> [('a', 'indefinite article', 'A1'), ('an', 'indefinite article', 'A1')]
-        4. "abandon v. B2" -> [('abandon', 'v.', 'B2')]
-        5. "all det., pron. A1, adv. A2" -> [('all', 'det.', 'A1'), ('all', 'pron.', 'A1'), ('all', 'adv.', 'A2')]
+        Parse Oxford CSV line format (see importers.parse_oxford_line).
         
         Returns list of (word, pos, level) tuples
         """
-        import re
-        
-        # Split by whitespace, keeping all parts
-        parts = line.strip().split()
-        
-        if len(parts) < 2:
-            return []
-        
-        # First part is the word(s)
-        word_part = parts[0].rstrip(',')
-        
-        # Handle cases like "a,an" -> multiple words
-        words = [w.strip() for w in word_part.split(',')]
-        
-        # Rest is pos and level info
-        info_text = ' '.join(parts[1:])
-        
-        # Strategy: Split by comma, track accumulated POS until we hit a level
-        pos_level_pairs = []
-        accumulated_pos = []
-        
-        segments = [s.strip() for s in info_text.split(',')]
-        
-        for segment in segments:
-            # Check if this segment contains a level
-            level_match = re.search(r'\b([ABC][12])\b', segment)
-            
-            if level_match:
-                level = level_match.group(1)
-                # Extract pos before the level (if any)
-                pos_part = segment[:level_match.start()].strip()
-                
-                if pos_part:
-                    accumulated_pos.append(pos_part)
-                
-                # Assign this level to all accumulated POS
-                for pos in accumulated_pos:
-                    pos_level_pairs.append((pos, level))
-                
-                # Reset for next group
-                accumulated_pos = []
-            else:
-                # No level in this segment, just accumulate the POS
-                accumulated_pos.append(segment)
-        
-        # Create results for each word with each pos/level combination
-        results = []
-        for word in words:
-            for pos, level in pos_level_pairs:
-                results.append((word, pos, level))
-        
-        return results
+        return parse_oxford_line(line)
     
-    def import_words_from_csv(self, csv_file, level_filter=''):
+    def _report_chunk(self, stats):
+        self.stdout.write(
+            f"Processed {stats['rows']} rows (imported: {stats['created']}, "
+            f"updated: {stats['updated']}, skipped: {stats['skipped']}) "
+            f"in {stats['elapsed_seconds']}s..."
+        )
+
+    def _report_import(self, stats):
+        self.stdout.write(self.style.SUCCESS(
+            f"\nImport complete: {stats['created']} words imported, {stats['updated']} updated, "
+            f"{stats['skipped']} skipped"
+        ))
+        self.stdout.write(
+            f"  {stats['rows']} rows in {stats['chunks']} chunks, "
+            f"{stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/s)"
+        )
+
+    def import_words_from_csv(self, csv_file, level_filter='', chunk_size=None):
         """
         Import words from Oxford CSV file.
         
@@ -149,93 +135,46 @@ class Command(BaseCommand):
         - "about prep., adv. A1"
         - "account n. B1, v. B2"
         - "abandon v. B2"
+        
+        Existing (text, pos, level) words are skipped; new words are
+        bulk inserted one chunk per transaction.
         """
-        imported = 0
-        skipped = 0
+        def warn(line_num, line):
+            self.stdout.write(self.style.WARNING(
+                f'Line {line_num}: Could not parse "{line}"'
+            ))
+
+        importer = VocabularyImporter(
+            chunk_size=chunk_size, rank_new_words=True, progress=self._report_chunk
+        )
+        stats = importer.run(iter_oxford_rows(csv_file, level_filter, on_error=warn))
+        self._report_import(stats)
         
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                if not line:
+        return stats['created']
+
+    def import_dictionaries(self, dictionary_dir, level_filter='', chunk_size=None):
+        """
+        Import level dictionaries (A1.csv ... C1.csv) in one streaming pass.
+        
+        Existing words get their IPA and Vietnamese meaning refreshed.
+        """
+        def rows():
+            for level in ['A1', 'A2', 'B1', 'B2', 'C1']:
+                if level_filter and level != level_filter:
                     continue
-                
-                # Parse the line
-                parsed = self.parse_oxford_line(line)
-                
-                if not parsed:
-                    self.stdout.write(self.style.WARNING(
-                        f'Line {line_num}: Could not parse "{line}"'
-                    ))
+                path = os.path.join(dictionary_dir, f'{level}.csv')
+                if not os.path.exists(path):
+                    self.stdout.write(self.style.WARNING(f'No dictionary for {level}: {path}'))
                     continue
-                
-                # Create Word entries for each word/pos/level combination
-                for word_text, pos, cefr_level in parsed:
-                    word_text = word_text.lower().strip()
-                    pos = pos.strip()
-                    cefr_level = cefr_level.strip().upper()
-                    
-                    # Skip if level filter doesn't match
-                    if level_filter and cefr_level != level_filter:
-                        continue
-                    
-                    if not word_text or not cefr_level:
-                        continue
-                    
-                    # Check if this exact word+pos combination exists
-                    existing = Word.objects.filter(
-                        text=word_text,
-                        pos=pos,
-                        cefr_level=cefr_level
-                    ).first()
-                    
-                    if existing:
-                        skipped += 1
-                        continue
-                    
-                    # Map pos abbreviations to full names
-                    pos_map = {
-                        'n.': 'noun',
-                        'v.': 'verb',
-                        'adj.': 'adjective',
-                        'adv.': 'adverb',
-                        'prep.': 'preposition',
-                        'pron.': 'pronoun',
-                        'conj.': 'conjunction',
-                        'det.': 'determiner',
-                        'modal v.': 'modal verb',
-                        'auxiliary v.': 'auxiliary verb',
-                        'exclam.': 'exclamation',
-                        'number': 'number',
-                        'indefinite article': 'article',
-                    }
-                    
-                    pos_full = pos_map.get(pos, pos)
-                    
-                    # Create or get word (skip duplicates)
-                    word, created = Word.objects.get_or_create(
-                        text=word_text,
-                        pos=pos_full,
-                        cefr_level=cefr_level,
-                        defaults={
-                            'meaning_vi': '',  # Will be filled later
-                            'frequency_rank': imported + 1,  # Use import order as frequency
-                        }
-                    )
-                    
-                    if created:
-                        imported += 1
-                    else:
-                        skipped += 1
-                    
-                    if (imported + skipped) % 100 == 0:
-                        self.stdout.write(f'Processed {imported + skipped} words (imported: {imported}, skipped: {skipped})...')
-        
-        self.stdout.write(self.style.SUCCESS(
-            f'\nImport complete: {imported} words imported, {skipped} skipped'
-        ))
+                yield from iter_dictionary_rows(path, level)
+
+        importer = VocabularyImporter(
+            chunk_size=chunk_size, update_fields=['ipa', 'meaning_vi'], progress=self._report_chunk
+        )
+        stats = importer.run(rows())
+        self._report_import(stats)
         
-        return imported
+        return stats
 
     def create_flashcard_decks(self):
         """Create flashcard decks for each CEFR level"""
@@ -294,8 +233,9 @@ class Command(BaseCommand):
                 # Create flashcards for words in this level
                 words = Word.objects.filter(cefr_level=level_code)[:100]  # Limit to 100 per deck initially
                 
-                for i, word in enumerate(words):
-                    Flashcard.objects.create(
+                # New deck: no existing cards, one bulk insert
+                Flashcard.objects.bulk_create([
+                    Flashcard(
                         word=word,
                         deck=deck,
                         front_text=word.text,
@@ -307,6 +247,8 @@ class Command(BaseCommand):
                         tags=f'{word.pos}, {word.cefr_level}',
                         order=i,
                     )
+                    for i, word in enumerate(words)
+                ])
                 
                 self.stdout.write(self.style.SUCCESS(
                     f'Created {words.count()} flashcards for {deck.name}'
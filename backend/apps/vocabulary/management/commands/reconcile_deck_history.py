@@ -0,0 +1,60 @@
+"""
+Management command to rebuild the materialized DeckStudyHistory progress stats.
+
+Progress stats are maintained by deltas on every review; this recomputes them
+with set-based SQL (UPDATE ... correlated COUNT subqueries) for all users, in
+primary-key batches. Run after migrating, and periodically as a safety net.
+
+Usage:
+    python manage.py reconcile_deck_history
+    python manage.py reconcile_deck_history --user 42 --deck 7
+    python manage.py reconcile_deck_history --batch-size 10000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from apps.vocabulary.models_study_tracking import DeckStudyHistory
+
+
+class Command(BaseCommand):
+    help = 'Rebuild DeckStudyHistory progress stats with set-based SQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only this user id')
+        parser.add_argument('--deck', type=int, help='Only this deck id')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Histories per UPDATE batch (primary-key range)'
+        )
+
+    def handle(self, *args, **options):
+        histories = DeckStudyHistory.objects.all()
+        if options['user']:
+            histories = histories.filter(user_id=options['user'])
+        if options['deck']:
+            histories = histories.filter(deck_id=options['deck'])
+
+        bounds = histories.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write(self.style.WARNING('⚠️  No deck histories to reconcile'))
+            return
+
+        self.stdout.write(self.style.SUCCESS('\n📚 Reconciling deck study progress'))
+        self.stdout.write('=' * 60)
+
+        started = time.perf_counter()
+        batch_size = max(1, options['batch_size'])
+        total = 0
+        for low in range(bounds['low'], bounds['high'] + 1, batch_size):
+            total += DeckStudyHistory.reconcile(
+                histories.filter(id__gte=low, id__lt=low + batch_size)
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {total} histories in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vocabulary", "0005_deckstudyhistory_usercardtag"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userflashcardprogress",
+            index=models.Index(
+                condition=models.Q(("is_learning", True)),
+                fields=["user", "next_review_date"],
+                name="vocab_progress_due_queue",
+            ),
+        ),
+    ]
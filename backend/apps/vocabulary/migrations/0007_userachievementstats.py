@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vocabulary", "0006_userflashcardprogress_due_queue_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAchievementStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "cards_learned",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Cards reviewed at least once"
+                    ),
+                ),
+                ("total_reviews", models.PositiveIntegerField(default=0)),
+                ("total_correct", models.PositiveIntegerField(default=0)),
+                (
+                    "reviews_today",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Distinct cards reviewed on reviews_today_date",
+                    ),
+                ),
+                ("reviews_today_date", models.DateField(blank=True, null=True)),
+                (
+                    "mastered_by_level",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Mastered cards per CEFR level: {'A1': 42}",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="achievement_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User Achievement Stats",
+                "verbose_name_plural": "User Achievement Stats",
+            },
+        ),
+    ]
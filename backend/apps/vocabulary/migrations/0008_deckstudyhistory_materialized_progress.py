@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:17
+
+from django.db import migrations, models
+
+from apps.vocabulary.models_study_tracking import reconcile_deck_progress
+
+
+def backfill_progress(apps, schema_editor):
+    """Fill the new summary columns for existing histories (set-based)."""
+    DeckStudyHistory = apps.get_model("vocabulary", "DeckStudyHistory")
+    reconcile_deck_progress(
+        DeckStudyHistory.objects.all(),
+        apps.get_model("vocabulary", "Flashcard"),
+        apps.get_model("vocabulary", "UserFlashcardProgress"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vocabulary", "0007_userachievementstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deckstudyhistory",
+            name="cards_studied",
+            field=models.IntegerField(
+                default=0, help_text="Number of cards studied at least once"
+            ),
+        ),
+        migrations.AddField(
+            model_name="deckstudyhistory",
+            name="total_cards",
+            field=models.IntegerField(
+                default=0, help_text="Number of cards in the deck"
+            ),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -17,7 +17,9 @@ from datetime import timedelta
 User = get_user_model()
 
 # Import achievement models to register them
-from .models_achievement import Achievement, UserAchievement, check_and_unlock_achievements
+from .models_achievement import (
+    Achievement, UserAchievement, UserAchievementStats, check_and_unlock_achievements
+)
 
 # Import study tracking models to register them
 from .models_study_tracking import DeckStudyHistory, UserCardTag
@@ -350,6 +352,12 @@ class UserFlashcardProgress(models.Model):
         indexes = [
             models.Index(fields=['user', 'next_review_date']),
             models.Index(fields=['user', 'is_learning']),
+            # Due queue: only learning cards, scanned in next_review_date order
+            models.Index(
+                fields=['user', 'next_review_date'],
+                condition=models.Q(is_learning=True),
+                name='vocab_progress_due_queue',
+            ),
         ]
         verbose_name = "User Flashcard Progress"
         verbose_name_plural = "User Flashcard Progress"
@@ -357,6 +365,14 @@ class UserFlashcardProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.flashcard.front_text} (next: {self.next_review_date.date()})"
     
+    # Fields written by apply_review() (used for bulk_update)
+    REVIEW_FIELDS = [
+        'easiness_factor', 'interval', 'repetitions', 'is_learning', 'is_mastered',
+        'next_review_date', 'last_reviewed_at', 'last_quality',
+        'total_reviews', 'total_correct', 'total_incorrect', 'streak', 'best_streak',
+        'updated_at',
+    ]
+    
     def calculate_next_review(self, quality):
         """
         SM-2 Algorithm implementation.
@@ -370,6 +386,19 @@ class UserFlashcardProgress(models.Model):
         3. Calculate new interval
         4. Schedule next review
         """
+        self.apply_review(quality)
+        self.save()
+    
+    def apply_review(self, quality, reviewed_at=None):
+        """
+        Apply one SM-2 review in memory (no save).
+        
+        Args:
+            quality (int): User's recall rating (0-5)
+            reviewed_at (datetime): When the review happened (default: now);
+                the next review is scheduled relative to it
+        """
+        reviewed_at = reviewed_at or timezone.now()
         
         # 1. Update E-Factor
         # Formula: EF' = EF + (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
@@ -400,8 +429,8 @@ class UserFlashcardProgress(models.Model):
                 self.is_learning = False
         
         # 3. Schedule next review
-        self.next_review_date = timezone.now() + timedelta(days=self.interval)
-        self.last_reviewed_at = timezone.now()
+        self.next_review_date = reviewed_at + timedelta(days=self.interval)
+        self.last_reviewed_at = reviewed_at
         self.last_quality = quality
         
         # 4. Update statistics
@@ -415,8 +444,6 @@ class UserFlashcardProgress(models.Model):
         else:
             self.total_incorrect += 1
             self.streak = 0
-        
-        self.save()
     
     @property
     def accuracy(self):
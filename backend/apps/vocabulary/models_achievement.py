@@ -4,12 +4,21 @@ Achievement System Models
 Gamification features to increase user engagement and motivation.
 """
 
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 User = get_user_model()
 
+# Requirement types evaluated from UserAchievementStats counters
+COUNTER_REQUIREMENT_TYPES = {'cards_learned', 'cards_per_day', 'accuracy_rate', 'level_completed'}
+ALL_REQUIREMENT_TYPES = COUNTER_REQUIREMENT_TYPES | {'streak_days'}
+
+LEVEL_WORD_COUNTS_CACHE_KEY = 'achievements:level_word_counts'
+
 
 class Achievement(models.Model):
     """
@@ -81,50 +90,42 @@ class Achievement(models.Model):
     def __str__(self):
         return f"{self.icon} {self.name}"
     
-    def check_user_qualifies(self, user):
+    def check_user_qualifies(self, user, stats=None):
         """
         Check if user qualifies for this achievement.
         
+        Reads the user's incremental counters instead of scanning their
+        review history.
+        
+        Args:
+            user: User instance
+            stats: UserAchievementStats (default: loaded for user)
+        
         Returns:
             bool: True if user meets requirements
         """
-        from .models import UserFlashcardProgress, StudySession
-        
-        if self.requirement_type == 'cards_learned':
-            # Count total cards learned
-            total = UserFlashcardProgress.objects.filter(
-                user=user,
-                total_reviews__gt=0
-            ).count()
-            return total >= self.requirement_value
-        
-        elif self.requirement_type == 'streak_days':
+        if self.requirement_type == 'streak_days':
             # Check current streak (streak_days is on User model)
             current_streak = getattr(user, 'streak_days', 0)
             return current_streak >= self.requirement_value
         
+        if self.requirement_type not in COUNTER_REQUIREMENT_TYPES:
+            return False
+        
+        if stats is None:
+            stats, _ = UserAchievementStats.for_user(user)
+        
+        if self.requirement_type == 'cards_learned':
+            return stats.cards_learned >= self.requirement_value
+        
         elif self.requirement_type == 'cards_per_day':
-            # Count cards learned today
-            today = timezone.now().date()
-            today_count = UserFlashcardProgress.objects.filter(
-                user=user,
-                last_reviewed_at__date=today
-            ).count()
-            return today_count >= self.requirement_value
+            return stats.get_reviews_today() >= self.requirement_value
         
         elif self.requirement_type == 'accuracy_rate':
-            # Calculate overall accuracy
-            progress = UserFlashcardProgress.objects.filter(user=user)
-            if not progress.exists():
-                return False
-            
-            total_reviews = sum(p.total_reviews for p in progress)
-            total_correct = sum(p.total_correct for p in progress)
-            
-            if total_reviews == 0:
+            if stats.total_reviews == 0:
                 return False
             
-            accuracy = (total_correct / total_reviews) * 100
+            accuracy = (stats.total_correct / stats.total_reviews) * 100
             return accuracy >= self.requirement_value
         
         elif self.requirement_type == 'level_completed':
@@ -133,13 +134,8 @@ class Achievement(models.Model):
             if not level:
                 return False
             
-            from .models import Word
-            total_words = Word.objects.filter(cefr_level=level).count()
-            mastered_words = UserFlashcardProgress.objects.filter(
-                user=user,
-                flashcard__word__cefr_level=level,
-                is_mastered=True
-            ).count()
+            total_words = level_word_counts().get(level, 0)
+            mastered_words = stats.mastered_by_level.get(level, 0)
             
             if total_words == 0:
                 return False
@@ -150,6 +146,153 @@ class Achievement(models.Model):
         return False
 
 
+class UserAchievementStats(models.Model):
+    """
+    Per-user counters behind the achievement requirements.
+    
+    Updated incrementally from review events (apply_review_events), so
+    evaluating an achievement costs the same no matter how much history the
+    user has. Built from the progress table the first time it is needed.
+    """
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='achievement_stats'
+    )
+    
+    # Counters
+    cards_learned = models.PositiveIntegerField(default=0, help_text="Cards reviewed at least once")
+    total_reviews = models.PositiveIntegerField(default=0)
+    total_correct = models.PositiveIntegerField(default=0)
+    reviews_today = models.PositiveIntegerField(default=0, help_text="Distinct cards reviewed on reviews_today_date")
+    reviews_today_date = models.DateField(null=True, blank=True)
+    mastered_by_level = models.JSONField(default=dict, help_text="Mastered cards per CEFR level: {'A1': 42}")
+    
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "User Achievement Stats"
+        verbose_name_plural = "User Achievement Stats"
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.cards_learned} cards learned"
+    
+    @classmethod
+    def for_user(cls, user, lock=False):
+        """
+        Get the user's counters, building them from history if missing.
+        
+        Args:
+            user: User instance
+            lock: Lock the row (select_for_update) - needs a transaction
+        
+        Returns:
+            tuple: (UserAchievementStats, rebuilt) - rebuilt counters already
+            include everything saved so far
+        """
+        queryset = cls.objects.select_for_update() if lock else cls.objects
+        try:
+            return queryset.get(user=user), False
+        except cls.DoesNotExist:
+            return cls.rebuild(user), True
+    
+    @classmethod
+    def rebuild(cls, user):
+        """
+        Recompute the counters from UserFlashcardProgress (two queries).
+        
+        Args:
+            user: User instance
+        
+        Returns:
+            UserAchievementStats
+        """
+        from .models import UserFlashcardProgress
+        
+        today = timezone.localdate()
+        progress = UserFlashcardProgress.objects.filter(user=user)
+        totals = progress.aggregate(
+            cards_learned=Count('id', filter=Q(total_reviews__gt=0)),
+            reviews_today=Count('id', filter=Q(last_reviewed_at__date=today)),
+            total_reviews=Sum('total_reviews'),
+            total_correct=Sum('total_correct'),
+        )
+        mastered_by_level = dict(
+            progress.filter(is_mastered=True)
+            .values_list('flashcard__word__cefr_level')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        
+        stats, _ = cls.objects.update_or_create(
+            user=user,
+            defaults={
+                'cards_learned': totals['cards_learned'],
+                'total_reviews': totals['total_reviews'] or 0,
+                'total_correct': totals['total_correct'] or 0,
+                'reviews_today': totals['reviews_today'],
+                'reviews_today_date': today,
+                'mastered_by_level': mastered_by_level,
+            }
+        )
+        return stats
+    
+    def get_reviews_today(self):
+        """Distinct cards reviewed today (0 once the day has rolled over)."""
+        if self.reviews_today_date != timezone.localdate():
+            return 0
+        return self.reviews_today
+    
+    def apply_events(self, events):
+        """
+        Apply review events to the counters in memory (no save).
+        
+        Args:
+            events: list of (before, progress, level) - see apply_review_events()
+        
+        Returns:
+            set: Requirement types whose counters changed
+        """
+        today = timezone.localdate()
+        if self.reviews_today_date != today:
+            self.reviews_today = 0
+            self.reviews_today_date = today
+        
+        affected = set()
+        for before, progress, level in events:
+            reviews_before, correct_before, mastered_before, reviewed_at_before = before
+            
+            if reviews_before == 0 and progress.total_reviews > 0:
+                self.cards_learned += 1
+                affected.add('cards_learned')
+            
+            if progress.total_reviews != reviews_before:
+                self.total_reviews += progress.total_reviews - reviews_before
+                self.total_correct += progress.total_correct - correct_before
+                affected.add('accuracy_rate')
+            
+            reviewed_today = (
+                progress.last_reviewed_at is not None
+                and timezone.localdate(progress.last_reviewed_at) == today
+            )
+            seen_today = (
+                reviewed_at_before is not None
+                and timezone.localdate(reviewed_at_before) == today
+            )
+            if reviewed_today and not seen_today:
+                self.reviews_today += 1
+                affected.add('cards_per_day')
+            
+            if progress.is_mastered != mastered_before and level:
+                delta = 1 if progress.is_mastered else -1
+                self.mastered_by_level[level] = max(0, self.mastered_by_level.get(level, 0) + delta)
+                affected.add('level_completed')
+        
+        return affected
+
+
 class UserAchievement(models.Model):
     """
     User's unlocked achievements.
@@ -185,39 +328,125 @@ class UserAchievement(models.Model):
         return f"{self.user.username} - {self.achievement.name}"
 
 
-def check_and_unlock_achievements(user):
+def review_snapshot(progress):
     """
-    Check all achievements and unlock any that user qualifies for.
+    Capture the counter-relevant state of a progress row before reviewing it.
+    
+    Args:
+        progress: UserFlashcardProgress (saved or not)
+    
+    Returns:
+        tuple: (total_reviews, total_correct, is_mastered, last_reviewed_at)
+    """
+    return (
+        progress.total_reviews,
+        progress.total_correct,
+        progress.is_mastered,
+        progress.last_reviewed_at,
+    )
+
+
+def level_word_counts():
+    """
+    Number of words per CEFR level (cached - one grouped query per timeout).
+    
+    Returns:
+        dict: {'A1': 900, 'A2': 850, ...}
+    """
+    counts = cache.get(LEVEL_WORD_COUNTS_CACHE_KEY)
+    if counts is None:
+        from .models import Word
+        
+        counts = dict(
+            Word.objects.values_list('cefr_level')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        cache.set(
+            LEVEL_WORD_COUNTS_CACHE_KEY,
+            counts,
+            getattr(settings, 'ACHIEVEMENT_LEVEL_COUNTS_TIMEOUT', 3600)
+        )
+    return counts
+
+
+def apply_review_events(user, events):
+    """
+    Update the user's achievement counters from review events.
+    
+    Call inside the transaction that saves the reviewed progress rows.
+    
+    Args:
+        user: User instance
+        events: list of (before, progress, level) where before is
+            review_snapshot(progress) taken before the review(s), progress is
+            the reviewed UserFlashcardProgress and level its word's CEFR level
+    
+    Returns:
+        tuple: (UserAchievementStats, set of affected requirement types)
+    """
+    with transaction.atomic():
+        stats, rebuilt = UserAchievementStats.for_user(user, lock=True)
+        if rebuilt:
+            # Freshly built counters already include these reviews
+            return stats, set(COUNTER_REQUIREMENT_TYPES)
+        
+        affected = stats.apply_events(events)
+        if affected:
+            stats.save()
+        return stats, affected
+
+
+def unlock_achievements(user, requirement_types=None, stats=None):
+    """
+    Evaluate locked achievements of the given requirement types and unlock
+    the ones the user now qualifies for (single bulk insert).
     
     Args:
         user: User instance
+        requirement_types: Iterable of requirement types (default: all)
+        stats: UserAchievementStats (default: loaded for user)
     
     Returns:
         list: List of newly unlocked achievements
     """
-    newly_unlocked = []
+    if requirement_types is not None and not requirement_types:
+        return []
     
-    # Get all active achievements
-    all_achievements = Achievement.objects.filter(is_active=True)
+    candidates = Achievement.objects.filter(is_active=True).exclude(
+        unlocked_by_users__user=user
+    )
+    if requirement_types is not None:
+        candidates = candidates.filter(requirement_type__in=requirement_types)
+    candidates = list(candidates)
+    if not candidates:
+        return []
     
-    # Get already unlocked achievement IDs
-    unlocked_ids = UserAchievement.objects.filter(
-        user=user
-    ).values_list('achievement_id', flat=True)
+    if stats is None and any(a.requirement_type in COUNTER_REQUIREMENT_TYPES for a in candidates):
+        stats, _ = UserAchievementStats.for_user(user)
     
-    # Check each achievement
-    for achievement in all_achievements:
-        # Skip if already unlocked
-        if achievement.id in unlocked_ids:
-            continue
-        
-        # Check if user qualifies
-        if achievement.check_user_qualifies(user):
-            # Unlock achievement
-            user_achievement = UserAchievement.objects.create(
-                user=user,
-                achievement=achievement
-            )
-            newly_unlocked.append(achievement)
+    newly_unlocked = [
+        achievement for achievement in candidates
+        if achievement.check_user_qualifies(user, stats)
+    ]
+    
+    if newly_unlocked:
+        UserAchievement.objects.bulk_create(
+            [UserAchievement(user=user, achievement=achievement) for achievement in newly_unlocked],
+            ignore_conflicts=True
+        )
     
     return newly_unlocked
+
+
+def check_and_unlock_achievements(user):
+    """
+    Check all achievements and unlock any that user qualifies for.
+    
+    Args:
+        user: User instance
+    
+    Returns:
+        list: List of newly unlocked achievements
+    """
+    return unlock_achievements(user)
@@ -1,17 +1,108 @@
 """
 Models for tracking user's flashcard study progress and history.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, DecimalField, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 User = get_user_model()
 
+# Cards below this easiness factor count as difficult
+DIFFICULT_EASINESS = 2.5
+
+
+def progress_percentage_expression():
+    """cards_studied / total_cards as a 0-100 percentage, 1 decimal (SQL)."""
+    return Case(
+        When(total_cards__lte=0, then=Value(0.0)),
+        default=Round(
+            Cast(
+                F('cards_studied') * 100.0 / F('total_cards'),
+                DecimalField(max_digits=7, decimal_places=3)
+            ),
+            1
+        ),
+        output_field=FloatField(),
+    )
+
+
+def reconcile_deck_progress(queryset, flashcard_model, progress_model):
+    """
+    Rebuild progress stats of DeckStudyHistory rows (two UPDATE statements).
+    
+    Takes the models as arguments so migrations can run it on historical
+    models (DeckStudyHistory.reconcile() passes the current ones).
+    
+    Args:
+        queryset: DeckStudyHistory QuerySet to rebuild
+        flashcard_model: Flashcard model
+        progress_model: UserFlashcardProgress model
+    
+    Returns:
+        int: Number of rows rebuilt
+    """
+    def count(rows):
+        return Coalesce(
+            Subquery(rows.annotate(count=Count('id')).values('count')[:1]),
+            0
+        )
+    
+    progress = progress_model.objects.filter(
+        user_id=OuterRef('user_id'),
+        flashcard__deck_id=OuterRef('deck_id')
+    ).order_by().values('user_id')
+    cards = flashcard_model.objects.filter(
+        deck_id=OuterRef('deck_id')
+    ).order_by().values('deck_id')
+    
+    with transaction.atomic():
+        rebuilt = queryset.update(
+            total_cards=count(cards),
+            cards_studied=count(progress),
+            cards_learning=count(progress.filter(is_learning=True, is_mastered=False)),
+            cards_mastered=count(progress.filter(is_mastered=True)),
+            cards_difficult=count(progress.filter(easiness_factor__lt=DIFFICULT_EASINESS)),
+            last_progress_update=timezone.now(),
+        )
+        queryset.update(
+            cards_new=F('total_cards') - F('cards_studied'),
+            progress_percentage=progress_percentage_expression(),
+        )
+    
+    return rebuilt
+
+
+def card_state(progress):
+    """
+    Contribution of one card to its deck summary.
+    
+    Args:
+        progress: UserFlashcardProgress, or None for a card never studied
+    
+    Returns:
+        tuple: (studied, learning, mastered, difficult) as 0/1
+    """
+    if progress is None:
+        return (0, 0, 0, 0)
+    return (
+        1,
+        int(progress.is_learning and not progress.is_mastered),
+        int(progress.is_mastered),
+        int(progress.easiness_factor < DIFFICULT_EASINESS),
+    )
+
 
 class DeckStudyHistory(models.Model):
     """
     Track user's study history and aggregated stats per deck.
-    Updated after each study session completion.
+    
+    Session stats are updated after each study session completion. Progress
+    stats are a materialized summary: reviews and single card inserts or
+    deletes or deck moves apply deltas (apply_card_changes, apply_card_added,
+    apply_card_removed, apply_card_moved), reconcile() rebuilds them with set-based SQL (bulk
+    imports, repairs).
     """
     user = models.ForeignKey(
         User,
@@ -38,7 +129,15 @@ class DeckStudyHistory(models.Model):
         help_text="Total study time in minutes"
     )
     
-    # Progress tracking (cached for performance)
+    # Progress tracking (materialized, see apply_card_changes)
+    total_cards = models.IntegerField(
+        default=0,
+        help_text="Number of cards in the deck"
+    )
+    cards_studied = models.IntegerField(
+        default=0,
+        help_text="Number of cards studied at least once"
+    )
     cards_new = models.IntegerField(
         default=0,
         help_text="Number of cards not yet studied"
@@ -87,34 +186,178 @@ class DeckStudyHistory(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.deck.name} ({self.progress_percentage}%)"
     
+    PROGRESS_FIELDS = [
+        'total_cards', 'cards_studied', 'cards_new', 'cards_learning',
+        'cards_mastered', 'cards_difficult', 'progress_percentage',
+        'last_progress_update',
+    ]
+    
+    def calculate_percentage(self):
+        """Share of the deck studied at least once (0-100, 1 decimal)."""
+        if self.total_cards <= 0:
+            return 0.0
+        return round(self.cards_studied / self.total_cards * 100, 1)
+    
     def update_progress(self):
         """Recalculate progress stats from UserFlashcardProgress"""
-        from .models import UserFlashcardProgress
+        DeckStudyHistory.reconcile(DeckStudyHistory.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=self.PROGRESS_FIELDS)
+    
+    @classmethod
+    def apply_card_changes(cls, user, changes, create=False):
+        """
+        Apply card state transitions to the user's deck summaries.
         
-        total_cards = self.deck.flashcards.count()
-        if total_cards == 0:
-            return
+        One locking SELECT and one bulk UPDATE, whatever the number of
+        cards or decks - no COUNT queries.
         
-        # Get user's progress for this deck
-        progress_qs = UserFlashcardProgress.objects.filter(
-            user=self.user,
-            flashcard__deck=self.deck
-        )
+        Args:
+            user: User instance
+            changes: Iterable of (deck_id, before, after) where before/after
+                are card_state() tuples
+            create: Create (and reconcile) missing histories
+        
+        Returns:
+            list: DeckStudyHistory rows of the touched decks
+        """
+        deltas = {}
+        for deck_id, before, after in changes:
+            delta = deltas.setdefault(deck_id, [0, 0, 0, 0])
+            for i, (old, new) in enumerate(zip(before, after)):
+                delta[i] += new - old
+        
+        if not deltas:
+            return []
+        
+        now = timezone.now()
+        with transaction.atomic():
+            histories = {
+                history.deck_id: history
+                for history in cls.objects.select_for_update().filter(
+                    user=user,
+                    deck_id__in=deltas
+                )
+            }
+            
+            for deck_id, history in histories.items():
+                studied, learning, mastered, difficult = deltas[deck_id]
+                history.cards_studied += studied
+                history.cards_new -= studied
+                history.cards_learning += learning
+                history.cards_mastered += mastered
+                history.cards_difficult += difficult
+                history.progress_percentage = history.calculate_percentage()
+                history.last_progress_update = now
+                # bulk_update() does not run auto_now
+                history.last_studied_at = now
+            
+            if histories:
+                cls.objects.bulk_update(
+                    histories.values(),
+                    cls.PROGRESS_FIELDS + ['last_studied_at']
+                )
+            
+            missing = [deck_id for deck_id in deltas if deck_id not in histories]
+            if create and missing:
+                cls.objects.bulk_create(
+                    [cls(user=user, deck_id=deck_id) for deck_id in missing],
+                    ignore_conflicts=True
+                )
+                created = cls.objects.filter(user=user, deck_id__in=missing)
+                cls.reconcile(created)
+                histories.update({history.deck_id: history for history in created})
+        
+        return [histories[deck_id] for deck_id in sorted(histories)]
+    
+    @classmethod
+    def reconcile(cls, queryset=None):
+        """
+        Rebuild progress stats with set-based SQL (two UPDATE statements).
+        
+        Args:
+            queryset: DeckStudyHistory QuerySet to rebuild (default: all)
+        
+        Returns:
+            int: Number of rows rebuilt
+        """
+        from .models import Flashcard, UserFlashcardProgress
+        
+        if queryset is None:
+            queryset = cls.objects.all()
+        return reconcile_deck_progress(queryset, Flashcard, UserFlashcardProgress)
+    
+    @classmethod
+    def apply_card_added(cls, deck_id):
+        """
+        A card joined the deck: new for every user (two UPDATEs, F() deltas).
+        
+        Args:
+            deck_id: Deck of the new card
+        """
+        histories = cls.objects.filter(deck_id=deck_id)
+        with transaction.atomic():
+            if histories.update(
+                total_cards=F('total_cards') + 1,
+                cards_new=F('cards_new') + 1,
+                last_progress_update=timezone.now(),
+            ):
+                histories.update(progress_percentage=progress_percentage_expression())
+    
+    @classmethod
+    def apply_card_removed(cls, flashcard):
+        """
+        A card is leaving the deck: take its state out of every user's summary.
+        
+        Runs before the delete (pre_delete), while the card's progress rows
+        still exist. One UPDATE per distinct card state, whatever the number
+        of users.
+        
+        Args:
+            flashcard: Flashcard about to be deleted
+        """
+        cls._apply_card_states(flashcard, flashcard.deck_id, -1)
+    
+    @classmethod
+    def apply_card_moved(cls, flashcard, old_deck_id):
+        """
+        A card changed deck: move its state between the two decks' summaries.
+        
+        Args:
+            flashcard: Flashcard, saved with its new deck
+            old_deck_id: Deck the card belonged to before
+        """
+        with transaction.atomic():
+            cls._apply_card_states(flashcard, old_deck_id, -1)
+            cls._apply_card_states(flashcard, flashcard.deck_id, 1)
+    
+    @classmethod
+    def _apply_card_states(cls, flashcard, deck_id, sign):
+        """Add (sign=1) or subtract (sign=-1) a card's per-user state in one deck."""
+        from .models import UserFlashcardProgress
         
-        self.cards_mastered = progress_qs.filter(is_mastered=True).count()
-        self.cards_learning = progress_qs.filter(
-            is_learning=True,
-            is_mastered=False
-        ).count()
-        self.cards_difficult = progress_qs.filter(
-            easiness_factor__lt=2.5
-        ).count()
+        by_state = {}
+        for progress in UserFlashcardProgress.objects.filter(flashcard=flashcard):
+            by_state.setdefault(card_state(progress), []).append(progress.user_id)
         
-        cards_learned = progress_qs.count()
-        self.cards_new = total_cards - cards_learned
-        self.progress_percentage = round((cards_learned / total_cards * 100), 1)
-        self.last_progress_update = timezone.now()
-        self.save()
+        histories = cls.objects.filter(deck_id=deck_id)
+        now = timezone.now()
+        with transaction.atomic():
+            for (studied, learning, mastered, difficult), user_ids in by_state.items():
+                histories.filter(user_id__in=user_ids).update(
+                    total_cards=F('total_cards') + sign,
+                    cards_studied=F('cards_studied') + sign * studied,
+                    cards_learning=F('cards_learning') + sign * learning,
+                    cards_mastered=F('cards_mastered') + sign * mastered,
+                    cards_difficult=F('cards_difficult') + sign * difficult,
+                    last_progress_update=now,
+                )
+            studied_by = [user_id for user_ids in by_state.values() for user_id in user_ids]
+            histories.exclude(user_id__in=studied_by).update(
+                total_cards=F('total_cards') + sign,
+                cards_new=F('cards_new') + sign,
+                last_progress_update=now,
+            )
+            histories.update(progress_percentage=progress_percentage_expression())
 
 
 class UserCardTag(models.Model):
@@ -10,6 +10,26 @@ from .models_achievement import Achievement, UserAchievement
 from services.tts_flashcard_service import get_tts_service
 
 
+def build_audio_index_for_cards(cards):
+    """
+    Batched audio availability for a list of flashcards.
+    
+    Pass the result as ``context['audio_index']`` when serializing many
+    cards so all audio URLs are resolved in one pass.
+    """
+    return get_tts_service().build_audio_index(
+        card.word.text for card in cards if card.word
+    )
+
+
+def _get_audio_index(serializer, word):
+    """Audio index from the serializer context (built for one word if absent)."""
+    index = serializer.context.get('audio_index')
+    if index is None or word not in index:
+        index = get_tts_service().build_audio_index([word])
+    return index
+
+
 class WordSerializer(serializers.ModelSerializer):
     """Serializer for Word model."""
     
@@ -30,22 +50,11 @@ class WordSerializer(serializers.ModelSerializer):
     
     def get_audio_url(self, obj):
         """Get default audio URL (US male, normal speed)."""
-        tts_service = get_tts_service()
-        return tts_service.get_audio_url(obj.text, voice='us_male', speed='normal')
+        return _get_audio_index(self, obj.text).url(obj.text, 'us_male', 'normal')
     
     def get_audio_urls(self, obj):
         """Get all available audio URLs for this word."""
-        tts_service = get_tts_service()
-        
-        urls = {}
-        for voice_id in ['us_male', 'us_female', 'uk_male', 'uk_female']:
-            voice_code = tts_service.VOICES[voice_id]
-            for speed in ['slow', 'normal', 'fast']:
-                url = tts_service.get_audio_url(obj.text, voice_code, speed)
-                if url:
-                    key = f"{voice_id}_{speed}"
-                    urls[key] = url
-        
+        urls = _get_audio_index(self, obj.text).urls(obj.text)
         return urls if urls else None
 
 
@@ -74,8 +83,7 @@ class FlashcardStudySerializer(serializers.ModelSerializer):
     def get_audio_url(self, obj):
         """Get default audio URL for flashcard word."""
         if obj.word:
-            tts_service = get_tts_service()
-            return tts_service.get_audio_url(obj.word.text)
+            return _get_audio_index(self, obj.word.text).url(obj.word.text)
         return None
     
     def get_last_reviewed(self, obj):
@@ -130,12 +138,17 @@ class FlashcardStudySerializer(serializers.ModelSerializer):
 
 
 class FlashcardDeckSerializer(serializers.ModelSerializer):
-    """Serializer for flashcard deck."""
+    """
+    Serializer for flashcard deck.
     
-    card_count = serializers.IntegerField(read_only=True)
-    mastered_count = serializers.SerializerMethodField()
-    new_count = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
+    Expects a queryset annotated by utils_flashcard.annotate_deck_progress()
+    (no queries per deck).
+    """
+    
+    card_count = serializers.IntegerField(source='total_cards', read_only=True)
+    mastered_count = serializers.IntegerField(read_only=True)
+    new_count = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
     progress_percentage = serializers.SerializerMethodField()
     
     class Meta:
@@ -147,54 +160,14 @@ class FlashcardDeckSerializer(serializers.ModelSerializer):
             'progress_percentage'
         ]
     
-    def get_mastered_count(self, obj):
-        """Count mastered cards for current user."""
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return 0
-        
-        return UserFlashcardProgress.objects.filter(
-            user=request.user,
-            flashcard__deck=obj,
-            is_mastered=True
-        ).count()
-    
-    def get_new_count(self, obj):
-        """Count new cards (not yet studied)."""
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return obj.card_count
-        
-        studied_ids = UserFlashcardProgress.objects.filter(
-            user=request.user,
-            flashcard__deck=obj
-        ).values_list('flashcard_id', flat=True)
-        
-        return obj.flashcards.exclude(id__in=studied_ids).count()
-    
-    def get_review_count(self, obj):
-        """Count cards due for review."""
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return 0
-        
-        from django.utils import timezone
-        return UserFlashcardProgress.objects.filter(
-            user=request.user,
-            flashcard__deck=obj,
-            next_review_date__lte=timezone.now(),
-            is_learning=True
-        ).count()
-    
     def get_progress_percentage(self, obj):
         """Calculate progress percentage."""
-        mastered = self.get_mastered_count(obj)
-        total = obj.card_count
+        total = obj.total_cards
         
         if total == 0:
             return 0
         
-        return int((mastered / total) * 100)
+        return int((obj.mastered_count / total) * 100)
 
 
 class StudySessionSerializer(serializers.ModelSerializer):
@@ -229,6 +202,21 @@ class ReviewCardRequestSerializer(serializers.Serializer):
     time_spent = serializers.IntegerField(min_value=0, required=False, default=0)
 
 
+class ReviewEventSerializer(serializers.Serializer):
+    """One review in a bulk (offline sync) request."""
+    
+    flashcard_id = serializers.IntegerField(min_value=1)
+    quality = serializers.IntegerField(min_value=0, max_value=5)
+    reviewed_at = serializers.DateTimeField(required=False)
+    time_spent = serializers.IntegerField(min_value=0, required=False, default=0)
+
+
+class BulkReviewRequestSerializer(serializers.Serializer):
+    """Serializer for bulk review request (events in the order they happened)."""
+    
+    reviews = ReviewEventSerializer(many=True, allow_empty=False, max_length=500)
+
+
 class AchievementSerializer(serializers.ModelSerializer):
     """Serializer for achievement."""
     
@@ -0,0 +1,42 @@
+"""
+Vocabulary signals for keeping deck study summaries in step with deck contents.
+
+Single cards apply deltas; bulk paths (bulk_create, imports) skip these
+signals and call DeckStudyHistory.reconcile() themselves.
+"""
+
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Flashcard
+from .models_study_tracking import DeckStudyHistory
+
+
+@receiver(pre_save, sender=Flashcard)
+def flashcard_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember the stored deck of an existing card, to detect deck moves."""
+    instance._stored_deck_id = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {'deck', 'deck_id'} & set(update_fields):
+        return
+    instance._stored_deck_id = Flashcard.objects.filter(
+        pk=instance.pk
+    ).values_list('deck_id', flat=True).first()
+
+
+@receiver(post_save, sender=Flashcard)
+def flashcard_added(sender, instance, created, **kwargs):
+    """A new card counts as new for every user studying the deck; a moved card changes decks."""
+    if created:
+        DeckStudyHistory.apply_card_added(instance.deck_id)
+        return
+    old_deck_id = getattr(instance, '_stored_deck_id', None)
+    if old_deck_id is not None and old_deck_id != instance.deck_id:
+        DeckStudyHistory.apply_card_moved(instance, old_deck_id)
+
+
+@receiver(pre_delete, sender=Flashcard)
+def flashcard_removed(sender, instance, **kwargs):
+    """Take the card out of the deck summaries (before its progress rows go)."""
+    DeckStudyHistory.apply_card_removed(instance)
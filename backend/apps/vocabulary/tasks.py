@@ -3,9 +3,11 @@ Celery Tasks for Flashcard Audio Generation
 
 Background tasks for TTS audio generation:
 - Async audio generation for individual words
-- Batch audio generation for decks
+- Batch audio generation for decks (chunked batch runs, see
+  apps.curriculum.audio_batches)
 - Cache cleanup
 - Audio regeneration
+- Nightly warm-up of audio for upcoming study sessions
 
 Usage:
     from apps.vocabulary.tasks import generate_flashcard_audio_async
@@ -63,6 +65,9 @@ def generate_deck_audio_batch(deck_id: int, voice: str = 'us_male', speed: str =
     """
     Generate audio for all flashcards in a deck.
     
+    Words with audio are found with one store lookup; the rest are queued
+    as a chunked batch run and the task returns without waiting for it.
+    
     Args:
         deck_id: FlashcardDeck ID
         voice: Voice identifier
@@ -71,46 +76,35 @@ def generate_deck_audio_batch(deck_id: int, voice: str = 'us_male', speed: str =
     Returns:
         Dictionary with generation statistics
     """
+    from apps.curriculum.audio_batches import start_audio_batch
     from apps.vocabulary.models import FlashcardDeck, Flashcard
     
     try:
         deck = FlashcardDeck.objects.get(id=deck_id)
-        flashcards = Flashcard.objects.filter(deck=deck).select_related('word')
-        
-        logger.info(f"[Celery] Starting batch audio generation for deck '{deck.name}' ({flashcards.count()} cards)")
+        words = list(
+            Flashcard.objects.filter(deck=deck).values_list('word__text', flat=True)
+        )
         
-        tts_service = get_tts_service()
-        success_count = 0
-        failed_count = 0
-        skipped_count = 0
+        logger.info(f"[Celery] Starting batch audio generation for deck '{deck.name}' ({len(words)} cards)")
         
-        for flashcard in flashcards:
-            word = flashcard.word.text
-            
-            # Check if audio already exists
-            existing_url = tts_service.get_audio_url(word, voice, speed)
-            if existing_url:
-                skipped_count += 1
-                continue
-            
-            # Generate audio
-            audio_url = tts_service.generate_audio(word, voice, speed)
-            
-            if audio_url:
-                success_count += 1
-            else:
-                failed_count += 1
+        index = get_tts_service().build_audio_index(words, voices=[voice], speeds=[speed])
+        missing = [word for word in dict.fromkeys(words) if not index.url(word, voice, speed)]
         
         result = {
             'deck_id': deck_id,
             'deck_name': deck.name,
-            'total_cards': flashcards.count(),
-            'success': success_count,
-            'failed': failed_count,
-            'skipped': skipped_count,
+            'total_cards': len(words),
+            'queued': len(missing),
+            'skipped': len(set(words)) - len(missing),
+            'batch_run_id': None,
         }
+        if missing:
+            run = start_audio_batch(
+                'flashcard_audio', missing, {'voice': voice, 'speed': speed, 'deck_id': deck_id}
+            )
+            result['batch_run_id'] = run.id
         
-        logger.info(f"[Celery] Batch generation complete: {result}")
+        logger.info(f"[Celery] Batch generation queued: {result}")
         return result
         
     except FlashcardDeck.DoesNotExist:
@@ -121,48 +115,82 @@ def generate_deck_audio_batch(deck_id: int, voice: str = 'us_male', speed: str =
         return {'error': str(e)}
 
 
+def synthesize_word_chunk(words: list, params: dict) -> dict:
+    """
+    Batch run handler: synthesize the audio of a chunk of words concurrently.
+    
+    Args:
+        words: Words of the chunk
+        params: {'voice': str, 'speed': str, 'force_regenerate': bool, 'concurrency': int}
+        
+    Returns:
+        Dictionary with 'succeeded', 'failed', 'skipped' and 'failures'
+    """
+    summary = get_tts_service().generate_batch(
+        words,
+        voice=params.get('voice', 'us_male'),
+        speed=params.get('speed', 'normal'),
+        force_regenerate=params.get('force_regenerate', False),
+        concurrency=params.get('concurrency'),
+    )
+    return {
+        'succeeded': summary['success'],
+        'failed': summary['failed'],
+        'skipped': summary['skipped'],
+        'failures': [
+            {'item': word, 'error': 'Audio generation failed'}
+            for word, url in summary['urls'].items() if not url
+        ],
+    }
+
+
+@shared_task
+def warm_upcoming_study_audio(window_hours: int = None, new_cards_per_deck: int = None):
+    """
+    Pre-synthesize audio for the cards users will study in the next hours.
+    
+    Runs nightly via Celery Beat (see apps.vocabulary.audio_warmup).
+    
+    Args:
+        window_hours: Look-ahead (default: settings.AUDIO_WARMUP_WINDOW_HOURS)
+        new_cards_per_deck: New cards per user and deck (default: the
+            user's cards_per_session)
+        
+    Returns:
+        Dictionary with coverage metrics
+    """
+    from apps.vocabulary.audio_warmup import run_audio_warmup
+    
+    try:
+        return run_audio_warmup(window_hours=window_hours, new_cards_per_deck=new_cards_per_deck)
+    except Exception as e:
+        logger.error(f"[Celery] Error in audio warm-up: {e}")
+        return {'error': str(e)}
+
+
 @shared_task
 def clean_expired_flashcard_audio():
     """
-    Clean up audio files that haven't been accessed in 30+ days.
+    Clean up audio store files that haven't been served in 30+ days.
+    
+    Uses the last access recorded by the store on every lookup (not
+    st_atime) and also evicts least recently used files above the storage
+    budget; see services.audio_gc.
+    
+    Legacy media/flashcard_audio files are moved into the store the first
+    time they are looked up, so they are collected like any store file.
     
     This task runs daily via Celery Beat to manage storage space.
     
     Returns:
         Dictionary with cleanup statistics
     """
-    from datetime import datetime, timedelta
-    from pathlib import Path
-    from django.conf import settings
+    from services.audio_gc import run_audio_gc
     
     try:
-        audio_dir = Path(settings.MEDIA_ROOT) / 'flashcard_audio'
-        
-        if not audio_dir.exists():
-            logger.info("[Celery] Audio directory doesn't exist, nothing to clean")
-            return {'deleted': 0, 'kept': 0}
-        
-        cutoff_date = datetime.now() - timedelta(days=30)
-        deleted_count = 0
-        kept_count = 0
-        
-        for audio_file in audio_dir.glob('*.mp3'):
-            # Check last access time
-            last_access = datetime.fromtimestamp(audio_file.stat().st_atime)
-            
-            if last_access < cutoff_date:
-                # Delete old file
-                audio_file.unlink()
-                deleted_count += 1
-                logger.debug(f"[Celery] Deleted old audio: {audio_file.name}")
-            else:
-                kept_count += 1
-        
-        result = {
-            'deleted': deleted_count,
-            'kept': kept_count,
-            'cutoff_date': cutoff_date.isoformat(),
-        }
+        report = run_audio_gc(pools=('audio_store',))
+        pool = report['pools']['audio_store']
+        result = {'deleted': pool['files_removed'], **pool}
         
         logger.info(f"[Celery] Audio cleanup complete: {result}")
         return result
@@ -2,7 +2,11 @@
 Utility functions for Flashcard system.
 """
 
+import random
+import zlib
+
 from django.db import transaction
+from .importers import sync_deck_flashcards
 from .models import Word, Flashcard, FlashcardDeck
 
 
@@ -11,6 +15,9 @@ def create_flashcards_from_words():
     Create flashcards from all words in database.
     Organized by CEFR level into separate decks.
     
+    Set-based per deck (see importers.sync_deck_flashcards): missing cards
+    are bulk created, cards whose texts changed are bulk updated.
+    
     Returns:
         dict: Statistics about created flashcards
     """
@@ -44,59 +51,40 @@ def create_flashcards_from_words():
         if deck_created:
             stats['decks_created'] += 1
         
-        # Get words for this level
-        words = Word.objects.filter(cefr_level=level)
-        
-        level_created = 0
-        level_updated = 0
-        
-        for word in words:
-            # Create front text
-            front_text = f"{word.text}"
-            
-            # Create back text with meaning and example
-            back_text = f"{word.meaning_vi}"
-            if word.example_en:
-                back_text += f"\n\nExample: {word.example_en}"
-            if word.example_vi:
-                back_text += f"\n{word.example_vi}"
-            
-            # Get or create flashcard
-            flashcard, created = Flashcard.objects.get_or_create(
-                word=word,
-                deck=deck,
-                defaults={
-                    'front_text': front_text,
-                    'back_text': back_text,
-                    'front_type': 'word',
-                    'difficulty': calculate_difficulty(word),
-                    'hint': f"Part of speech: {word.pos}",
-                    'audio_url': '',  # Will be generated on demand
-                    'order': 0
-                }
-            )
-            
-            if created:
-                level_created += 1
-            else:
-                # Update existing flashcard
-                flashcard.front_text = front_text
-                flashcard.back_text = back_text
-                flashcard.save()
-                level_updated += 1
-        
-        stats['by_level'][level] = {
-            'created': level_created,
-            'updated': level_updated,
-            'total': words.count()
-        }
+        # One query for the deck's cards, then bulk create/update
+        words = Word.objects.filter(cefr_level=level).only(
+            'id', 'text', 'pos', 'cefr_level', 'meaning_vi', 'example_en', 'example_vi'
+        ).iterator()
+        level_stats = sync_deck_flashcards(
+            deck, words, _word_card_values, update_fields=['front_text', 'back_text']
+        )
         
-        stats['flashcards_created'] += level_created
-        stats['flashcards_updated'] += level_updated
+        stats['by_level'][level] = level_stats
+        stats['flashcards_created'] += level_stats['created']
+        stats['flashcards_updated'] += level_stats['updated']
     
     return stats
 
 
+def _word_card_values(word):
+    """Flashcard fields for an Oxford level deck card."""
+    back_text = f"{word.meaning_vi}"
+    if word.example_en:
+        back_text += f"\n\nExample: {word.example_en}"
+    if word.example_vi:
+        back_text += f"\n{word.example_vi}"
+    
+    return {
+        'front_text': f"{word.text}",
+        'back_text': back_text,
+        'front_type': 'word',
+        'difficulty': calculate_difficulty(word),
+        'hint': f"Part of speech: {word.pos}",
+        'audio_url': '',  # Will be generated on demand
+        'order': 0
+    }
+
+
 def get_level_color(level):
     """Get color for CEFR level."""
     colors = {
@@ -144,83 +132,245 @@ def calculate_difficulty(word):
     return difficulty
 
 
-def get_cards_for_study(user, level=None, limit=20, deck_id=None):
+def due_progress_queryset(user, deck_id=None, level=None, now=None):
     """
-    Smart card selection algorithm for study session.
+    Due queue: progress rows of learning cards whose review is due.
     
-    Priority:
-    1. Cards due for review (70%)
-    2. New cards (30%)
+    Served by the partial index (user, next_review_date) WHERE is_learning,
+    most overdue first, so taking the first N rows is an index range scan.
     
     Args:
         user: User instance
-        level: CEFR level filter (optional)
-        limit: Number of cards to return
-        deck_id: Specific deck to study from (optional)
+        deck_id: Only cards of this deck (optional)
+        level: Only words of this CEFR level (optional)
+        now: Reference time (default: now)
     
     Returns:
-        list: List of Flashcard instances
+        QuerySet of UserFlashcardProgress
     """
     from .models import UserFlashcardProgress
     from django.utils import timezone
-    import random
     
-    # Get cards due for review
-    due_progress = UserFlashcardProgress.objects.filter(
+    progress_qs = UserFlashcardProgress.objects.filter(
         user=user,
-        next_review_date__lte=timezone.now(),
-        is_learning=True
-    ).select_related('flashcard__word')
+        is_learning=True,
+        next_review_date__lte=now or timezone.now()
+    )
     
     if level:
-        due_progress = due_progress.filter(flashcard__word__cefr_level=level)
+        progress_qs = progress_qs.filter(flashcard__word__cefr_level=level)
     
     if deck_id:
-        due_progress = due_progress.filter(flashcard__deck_id=deck_id)
+        progress_qs = progress_qs.filter(flashcard__deck_id=deck_id)
+    
+    return progress_qs.order_by('next_review_date')
+
+
+def new_cards_queryset(user, deck_id=None, level=None):
+    """
+    Cards the user has never studied (anti-join via NOT EXISTS).
+    
+    Args:
+        user: User instance
+        deck_id: Only cards of this deck (optional)
+        level: Deck level when no deck is given (default: user's current level)
     
-    # Get new cards (not yet studied)
-    studied_card_ids = UserFlashcardProgress.objects.filter(
-        user=user
-    ).values_list('flashcard_id', flat=True)
+    Returns:
+        QuerySet of Flashcard
+    """
+    from .models import UserFlashcardProgress
+    from django.db.models import Exists, OuterRef
     
-    new_cards = Flashcard.objects.exclude(
-        id__in=studied_card_ids
-    ).select_related('word', 'deck')
+    new_cards = Flashcard.objects.filter(
+        ~Exists(UserFlashcardProgress.objects.filter(user=user, flashcard=OuterRef('pk')))
+    )
     
     # Filter by deck if specified
     if deck_id:
         new_cards = new_cards.filter(deck_id=deck_id)
-    elif level:
-        # Filter by level (match deck level, not word level)
-        new_cards = new_cards.filter(deck__level=level)
     else:
-        # Default to user's current level
-        user_level = getattr(user, 'current_level', 'A1')
-        new_cards = new_cards.filter(deck__level=user_level)
+        # Filter by level (match deck level, not word level),
+        # default to user's current level
+        new_cards = new_cards.filter(deck__level=level or getattr(user, 'current_level', 'A1'))
+    
+    return new_cards
+
+
+def study_seed(user, day=None):
+    """
+    Deterministic sampler seed for a user and day.
+    
+    Restarting a session on the same day offers the same new cards.
+    """
+    from django.utils import timezone
+    
+    day = day or timezone.now().date()
+    return zlib.crc32(f"{user.pk}:{day.isoformat()}".encode())
+
+
+def sample_new_card_ids(new_cards, limit, seed):
+    """
+    Seeded random sample of ``limit`` card IDs without ORDER BY RANDOM().
+    
+    Only candidate IDs are fetched (no sort) and sampled in Python with a
+    seeded RNG, so the same seed always picks the same cards.
+    
+    Args:
+        new_cards: Flashcard QuerySet (e.g. new_cards_queryset())
+        limit: Number of cards
+        seed: RNG seed (see study_seed())
+    
+    Returns:
+        list: Flashcard IDs in sampled order
+    """
+    if limit <= 0:
+        return []
+    
+    return sample_candidate_ids(new_cards.values_list('id', flat=True), limit, seed)
+
+
+def sample_candidate_ids(candidate_ids, limit, seed):
+    """
+    The sample sample_new_card_ids() draws, from IDs already fetched.
+    
+    Lets a caller that needs several samples of one candidate list (e.g.
+    one per day) fetch it once.
+    
+    Args:
+        candidate_ids: Iterable of Flashcard IDs (any order)
+        limit: Number of cards
+        seed: RNG seed (see study_seed())
+    
+    Returns:
+        list: Flashcard IDs in sampled order
+    """
+    candidate_ids = sorted(candidate_ids)
+    if limit <= 0 or not candidate_ids:
+        return []
+    
+    rng = random.Random(seed)
+    return rng.sample(candidate_ids, min(limit, len(candidate_ids)))
+
+
+def sample_new_cards(new_cards, limit, seed):
+    """
+    Seeded random sample of ``limit`` cards without ORDER BY RANDOM().
+    
+    The IDs are chosen by sample_new_card_ids(), then the chosen rows are
+    loaded by primary key.
+    
+    Args:
+        new_cards: Flashcard QuerySet (e.g. new_cards_queryset())
+        limit: Number of cards
+        seed: RNG seed (see study_seed())
+    
+    Returns:
+        list: Flashcard instances in sampled order
+    """
+    chosen = sample_new_card_ids(new_cards, limit, seed)
+    if not chosen:
+        return []
+    
+    cards = Flashcard.objects.select_related('word', 'deck').in_bulk(chosen)
+    return [cards[card_id] for card_id in chosen if card_id in cards]
+
+
+def get_cards_for_study(user, level=None, limit=20, deck_id=None, seed=None):
+    """
+    Smart card selection algorithm for study session.
+    
+    Priority:
+    1. Cards due for review (70%)
+    2. New cards (30%)
+    
+    Args:
+        user: User instance
+        level: CEFR level filter (optional)
+        limit: Number of cards to return
+        deck_id: Specific deck to study from (optional)
+        seed: Sampler seed (default: study_seed(user))
+    
+    Returns:
+        list: List of Flashcard instances
+    """
+    seed = study_seed(user) if seed is None else seed
     
     # Calculate mix: 70% due, 30% new
     due_count = int(limit * 0.7)
     
     # Get due cards
+    due_progress = due_progress_queryset(user, deck_id=deck_id, level=level).select_related(
+        'flashcard__word', 'flashcard__deck'
+    )
     due_cards = [p.flashcard for p in due_progress[:due_count]]
     actual_due = len(due_cards)
     
     # Calculate how many new cards we need
     # If we have fewer due cards than expected, get more new cards to compensate
     needed_new = limit - actual_due
-    
-    # Get new cards - ensure we get enough
-    new_card_queryset = new_cards.order_by('?')  # Random order
-    new_card_list = list(new_card_queryset[:needed_new])
+    new_card_list = sample_new_cards(
+        new_cards_queryset(user, deck_id=deck_id, level=level),
+        needed_new,
+        seed
+    )
     
     # Combine and shuffle
     selected_cards = due_cards + new_card_list
-    random.shuffle(selected_cards)
+    random.Random(seed).shuffle(selected_cards)
     
     # Ensure we have exactly 'limit' cards (or as many as available)
     return selected_cards[:limit]
 
 
+def annotate_deck_progress(decks, user, now=None):
+    """
+    Annotate per-user progress stats on a FlashcardDeck queryset.
+    
+    One grouped query: decks LEFT JOIN cards LEFT JOIN this user's progress
+    rows (FilteredRelation, at most one per card), counted with
+    conditional aggregates.
+    
+    Annotations:
+        total_cards, studied_count, mastered_count, learning_count,
+        review_count (due now), difficult_count, new_count
+    
+    Args:
+        decks: FlashcardDeck QuerySet
+        user: User instance (anonymous/None -> every card counts as new)
+        now: Reference time for review_count (default: now)
+    
+    Returns:
+        Annotated QuerySet
+    """
+    from django.db.models import Count, F, FilteredRelation, Q
+    from django.utils import timezone
+    
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    now = now or timezone.now()
+    
+    return decks.alias(
+        user_progress=FilteredRelation(
+            'flashcards__vocabulary_user_progress',
+            condition=Q(flashcards__vocabulary_user_progress__user_id=user_id)
+        )
+    ).annotate(
+        total_cards=Count('flashcards'),
+        studied_count=Count('user_progress'),
+        mastered_count=Count('user_progress', filter=Q(user_progress__is_mastered=True)),
+        learning_count=Count(
+            'user_progress',
+            filter=Q(user_progress__is_learning=True, user_progress__is_mastered=False)
+        ),
+        review_count=Count(
+            'user_progress',
+            filter=Q(user_progress__is_learning=True, user_progress__next_review_date__lte=now)
+        ),
+        difficult_count=Count('user_progress', filter=Q(user_progress__easiness_factor__lt=2.5)),
+    ).annotate(
+        new_count=F('total_cards') - F('studied_count')
+    )
+
+
 def calculate_daily_progress(user):
     """
     Calculate user's progress for today.
@@ -403,7 +553,7 @@ def get_failed_cards(user, deck_id=None, limit=20):
 
 def get_due_cards(user, deck_id=None, limit=20):
     """
-    Get cards that are due for review today.
+    Get cards that are due for review.
     
     Args:
         user: User object
@@ -413,26 +563,15 @@ def get_due_cards(user, deck_id=None, limit=20):
     Returns:
         QuerySet of Flashcard objects
     """
-    from django.utils import timezone
-    from .models import UserFlashcardProgress, Flashcard
-    
-    today = timezone.now().date()
-    
-    # Get progress entries due for review
-    progress_qs = UserFlashcardProgress.objects.filter(
-        user=user,
-        next_review_date__lte=today,
-        is_mastered=False
-    ).select_related('flashcard', 'flashcard__word', 'flashcard__deck')
-    
-    if deck_id:
-        progress_qs = progress_qs.filter(flashcard__deck_id=deck_id)
+    from .models import Flashcard
     
-    # Order by next review date (most overdue first)
-    progress_qs = progress_qs.order_by('next_review_date', 'easiness_factor')
+    # Due queue, most overdue first (harder cards first on ties)
+    progress_qs = due_progress_queryset(user, deck_id=deck_id).order_by(
+        'next_review_date', 'easiness_factor'
+    )
     
     # Extract flashcards
-    flashcard_ids = [p.flashcard_id for p in progress_qs[:limit]]
+    flashcard_ids = list(progress_qs.values_list('flashcard_id', flat=True)[:limit])
     return Flashcard.objects.filter(id__in=flashcard_ids).select_related('word', 'deck')
 
 
@@ -467,3 +606,152 @@ def get_tagged_cards(user, tag, deck_id=None, limit=20):
     # Extract flashcards
     flashcard_ids = [t.flashcard_id for t in tags_qs[:limit]]
     return Flashcard.objects.filter(id__in=flashcard_ids).select_related('word', 'deck')
+
+
+def ingest_reviews(user, events):
+    """
+    Apply a batch of reviews (e.g. synced from an offline client).
+    
+    Progress rows are loaded in one query, SM-2 runs in memory in
+    reviewed_at order (a card reviewed twice gets both reviews applied),
+    and the rows are written back with bulk_update on the SM-2 fields only,
+    all in one transaction. Streak, DeckStudyHistory and achievements are
+    updated once at the end instead of once per review.
+    
+    Missing rows are inserted first (ignore_conflicts) and then locked with
+    the rest, so two syncs carrying the first review of the same card
+    serialize on the row instead of failing on the unique constraint.
+    Events older than the card's last applied review (a late offline sync)
+    are skipped, so SM-2 state never moves backwards.
+    
+    Args:
+        user: User instance
+        events: List of dicts with keys
+            flashcard_id (int), quality (0-5),
+            reviewed_at (datetime, optional - default: now, future values
+            are clamped to now), time_spent (seconds, optional)
+    
+    Returns:
+        dict: {
+            'processed': int,
+            'created': int,           # new progress rows
+            'updated': int,           # existing progress rows
+            'rejected': [flashcard_id, ...],  # unknown flashcards
+            'stale': [flashcard_id, ...],     # skipped, older than the last review
+            'time_spent': int,
+            'progress': [UserFlashcardProgress, ...],
+            'deck_histories': [DeckStudyHistory, ...],
+            'achievements_unlocked': [Achievement, ...],
+            'streak': dict,
+        }
+    """
+    from django.utils import timezone
+    from .models import UserFlashcardProgress
+    from .models_achievement import apply_review_events, review_snapshot, unlock_achievements
+    from .models_study_tracking import DeckStudyHistory, card_state
+    
+    now = timezone.now()
+    flashcard_ids = {event['flashcard_id'] for event in events}
+    deck_ids = {}
+    levels = {}
+    for flashcard_id, deck_id, level in Flashcard.objects.filter(
+        id__in=flashcard_ids
+    ).values_list('id', 'deck_id', 'word__cefr_level'):
+        deck_ids[flashcard_id] = deck_id
+        levels[flashcard_id] = level
+    rejected = sorted(flashcard_ids - deck_ids.keys())
+    
+    # Oldest first (stable: same-time events keep their order)
+    events = sorted(
+        (event for event in events if event['flashcard_id'] in deck_ids),
+        key=lambda event: min(event.get('reviewed_at') or now, now)
+    )
+    
+    processed = 0
+    time_spent = 0
+    stale = []
+    
+    with transaction.atomic():
+        missing = set(deck_ids) - set(
+            UserFlashcardProgress.objects.filter(
+                user=user,
+                flashcard_id__in=deck_ids
+            ).values_list('flashcard_id', flat=True)
+        )
+        if missing:
+            # select_for_update() can't lock rows that don't exist yet
+            UserFlashcardProgress.objects.bulk_create([
+                UserFlashcardProgress(user=user, flashcard_id=flashcard_id, next_review_date=now)
+                for flashcard_id in missing
+            ], ignore_conflicts=True)
+        
+        existing = {}
+        created = {}
+        for progress in UserFlashcardProgress.objects.select_for_update().filter(
+            user=user,
+            flashcard_id__in=deck_ids
+        ):
+            # Our untouched placeholder, or a row a concurrent sync filled in
+            is_new = progress.flashcard_id in missing and not progress.total_reviews
+            (created if is_new else existing)[progress.flashcard_id] = progress
+        snapshots = {
+            flashcard_id: review_snapshot(progress)
+            for flashcard_id, progress in existing.items()
+        }
+        states = {
+            flashcard_id: card_state(progress)
+            for flashcard_id, progress in existing.items()
+        }
+        for flashcard_id, progress in created.items():
+            snapshots[flashcard_id] = review_snapshot(progress)
+            states[flashcard_id] = card_state(None)
+        
+        for event in events:
+            flashcard_id = event['flashcard_id']
+            reviewed_at = min(event.get('reviewed_at') or now, now)
+            progress = existing.get(flashcard_id) or created.get(flashcard_id)
+            if progress.last_reviewed_at and reviewed_at < progress.last_reviewed_at:
+                stale.append(flashcard_id)
+                continue
+            
+            progress.apply_review(event['quality'], reviewed_at=reviewed_at)
+            processed += 1
+            time_spent += event.get('time_spent') or 0
+        
+        reviewed = list(existing.items()) + list(created.items())
+        for _, progress in reviewed:
+            # bulk_update() does not run auto_now
+            progress.updated_at = now
+        if reviewed:
+            UserFlashcardProgress.objects.bulk_update(
+                [progress for _, progress in reviewed],
+                UserFlashcardProgress.REVIEW_FIELDS
+            )
+        
+        deck_histories = DeckStudyHistory.apply_card_changes(user, [
+            (deck_ids[flashcard_id], states[flashcard_id], card_state(progress))
+            for flashcard_id, progress in reviewed
+        ], create=True)
+        
+        stats, affected = apply_review_events(user, [
+            (snapshots[flashcard_id], progress, levels[flashcard_id])
+            for flashcard_id, progress in reviewed
+        ])
+    
+    streak = update_user_streak(user) if processed else None
+    if streak and streak['updated']:
+        affected.add('streak_days')
+    newly_unlocked = unlock_achievements(user, affected, stats) if processed else []
+    
+    return {
+        'processed': processed,
+        'created': len(created),
+        'updated': len(existing),
+        'rejected': rejected,
+        'stale': sorted(set(stale)),
+        'time_spent': time_spent,
+        'progress': list(existing.values()) + list(created.values()),
+        'deck_histories': deck_histories,
+        'achievements_unlocked': newly_unlocked,
+        'streak': streak,
+    }
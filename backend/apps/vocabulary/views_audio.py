@@ -17,17 +17,49 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
-from django.http import FileResponse, Http404
+from django.conf import settings
+from django.http import Http404
 from django.core.cache import cache
 from pathlib import Path
 
+from services.audio_serving import serve_audio
 from services.tts_flashcard_service import get_tts_service
+from apps.vocabulary.audio_warmup import record_cold_miss
 from apps.vocabulary.models import Flashcard, FlashcardDeck
 from apps.vocabulary.tasks import generate_flashcard_audio_async, generate_deck_audio_batch
 
 logger = logging.getLogger(__name__)
 
 
+def _follower_wait_timeout(request):
+    """
+    How long a request may wait for audio another request is generating.
+    
+    Clients that send ``Prefer: respond-async`` or ``?wait=false`` get an
+    immediate 202 + Retry-After instead of holding a worker.
+    """
+    prefer = request.headers.get('Prefer', '').lower()
+    if 'respond-async' in prefer or request.query_params.get('wait', '').lower() in ('false', '0'):
+        return 0
+    return getattr(settings, 'AUDIO_SINGLE_FLIGHT_WAIT', 3)
+
+
+def _audio_pending_response(word, voice, speed, **extra):
+    """202 response telling the client to retry once generation finished."""
+    retry_after = getattr(settings, 'AUDIO_SINGLE_FLIGHT_RETRY_AFTER', 1)
+    response = Response({
+        **extra,
+        'word': word,
+        'voice': voice,
+        'speed': speed,
+        'status': 'pending',
+        'retry_after': retry_after,
+        'message': 'Audio is being generated, retry shortly',
+    }, status=status.HTTP_202_ACCEPTED)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
 class FlashcardAudioViewSet(ViewSet):
     """
     ViewSet for flashcard audio operations.
@@ -222,9 +254,16 @@ class FlashcardAudioViewSet(ViewSet):
         Query Parameters:
             voice: Voice identifier (default: us_male)
             speed: Speed identifier (default: normal)
+            wait: "false" to get 202 immediately while another request
+                  is generating the audio (same as header Prefer: respond-async)
+        
+        Headers:
+            Range / If-Range: byte ranges (206) for seeking
+            If-None-Match / If-Modified-Since: 304 when the client copy is current
         
         Response:
-            Audio file (MP3) or 404 if not found
+            Audio file (MP3), 202 + Retry-After while the audio is being
+            generated by another request, or 404 if not found
         """
         if not word:
             raise Http404("Word parameter is required")
@@ -241,9 +280,16 @@ class FlashcardAudioViewSet(ViewSet):
         audio_path = tts_service.get_audio_path(word, voice_code, speed)
         
         if not audio_path.exists():
-            # Try to generate on-the-fly
+            # Generate on-the-fly; concurrent requests for the same audio
+            # share one synthesis (single-flight)
             logger.info(f"Audio not found for '{word}', generating on-the-fly")
-            audio_url = tts_service.generate_audio(word, voice, speed)
+            record_cold_miss()
+            audio_url, pending = tts_service.generate_audio_single_flight(
+                word, voice, speed, wait_timeout=_follower_wait_timeout(request)
+            )
+            
+            if pending:
+                return _audio_pending_response(word, voice, speed)
             
             if not audio_url:
                 raise Http404(f"Audio not found for word '{word}'")
@@ -251,17 +297,13 @@ class FlashcardAudioViewSet(ViewSet):
             # Get path again after generation
             audio_path = tts_service.get_audio_path(word, voice_code, speed)
         
-        # Stream the file
-        try:
-            return FileResponse(
-                open(audio_path, 'rb'),
-                content_type='audio/mpeg',
-                as_attachment=False,
-                filename=audio_path.name
-            )
-        except Exception as e:
-            logger.error(f"Error streaming audio: {e}")
-            raise Http404(f"Error streaming audio for '{word}'")
+        # Stream the file (ETag/304, Range/206, immutable caching)
+        return serve_audio(
+            request,
+            audio_path,
+            content_type='audio/mpeg',
+            filename=audio_path.name
+        )
 
 
 @api_view(['GET'])
@@ -274,6 +316,8 @@ def get_flashcard_audio(request, flashcard_id):
         voice: Voice identifier (default: us_male)
         speed: Speed identifier (default: normal)
         generate: Auto-generate if missing (default: true)
+        wait: "false" to get 202 + Retry-After immediately while another
+              request is generating the same audio
     
     Response:
         {
@@ -308,8 +352,12 @@ def get_flashcard_audio(request, flashcard_id):
     generated = False
     
     if not audio_url and auto_generate:
-        # Generate audio
-        audio_url = tts_service.generate_audio(word, voice, speed)
+        # Generate audio (single-flight: one synthesis per word/voice/speed)
+        audio_url, pending = tts_service.generate_audio_single_flight(
+            word, voice, speed, wait_timeout=_follower_wait_timeout(request)
+        )
+        if pending:
+            return _audio_pending_response(word, voice, speed, flashcard_id=flashcard_id)
         generated = True
     
     if audio_url:
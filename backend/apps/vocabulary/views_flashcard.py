@@ -7,17 +7,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count, Avg, Sum
 
 from .models import Flashcard, FlashcardDeck, UserFlashcardProgress, StudySession
-from .models_achievement import Achievement, check_and_unlock_achievements
+from .models_achievement import (
+    Achievement, check_and_unlock_achievements,
+    apply_review_events, review_snapshot, unlock_achievements
+)
 from .serializers_flashcard import (
     FlashcardStudySerializer, FlashcardDeckSerializer,
-    StudySessionSerializer, ReviewCardRequestSerializer,
-    AchievementSerializer, DailyProgressSerializer, StreakSerializer
+    StudySessionSerializer, ReviewCardRequestSerializer, BulkReviewRequestSerializer,
+    AchievementSerializer, DailyProgressSerializer, StreakSerializer,
+    build_audio_index_for_cards
 )
+from .models_study_tracking import DeckStudyHistory, card_state
 from .utils_flashcard import (
-    get_cards_for_study, calculate_daily_progress, update_user_streak
+    get_cards_for_study, calculate_daily_progress, update_user_streak,
+    ingest_reviews, due_progress_queryset, annotate_deck_progress
 )
 
 
@@ -28,6 +35,7 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
     Endpoints:
     - POST /study/session/start/ - Start new study session
     - POST /study/card/{id}/review/ - Review a card
+    - POST /study/bulk_review/ - Apply many reviews at once (offline sync)
     - GET /study/due/ - Get cards due for review
     - POST /study/session/{id}/end/ - End study session
     """
@@ -49,8 +57,7 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         }
         """
         from .utils_flashcard import (
-            get_cards_for_study, get_difficult_cards,
-            get_due_cards, get_failed_cards, get_tagged_cards
+            get_difficult_cards, get_due_cards, get_failed_cards, get_tagged_cards
         )
         
         # Get parameters
@@ -140,7 +147,10 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         serializer = FlashcardStudySerializer(
             cards,
             many=True,
-            context={'request': request}
+            context={
+                'request': request,
+                'audio_index': build_audio_index_for_cards(cards),
+            }
         )
         
         return Response({
@@ -179,31 +189,46 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         
         # Get flashcard
         try:
-            flashcard = Flashcard.objects.get(id=pk)
+            flashcard = Flashcard.objects.select_related('word').get(id=pk)
         except Flashcard.DoesNotExist:
             return Response(
                 {'error': 'Flashcard not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get or create progress
-        progress, created = UserFlashcardProgress.objects.get_or_create(
-            user=request.user,
-            flashcard=flashcard,
-            defaults={'next_review_date': timezone.now()}
-        )
-        
-        # Apply SM-2 algorithm
-        progress.calculate_next_review(quality)
+        with transaction.atomic():
+            # Get or create progress
+            progress, created = UserFlashcardProgress.objects.get_or_create(
+                user=request.user,
+                flashcard=flashcard,
+                defaults={'next_review_date': timezone.now()}
+            )
+            before = review_snapshot(progress)
+            state_before = card_state(None if created else progress)
+            
+            # Apply SM-2 algorithm
+            progress.calculate_next_review(quality)
+            
+            # Update achievement counters and deck summary
+            stats, affected = apply_review_events(
+                request.user,
+                [(before, progress, flashcard.word.cefr_level if flashcard.word_id else None)]
+            )
+            DeckStudyHistory.apply_card_changes(
+                request.user,
+                [(flashcard.deck_id, state_before, card_state(progress))]
+            )
         
         # Update streak
         streak_info = update_user_streak(request.user)
+        if streak_info['updated']:
+            affected.add('streak_days')
         
         # Get daily progress
         daily_progress = calculate_daily_progress(request.user)
         
-        # Check for achievements
-        newly_unlocked = check_and_unlock_achievements(request.user)
+        # Check only the achievements this review could have changed
+        newly_unlocked = unlock_achievements(request.user, affected, stats)
         achievement_data = AchievementSerializer(
             newly_unlocked,
             many=True,
@@ -222,6 +247,60 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
             'achievements_unlocked': achievement_data
         })
     
+    @action(detail=False, methods=['post'], url_path='bulk_review')
+    def bulk_review(self, request):
+        """
+        Apply many reviews at once (offline clients syncing their queue).
+        
+        URL: /study/bulk_review/
+        
+        Request body:
+        {
+            "reviews": [                // Applied in reviewed_at order
+                {"flashcard_id": 12, "quality": 4,
+                 "reviewed_at": "2026-01-05T08:00:00Z", "time_spent": 6},
+                {"flashcard_id": 15, "quality": 2}
+            ]
+        }
+        """
+        serializer = BulkReviewRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = ingest_reviews(request.user, serializer.validated_data['reviews'])
+        
+        achievement_data = AchievementSerializer(
+            result['achievements_unlocked'],
+            many=True,
+            context={'request': request}
+        ).data if result['achievements_unlocked'] else []
+        
+        return Response({
+            'processed': result['processed'],
+            'created': result['created'],
+            'updated': result['updated'],
+            'rejected': result['rejected'],
+            'stale': result['stale'],
+            'cards': [
+                {
+                    'flashcard_id': progress.flashcard_id,
+                    'next_review_date': progress.next_review_date,
+                    'interval': progress.interval,
+                    'easiness_factor': progress.easiness_factor,
+                    'is_mastered': progress.is_mastered,
+                    'total_reviews': progress.total_reviews,
+                    'accuracy': progress.accuracy,
+                }
+                for progress in result['progress']
+            ],
+            'streak': result['streak'],
+            'daily_progress': calculate_daily_progress(request.user),
+            'achievements_unlocked': achievement_data
+        })
+    
     @action(detail=False, methods=['get'])
     def due(self, request):
         """
@@ -234,35 +313,34 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         level = request.query_params.get('level')
         limit = int(request.query_params.get('limit', 20))
         
-        # Get due cards
-        due_progress = UserFlashcardProgress.objects.filter(
-            user=request.user,
-            next_review_date__lte=timezone.now(),
-            is_learning=True
-        ).select_related('flashcard__word')
-        
-        if level:
-            due_progress = due_progress.filter(
-                flashcard__word__cefr_level=level
-            )
+        # Get due cards (due queue, most overdue first)
+        due_progress = due_progress_queryset(request.user, level=level)
         
         # Get flashcards
-        due_cards = [p.flashcard for p in due_progress[:limit]]
+        due_cards = [
+            p.flashcard for p in due_progress.select_related('flashcard__word')[:limit]
+        ]
         
-        # Count by level
-        by_level = {}
-        for lvl in ['A1', 'A2', 'B1', 'B2', 'C1']:
-            count = due_progress.filter(
-                flashcard__word__cefr_level=lvl
-            ).count()
-            if count > 0:
-                by_level[lvl] = count
+        # Count by level (one grouped query)
+        level_counts = dict(
+            due_progress.order_by().values_list(
+                'flashcard__word__cefr_level'
+            ).annotate(count=Count('id'))
+        )
+        by_level = {
+            lvl: level_counts[lvl]
+            for lvl in ['A1', 'A2', 'B1', 'B2', 'C1']
+            if level_counts.get(lvl)
+        }
         
         # Serialize
         serializer = FlashcardStudySerializer(
             due_cards,
             many=True,
-            context={'request': request}
+            context={
+                'request': request,
+                'audio_index': build_audio_index_for_cards(due_cards),
+            }
         )
         
         return Response({
@@ -323,45 +401,30 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         
         # Update DeckStudyHistory
         deck_history = None
+        deck_progress = None
         if session.deck:
-            from .models_study_tracking import DeckStudyHistory
-            
             deck_history, created = DeckStudyHistory.objects.get_or_create(
                 user=request.user,
                 deck=session.deck
             )
+            if created:
+                deck_history.update_progress()
             
-            # Update aggregated stats
+            # Update aggregated stats (progress stats are kept current by reviews)
             deck_history.total_sessions += 1
             deck_history.total_cards_studied += session.cards_studied
             deck_history.total_time_minutes += session.duration_minutes
             deck_history.save()
             
-            # Recalculate progress
-            deck_history.update_progress()
-        
-        # Get deck progress if session has deck
-        deck_progress = None
-        if session.deck:
-            total_cards = session.deck.flashcards.count()
-            user_progress = UserFlashcardProgress.objects.filter(
-                user=request.user,
-                flashcard__deck=session.deck
-            )
-            
-            learned_count = user_progress.count()
-            mastered_count = user_progress.filter(is_mastered=True).count()
-            learning_count = user_progress.filter(is_learning=True, is_mastered=False).count()
-            
             deck_progress = {
                 'deck_name': session.deck.name,
                 'deck_level': session.deck.level,
-                'total_cards': total_cards,
-                'cards_learned': learned_count,
-                'cards_mastered': mastered_count,
-                'cards_learning': learning_count,
-                'cards_new': total_cards - learned_count,
-                'progress_percentage': round((learned_count / total_cards * 100), 1) if total_cards > 0 else 0
+                'total_cards': deck_history.total_cards,
+                'cards_learned': deck_history.cards_studied,
+                'cards_mastered': deck_history.cards_mastered,
+                'cards_learning': deck_history.cards_learning,
+                'cards_new': deck_history.cards_new,
+                'progress_percentage': deck_history.progress_percentage
             }
         
         # Check achievements
@@ -391,40 +454,6 @@ class FlashcardStudyViewSet(viewsets.ViewSet):
         })
 
 
-class FlashcardDeckViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    ViewSet for flashcard decks.
-    
-    Endpoints:
-    - GET /decks/ - List all decks
-    - GET /decks/{id}/ - Get deck details
-    """
-    
-    permission_classes = [IsAuthenticated]
-    serializer_class = FlashcardDeckSerializer
-    
-    def get_queryset(self):
-        """Get decks - public decks or user's own decks."""
-        return FlashcardDeck.objects.filter(
-            is_public=True
-        ).annotate(
-            card_count=Count('flashcards')
-        ).order_by('level', 'name')
-    
-    def list(self, request):
-        """List all available decks with progress."""
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(
-            queryset,
-            many=True,
-            context={'request': request}
-        )
-        
-        return Response({
-            'decks': serializer.data
-        })
-
-
 class ProgressDashboardViewSet(viewsets.ViewSet):
     """
     ViewSet for progress and statistics.
@@ -546,11 +575,38 @@ class FlashcardDeckViewSet(viewsets.ViewSet):
     """
     ViewSet for managing flashcard decks and study history.
     
-    New endpoints for progress tracking and review modes.
+    Endpoints:
+    - GET /flashcards/decks/ - List public decks with the user's progress
+    - GET /flashcards/decks/recent/ - Recently studied decks
+    - GET /flashcards/decks/{id}/progress/ - Detailed deck progress
+    
+    Per-user deck stats come from annotate_deck_progress() (one grouped
+    query for the whole list).
     """
     
     permission_classes = [IsAuthenticated]
     
+    def list(self, request):
+        """
+        List all available decks with progress.
+        
+        GET /api/v1/vocabulary/flashcards/decks/
+        """
+        decks = annotate_deck_progress(
+            FlashcardDeck.objects.filter(is_public=True),
+            request.user
+        ).order_by('level', 'name')
+        
+        serializer = FlashcardDeckSerializer(
+            decks,
+            many=True,
+            context={'request': request}
+        )
+        
+        return Response({
+            'decks': serializer.data
+        })
+    
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """
@@ -571,28 +627,33 @@ class FlashcardDeckViewSet(viewsets.ViewSet):
             }
         ]
         """
-        from .models_study_tracking import DeckStudyHistory
-        
         # Get recent decks
-        recent_histories = DeckStudyHistory.objects.filter(
+        recent_histories = list(DeckStudyHistory.objects.filter(
             user=request.user
-        ).select_related('deck').order_by('-last_studied_at')[:5]
+        ).order_by('-last_studied_at')[:5])
         
         if not recent_histories:
             return Response([])
         
+        # Card counts for all recent decks in one grouped query
+        decks = annotate_deck_progress(
+            FlashcardDeck.objects.filter(id__in=[h.deck_id for h in recent_histories]),
+            request.user
+        ).in_bulk()
+        
         # Build response
         results = []
         for history in recent_histories:
+            deck = decks[history.deck_id]
             results.append({
                 'deck': {
-                    'id': history.deck.id,
-                    'name': history.deck.name,
-                    'description': history.deck.description,
-                    'level': history.deck.level,
-                    'icon': history.deck.icon,
-                    'color': history.deck.color,
-                    'card_count': history.deck.flashcards.count()
+                    'id': deck.id,
+                    'name': deck.name,
+                    'description': deck.description,
+                    'level': deck.level,
+                    'icon': deck.icon,
+                    'color': deck.color,
+                    'card_count': deck.total_cards
                 },
                 'last_studied_at': history.last_studied_at,
                 'total_sessions': history.total_sessions,
@@ -614,43 +675,44 @@ class FlashcardDeckViewSet(viewsets.ViewSet):
         
         GET /api/v1/vocabulary/flashcards/decks/{deck_id}/progress/
         
-        Returns detailed breakdown of user's progress in this deck.
+        Returns detailed breakdown of user's progress in this deck
+        (read from the materialized DeckStudyHistory row).
         """
-        from .models_study_tracking import DeckStudyHistory
-        
         try:
-            deck = FlashcardDeck.objects.get(pk=pk)
-        except FlashcardDeck.DoesNotExist:
-            return Response(
-                {'error': 'Deck not found'},
-                status=status.HTTP_404_NOT_FOUND
+            history = DeckStudyHistory.objects.select_related('deck').get(
+                user=request.user,
+                deck_id=pk
+            )
+        except DeckStudyHistory.DoesNotExist:
+            try:
+                deck = FlashcardDeck.objects.get(pk=pk)
+            except FlashcardDeck.DoesNotExist:
+                return Response(
+                    {'error': 'Deck not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            history, _ = DeckStudyHistory.objects.get_or_create(
+                user=request.user,
+                deck=deck
             )
+            history.update_progress()
         
-        # Get or create history
-        history, created = DeckStudyHistory.objects.get_or_create(
-            user=request.user,
-            deck=deck
-        )
+        deck = history.deck
         
-        # Update progress if needed
-        if created or (timezone.now() - history.last_progress_update).total_seconds() > 300:
-            history.update_progress()
+        # Due cards depend on the current time (due-queue index)
+        due_cards = due_progress_queryset(request.user, deck_id=deck.id).count()
         
-        # Get user's progress entries
-        progress_qs = UserFlashcardProgress.objects.filter(
-            user=request.user,
-            flashcard__deck=deck
-        )
+        # FlashcardDeckSerializer reads these from the summary
+        deck.total_cards = history.total_cards
+        deck.mastered_count = history.cards_mastered
+        deck.new_count = history.cards_new
+        deck.review_count = due_cards
         
-        # Calculate detailed stats
-        total_cards = deck.flashcards.count()
-        difficult_cards = progress_qs.filter(easiness_factor__lt=2.5).count()
-        due_cards = progress_qs.filter(
-            next_review_date__lte=timezone.now().date()
-        ).count()
+        total_cards = history.total_cards
+        difficult_cards = history.cards_difficult
         
         return Response({
-            'deck': FlashcardDeckSerializer(deck).data,
+            'deck': FlashcardDeckSerializer(deck, context={'request': request}).data,
             'history': {
                 'first_studied_at': history.first_studied_at,
                 'last_studied_at': history.last_studied_at,
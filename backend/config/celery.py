@@ -36,12 +36,24 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=2, minute=0),
     },
     
+    # Write buffered audio play counts every minute
+    'flush-audio-usage-counters': {
+        'task': 'apps.curriculum.tasks.flush_audio_usage_counters',
+        'schedule': 60.0,
+    },
+    
     # Generate missing audio for new phonemes daily at 3 AM
     'generate-missing-audio': {
         'task': 'apps.curriculum.tasks.generate_missing_audio_batch',
         'schedule': crontab(hour=3, minute=0),
     },
     
+    # Pre-synthesize audio for cards due in the next 24h at 1 AM
+    'warm-upcoming-study-audio': {
+        'task': 'apps.vocabulary.tasks.warm_upcoming_study_audio',
+        'schedule': crontab(hour=1, minute=0),
+    },
+    
     # NEW: Clean expired flashcard audio daily at 4 AM
     'clean-expired-flashcard-audio': {
         'task': 'apps.vocabulary.tasks.clean_expired_flashcard_audio',
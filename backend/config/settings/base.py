@@ -218,6 +218,9 @@ CELERY_TASK_ROUTES = {
     'apps.curriculum.tasks.generate_phoneme_audio': {'queue': 'tts'},
     'apps.curriculum.tasks.generate_audio_batch': {'queue': 'tts'},
     'apps.curriculum.tasks.clean_expired_audio_cache': {'queue': 'maintenance'},
+    'apps.study.tasks.score_production_recording': {'queue': 'scoring'},
+    'apps.vocabulary.tasks.warm_upcoming_study_audio': {'queue': 'tts'},
+    'apps.curriculum.tasks.process_audio_batch_chunk': {'queue': 'tts'},
 }
 
 # Worker settings
@@ -250,6 +253,54 @@ TTS_CACHE_DAYS = 30  # Cache TTS audio for 30 days
 # Audio Output Directory
 TTS_AUDIO_DIR = os.path.join(MEDIA_ROOT, 'tts_audio')
 
+# Shared content-addressed audio store for all TTS services (services.audio_store)
+# Layout: {AUDIO_STORE_ROOT}/ab/cd/<sha256>.mp3; the index is the curriculum.AudioStoreEntry table
+AUDIO_STORE_ROOT = os.path.join(MEDIA_ROOT, 'audio_store')
+
+# Storage GC (services.audio_gc): LRU by recorded last access, never atime
+AUDIO_GC_MAX_AGE_DAYS = 30  # Store files not served for this many days are removed
+AUDIO_GC_STORE_BUDGET_MB = None  # Evict least recently used store files above this size (None = no budget)
+AUDIO_GC_KEEP_PLAYED_DAYS = 7  # Expired TTS AudioSources played this recently are renewed instead
+AUDIO_GC_BATCH_SIZE = 500  # Rows per set-based delete
+AUDIO_GC_WORKERS = 8  # Threads removing files
+
+# Write-behind audio play counters (apps.curriculum.usage_counters)
+AUDIO_USAGE_FLUSH_SECONDS = 30  # Max age of a process's buffered counts before they are spilled
+AUDIO_USAGE_MAX_PENDING = 1000  # Spill earlier once this many rows are buffered
+AUDIO_USAGE_FLUSH_BATCH = 500  # Rows per UPDATE ... CASE
+AUDIO_USAGE_SHARED_CACHE = None  # Spill to the cache backend (None = auto: unless LocMem/Dummy)
+
+# Phoneme audio resolution cache (apps.curriculum.audio_resolution)
+AUDIO_RESOLUTION_LRU_SIZE = 2048  # In-process descriptors per worker
+AUDIO_RESOLUTION_LOCAL_TTL = 300  # Max seconds an in-process copy is served
+AUDIO_RESOLUTION_SHARED_CACHE = None  # Shared tier in the cache backend (None = auto: unless LocMem/Dummy)
+
+# Precomputed float16 reference-audio features for pronunciation scoring
+# Layout: {REFERENCE_FEATURE_ROOT}/ab/<sha256>.<version>.npy (memory-mapped on read)
+REFERENCE_FEATURE_ROOT = os.path.join(MEDIA_ROOT, 'reference_features')
+
+# Single-flight on-the-fly audio generation (services.single_flight)
+AUDIO_SINGLE_FLIGHT_LOCK_TIMEOUT = 60  # Seconds before an abandoned lock is broken
+AUDIO_SINGLE_FLIGHT_WAIT = 3  # Seconds a concurrent request waits before 202
+AUDIO_SINGLE_FLIGHT_RETRY_AFTER = 1  # Retry-After (seconds) sent with 202
+
+# Audio serving (services.audio_serving): ETag/304, Range/206, offload mode
+# AUDIO_SERVE_MODE: 'django' | 'x-accel-redirect' (nginx) | 'x-sendfile' (Apache)
+AUDIO_SERVE_MODE = os.environ.get('AUDIO_SERVE_MODE', 'django')
+AUDIO_ACCEL_REDIRECT_PREFIX = '/protected-media/'  # nginx internal location aliasing MEDIA_ROOT
+AUDIO_CACHE_MAX_AGE = 86400  # Cache-Control max-age for non content-addressed audio
+# MEDIA_ROOT subdirectories served through the audio layer (always, not only in DEBUG)
+AUDIO_MEDIA_DIRS = [
+    'audio_store',
+    'flashcard_audio',
+    'phonemes/audio',
+    'phonemes/mistake_audio',
+    'phoneme_words/audio',
+    'sentences/audio',
+    'sentences/audio_slow',
+    'flashcards/audio',
+]
+
 # Audio Processing Settings
 AUDIO_FORMAT = 'mp3'
 AUDIO_BITRATE = '128k'  # Good quality, reasonable file size
@@ -258,6 +309,19 @@ AUDIO_SAMPLE_RATE = 44100  # CD quality
 # Mock TTS Mode (for offline development/testing)
 MOCK_TTS_MODE = os.environ.get('MOCK_TTS', 'false').lower() == 'true'
 
+# Batch TTS synthesis (apps.curriculum.services.tts_batch)
+TTS_BATCH_CONCURRENCY = 8  # Max in-flight Edge TTS requests per batch
+TTS_BATCH_RATE_PER_VOICE = 5  # Requests per second per voice (0 = unlimited)
+TTS_BATCH_MAX_RETRIES = 3  # Retries per job (exponential backoff)
+TTS_BATCH_MOCK_LATENCY = 0.2  # Simulated request latency in mock mode (seconds)
+AUDIO_BATCH_CHUNK_SIZE = 25  # Items per Celery chunk task of a batch run (apps.curriculum.audio_batches)
+
+# Nightly flashcard audio warm-up (apps.vocabulary.audio_warmup)
+AUDIO_WARMUP_WINDOW_HOURS = 24  # Cards due within this many hours are pre-synthesized
+AUDIO_WARMUP_ACTIVE_DAYS = 14  # Only users who reviewed a card in the last N days
+AUDIO_WARMUP_NEW_CARDS_PER_DECK = None  # None = each user's cards_per_session
+AUDIO_WARMUP_CONCURRENCY = 4  # Max in-flight TTS requests (leaves room for live traffic)
+
 # =============================================================================
 # SPEECH-TO-TEXT SETTINGS (Phase 5)
 # =============================================================================
@@ -278,6 +342,10 @@ AZURE_SPEECH_REGION = config('AZURE_SPEECH_REGION', default='')
 # AssemblyAI (future)
 ASSEMBLYAI_API_KEY = config('ASSEMBLYAI_API_KEY', default='')
 
+# Offline pronunciation scoring of production recordings (no network access)
+PRONUNCIATION_SCORING_PROVIDER = config('PRONUNCIATION_SCORING_PROVIDER', default='local')
+PRONUNCIATION_AUTO_SCORE = config('PRONUNCIATION_AUTO_SCORE', default=True, cast=bool)  # Queue scoring on upload
+
 # =============================================================================
 # CACHE SETTINGS
 # =============================================================================
@@ -10,6 +10,9 @@ from django.views.generic import TemplateView
 from django.views.static import serve
 from rest_framework_simplejwt.views import TokenVerifyView
 import os
+import re
+
+from services.audio_serving import serve_media_audio
 
 # Conditional import for API documentation
 try:
@@ -110,6 +113,17 @@ if HAS_SPECTACULAR:
         path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     ]
 
+# Audio files: ETag/304, Range/206 and X-Accel-Redirect offload (services.audio_serving)
+_audio_dirs = '|'.join(re.escape(d.strip('/')) for d in getattr(settings, 'AUDIO_MEDIA_DIRS', []))
+if _audio_dirs:
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>(?:%s)/.+)$' % (re.escape(settings.MEDIA_URL.lstrip('/')), _audio_dirs),
+            serve_media_audio,
+            name='serve_media_audio'
+        ),
+    ]
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
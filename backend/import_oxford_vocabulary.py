@@ -9,6 +9,8 @@ This script:
 4. Creates Word entries with proper unique constraints
 5. Handles duplicates gracefully
 
+Parsing and the chunked bulk writes live in apps.vocabulary.importers.
+
 Usage:
     python backend/import_oxford_vocabulary.py
 """
@@ -16,7 +18,6 @@ Usage:
 import os
 import sys
 import django
-import csv
 from pathlib import Path
 
 # Setup Django environment
@@ -24,8 +25,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 django.setup()
 
+from apps.vocabulary.importers import VocabularyImporter, iter_dictionary_rows
 from apps.vocabulary.models import Word
-from django.db import transaction
 
 
 # CEFR levels to import
@@ -36,74 +37,6 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DICTIONARY_DIR = BASE_DIR / 'dictionary'
 
 
-def clean_text(text):
-    """Remove extra whitespace from text."""
-    if not text:
-        return ''
-    return text.strip()
-
-
-def parse_pos(pos_text):
-    """
-    Parse part of speech from CSV format.
-    
-    Examples:
-    - "n" -> "noun"
-    - "verb" -> "verb"
-    - "adj" -> "adjective"
-    - "preposition, adverb" -> "preposition"  (take first)
-    - "(money) n" -> "noun"
-    """
-    if not pos_text:
-        return 'other'
-    
-    # Clean the text
-    pos_text = clean_text(pos_text)
-    
-    # Remove parenthetical notes like "(money)", "(type)"
-    import re
-    pos_text = re.sub(r'\([^)]*\)', '', pos_text)
-    pos_text = pos_text.strip()
-    
-    # Handle multiple POS separated by comma - take the first one
-    if ',' in pos_text:
-        pos_text = pos_text.split(',')[0].strip()
-    
-    # Handle slash separated - take the first one
-    if '/' in pos_text:
-        pos_text = pos_text.split('/')[0].strip()
-    
-    # Normalize abbreviations
-    pos_map = {
-        'n': 'noun',
-        'v': 'verb',
-        'adj': 'adjective',
-        'adv': 'adverb',
-        'prep': 'preposition',
-        'conj': 'conjunction',
-        'pron': 'pronoun',
-        'det': 'determiner',
-        'exclam': 'exclamation',
-        'modal': 'modal verb',
-        'auxiliary': 'auxiliary verb',
-        'number': 'number',
-    }
-    
-    # Try to match abbreviation
-    pos_lower = pos_text.lower()
-    for abbr, full in pos_map.items():
-        if pos_lower.startswith(abbr):
-            return full
-    
-    # Return as-is if already full form
-    if pos_lower in ['noun', 'verb', 'adjective', 'adverb', 'preposition', 
-                     'conjunction', 'pronoun', 'determiner', 'exclamation']:
-        return pos_lower
-    
-    # Default
-    return pos_text if pos_text else 'other'
-
-
 def import_csv_file(file_path, cefr_level):
     """
     Import words from a single CSV file.
@@ -111,6 +44,9 @@ def import_csv_file(file_path, cefr_level):
     CSV format:
     text, pos, ipa, meaning_vi
     
+    Rows are streamed in chunks (one transaction and bulk write each);
+    existing words get their IPA and meaning refreshed.
+    
     Returns:
     - (created_count, updated_count, skipped_count)
     """
@@ -122,83 +58,24 @@ def import_csv_file(file_path, cefr_level):
         print(f"❌ File not found: {file_path}")
         return (0, 0, 0)
     
-    created_count = 0
-    updated_count = 0
-    skipped_count = 0
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        # Read CSV with proper handling
-        reader = csv.reader(f)
-        
-        for row_num, row in enumerate(reader, start=1):
-            # Skip empty rows
-            if not row or len(row) < 4:
-                continue
-            
-            # Extract fields
-            text = clean_text(row[0])
-            pos_raw = clean_text(row[1])
-            ipa = clean_text(row[2])
-            meaning_vi = clean_text(row[3])
-            
-            # Skip invalid entries
-            if not text or not meaning_vi:
-                skipped_count += 1
-                continue
-            
-            # Skip header-like rows
-            if text.lower() in ['about', '©'] and row_num == 1:
-                continue
-            
-            # Skip copyright notices
-            if '©' in text or 'Oxford' in text:
-                skipped_count += 1
-                continue
-            
-            # Skip malformed entries
-            if text.startswith('#') or meaning_vi.startswith('#'):
-                skipped_count += 1
-                continue
-            
-            # Parse POS
-            pos = parse_pos(pos_raw)
-            
-            try:
-                with transaction.atomic():
-                    # Try to find existing word with same text, pos, and cefr_level
-                    word, created = Word.objects.get_or_create(
-                        text=text,
-                        pos=pos,
-                        cefr_level=cefr_level,
-                        defaults={
-                            'ipa': ipa,
-                            'meaning_vi': meaning_vi,
-                            'meaning_en': '',
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                        if created_count % 50 == 0:
-                            print(f"  ✓ Created {created_count} words...")
-                    else:
-                        # Update existing word
-                        word.ipa = ipa
-                        word.meaning_vi = meaning_vi
-                        word.save()
-                        updated_count += 1
-                        
-            except Exception as e:
-                print(f"  ⚠ Error on row {row_num} ({text}): {e}")
-                skipped_count += 1
-                continue
+    rejected = []
+    
+    def report(stats):
+        print(f"  ✓ {stats['rows']} rows ({stats['created']} created)...")
+    
+    importer = VocabularyImporter(update_fields=['ipa', 'meaning_vi'], progress=report)
+    stats = importer.run(
+        iter_dictionary_rows(file_path, cefr_level, on_skip=lambda row_num, row: rejected.append(row_num))
+    )
+    skipped_count = stats['skipped'] + len(rejected)
     
     print(f"\n📊 Import Summary for {cefr_level}:")
-    print(f"  ✅ Created: {created_count}")
-    print(f"  🔄 Updated: {updated_count}")
+    print(f"  ✅ Created: {stats['created']}")
+    print(f"  🔄 Updated: {stats['updated']}")
     print(f"  ⏭️  Skipped: {skipped_count}")
+    print(f"  ⚡ {stats['rows_per_second']} rows/s")
     
-    return (created_count, updated_count, skipped_count)
+    return (stats['created'], stats['updated'], skipped_count)
 
 
 def main():
@@ -0,0 +1,322 @@
+"""
+Audio Storage Garbage Collector
+
+One collector for the synthesized audio on disk, replacing the per-row
+delete loop of clean_expired_audio_cache, the st_atime scan of
+clean_expired_flashcard_audio and AudioStore.cleanup():
+
+- audio_store: content-addressed TTS files (services.audio_store). Victims
+  are picked least recently used first from the index's last_accessed_at,
+  which the serving path records on every lookup (AudioStore.get/touch),
+  until nothing is older than AUDIO_GC_MAX_AGE_DAYS and the store fits in
+  AUDIO_GC_STORE_BUDGET_MB.
+- audio_sources: expired TTS AudioSource rows. Rows played within
+  AUDIO_GC_KEEP_PLAYED_DAYS (AudioCache.last_accessed_at, updated on
+  every play) are renewed instead; rows kept by an AudioVersion are never
+  touched.
+
+Features:
+- Victims selected in bulk (one ordered index scan / one query)
+- Set-based deletes in batches of AUDIO_GC_BATCH_SIZE
+- Files removed by a thread pool after their rows are gone, so a lookup
+  never finds a row without its file
+- Report per run: files and bytes reclaimed, bytes left, and the share
+  of recorded plays that went to removed audio (expected hit-rate loss);
+  the last report is kept in the cache
+- Dry run: same report, nothing deleted
+
+Usage:
+    from services.audio_gc import run_audio_gc
+
+    report = run_audio_gc()
+    report['bytes_reclaimed'], report['pools']['audio_store']['hit_rate_impact']
+
+    python manage.py audio_gc --dry-run --budget-mb 2048
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .audio_store import AudioStore, get_audio_store
+
+logger = logging.getLogger(__name__)
+
+POOLS = ('audio_store', 'audio_sources')
+LAST_REPORT_KEY = 'audio_gc:last_report'
+
+
+def _batches(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _hit_rate_impact(victim_accesses: int, total_accesses: int) -> Dict:
+    """Share of recorded plays that went to the removed audio."""
+    return {
+        'victim_accesses': victim_accesses,
+        'total_accesses': total_accesses,
+        'expected_hit_rate_loss': round(victim_accesses / total_accesses, 4) if total_accesses else 0.0,
+    }
+
+
+def remove_files(items: Iterable, remove: Callable, workers: Optional[int] = None) -> Tuple[int, int, List]:
+    """
+    Remove files in a thread pool.
+
+    Args:
+        items: Whatever ``remove`` takes (keys, storage names)
+        remove: Callable returning the bytes freed, or None if nothing was removed
+        workers: Thread count (default: settings.AUDIO_GC_WORKERS)
+
+    Returns:
+        (files removed, bytes freed, [(item, error), ...])
+    """
+    workers = workers or getattr(settings, 'AUDIO_GC_WORKERS', 8)
+
+    def attempt(item):
+        try:
+            return item, remove(item), None
+        except Exception as e:
+            return item, None, str(e)
+
+    removed = freed = 0
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item, size, error in pool.map(attempt, items):
+            if error:
+                errors.append((item, error))
+            elif size is not None:
+                removed += 1
+                freed += size
+    for item, error in errors[:10]:
+        logger.warning(f"Audio GC could not remove {item}: {error}")
+    return removed, freed, errors
+
+
+# =========================================================================
+# POOLS
+# =========================================================================
+
+def collect_audio_store(
+    max_age_days: Optional[float] = None,
+    budget_bytes: Optional[int] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    store: Optional[AudioStore] = None
+) -> Dict:
+    """
+    Evict store files by last access: everything older than max_age_days,
+    then least recently used files until the store fits in budget_bytes.
+
+    Args:
+        max_age_days: Default settings.AUDIO_GC_MAX_AGE_DAYS
+        budget_bytes: Default settings.AUDIO_GC_STORE_BUDGET_MB (None = no budget)
+        dry_run: Report only
+        workers: File removal threads
+        store: AudioStore (default: the shared store)
+
+    Returns:
+        Pool report dict
+    """
+    store = store or get_audio_store()
+    if max_age_days is None:
+        max_age_days = getattr(settings, 'AUDIO_GC_MAX_AGE_DAYS', 30)
+    if budget_bytes is None:
+        budget_mb = getattr(settings, 'AUDIO_GC_STORE_BUDGET_MB', None)
+        budget_bytes = int(budget_mb * 1024 * 1024) if budget_mb is not None else None
+
+    stats = store.stats()
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    remaining = stats['total_size_bytes']
+
+    victims = []
+    sizes = {}
+    expired = over_budget = victim_accesses = 0
+    # Rows come least recently used first: stop at the first one that is
+    # neither too old nor needed to get under the budget
+    for key, size, last_accessed_at, access_count in store.iter_lru():
+        if last_accessed_at < cutoff:
+            expired += 1
+        elif budget_bytes is not None and remaining > budget_bytes:
+            over_budget += 1
+        else:
+            break
+        victims.append(key)
+        sizes[key] = size
+        remaining -= size
+        victim_accesses += access_count
+
+    report = {
+        'candidates': len(victims),
+        'expired': expired,
+        'over_budget': over_budget,
+        'rows_deleted': 0,
+        'files_removed': 0,
+        'bytes_reclaimed': sum(sizes.values()),
+        'bytes_remaining': remaining,
+        'budget_bytes': budget_bytes,
+        'errors': 0,
+        'hit_rate_impact': _hit_rate_impact(victim_accesses, stats['total_accesses']),
+    }
+    if dry_run or not victims:
+        return report
+
+    batch_size = getattr(settings, 'AUDIO_GC_BATCH_SIZE', 500)
+    for batch in _batches(victims, batch_size):
+        report['rows_deleted'] += store.delete_entries(batch)
+
+    def remove(key):
+        return sizes[key] if store.unlink(key) else None
+
+    removed, freed, errors = remove_files(victims, remove, workers)
+    report.update(files_removed=removed, bytes_reclaimed=freed, errors=len(errors))
+    return report
+
+
+def collect_tts_audio_sources(
+    keep_played_days: Optional[float] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    Delete expired TTS AudioSource rows and their files in batches.
+
+    Expired rows played within keep_played_days get a new cached_until
+    instead (one UPDATE). Rows referenced by an AudioVersion are skipped
+    (the relation is protected).
+
+    Args:
+        keep_played_days: Default settings.AUDIO_GC_KEEP_PLAYED_DAYS
+        dry_run: Report only
+        workers: File removal threads
+
+    Returns:
+        Pool report dict
+    """
+    from django.db.models import Sum
+    from apps.curriculum.models import AudioCache, AudioSource
+
+    if keep_played_days is None:
+        keep_played_days = getattr(settings, 'AUDIO_GC_KEEP_PLAYED_DAYS', 7)
+    now = timezone.now()
+
+    expired = AudioSource.objects.filter(source_type='tts', cached_until__lt=now)
+    recently_played = expired.filter(
+        cache__usage_count__gt=0,
+        cache__last_accessed_at__gte=now - timedelta(days=keep_played_days)
+    )
+    rows = list(
+        expired.exclude(id__in=recently_played.values('id'))
+        .exclude(versions__isnull=False)
+        .values_list('id', 'audio_file', 'cache__file_size', 'cache__usage_count')
+    )
+    total_plays = AudioCache.objects.aggregate(total=Sum('usage_count'))['total'] or 0
+
+    report = {
+        'candidates': len(rows),
+        'renewed': recently_played.count(),
+        'rows_deleted': 0,
+        'files_removed': 0,
+        'bytes_reclaimed': sum(size or 0 for _, _, size, _ in rows),
+        'errors': 0,
+        'hit_rate_impact': _hit_rate_impact(sum(plays or 0 for *_, plays in rows), total_plays),
+    }
+    if dry_run:
+        return report
+
+    if report['renewed']:
+        report['renewed'] = AudioSource.objects.filter(id__in=recently_played.values('id')).update(
+            cached_until=now + timedelta(days=settings.TTS_CACHE_DAYS)
+        )
+    if not rows:
+        return report
+
+    batch_size = getattr(settings, 'AUDIO_GC_BATCH_SIZE', 500)
+    for batch in _batches([source_id for source_id, *_ in rows], batch_size):
+        _, deleted = AudioSource.objects.filter(id__in=batch).delete()
+        report['rows_deleted'] += deleted.get(AudioSource._meta.label, 0)
+
+    storage = AudioSource._meta.get_field('audio_file').storage
+
+    def remove(name):
+        if not storage.exists(name):
+            return None
+        size = storage.size(name)
+        storage.delete(name)
+        return size
+
+    removed, freed, errors = remove_files([name for _, name, *_ in rows if name], remove, workers)
+    report.update(files_removed=removed, bytes_reclaimed=freed, errors=len(errors))
+    return report
+
+
+# =========================================================================
+# RUN
+# =========================================================================
+
+def run_audio_gc(pools: Sequence[str] = POOLS, dry_run: bool = False, **options) -> Dict:
+    """
+    Collect the given pools and store the report.
+
+    Args:
+        pools: Subset of POOLS
+        dry_run: Report only
+        **options: max_age_days, budget_bytes (audio_store),
+            keep_played_days (audio_sources), workers
+
+    Returns:
+        {
+            'dry_run': bool,
+            'started_at': str,
+            'elapsed_seconds': float,
+            'files_removed': int,
+            'bytes_reclaimed': int,
+            'pools': {pool: pool report},
+        }
+    """
+    unknown = set(pools) - set(POOLS)
+    if unknown:
+        raise ValueError(f"Unknown audio GC pools: {sorted(unknown)}")
+
+    started = time.monotonic()
+    report = {'dry_run': dry_run, 'started_at': timezone.now().isoformat(), 'pools': {}}
+    workers = options.get('workers')
+
+    if 'audio_store' in pools:
+        report['pools']['audio_store'] = collect_audio_store(
+            max_age_days=options.get('max_age_days'),
+            budget_bytes=options.get('budget_bytes'),
+            dry_run=dry_run,
+            workers=workers,
+        )
+    if 'audio_sources' in pools:
+        report['pools']['audio_sources'] = collect_tts_audio_sources(
+            keep_played_days=options.get('keep_played_days'),
+            dry_run=dry_run,
+            workers=workers,
+        )
+
+    report['files_removed'] = sum(pool['files_removed'] for pool in report['pools'].values())
+    report['bytes_reclaimed'] = sum(pool['bytes_reclaimed'] for pool in report['pools'].values())
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+
+    if not dry_run:
+        cache.set(LAST_REPORT_KEY, report, None)
+    logger.info(
+        f"🧹 Audio GC{' (dry run)' if dry_run else ''}: {report['files_removed']} files, "
+        f"{report['bytes_reclaimed'] / (1024 * 1024):.1f} MB reclaimed "
+        f"in {report['elapsed_seconds']}s"
+    )
+    return report
+
+
+def get_last_gc_report() -> Optional[Dict]:
+    """Report of the last (non dry-run) collection, if any."""
+    return cache.get(LAST_REPORT_KEY)
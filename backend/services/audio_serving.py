@@ -0,0 +1,324 @@
+"""
+Audio Serving
+
+Shared HTTP layer for every audio file the platform hands out (flashcard
+stream, phoneme AudioSource files, TTS output in the audio store).
+
+Features:
+- Strong ETags derived from the content hash (the AudioStore key for
+  content-addressed files, SHA-256 of the bytes for everything else)
+- Conditional GET: If-None-Match / If-Modified-Since -> 304
+- Byte ranges: Range / If-Range -> 206 (416 when unsatisfiable)
+- ``Cache-Control: immutable`` for content-addressed files
+- Optional offload to the front-end server (X-Accel-Redirect for nginx,
+  X-Sendfile for Apache/lighttpd) via ``AUDIO_SERVE_MODE``
+
+Usage:
+    from services.audio_serving import serve_audio
+
+    return serve_audio(request, audio_path)
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+from .audio_store import get_audio_store
+
+logger = logging.getLogger(__name__)
+
+SERVE_MODE_DJANGO = 'django'
+SERVE_MODE_X_ACCEL = 'x-accel-redirect'
+SERVE_MODE_X_SENDFILE = 'x-sendfile'
+
+IMMUTABLE_MAX_AGE = 31536000  # One year
+CHUNK_SIZE = 64 * 1024
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.m4a', '.webm')
+
+_CONTENT_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# =============================================================================
+# ETAGS
+# =============================================================================
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    """SHA-256 of a file, memoized per (path, size, mtime)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_key_for(path: Union[str, Path]) -> Optional[str]:
+    """
+    Return the AudioStore key if ``path`` is a content-addressed store file.
+
+    Store files are named ``<sha256>.mp3`` inside AUDIO_STORE_ROOT and are
+    never rewritten in place, so the key doubles as a strong validator.
+    """
+    path = Path(path)
+    if not _CONTENT_KEY_RE.match(path.stem):
+        return None
+    try:
+        path.resolve().relative_to(get_audio_store().root.resolve())
+    except ValueError:
+        return None
+    return path.stem
+
+
+def compute_etag(path: Union[str, Path], stat: Optional[os.stat_result] = None) -> str:
+    """Strong ETag (quoted) for an audio file."""
+    key = content_key_for(path)
+    if key is None:
+        stat = stat or os.stat(path)
+        key = _file_digest(str(path), stat.st_size, stat.st_mtime_ns)
+    return f'"{key}"'
+
+
+# =============================================================================
+# REQUEST HEADER PARSING
+# =============================================================================
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, RFC 9110 13.1.2)."""
+    header = header.strip()
+    if header == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified(request, etag: str, mtime: float) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+    if if_modified_since:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(mtime) <= since
+    return False
+
+
+def _range_applies(request, etag: str, mtime: float) -> bool:
+    """If-Range: only honour Range when the client's copy is current."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        # Strong comparison required for If-Range
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) == since
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Args:
+        header: Range header value, e.g. "bytes=0-1023", "bytes=500-", "bytes=-500"
+        size: File size in bytes
+
+    Returns:
+        (start, end) inclusive, None to serve the full file (no/invalid/
+        multi-range header), or (-1, -1) when the range is unsatisfiable
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        # Malformed or multiple ranges - a full 200 response is allowed
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return (-1, -1)
+        return (max(size - length, 0), size - 1)
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        return (-1, -1)
+    return (start, min(end, size - 1))
+
+
+# =============================================================================
+# RESPONSES
+# =============================================================================
+
+def _read_range(path: Path, start: int, length: int):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _set_validators(response, etag: str, mtime: float, immutable: bool) -> None:
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Accept-Ranges'] = 'bytes'
+    if immutable:
+        response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        max_age = getattr(settings, 'AUDIO_CACHE_MAX_AGE', 86400)
+        response['Cache-Control'] = f'public, max-age={max_age}'
+
+
+def _offload_response(path: Path, content_type: str, mode: str) -> HttpResponse:
+    """Empty response telling nginx/Apache to send the file itself."""
+    response = HttpResponse(content_type=content_type)
+    if mode == SERVE_MODE_X_SENDFILE:
+        response['X-Sendfile'] = str(path)
+        return response
+
+    prefix = getattr(settings, 'AUDIO_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+    try:
+        relative = path.resolve().relative_to(Path(settings.MEDIA_ROOT).resolve())
+    except ValueError:
+        raise Http404("Audio file is outside MEDIA_ROOT")
+    response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + relative.as_posix()
+    return response
+
+
+def serve_audio(
+    request,
+    path: Union[str, Path],
+    content_type: Optional[str] = None,
+    etag: Optional[str] = None,
+    immutable: Optional[bool] = None,
+    filename: Optional[str] = None
+):
+    """
+    Serve an audio file with validators, conditional GET and byte ranges.
+
+    Args:
+        request: Django/DRF request
+        path: Absolute path of the audio file
+        content_type: MIME type (guessed from the extension by default)
+        etag: Precomputed strong ETag (computed from content if omitted)
+        immutable: Long-lived immutable caching (default: True for
+                   content-addressed AudioStore files)
+        filename: Filename for Content-Disposition (inline)
+
+    Returns:
+        200 (full file), 206 (range), 304 (not modified), 416 (bad range),
+        or an X-Accel-Redirect/X-Sendfile response in offload mode
+
+    Raises:
+        Http404: If the file does not exist
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("Audio file not found")
+    if not path.is_file():
+        raise Http404("Audio file not found")
+
+    if content_type is None:
+        content_type = mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+    if etag is None:
+        etag = compute_etag(path, stat)
+    if immutable is None:
+        immutable = content_key_for(path) is not None
+
+    if _not_modified(request, etag, stat.st_mtime):
+        response = HttpResponse(status=304)
+        _set_validators(response, etag, stat.st_mtime, immutable)
+        return response
+
+    mode = getattr(settings, 'AUDIO_SERVE_MODE', SERVE_MODE_DJANGO)
+    if mode in (SERVE_MODE_X_ACCEL, SERVE_MODE_X_SENDFILE):
+        # The front-end server handles Range itself
+        response = _offload_response(path, content_type, mode)
+        _set_validators(response, etag, stat.st_mtime, immutable)
+        return response
+
+    size = stat.st_size
+    byte_range = None
+    if request.method in ('GET', 'HEAD') and _range_applies(request, etag, stat.st_mtime):
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+
+    if byte_range == (-1, -1):
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        _set_validators(response, etag, stat.st_mtime, immutable)
+        return response
+
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(path, start, length),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    if filename:
+        response['Content-Disposition'] = f'inline; filename="{filename}"'
+    _set_validators(response, etag, stat.st_mtime, immutable)
+    return response
+
+
+def serve_media_audio(request, path):
+    """
+    View serving audio files below MEDIA_ROOT through ``serve_audio``.
+
+    Mounted on MEDIA_URL for the directories in ``AUDIO_MEDIA_DIRS`` so the
+    URLs returned by the TTS services and ``AudioSource.get_url()`` get the
+    same validators, range support and offload mode as the stream endpoint.
+    Serving an audio store file records an access (AudioStore.touch(),
+    throttled per key), so the storage GC keeps audio that is played
+    through its URL.
+    """
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    full_path = (media_root / path).resolve()
+    try:
+        full_path.relative_to(media_root)
+    except ValueError:
+        raise Http404("Audio file not found")
+    if full_path.name.startswith('.') or full_path.suffix.lower() not in AUDIO_EXTENSIONS:
+        # Temp files, locks and the store index are not public
+        raise Http404("Audio file not found")
+    response = serve_audio(request, full_path)
+    key = content_key_for(full_path)
+    if key is not None:
+        get_audio_store().touch(key)
+    return response
@@ -0,0 +1,491 @@
+"""
+Content-Addressed TTS Audio Store
+
+One place on disk for every synthesized utterance, shared by:
+- EnglishTTSService (apps/curriculum/services/edge_tts_service.py)
+- FlashcardTTSService (services/tts_flashcard_service.py)
+- TTSService (utils/tts.py)
+
+Features:
+- Key = SHA-256 of the normalized synthesis parameters
+  (engine, voice, rate, pitch, text), so the same word/voice/rate is
+  synthesized once no matter which service asks for it
+- Two-level directory sharding: {root}/ab/cd/abcd....mp3
+- Atomic writes (temp file in the shard directory + os.replace)
+- Index in the database (curriculum.AudioStoreEntry: key -> size,
+  duration, last access, params), so every host sharing AUDIO_STORE_ROOT
+  sees the same entries
+
+The synthesis code paths commit from inside an event loop, where the ORM
+cannot be used; index writes made there are queued and applied by the
+next synchronous store call (or flush()).
+
+Usage:
+    from services.audio_store import get_audio_store, make_audio_key
+
+    store = get_audio_store()
+    key = make_audio_key("hello", "en-US-GuyNeural", rate="+0%")
+    path = store.get(key)
+    if path is None:
+        tmp = store.temp_path(key)
+        await edge_tts.Communicate("hello", "en-US-GuyNeural").save(str(tmp))
+        path = store.commit(key, tmp, text="hello", voice="en-US-GuyNeural")
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F, Sum
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every key (e.g. when the normalization rules change)
+KEY_VERSION = 'v1'
+
+
+# =========================================================================
+# KEY NORMALIZATION
+# =========================================================================
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+@lru_cache(maxsize=256)
+def _normalize_signed(value: Union[int, str, None], unit: str) -> str:
+    """Normalize 0 / '0' / '+0%' / '-30%' style values to '+0%' / '-30%'."""
+    if value is None or value == '':
+        return f"+0{unit}"
+    if isinstance(value, (int, float)):
+        return f"{int(value):+d}{unit}"
+    match = re.fullmatch(r'\s*([+-]?\d+)\s*' + re.escape(unit) + r'?\s*', str(value))
+    if not match:
+        return str(value).strip()
+    return f"{int(match.group(1)):+d}{unit}"
+
+
+def normalize_rate(rate: Union[int, str, None]) -> str:
+    return _normalize_signed(rate, '%')
+
+
+def normalize_pitch(pitch: Union[int, str, None]) -> str:
+    return _normalize_signed(pitch, 'Hz')
+
+
+def make_audio_key(
+    text: str,
+    voice: str,
+    rate: Union[int, str, None] = 0,
+    pitch: Union[int, str, None] = 0,
+    engine: str = 'edge',
+    audio_format: str = 'mp3'
+) -> str:
+    """
+    Build the content key for a synthesis request.
+
+    Args:
+        text: Text to speak
+        voice: Full engine voice ID (e.g. "en-US-AriaNeural")
+        rate: Rate as int percent or Edge string ("-30%")
+        pitch: Pitch as int Hz or Edge string ("+5Hz")
+        engine: "edge" or "mock" (mock audio never collides with real audio)
+        audio_format: File format
+
+    Returns:
+        64-character hex SHA-256 digest
+    """
+    parts = [
+        KEY_VERSION,
+        engine,
+        audio_format,
+        voice.strip(),
+        normalize_rate(rate),
+        normalize_pitch(pitch),
+        normalize_text(text),
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+# =========================================================================
+# STORE
+# =========================================================================
+
+class AudioStore:
+    """
+    Sharded, content-addressed audio files plus a database index.
+    """
+
+    EXTENSION = '.mp3'
+
+    # Only persist a key's last access (and the hits counted since) once per
+    # interval (per process)
+    TOUCH_INTERVAL_SECONDS = 60
+
+    # Keys per "IN (...)" query and rows per fetch
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        if root is None:
+            root = getattr(
+                settings,
+                'AUDIO_STORE_ROOT',
+                os.path.join(settings.MEDIA_ROOT, 'audio_store')
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._last_touch: Dict[str, float] = {}
+        self._hits: Dict[str, int] = {}
+        self._pending: List[Tuple[Callable, tuple]] = []
+        self._pending_lock = threading.Lock()
+        self._url_prefix_cache = None
+
+    # -------------------------------------------------------------------------
+    # Paths & URLs
+    # -------------------------------------------------------------------------
+
+    def relative_path_for(self, key: str) -> str:
+        return f"{key[:2]}/{key[2:4]}/{key}{self.EXTENSION}"
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / f"{key}{self.EXTENSION}"
+
+    def url_for(self, key: str) -> Optional[str]:
+        """MEDIA_URL based URL (None if the store lives outside MEDIA_ROOT)."""
+        prefix = self._url_prefix()
+        if prefix is None:
+            return None
+        return f"{prefix}{self.relative_path_for(key)}"
+
+    def _url_prefix(self) -> Optional[str]:
+        """URL of the store root, recomputed only when MEDIA_ROOT/MEDIA_URL change."""
+        media = (str(settings.MEDIA_ROOT), settings.MEDIA_URL)
+        cached = self._url_prefix_cache
+        if cached is None or cached[0] != media:
+            try:
+                relative = self.root.relative_to(media[0]).as_posix()
+                prefix = f"{media[1]}{relative}/" if relative != '.' else media[1]
+            except ValueError:
+                prefix = None
+            cached = self._url_prefix_cache = (media, prefix)
+        return cached[1]
+
+    def temp_path(self, key: str) -> Path:
+        """Temp file in the final shard directory (same filesystem -> atomic rename)."""
+        final = self.path_for(key)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        return final.parent / f".{key}.{uuid.uuid4().hex}.tmp"
+
+    # -------------------------------------------------------------------------
+    # Lookup / write
+    # -------------------------------------------------------------------------
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def get(self, key: str, touch: bool = True) -> Optional[Path]:
+        """Return the stored file path (recording the access) or None."""
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        if touch:
+            self.touch(key)
+        return path
+
+    def commit(self, key: str, temp_path: Union[str, Path], **params) -> Path:
+        """
+        Atomically move a finished temp file into place and index it.
+
+        Args:
+            key: Content key
+            temp_path: File produced by the synthesizer (see temp_path())
+            **params: text, voice, rate, pitch, engine (stored in the index)
+
+        Returns:
+            Final path
+        """
+        final = self.path_for(key)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, final)
+        self._record(key, final, params)
+        return final
+
+    def put_file(self, key: str, source: Union[str, Path], **params) -> Path:
+        """Copy an existing file into the store (used to adopt legacy files)."""
+        tmp = self.temp_path(key)
+        try:
+            shutil.copyfile(source, tmp)
+            return self.commit(key, tmp, **params)
+        except Exception:
+            self.discard(tmp)
+            raise
+
+    @staticmethod
+    def discard(temp_path: Union[str, Path]) -> None:
+        """Remove an unfinished temp file (ignore if missing)."""
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def delete(self, key: str) -> bool:
+        """Delete file and index entry. Returns True if a file was removed."""
+        removed = self.unlink(key)
+        self.flush()
+        _entry_model().objects.filter(key=key).delete()
+        self._last_touch.pop(key, None)
+        self._hits.pop(key, None)
+        return removed
+
+    def unlink(self, key: str) -> bool:
+        """Remove only the file of a key. Returns True if it existed."""
+        try:
+            self.path_for(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete_entries(self, keys: Iterable[str]) -> int:
+        """
+        Drop index entries set-based (one DELETE per 500 keys).
+
+        Files are left in place; the storage GC (services/audio_gc.py)
+        removes them in parallel afterwards.
+
+        Returns:
+            Number of index rows deleted
+        """
+        keys = list(keys)
+        self.flush()
+        entries = _entry_model().objects
+        deleted = 0
+        for i in range(0, len(keys), self.QUERY_CHUNK_SIZE):
+            deleted += entries.filter(key__in=keys[i:i + self.QUERY_CHUNK_SIZE]).delete()[0]
+        for key in keys:
+            self._last_touch.pop(key, None)
+            self._hits.pop(key, None)
+        return deleted
+
+    def clear(self, voice: Optional[str] = None) -> int:
+        """Delete every entry (optionally only one voice). Returns files removed."""
+        self.flush()
+        entries = _entry_model().objects.all()
+        if voice:
+            entries = entries.filter(voice=voice)
+        keys = list(entries.values_list('key', flat=True))
+        return sum(1 for key in keys if self.delete(key))
+
+    def cleanup(self, max_age_days: int) -> int:
+        """Delete entries not accessed for max_age_days. Returns files removed."""
+        from .audio_gc import collect_audio_store
+
+        return collect_audio_store(max_age_days=max_age_days, store=self)['files_removed']
+
+    # -------------------------------------------------------------------------
+    # Index
+    # -------------------------------------------------------------------------
+
+    def touch(self, key: str) -> None:
+        """
+        Record an access.
+
+        Every hit is counted; the index write is throttled to one per key
+        per interval and adds the hits counted in memory since the last one.
+        """
+        now = time.time()
+        hits = self._hits.pop(key, 0) + 1
+        if now - self._last_touch.get(key, 0) < self.TOUCH_INTERVAL_SECONDS:
+            self._hits[key] = hits
+            return
+        self._last_touch[key] = now
+        self._write(self._save_touch, key, _as_datetime(now), hits)
+
+    def iter_lru(self, batch_size: int = QUERY_CHUNK_SIZE):
+        """
+        Index rows, least recently used first.
+
+        Yields:
+            (key, size_bytes, last_accessed_at, access_count)
+        """
+        self.flush()
+        yield from _entry_model().objects.order_by('last_accessed_at').values_list(
+            'key', 'size_bytes', 'last_accessed_at', 'access_count'
+        ).iterator(chunk_size=batch_size)
+
+    def existing_keys(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Keys (out of ``keys``) that are present in the index.
+
+        One indexed query per 500 keys instead of one stat() per file; the
+        index is written by commit()/delete(), so it is current for every
+        file produced through the store.
+        """
+        keys = list(dict.fromkeys(keys))
+        self.flush()
+        entries = _entry_model().objects
+        found: Set[str] = set()
+        for i in range(0, len(keys), self.QUERY_CHUNK_SIZE):
+            found.update(entries.filter(
+                key__in=keys[i:i + self.QUERY_CHUNK_SIZE]
+            ).values_list('key', flat=True))
+        return found
+
+    def entry(self, key: str) -> Optional[Dict]:
+        """Index row for a key as a dict (None if unknown)."""
+        self.flush()
+        return _entry_model().objects.filter(key=key).values().first()
+
+    def stats(self) -> Dict:
+        """Entry count, total size and recorded accesses from the index."""
+        self.flush()
+        entries = _entry_model().objects
+        totals = entries.aggregate(total=Sum('size_bytes'), accesses=Sum('access_count'))
+        total = totals['total'] or 0
+        return {
+            'total_files': entries.count(),
+            'total_size_bytes': total,
+            'total_size_mb': round(total / (1024 * 1024), 2),
+            'total_accesses': totals['accesses'] or 0,
+            'storage_path': str(self.root),
+        }
+
+    def flush(self) -> int:
+        """
+        Apply the index writes queued from inside an event loop.
+
+        Called by every synchronous index operation; call it explicitly
+        after an async batch if nothing else touches the store afterwards.
+
+        Returns:
+            Number of writes applied
+        """
+        if not self._pending or _in_event_loop():
+            return 0
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        for write, args in pending:
+            self._apply(write, args)
+        return len(pending)
+
+    def _record(self, key: str, path: Path, params: Dict) -> None:
+        now = time.time()
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        fields = {
+            'size_bytes': size,
+            'duration': _probe_duration(path),
+            'last_accessed_at': _as_datetime(now),
+        }
+        # Missing parameters keep the values already indexed
+        optional = {
+            'engine': params.get('engine'),
+            'voice': params.get('voice'),
+            'rate': normalize_rate(params['rate']) if 'rate' in params else None,
+            'pitch': normalize_pitch(params['pitch']) if 'pitch' in params else None,
+            'text': (params.get('text') or '')[:500] or None,
+        }
+        fields.update((name, value) for name, value in optional.items() if value is not None)
+        self._last_touch[key] = now
+        self._write(self._save_entry, key, fields)
+
+    def _save_entry(self, key: str, fields: Dict) -> None:
+        AudioStoreEntry = _entry_model()
+        AudioStoreEntry.objects.bulk_create(
+            [AudioStoreEntry(
+                key=key,
+                relative_path=self.relative_path_for(key),
+                created_at=fields['last_accessed_at'],
+                **fields
+            )],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=list(fields),
+        )
+
+    def _save_touch(self, key: str, accessed_at: datetime, hits: int) -> None:
+        updated = _entry_model().objects.filter(key=key).update(
+            last_accessed_at=accessed_at,
+            access_count=F('access_count') + hits
+        )
+        if not updated:
+            # File exists but was written before the index (or index lost)
+            self._record(key, self.path_for(key), {})
+
+    def _write(self, write: Callable, *args) -> None:
+        """Run an index write now, or queue it when called on an event loop."""
+        if _in_event_loop():
+            with self._pending_lock:
+                self._pending.append((write, args))
+            return
+        self.flush()
+        self._apply(write, args)
+
+    def _apply(self, write: Callable, args: tuple) -> None:
+        try:
+            write(*args)
+        except DatabaseError as e:
+            logger.warning(f"Audio store index write failed for {args[0]}: {e}")
+
+
+def _entry_model():
+    """curriculum.AudioStoreEntry (imported lazily, like the other services)."""
+    from apps.curriculum.models import AudioStoreEntry
+    return AudioStoreEntry
+
+
+def _in_event_loop() -> bool:
+    """True on a thread running an asyncio loop (where the ORM refuses to run)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _as_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, dt_timezone.utc)
+
+
+def _probe_duration(path: Path) -> Optional[float]:
+    """MP3 duration in seconds via mutagen (None if unavailable/unreadable)."""
+    try:
+        from mutagen.mp3 import MP3
+        return round(MP3(str(path)).info.length, 3)
+    except Exception:
+        return None
+
+
+# =========================================================================
+# SINGLETON
+# =========================================================================
+
+_audio_store = None
+
+
+def get_audio_store() -> AudioStore:
+    """
+    Get the shared AudioStore instance.
+
+    Returns:
+        AudioStore rooted at settings.AUDIO_STORE_ROOT
+    """
+    global _audio_store
+    if _audio_store is None:
+        _audio_store = AudioStore()
+    return _audio_store
@@ -0,0 +1,82 @@
+"""
+Cache Version Counters
+
+Version numbers (generations) kept in the Django cache. Anything derived
+from a source is cached under the source's current version, so bumping
+one key makes all of it stale in O(1): the quiz pair catalogue, the
+lesson unlock graph, a user's progress series, phoneme audio resolutions.
+
+Features:
+- get_version()/get_versions(): a missing version is seeded from
+  time.time_ns() with cache.add(), never 0/1, so data cached or held in
+  process memory under a number from before a cache flush or eviction is
+  never taken for current
+- bump_version(): atomic cache.incr(); a missing key is re-seeded
+- incr_counter(): plain counter created on first use (cache.add, then incr)
+
+Process-memory copies of versioned data must still expire on their own
+(see e.g. QuizEngine.catalogue): with a per-process cache (LocMemCache) a
+bump in one process is invisible to the others.
+
+Usage:
+    from services.cache_versions import bump_version, get_version
+
+    version = get_version('quiz_engine:catalogue:version')
+    data = cache.get(f'quiz_engine:catalogue:{version}')
+
+    bump_version('quiz_engine:catalogue:version')    # On change
+"""
+
+import time
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+
+def get_version(key: str) -> int:
+    """Current version of ``key`` (seeded on first use)."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def get_versions(keys: Iterable[str]) -> Dict[str, int]:
+    """Current versions of several keys with one get_many (seeded on first use)."""
+    keys = list(keys)
+    versions = cache.get_many(keys)
+    for key in keys:
+        if versions.get(key) is None:
+            versions[key] = get_version(key)
+    return versions
+
+
+def bump_version(key: str) -> None:
+    """New version of ``key``: everything cached under the old one is stale."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def incr_counter(key: str, delta: int = 1, timeout: Optional[float] = None) -> int:
+    """
+    Add to a counter, creating it on first use.
+
+    Args:
+        key: Cache key
+        delta: Increment
+        timeout: Expiry of a newly created counter (None = never)
+
+    Returns:
+        New value
+    """
+    if cache.add(key, delta, timeout):
+        return delta
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, delta, timeout)
+        return delta
@@ -0,0 +1,235 @@
+"""
+Progress Time Series for Dashboard Charts
+
+Daily/weekly buckets of a user's practice metrics, shared by:
+- Learning Hub dashboard (apps/study/api/dashboard_api.py)
+- Phase 5.4 progress history (apps/curriculum/api_phase54.py)
+
+Features:
+- One grouped query per metric: TruncDate/TruncWeek (current time zone)
+  + aggregates, instead of one query per day
+- Missing buckets are zero-filled in Python
+- Results cached per (user, metric, bucket, period, filters); a per-user
+  generation number is bumped on every new attempt/session/recording
+  (apps/study/signals.py), so stale series are never served
+
+Usage:
+    from services.progress_timeseries import get_time_series
+
+    series = get_time_series(user, 'production_recordings', days=30)
+    series['labels']            # ['05/02', '05/03', ...]
+    series['values']['count']   # [0, 3, 1, ...]
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .cache_versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+BUCKET_DAY = 'day'
+BUCKET_WEEK = 'week'
+BUCKETS = (BUCKET_DAY, BUCKET_WEEK)
+
+SUCCESS_ACCURACY = 70  # PhonemeAttempt accuracy counted as a successful attempt
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A per-user time series: which rows, which timestamp, which aggregates."""
+
+    model: Callable          # Returns the model class (lazy, avoids app-loading cycles)
+    date_field: str
+    aggregates: Callable     # Returns {name: aggregate expression}
+    filters: Optional[Callable] = None   # Returns a Q for the base queryset
+    decimals: int = 1
+
+
+def _discrimination_session():
+    from apps.study.models import DiscriminationSession
+    return DiscriminationSession
+
+
+def _production_recording():
+    from apps.study.models import ProductionRecording
+    return ProductionRecording
+
+
+def _phoneme_attempt():
+    from apps.curriculum.models import PhonemeAttempt
+    return PhonemeAttempt
+
+
+METRICS: Dict[str, Metric] = {
+    'discrimination_accuracy': Metric(
+        model=_discrimination_session,
+        date_field='completed_at',
+        aggregates=lambda: {'accuracy': Avg('accuracy'), 'sessions': Count('id')},
+        filters=lambda: Q(status='completed'),
+    ),
+    'production_recordings': Metric(
+        model=_production_recording,
+        date_field='created_at',
+        aggregates=lambda: {'count': Count('id'), 'avg_ai_score': Avg('ai_score')},
+    ),
+    'phoneme_attempts': Metric(
+        model=_phoneme_attempt,
+        date_field='attempted_at',
+        aggregates=lambda: {
+            'attempts': Count('id'),
+            'avg_accuracy': Avg('accuracy'),
+            'successful_attempts': Count('id', filter=Q(accuracy__gte=SUCCESS_ACCURACY)),
+        },
+        decimals=2,
+    ),
+}
+
+
+# =========================================================================
+# CACHE GENERATIONS
+# =========================================================================
+
+def _generation_key(user_id: int) -> str:
+    return f"progress_timeseries:gen:{user_id}"
+
+
+def get_generation(user_id: int) -> int:
+    return get_version(_generation_key(user_id))
+
+
+def invalidate_user_series(user_id: int) -> None:
+    """Make every cached series of the user stale (called on new attempts)."""
+    bump_version(_generation_key(user_id))
+
+
+# =========================================================================
+# BUCKETS
+# =========================================================================
+
+def bucket_starts(days: int, bucket: str = BUCKET_DAY, today: Optional[date] = None) -> List[date]:
+    """
+    Bucket start dates covering the last `days` days (today included).
+
+    Weekly buckets start on Monday (TruncWeek). At least one day (today).
+    """
+    days = max(1, days)
+    today = today or timezone.localdate()
+    first = today - timedelta(days=days - 1)
+    if bucket == BUCKET_WEEK:
+        first -= timedelta(days=first.weekday())
+        step = timedelta(weeks=1)
+    else:
+        step = timedelta(days=1)
+
+    starts = []
+    current = first
+    while current <= today:
+        starts.append(current)
+        current += step
+    return starts
+
+
+def _aggregate(user, metric: Metric, bucket: str, since: date, filters: Dict) -> Dict[date, Dict]:
+    """One grouped query: {bucket start date: {aggregate: value}}."""
+    trunc = TruncWeek if bucket == BUCKET_WEEK else TruncDate
+    start = timezone.make_aware(datetime.combine(since, time.min))
+
+    queryset = metric.model().objects.filter(
+        user=user, **{f'{metric.date_field}__gte': start}, **filters
+    )
+    if metric.filters:
+        queryset = queryset.filter(metric.filters())
+
+    rows = queryset.annotate(
+        bucket=trunc(metric.date_field)
+    ).values('bucket').annotate(**metric.aggregates()).order_by('bucket')
+
+    results = {}
+    for row in rows:
+        key = row.pop('bucket')
+        if key is None:
+            continue
+        results[key.date() if isinstance(key, datetime) else key] = row
+    return results
+
+
+def get_time_series(
+    user,
+    metric: str,
+    days: int = 30,
+    bucket: str = BUCKET_DAY,
+    use_cache: bool = True,
+    **filters
+) -> Dict:
+    """
+    Zero-filled time series of one metric for a user.
+
+    Args:
+        user: User instance
+        metric: Key of METRICS
+        days: Period length in days (today included, at least 1)
+        bucket: 'day' or 'week'
+        use_cache: Read/write the per-user cache
+        **filters: Extra queryset filters (e.g. phoneme_id=3)
+
+    Returns:
+        {
+            'metric': str,
+            'bucket': 'day' | 'week',
+            'dates': [date, ...],           # Bucket start dates
+            'labels': ['05/02', ...],
+            'values': {aggregate: [value per bucket, ...]}
+        }
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+
+    spec = METRICS[metric]
+    days = max(1, days)
+    today = timezone.localdate()
+    filters = {k: v for k, v in filters.items() if v is not None}
+
+    cache_key = None
+    if use_cache:
+        filter_part = ','.join(f'{k}={v}' for k, v in sorted(filters.items()))
+        cache_key = (
+            f"progress_timeseries:{user.id}:{get_generation(user.id)}:"
+            f"{metric}:{bucket}:{days}:{today.isoformat()}:{filter_part}"
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    starts = bucket_starts(days, bucket, today)
+    grouped = _aggregate(user, spec, bucket, starts[0], filters)
+    names = list(spec.aggregates())
+
+    values = {name: [] for name in names}
+    for start in starts:
+        row = grouped.get(start, {})
+        for name in names:
+            value = row.get(name) or 0
+            values[name].append(round(value, spec.decimals) if isinstance(value, float) else value)
+
+    series = {
+        'metric': metric,
+        'bucket': bucket,
+        'dates': starts,
+        'labels': [start.strftime('%m/%d') for start in starts],
+        'values': values,
+    }
+
+    if cache_key:
+        cache.set(cache_key, series, getattr(settings, 'PROGRESS_TIMESERIES_CACHE_TIMEOUT', 600))
+    return series
@@ -0,0 +1,131 @@
+"""
+Single-Flight Locks
+
+Coalesces concurrent work for the same key: the first caller (leader)
+does the work, everybody else (followers) waits for its result or is told
+to come back later.
+
+The lock is a lock file created with O_CREAT | O_EXCL, which is atomic
+across processes and hosts sharing the filesystem (gunicorn workers,
+Celery workers). The Django cache is not used because the configured
+LocMemCache is per process. A lock older than ``lock_timeout`` is
+considered abandoned (leader crashed) and is broken.
+
+Usage:
+    from services.single_flight import SingleFlight
+
+    flight = SingleFlight(lock_dir)
+    if flight.try_acquire(key):
+        try:
+            do_work()
+        finally:
+            flight.release(key)
+    else:
+        flight.wait(key, check=lambda: result_exists(), timeout=3)
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    File-based single-flight lock with timeout.
+
+    Args:
+        lock_dir: Directory for lock files (must be on the shared filesystem)
+        lock_timeout: Seconds after which a held lock is considered stale
+        poll_interval: Seconds between checks while waiting
+    """
+
+    def __init__(
+        self,
+        lock_dir: Union[str, Path],
+        lock_timeout: Optional[float] = None,
+        poll_interval: float = 0.05
+    ):
+        self.lock_dir = Path(lock_dir)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        if lock_timeout is None:
+            lock_timeout = getattr(settings, 'AUDIO_SINGLE_FLIGHT_LOCK_TIMEOUT', 60)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+
+    def _lock_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.lock"
+
+    def try_acquire(self, key: str) -> bool:
+        """Become the leader for ``key`` (non-blocking). Returns True on success."""
+        path = self._lock_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(str(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break_if_stale(path):
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def release(self, key: str) -> None:
+        """Release the lock (safe to call if already gone)."""
+        try:
+            self._lock_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def in_flight(self, key: str) -> bool:
+        """True if a (non-stale) leader currently holds ``key``."""
+        path = self._lock_path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return age < self.lock_timeout
+
+    def wait(self, key: str, check: Callable[[], bool], timeout: float) -> bool:
+        """
+        Wait for the leader's result.
+
+        Args:
+            key: Lock key
+            check: Returns True once the result is available
+            timeout: Maximum seconds to wait (0 = check once)
+
+        Returns:
+            True if ``check`` succeeded within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if check():
+                return True
+            if not self.in_flight(key):
+                # Leader finished (or died) - one last look for its result
+                return check()
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def _break_if_stale(self, path: Path) -> bool:
+        """Remove an abandoned lock. Returns True if the lock is gone."""
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        if age < self.lock_timeout:
+            return False
+        logger.warning(f"Breaking stale single-flight lock {path.name} ({age:.0f}s old)")
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        return True
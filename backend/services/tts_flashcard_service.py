@@ -5,6 +5,7 @@ Provides audio generation for flashcard words using Edge-TTS with:
 - Multiple voice options (US/UK, male/female)
 - Speed control (slow/normal/fast)
 - Redis caching (30-day TTL)
+- Shared content-addressed storage (services.audio_store)
 - Async generation with Celery
 - Fallback to synchronous generation
 
@@ -29,11 +30,14 @@ import os
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Dict, Iterable, Literal, Optional, Sequence, Set, Tuple
 from django.conf import settings
 from django.core.cache import cache
 import edge_tts
 
+from services.audio_store import get_audio_store, make_audio_key
+from services.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +54,9 @@ class FlashcardTTSService:
         'uk_female': 'en-GB-SoniaNeural',
     }
     
+    # Reverse lookup: Edge voice code -> shorthand
+    VOICE_IDS = {code: voice_id for voice_id, code in VOICES.items()}
+    
     # Speed configurations (rate parameter for Edge-TTS)
     SPEEDS = {
         'slow': '-30%',      # 70% of normal speed
@@ -62,13 +69,22 @@ class FlashcardTTSService:
     
     def __init__(self):
         """Initialize TTS service."""
-        # Audio storage directory
+        # Shared content-addressed store (one file per word/voice/rate)
+        self.store = get_audio_store()
+        
+        # Legacy storage directory ({word}_{voice}_{speed}.mp3), read-only:
+        # files found here are adopted into the store on first use
         self.audio_dir = Path(settings.MEDIA_ROOT) / 'flashcard_audio'
-        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Coalesces concurrent on-the-fly generation of the same audio
+        self.single_flight = SingleFlight(self.store.root / '.locks')
         
         # Default voice
         self.default_voice = self.VOICES['us_male']
         self.default_speed = self.SPEEDS['normal']
+        
+        # (legacy dir mtime, filenames) - one listing instead of a stat per lookup
+        self._legacy_listing: Tuple[Optional[int], Set[str]] = (None, set())
     
     def get_cache_key(self, word: str, voice: str, speed: str) -> str:
         """
@@ -84,9 +100,25 @@ class FlashcardTTSService:
         """
         return f"flashcard_audio:{word.lower()}:{voice}:{speed}"
     
+    def get_store_key(self, word: str, voice: str, speed: str) -> str:
+        """
+        Content key of the audio in the shared AudioStore.
+        
+        Args:
+            word: The word to speak
+            voice: Voice shorthand (us_male) or Edge voice code (en-US-GuyNeural)
+            speed: Speed identifier (slow/normal/fast) or Edge rate string
+            
+        Returns:
+            SHA-256 hex key
+        """
+        voice_code = self.VOICES.get(voice, voice)
+        rate = self.SPEEDS.get(speed, speed)
+        return make_audio_key(word, voice_code, rate=rate)
+    
     def get_audio_filename(self, word: str, voice: str, speed: str) -> str:
         """
-        Generate filename for audio file.
+        Generate legacy filename for audio file.
         
         Args:
             word: The word to speak
@@ -96,16 +128,15 @@ class FlashcardTTSService:
         Returns:
             Filename string (e.g., "hello_us_male_normal.mp3")
         """
-        # Get voice shorthand
-        voice_key = next(
-            (k for k, v in self.VOICES.items() if v == voice),
-            'us_male'
-        )
+        voice_key = voice if voice in self.VOICES else self.VOICE_IDS.get(voice, 'us_male')
         return f"{word.lower()}_{voice_key}_{speed}.mp3"
     
     def get_audio_path(self, word: str, voice: str, speed: str) -> Path:
         """
-        Get full path to audio file.
+        Get full path to audio file in the shared store.
+        
+        Legacy files from media/flashcard_audio are adopted into the store
+        the first time they are looked up.
         
         Args:
             word: The word to speak
@@ -113,10 +144,13 @@ class FlashcardTTSService:
             speed: Speed identifier
             
         Returns:
-            Path object
+            Path object (may not exist yet)
         """
-        filename = self.get_audio_filename(word, voice, speed)
-        return self.audio_dir / filename
+        key = self.get_store_key(word, voice, speed)
+        path = self.store.path_for(key)
+        if not path.exists():
+            self._adopt_legacy_file(word, voice, speed, key)
+        return path
     
     def get_audio_url(self, word: str, voice: str = None, speed: str = 'normal') -> Optional[str]:
         """
@@ -131,34 +165,64 @@ class FlashcardTTSService:
             URL string or None if not exists
         """
         voice = voice or self.default_voice
-        audio_path = self.get_audio_path(word, voice, speed)
+        key = self.get_store_key(word, voice, speed)
         
-        if audio_path.exists():
-            # Return relative URL
-            relative_path = audio_path.relative_to(settings.MEDIA_ROOT)
-            return f"{settings.MEDIA_URL}{relative_path}".replace('\\', '/')
+        if self.store.get(key) or self._adopt_legacy_file(word, voice, speed, key):
+            return self.store.url_for(key)
         
         return None
     
+    def _adopt_legacy_file(self, word: str, voice: str, speed: str, key: str) -> bool:
+        """
+        Move a legacy flashcard_audio file into the store (if present).
+
+        The legacy copy is removed once the store has it, so it is not kept
+        twice on disk and not re-adopted after the store GC evicts the key.
+        """
+        voice_code = self.VOICES.get(voice, voice)
+        legacy_path = self.audio_dir / self.get_audio_filename(word, voice_code, speed)
+        if not legacy_path.exists():
+            return False
+        try:
+            self.store.put_file(
+                key,
+                legacy_path,
+                text=word,
+                voice=voice_code,
+                rate=self.SPEEDS.get(speed, speed),
+                engine='edge'
+            )
+        except OSError as e:
+            logger.warning(f"Failed to adopt legacy audio {legacy_path}: {e}")
+            return False
+        try:
+            legacy_path.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to remove adopted legacy audio {legacy_path}: {e}")
+        return True
+    
     async def _generate_audio_async(
         self,
         word: str,
         voice: str,
-        speed: str,
-        output_path: Path
-    ) -> bool:
+        speed: str
+    ) -> Optional[Path]:
         """
         Generate audio file using Edge-TTS (async).
         
+        The file is written to a temp file and atomically moved into the
+        shared store.
+        
         Args:
             word: The word to speak
             voice: Edge-TTS voice name
             speed: Speed rate string
-            output_path: Path to save audio file
             
         Returns:
-            True if successful, False otherwise
+            Path of the stored file, or None if generation failed
         """
+        key = make_audio_key(word, voice, rate=speed)
+        temp_path = self.store.temp_path(key)
         try:
             # Create TTS communicate object
             communicate = edge_tts.Communicate(
@@ -168,14 +232,18 @@ class FlashcardTTSService:
             )
             
             # Generate and save audio
-            await communicate.save(str(output_path))
+            await communicate.save(str(temp_path))
+            output_path = self.store.commit(
+                key, temp_path, text=word, voice=voice, rate=speed, engine='edge'
+            )
             
             logger.info(f"Generated audio for '{word}' with voice '{voice}' at '{output_path}'")
-            return True
+            return output_path
             
         except Exception as e:
+            self.store.discard(temp_path)
             logger.error(f"Error generating audio for '{word}': {e}")
-            return False
+            return None
     
     def generate_audio(
         self,
@@ -232,7 +300,7 @@ class FlashcardTTSService:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             success = loop.run_until_complete(
-                self._generate_audio_async(word, voice_code, speed_rate, audio_path)
+                self._generate_audio_async(word, voice_code, speed_rate)
             )
             loop.close()
             
@@ -248,6 +316,60 @@ class FlashcardTTSService:
             logger.error(f"Failed to generate audio for '{word}': {e}")
             return None
     
+    def generate_audio_single_flight(
+        self,
+        word: str,
+        voice: str = None,
+        speed: str = 'normal',
+        wait_timeout: float = None
+    ) -> tuple[Optional[str], bool]:
+        """
+        Generate audio on the fly with request coalescing.
+        
+        Only one caller (across all worker processes) synthesizes a given
+        word/voice/speed; concurrent callers wait up to ``wait_timeout``
+        seconds for that result instead of starting their own synthesis.
+        
+        Args:
+            word: The word to speak
+            voice: Voice identifier (us_male, us_female, uk_male, uk_female)
+            speed: Speed identifier (slow, normal, fast)
+            wait_timeout: Seconds a follower waits (default:
+                settings.AUDIO_SINGLE_FLIGHT_WAIT, 0 = don't wait)
+            
+        Returns:
+            (audio_url, pending) - pending is True when another request is
+            still generating the audio and the caller should retry later
+        """
+        voice = voice if voice in self.VOICES else 'us_male'
+        speed = speed if speed in self.SPEEDS else 'normal'
+        voice_code = self.VOICES[voice]
+        
+        url = self.get_audio_url(word, voice_code, speed)
+        if url:
+            return url, False
+        
+        key = self.get_store_key(word, voice, speed)
+        
+        if self.single_flight.try_acquire(key):
+            try:
+                # Re-check: the previous leader may have just finished
+                url = self.get_audio_url(word, voice_code, speed)
+                if not url:
+                    url = self.generate_audio(word, voice, speed)
+                return url, False
+            finally:
+                self.single_flight.release(key)
+        
+        if wait_timeout is None:
+            wait_timeout = getattr(settings, 'AUDIO_SINGLE_FLIGHT_WAIT', 3)
+        
+        logger.debug(f"Audio for '{word}' is being generated by another request, waiting")
+        if self.single_flight.wait(key, lambda: self.store.exists(key), wait_timeout):
+            return self.get_audio_url(word, voice_code, speed), False
+        
+        return None, self.single_flight.in_flight(key)
+    
     def generate_multiple_audio(
         self,
         words: list[str],
@@ -265,12 +387,80 @@ class FlashcardTTSService:
         Returns:
             Dictionary mapping word to audio URL
         """
-        results = {}
-        for word in words:
-            url = self.generate_audio(word, voice, speed)
-            results[word] = url
+        summary = self.generate_batch(words, voice, speed)
+        return summary['urls']
+    
+    def generate_batch(
+        self,
+        words: list[str],
+        voice: str = None,
+        speed: str = 'normal',
+        force_regenerate: bool = False,
+        concurrency: int = None,
+        progress_callback=None
+    ) -> dict:
+        """
+        Generate audio for many words concurrently on a single event loop.
+        
+        Existing files are skipped (unless force_regenerate), the rest go
+        through TTSBatchSynthesizer (bounded concurrency, per-voice rate
+        limit, retry with backoff).
+        
+        Args:
+            words: List of words
+            voice: Voice identifier (us_male, us_female, uk_male, uk_female)
+            speed: Speed identifier (slow, normal, fast)
+            force_regenerate: Regenerate even if the file exists
+            concurrency: Max in-flight TTS requests (default: settings)
+            progress_callback: Optional callback(done, total, result)
+            
+        Returns:
+            Dictionary with 'urls' (word -> URL or None), 'success',
+            'failed', 'skipped' and 'elapsed_seconds'
+        """
+        from apps.curriculum.services.tts_batch import TTSBatchSynthesizer, TTSJob
+        
+        voice = voice if voice in self.VOICES else 'us_male'
+        speed = speed if speed in self.SPEEDS else 'normal'
+        voice_code = self.VOICES[voice]
+        speed_rate = self.SPEEDS[speed]
+        
+        urls = {}
+        pending = []
+        for word in dict.fromkeys(words):
+            url = None if force_regenerate else self.get_audio_url(word, voice_code, speed)
+            if url:
+                urls[word] = url
+            else:
+                pending.append(word)
+        skipped = len(urls)
         
-        return results
+        async def synthesize(job):
+            output_path = await self._generate_audio_async(job.text, voice_code, speed_rate)
+            if not output_path:
+                raise RuntimeError(f"Edge TTS failed for '{job.text}'")
+            return str(output_path)
+        
+        summary = TTSBatchSynthesizer(
+            concurrency=concurrency,
+            synthesize=synthesize,
+            progress_callback=progress_callback,
+        ).run_sync(TTSJob(text=word, voice_key=voice, speed_level=speed) for word in pending)
+        
+        for result in summary['results']:
+            word = result['job'].text
+            url = self.get_audio_url(word, voice_code, speed) if result['success'] else None
+            urls[word] = url
+            if url:
+                cache.set(self.get_cache_key(word, voice, speed), url, self.CACHE_TTL)
+        
+        return {
+            'urls': urls,
+            'success': summary['successful'],
+            'failed': summary['failed'],
+            'skipped': skipped,
+            'elapsed_seconds': summary['elapsed_seconds'],
+        }
     
     def delete_audio(self, word: str, voice: str = None, speed: str = 'normal') -> bool:
         """
@@ -286,11 +476,10 @@ class FlashcardTTSService:
         """
         voice = voice or self.default_voice
         
-        # Delete file
-        audio_path = self.get_audio_path(word, voice, speed)
-        if audio_path.exists():
-            audio_path.unlink()
-            logger.info(f"Deleted audio file: {audio_path}")
+        # Delete file (shared store entry)
+        key = self.get_store_key(word, voice, speed)
+        if self.store.delete(key):
+            logger.info(f"Deleted audio for '{word}' ({key})")
         
         # Delete cache
         cache_key = self.get_cache_key(word, voice, speed)
@@ -326,14 +515,101 @@ class FlashcardTTSService:
         Returns:
             Dictionary with storage info
         """
-        audio_files = list(self.audio_dir.glob('*.mp3'))
-        total_size = sum(f.stat().st_size for f in audio_files)
+        return self.store.stats()
+    
+    def build_audio_index(
+        self,
+        words: Iterable[str],
+        voices: Optional[Sequence[str]] = None,
+        speeds: Optional[Sequence[str]] = None
+    ) -> 'AudioAvailabilityIndex':
+        """
+        Resolve audio availability for many words at once.
+        
+        One query against the store index plus (at most) one listing of the
+        legacy directory, instead of a stat() per word/voice/speed.
+        
+        Args:
+            words: Word texts
+            voices: Voice shorthands (default: all VOICES)
+            speeds: Speed identifiers (default: all SPEEDS)
+            
+        Returns:
+            AudioAvailabilityIndex
+        """
+        voices = list(voices or self.VOICES)
+        speeds = list(speeds or self.SPEEDS)
+        
+        keys: Dict[str, Dict[Tuple[str, str], str]] = {}
+        for word in words:
+            if word in keys:
+                continue
+            keys[word] = {
+                (voice, speed): self.get_store_key(word, voice, speed)
+                for voice in voices
+                for speed in speeds
+            }
+        
+        available = self.store.existing_keys(
+            key for variants in keys.values() for key in variants.values()
+        )
+        
+        legacy_files = None
+        for word, variants in keys.items():
+            for (voice, speed), key in variants.items():
+                if key in available:
+                    continue
+                if legacy_files is None:
+                    legacy_files = self._legacy_filenames()
+                if self.get_audio_filename(word, voice, speed) not in legacy_files:
+                    continue
+                if self._adopt_legacy_file(word, voice, speed, key):
+                    available.add(key)
         
+        return AudioAvailabilityIndex(self.store, keys, available)
+    
+    def _legacy_filenames(self) -> Set[str]:
+        """Filenames in the legacy audio dir (re-listed only when it changes)."""
+        try:
+            mtime = self.audio_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return set()
+        cached_mtime, names = self._legacy_listing
+        if cached_mtime != mtime:
+            names = {entry.name for entry in os.scandir(self.audio_dir)}
+            self._legacy_listing = (mtime, names)
+        return names
+
+
+class AudioAvailabilityIndex:
+    """
+    Audio URLs for a set of words, resolved in one pass.
+    
+    Built by FlashcardTTSService.build_audio_index() and passed to the
+    flashcard serializers through the serializer context ('audio_index').
+    """
+    
+    def __init__(self, store, keys: Dict[str, Dict[Tuple[str, str], str]], available: Set[str]):
+        self.store = store
+        self.keys = keys
+        self.available = available
+    
+    def __contains__(self, word: str) -> bool:
+        return word in self.keys
+    
+    def url(self, word: str, voice: str = 'us_male', speed: str = 'normal') -> Optional[str]:
+        """URL of one variant, or None if it has not been generated."""
+        key = self.keys.get(word, {}).get((voice, speed))
+        if key is None or key not in self.available:
+            return None
+        return self.store.url_for(key)
+    
+    def urls(self, word: str) -> Dict[str, str]:
+        """All available variants as {"us_male_normal": url, ...}."""
         return {
-            'total_files': len(audio_files),
-            'total_size_bytes': total_size,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'storage_path': str(self.audio_dir),
+            f"{voice}_{speed}": self.store.url_for(key)
+            for (voice, speed), key in self.keys.get(word, {}).items()
+            if key in self.available
         }
 
 
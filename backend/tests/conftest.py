@@ -3,8 +3,11 @@ Shared pytest fixtures for all tests
 """
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from apps.curriculum.models import Phoneme, PhonemeCategory
+
 User = get_user_model()
 
 
@@ -18,6 +21,29 @@ def user(db):
     )
 
 
+@pytest.fixture
+def phoneme_category(db):
+    """Create a vowel phoneme category"""
+    return PhonemeCategory.objects.create(
+        name='Vowels',
+        name_vi='Nguyên âm',
+        category_type='vowel',
+        order=1
+    )
+
+
+@pytest.fixture
+def phoneme(phoneme_category):
+    """Create a short vowel phoneme (/ɪ/)"""
+    return Phoneme.objects.create(
+        category=phoneme_category,
+        ipa_symbol='ɪ',
+        vietnamese_approx='i',
+        phoneme_type='short_vowel',
+        order=1
+    )
+
+
 @pytest.fixture
 def authenticated_client(user):
     """Create an authenticated API client"""
@@ -30,3 +56,9 @@ def authenticated_client(user):
 def api_client():
     """Create an unauthenticated API client"""
     return APIClient()
+
+
+@pytest.fixture
+def clear_cache():
+    """Start from an empty cache (use with pytest.mark.usefixtures)"""
+    cache.clear()
@@ -0,0 +1,146 @@
+"""
+Tests for chunked TTS batch runs.
+
+Tests:
+- Items are processed in chunks; the chord callback records progress
+  and throughput on the run
+- A failed chunk leaves the run resumable; resuming runs only that chunk
+  and chunks are never counted twice
+- Phoneme batches synthesize concurrently and store AudioSource records
+- Deck batches queue only the words without audio
+"""
+
+import pytest
+
+from apps.curriculum import audio_batches
+from apps.curriculum.audio_batches import (
+    record_chunk, resume_audio_batch, run_summary, start_audio_batch
+)
+from apps.curriculum.models import AudioBatchRun, AudioSource, Phoneme
+from apps.vocabulary.models import Flashcard, FlashcardDeck, Word
+from services.tts_flashcard_service import FlashcardTTSService
+
+calls = []
+
+
+def fake_handler(items, params):
+    calls.append(list(items))
+    if params.get('fail_on') in items:
+        raise RuntimeError('TTS unavailable')
+    return {
+        'succeeded': len(items) - items.count('bad'),
+        'failed': items.count('bad'),
+        'skipped': 0,
+        'failures': [{'item': 'bad', 'error': 'empty audio'}] if 'bad' in items else [],
+    }
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    calls.clear()
+    monkeypatch.setitem(audio_batches.BATCH_HANDLERS, 'phoneme_audio', f'{__name__}.fake_handler')
+    return calls
+
+
+@pytest.mark.django_db
+def test_chunked_run_and_resume(handler, django_capture_on_commit_callbacks):
+    items = ['a', 'b', 'c', 'd', 'bad', 'f', 'g', 'a']
+    with django_capture_on_commit_callbacks(execute=True):
+        run = start_audio_batch('phoneme_audio', items, {'fail_on': 'd'}, chunk_size=3)
+
+    run.refresh_from_db()
+    assert handler == [['a', 'b', 'c'], ['d', 'bad', 'f'], ['g']]
+    assert (run.total_items, run.total_chunks) == (7, 3)
+    assert run.status == 'failed'
+    assert run.completed_chunks == [0, 2]
+    assert run.pending_chunks() == [1]
+    assert (run.succeeded, run.failed, run.progress_percent) == (4, 0, 66)
+    assert run.task_id and run.finished_at
+
+    handler.clear()
+    AudioBatchRun.objects.filter(id=run.id).update(params={})
+    resume_audio_batch(run.id)
+
+    run.refresh_from_db()
+    assert handler == [['d', 'bad', 'f']]
+    assert run.status == 'partial'
+    assert (run.succeeded, run.failed, run.processed_items) == (6, 1, 7)
+    assert run.failures == [{'item': 'bad', 'error': 'empty audio'}]
+    assert run.items_per_second > 0
+
+    # Redelivered chunk: not counted again
+    assert not record_chunk(run.id, 1, {'succeeded': 3})
+    assert AudioBatchRun.objects.get(id=run.id).succeeded == 6
+
+
+@pytest.mark.django_db
+def test_phoneme_batch_stores_audio(
+    settings, tmp_path, monkeypatch, phoneme_category, django_capture_on_commit_callbacks
+):
+    from apps.curriculum import tasks
+
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.TTS_BATCH_RATE_PER_VOICE = 0
+
+    class FakeTTSService:
+        async def generate_audio(self, text, voice):
+            if not text:
+                raise ValueError('empty text')
+            path = tmp_path / f'{len(list(tmp_path.iterdir()))}.mp3'
+            path.write_bytes(b'ID3' + text.encode())
+            return str(path)
+
+    monkeypatch.setattr(tasks, 'TTSService', FakeTTSService)
+    monkeypatch.setattr(tasks, 'optimize_audio', lambda path, **kwargs: path)
+    monkeypatch.setattr(tasks, 'get_audio_duration', lambda path: 0.5)
+
+    phonemes = [
+        Phoneme.objects.create(category=phoneme_category, ipa_symbol=symbol, vietnamese_approx=approx, phoneme_type='short_vowel', order=i)
+        for i, (symbol, approx) in enumerate([('ɪ', 'i'), ('e', 'e'), ('æ', 'e'), ('ʌ', 'ă')])
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        run_id = tasks.generate_audio_batch([p.id for p in phonemes] + [999999], 'en-US-AriaNeural')['batch_run_id']
+
+    summary = run_summary(AudioBatchRun.objects.get(id=run_id))
+    assert summary['status'] == 'partial'
+    assert (summary['total'], summary['successful'], summary['failed']) == (5, 4, 1)
+    assert summary['chunks'] == 1
+    assert AudioSource.objects.filter(source_type='tts', voice_id='en-US-AriaNeural').count() == 4
+
+    # Fresh audio is skipped on the next run
+    with django_capture_on_commit_callbacks(execute=True):
+        run_id = tasks.generate_audio_batch([p.id for p in phonemes])['batch_run_id']
+    summary = run_summary(AudioBatchRun.objects.get(id=run_id))
+    assert (summary['status'], summary['skipped']) == ('completed', 4)
+
+
+@pytest.mark.django_db
+def test_deck_batch_queues_missing_words(user, monkeypatch, django_capture_on_commit_callbacks):
+    from apps.vocabulary.tasks import generate_deck_audio_batch
+
+    deck = FlashcardDeck.objects.create(name='Deck', level='A1', created_by=user)
+    for text in ['one', 'two', 'three']:
+        word = Word.objects.create(text=text, pos='noun', cefr_level='A1', meaning_vi=text)
+        Flashcard.objects.create(deck=deck, word=word, front_text=text, back_text=text)
+
+    synthesized = []
+
+    def fake_generate_batch(self, words, voice=None, speed='normal', **kwargs):
+        synthesized.extend(words)
+        return {
+            'urls': {word: None if word == 'two' else f'/media/{word}.mp3' for word in words},
+            'success': len(words) - 1, 'failed': 1, 'skipped': 0, 'elapsed_seconds': 0.1,
+        }
+
+    monkeypatch.setattr(FlashcardTTSService, 'generate_batch', fake_generate_batch)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        result = generate_deck_audio_batch(deck.id)
+
+    assert (result['total_cards'], result['queued'], result['skipped']) == (3, 3, 0)
+    assert sorted(synthesized) == ['one', 'three', 'two']
+    run = AudioBatchRun.objects.get(id=result['batch_run_id'])
+    assert (run.kind, run.status, run.succeeded, run.failed) == ('flashcard_audio', 'partial', 2, 1)
+    assert run.params == {'voice': 'us_male', 'speed': 'normal', 'deck_id': deck.id}
+    assert run.failures == [{'item': 'two', 'error': 'Audio generation failed'}]
@@ -0,0 +1,166 @@
+"""
+Tests for the two-tier phoneme audio resolution cache.
+
+Tests:
+- Hits are served from the in-process LRU without a query or cache I/O;
+  a cold LRU is filled from the shared tier, also without a query
+- One generation bump invalidates a phoneme (every voice) or everything,
+  in both shared and local-only mode; audio edits bump through signals;
+  bumps from other processes are seen within AUDIO_RESOLUTION_LOCAL_TTL
+- The LRU is bounded, TTS descriptors don't outlive their audio, and a
+  failing shared tier degrades to a miss
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.curriculum import audio_resolution
+from apps.curriculum.audio_resolution import (
+    AudioResolutionCache, describe_audio, get_resolution_cache, invalidate_phoneme_audio
+)
+from apps.curriculum.models import AudioSource, Phoneme
+from apps.curriculum.services.audio_service import PhonemeAudioService
+from services import cache_versions
+from services.cache_versions import bump_version
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    cache.clear()
+    resolution_cache = get_resolution_cache()
+    resolution_cache.local.clear()
+    resolution_cache.reset_stats()
+    yield
+    resolution_cache.local.clear()
+
+
+@pytest.fixture
+def phonemes(phoneme_category):
+    result = []
+    for i, symbol in enumerate(['ɪ', 'e']):
+        phoneme = Phoneme.objects.create(category=phoneme_category, ipa_symbol=symbol, phoneme_type='short_vowel', order=i)
+        AudioSource.objects.create(phoneme=phoneme, source_type='native', audio_file=f'phonemes/{i}.mp3')
+        result.append(phoneme)
+    return result
+
+
+def _lookup(service, phoneme):
+    return service.get_audio_for_phoneme(phoneme, auto_generate=False)
+
+
+@pytest.mark.django_db
+def test_hits_cost_no_queries(phonemes, settings, django_assert_num_queries, monkeypatch):
+    settings.AUDIO_RESOLUTION_SHARED_CACHE = True
+    service = PhonemeAudioService()
+    phoneme = phonemes[0]
+
+    audio = _lookup(service, phoneme)
+    with django_assert_num_queries(0):
+        cached = _lookup(service, phoneme)
+        url = service.get_audio_url(phoneme)
+    assert (cached.id, cached.source_type, cached.get_quality_score()) == (audio.id, 'native', 100)
+    assert url == audio.get_url()
+    assert cached.cached_until is None and cached.created_at == audio.created_at
+
+    # Another worker: cold LRU, warm shared tier
+    get_resolution_cache().local.clear()
+    with django_assert_num_queries(0):
+        assert _lookup(service, phoneme).id == audio.id
+    assert len(get_resolution_cache().local) == 1
+
+    stats = service.get_cache_stats()
+    assert (stats['local_hits'], stats['shared_hits'], stats['misses']) == (2, 1, 1)
+    assert stats['hit_rate'] == 0.75 and stats['shared'] is True
+
+    # LRU hit: generations from process memory, no cache round trip
+    class NoCache:
+        def __getattr__(self, name):
+            raise AssertionError(f'cache.{name}() on an LRU hit')
+
+    monkeypatch.setattr(audio_resolution, 'cache', NoCache())
+    monkeypatch.setattr(cache_versions, 'cache', NoCache())
+    assert _lookup(service, phoneme).id == audio.id
+    assert get_resolution_cache().stats()['errors'] == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('shared', [True, False])
+def test_generation_invalidation(phonemes, settings, django_assert_num_queries, monkeypatch, shared):
+    settings.AUDIO_RESOLUTION_SHARED_CACHE = shared
+    settings.AUDIO_RESOLUTION_LOCAL_TTL = 300
+    service = PhonemeAudioService()
+    resolution_cache = get_resolution_cache()
+    first, second = phonemes
+
+    def cached(phoneme, voice_id=None):
+        return resolution_cache.get(phoneme.id, voice_id) is not None
+
+    for phoneme in phonemes:
+        _lookup(service, phoneme)
+    service.get_audio_for_phoneme(first, voice_id='en-US-AriaNeural', auto_generate=False)
+    assert cached(first) and cached(first, 'en-US-AriaNeural') and cached(second)
+
+    # One phoneme, every voice
+    invalidate_phoneme_audio(first.id)
+    assert not cached(first) and not cached(first, 'en-US-AriaNeural') and cached(second)
+
+    # New audio for a phoneme (post_save signal)
+    AudioSource.objects.create(
+        phoneme=second, source_type='tts', audio_file='phonemes/tts.mp3',
+        cached_until=timezone.now() + timedelta(days=1)
+    )
+    assert not cached(second)
+
+    # Whole namespace
+    for phoneme in phonemes:
+        _lookup(service, phoneme)
+    with django_assert_num_queries(0):
+        service.clear_all_audio_cache()
+    assert not cached(first) and not cached(second)
+    assert resolution_cache.stats()['invalidations'] >= 3
+
+    if shared:
+        # Bumped by another process: seen once the local copy expires
+        _lookup(service, first)
+        bump_version(f'phoneme_audio:version:{first.id}')
+        assert cached(first)
+        later = time.monotonic() + settings.AUDIO_RESOLUTION_LOCAL_TTL
+        monkeypatch.setattr(audio_resolution.time, 'monotonic', lambda: later)
+        assert not cached(first)
+
+
+@pytest.mark.django_db
+def test_bounded_lru_ttl_and_shared_failure(phonemes, settings, monkeypatch):
+    settings.AUDIO_RESOLUTION_SHARED_CACHE = False
+    resolution_cache = AudioResolutionCache(max_entries=2)
+    audio = AudioSource.objects.filter(phoneme=phonemes[0]).get()
+    descriptor = describe_audio(audio)
+
+    for phoneme_id in (1, 2, 3):
+        assert resolution_cache.set(phoneme_id, None, descriptor, ttl=60)
+    assert len(resolution_cache.local) == 2
+    assert resolution_cache.get(1) is None and resolution_cache.get(3) == descriptor
+
+    # TTS descriptors expire with the audio
+    tts = AudioSource.objects.create(
+        phoneme=phonemes[1], source_type='tts', audio_file='phonemes/tts.mp3',
+        cached_until=timezone.now() - timedelta(minutes=1)
+    )
+    assert not resolution_cache.set(phonemes[1].id, None, describe_audio(tts), ttl=60)
+    tts.cached_until = timezone.now() + timedelta(seconds=10)
+    assert audio_resolution.descriptor_ttl(describe_audio(tts), 1800) <= 10
+
+    # Shared tier down: a miss, resolved from the database
+    class BrokenCache:
+        def __getattr__(self, name):
+            raise ConnectionError('cache unavailable')
+
+    settings.AUDIO_RESOLUTION_SHARED_CACHE = True
+    monkeypatch.setattr(audio_resolution, 'cache', BrokenCache())
+    service = PhonemeAudioService()
+    assert _lookup(service, phonemes[0]).id == audio.id
+    assert get_resolution_cache().stats()['errors'] >= 1
@@ -0,0 +1,92 @@
+"""
+Tests for the IPA minimal pair index.
+
+Tests:
+- Transcriptions are segmented by the phoneme inventory
+- One pass finds the pairs of every contrast, with positions
+- Incremental add() returns only the new pairs
+- The command creates pairs from PhonemeWord and vocabulary transcriptions
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.curriculum.models import MinimalPair, Phoneme, PhonemeWord
+from apps.curriculum.services.minimal_pair_index import MinimalPairIndex, build_minimal_pair_index
+from apps.vocabulary.models import Word
+
+INVENTORY = ['p', 'b', 't', 'd', 'ʃ', 's', 'ɪ', 'iː', 'e', 'æ', 'n', 'tʃ']
+
+WORDS = [
+    ('ship', '/ʃɪp/'),
+    ('sheep', '/ʃiːp/'),
+    ('sip', '/sɪp/'),
+    ('pin', '/pɪn/'),
+    ('bin', '/bɪn/'),
+    ('Bin', 'bɪn'),         # Duplicate spelling/transcription
+    ('pen', '/pen/'),
+    ('chip', '/ˈtʃɪp/'),
+]
+
+
+@pytest.fixture
+def index():
+    index = MinimalPairIndex(INVENTORY)
+    for word, ipa in WORDS:
+        index.add(word, ipa)
+    return index
+
+
+def test_segmentation():
+    index = MinimalPairIndex(INVENTORY)
+    assert index.segment('/ˈtʃiːp/') == ('tʃ', 'iː', 'p')
+    assert index.segment('ʃi:p') == ('ʃ', 'iː', 'p')
+    assert index.segment('/bʌs/') == ('b', 'ʌ', 's')
+
+
+def test_pairs_for_all_contrasts(index):
+    found = {(m.word_1.word, m.word_2.word, m.phoneme_1, m.phoneme_2, m.position_label) for m in index.pairs()}
+
+    assert found == {
+        ('sheep', 'ship', 'iː', 'ɪ', 'medial'),
+        ('sip', 'ship', 's', 'ʃ', 'initial'),
+        ('chip', 'ship', 'tʃ', 'ʃ', 'initial'),
+        ('sip', 'chip', 's', 'tʃ', 'initial'),
+        ('bin', 'pin', 'b', 'p', 'initial'),
+        ('pen', 'pin', 'e', 'ɪ', 'medial'),
+    }
+    assert len(index) == 7
+
+    ordered = index.pairs(contrast=('ɪ', 'iː'))
+    assert [(m.word_1.word, m.word_2.word, m.position) for m in ordered] == [('ship', 'sheep', 1)]
+
+
+def test_incremental_add(index):
+    new = index.add('pit', '/pɪt/')
+    assert {(m.word_1.word, m.contrast, m.position_label) for m in new} == {('pin', ('n', 't'), 'final')}
+    assert index.add('pit', 'pɪt') == []
+    assert len(index.pairs(contrast=('n', 't'))) == 1
+
+
+@pytest.mark.django_db
+def test_command_creates_pairs(monkeypatch, phoneme_category):
+    long_i = Phoneme.objects.create(category=phoneme_category, ipa_symbol='iː', phoneme_type='long_vowel', order=1)
+    short_i = Phoneme.objects.create(category=phoneme_category, ipa_symbol='ɪ', phoneme_type='short_vowel', order=2)
+    PhonemeWord.objects.create(phoneme=long_i, word='Sheep', ipa_transcription='/ʃiːp/')
+    PhonemeWord.objects.create(phoneme=short_i, word='Ship', ipa_transcription='/ʃɪp/')
+    Word.objects.create(text='seat', pos='noun', cefr_level='A1', meaning_vi='ghế', ipa='siːt')
+    Word.objects.create(text='sit', pos='verb', cefr_level='A1', meaning_vi='ngồi', ipa='sɪt')
+    assert len(build_minimal_pair_index()) == 4
+
+    monkeypatch.setattr('builtins.input', lambda message: 'y')
+    call_command('auto_generate_minimal_pairs', phoneme1='ɪ', phoneme2='iː', stdout=StringIO())
+    call_command('auto_generate_minimal_pairs', phoneme1='iː', phoneme2='ɪ', stdout=StringIO())
+
+    pairs = MinimalPair.objects.order_by('word_1')
+    assert [(p.word_1, p.word_2, p.word_1_ipa, p.difficulty) for p in pairs] == [
+        ('Ship', 'Sheep', '/ʃɪp/', 2),
+        ('sit', 'seat', 'sɪt', 2),
+    ]
+    assert pairs[1].word_2_meaning == 'ghế'
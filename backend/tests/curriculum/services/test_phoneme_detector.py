@@ -0,0 +1,65 @@
+"""
+Unit tests for the precompiled phoneme detector (GraphemeTrie).
+
+Tests:
+- Same output as one re.finditer() per spelling check
+- Per-word memoization
+- Batch API matches per-text analysis
+"""
+
+import re
+
+import pytest
+
+from apps.curriculum.phoneme_analyzer import (
+    PHONEME_SPELLING_CHECKS, PhonemeAnalyzer, detect_word_phonemes
+)
+
+
+def regex_detect(word):
+    detected = []
+    for alternatives, phonemes in PHONEME_SPELLING_CHECKS:
+        for match in re.finditer('|'.join(alternatives), word):
+            for phoneme in phonemes:
+                detected.append((phoneme, match.start(), match.group()))
+    return tuple(detected)
+
+
+@pytest.mark.parametrize('word', [
+    'she', 'sells', 'seashells', 'thinking', 'nation', 'session', 'catch',
+    'church', 'strength', 'eee', 'eea', 'tchtch', 'ssh', 'teeth', 'world,', '',
+])
+def test_matches_regex_detector(word):
+    assert detect_word_phonemes(word) == regex_detect(word)
+
+
+def test_words_are_memoized():
+    analyzer = PhonemeAnalyzer()
+    detect_word_phonemes.cache_clear()
+
+    for _ in range(3):
+        analyzer.identify_problem_phonemes('three thin thieves', ['tree'], [0.5])
+
+    info = detect_word_phonemes.cache_info()
+    assert info.misses == 3
+    assert info.hits == 6
+
+
+def test_results_are_not_shared():
+    analyzer = PhonemeAnalyzer()
+    first = analyzer.analyze_text_for_phonemes('three')
+    first[0]['phoneme'] = 'x'
+
+    assert analyzer.analyze_text_for_phonemes('three')[0]['phoneme'] == 'θ'
+
+
+def test_batch_matches_single_text():
+    analyzer = PhonemeAnalyzer()
+    texts = ['She sells seashells', 'The thirty-three thieves', 'She sells']
+
+    assert analyzer.analyze_texts_for_phonemes(texts) == [
+        analyzer.analyze_text_for_phonemes(text) for text in texts
+    ]
+    assert analyzer.analyze_text_for_phonemes('Red lorry')[0] == {
+        'phoneme': 'r', 'position': 0, 'spelling': 'r', 'word': 'red'
+    }
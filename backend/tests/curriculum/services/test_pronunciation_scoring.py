@@ -0,0 +1,132 @@
+"""
+Tests for the offline pronunciation scorer and the async recording scoring.
+
+Tests:
+- Vectorized DTW matches the textbook recurrence
+- VAD trims silence; pitch is tracked on voiced frames
+- Same vowel scores higher than a different vowel or a much longer attempt
+- Upload queues scoring on commit and attaches the score to the recording;
+  a passing score masters the phoneme without counting a second attempt
+"""
+
+import io
+import wave
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+np = pytest.importorskip('numpy')
+
+from apps.curriculum.models import AudioSource  # noqa: E402
+from apps.curriculum.pronunciation_scoring import (  # noqa: E402
+    LocalPronunciationScorer, ScoringError, decode_audio, dtw_distance, extract_features
+)
+from apps.study.models import ProductionRecording  # noqa: E402
+
+RATE = 22050
+
+
+def _vowel(f0=150, duration=0.8, formants=(700, 1200), silence=0.3, seed=0):
+    """Harmonic 'vowel' with formant-shaped spectrum, padded with low noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * RATE)) / RATE
+    phase = 2 * np.pi * np.cumsum(f0 * (1 + 0.1 * np.sin(2 * np.pi * 1.5 * t))) / RATE
+    voiced = sum(
+        np.sin(k * phase) / k * (1 + sum(2 * np.exp(-((k * f0 - f) / 200) ** 2) for f in formants))
+        for k in range(1, 20)
+    )
+    voiced = 0.5 * voiced / np.abs(voiced).max()
+    pad = np.zeros(int(silence * RATE))
+    signal = np.concatenate([pad, voiced, pad])
+    return signal + rng.normal(0, 0.002, len(signal))
+
+
+def _wav(signal):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def test_dtw_matches_reference_recurrence():
+    rng = np.random.default_rng(1)
+    a, b = rng.normal(size=(17, 4)), rng.normal(size=(23, 4))
+
+    cost = np.sqrt(((a[:, None] - b[None]) ** 2).sum(axis=2))
+    table = np.full((18, 24), np.inf)
+    table[0, 0] = 0
+    for i in range(1, 18):
+        for j in range(1, 24):
+            table[i, j] = cost[i - 1, j - 1] + min(table[i - 1, j - 1], table[i - 1, j], table[i, j - 1])
+
+    assert dtw_distance(a, b) == pytest.approx(table[-1, -1] / 40)
+
+
+def test_features_segment_speech_and_track_pitch():
+    samples = decode_audio(io.BytesIO(_wav(_vowel())))
+    features = extract_features(samples)
+
+    assert len(samples) == pytest.approx(1.4 * 16000, abs=2)
+    assert len(features.segments) == 1
+    assert features.speech_duration == pytest.approx(0.8, abs=0.1)
+    assert features.summary()['pitch_mean'] == pytest.approx(150, rel=0.05)
+    assert not features.speech_mask[:20].any()
+
+
+def test_score_ranks_attempts():
+    scorer = LocalPronunciationScorer()
+    reference = io.BytesIO(_wav(_vowel()))
+
+    same = scorer.score(io.BytesIO(_wav(_vowel(seed=1))), reference)
+    other_vowel = scorer.score(io.BytesIO(_wav(_vowel(formants=(300, 2300), seed=2))), reference)
+    too_long = scorer.score(io.BytesIO(_wav(_vowel(f0=140, duration=1.6, seed=3))), reference)
+
+    assert same['score'] > 80
+    assert same['score'] > other_vowel['score']
+    assert same['score'] > too_long['score']
+    assert too_long['duration_ratio'] > 1.7
+    assert 'dài' in too_long['feedback']
+
+    with pytest.raises(ScoringError):
+        scorer.score(io.BytesIO(_wav(np.zeros(RATE))), reference)
+
+
+@pytest.mark.django_db
+def test_upload_scores_recording_asynchronously(authenticated_client, phoneme, settings, tmp_path,
+                                                monkeypatch, django_capture_on_commit_callbacks):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.REFERENCE_FEATURE_ROOT = str(tmp_path / 'reference_features')
+    monkeypatch.setattr('apps.curriculum.reference_features._reference_feature_store', None)
+    reference = AudioSource(phoneme=phoneme, source_type='native')
+    reference.audio_file.save('reference.wav', ContentFile(_wav(_vowel())), save=True)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        response = authenticated_client.post('/api/v1/production/recordings/upload/', {
+            'phoneme_id': phoneme.id,
+            'audio_file': SimpleUploadedFile('attempt.wav', _wav(_vowel(seed=4)), content_type='audio/wav'),
+            'duration_seconds': '1.4',
+        }, format='multipart')
+
+    assert response.status_code == 201
+    recording_data = response.json()['data']['recording']
+    assert recording_data['scoring_status'] == 'pending'
+    assert len(callbacks) == 1
+
+    from apps.users.models import UserPhonemeProgress
+    UserPhonemeProgress.objects.filter(phoneme=phoneme).update(discrimination_accuracy=0.9)
+
+    callbacks[0]()     # Eager Celery in tests: runs the scoring task inline
+    recording = ProductionRecording.objects.get(id=recording_data['id'])
+    assert recording.scoring_status == 'completed'
+    assert recording.ai_score > 80
+    assert recording.ai_feedback
+    assert recording.ai_metrics['reference_audio_id'] == reference.id
+    assert recording.ai_metrics['recording']['segments'] == 1
+    progress = recording.phoneme.user_progress.get()
+    assert progress.production_best_score == pytest.approx(recording.ai_score / 100)
+    assert (progress.current_stage, progress.mastery_level, progress.production_attempts) == ('mastered', 5, 1)
+    assert progress.mastered_at is not None
@@ -0,0 +1,140 @@
+"""
+Tests for the float16 reference-audio feature store.
+
+Tests:
+- Features are decoded once, stored as float16 and read back memory-mapped
+- Stored features score like freshly extracted ones
+- Identical audio shares one file; minimal pair audio is supported
+- AudioVersion.activate() switches the phoneme to the new version's features
+"""
+
+import io
+import wave
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+np = pytest.importorskip('numpy')
+
+from apps.curriculum import reference_features  # noqa: E402
+from apps.curriculum.models import (  # noqa: E402
+    AudioSource, AudioVersion, MinimalPair, Phoneme
+)
+from apps.curriculum.pronunciation_scoring import LocalPronunciationScorer  # noqa: E402
+from apps.curriculum.reference_features import ReferenceFeatureStore, content_hash  # noqa: E402
+
+RATE = 16000
+
+
+def _wav(f0=150, duration=0.6, seed=0):
+    """Voiced harmonic tone between two short silences."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * RATE)) / RATE
+    voiced = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 12))
+    pad = np.zeros(RATE // 4)
+    signal = np.concatenate([pad, 0.5 * voiced / np.abs(voiced).max(), pad])
+    signal += rng.normal(0, 0.002, len(signal))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes((np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path, settings, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.REFERENCE_FEATURE_ROOT = str(tmp_path / 'reference_features')
+    cache.clear()
+    store = ReferenceFeatureStore()
+    monkeypatch.setattr(reference_features, '_reference_feature_store', store)
+    return store
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    original = reference_features.decode_audio
+
+    def counting(source, *args, **kwargs):
+        calls.append(source)
+        return original(source, *args, **kwargs)
+
+    monkeypatch.setattr(reference_features, 'decode_audio', counting)
+    return calls
+
+
+def _audio_source(phoneme, data, name='reference.wav'):
+    source = AudioSource(phoneme=phoneme, source_type='native')
+    source.audio_file.save(name, ContentFile(data), save=True)
+    return source
+
+
+def test_decoded_once_and_memory_mapped(store, decode_calls):
+    data = _wav()
+    key, first = store.get(io.BytesIO(data))
+    store._open.clear()
+    _, second = store.get(io.BytesIO(data))
+
+    assert len(decode_calls) == 1
+    assert store.path_for(key).exists()
+    assert isinstance(second.mfcc.base, np.memmap)
+    assert second.mfcc.dtype == np.float16
+    assert second.segments == first.segments
+    assert second.duration == pytest.approx(1.1, abs=0.01)
+
+
+def test_stored_features_score_like_fresh(store):
+    reference, attempt = _wav(), _wav(f0=160, duration=0.7, seed=1)
+    scorer = LocalPronunciationScorer()
+
+    fresh = scorer.score(io.BytesIO(attempt), io.BytesIO(reference))
+    stored = scorer.score(io.BytesIO(attempt), store.get(io.BytesIO(reference))[1])
+
+    assert stored['score'] == pytest.approx(fresh['score'], abs=1.0)
+    assert stored['reference'] == fresh['reference']
+
+
+@pytest.mark.django_db
+def test_same_audio_shares_file_and_minimal_pairs(store, phoneme, decode_calls):
+    data = _wav()
+    first = _audio_source(phoneme, data, 'a.wav')
+    second = _audio_source(phoneme, data, 'b.wav')
+    other = Phoneme.objects.create(category=phoneme.category, ipa_symbol='æ', vietnamese_approx='a', order=2)
+    pair = MinimalPair(phoneme_1=phoneme, phoneme_2=other, word_1='bed', word_1_ipa='bed',
+                       word_2='bad', word_2_ipa='bæd')
+    pair.word_1_audio.save('bed.wav', ContentFile(data), save=False)
+    pair.word_2_audio.save('bad.wav', ContentFile(_wav(f0=200)), save=False)
+    pair.save()
+
+    store.for_audio_source(first)
+    store.for_audio_source(second)
+    word_1, word_2 = store.for_minimal_pair(pair)
+
+    assert len(decode_calls) == 2
+    assert len(list(store.root.glob('*/*.npy'))) == 2
+    assert word_1 is store.load(content_hash(first.audio_file))
+    assert word_2.summary()['pitch_mean'] == pytest.approx(200, rel=0.05)
+
+
+@pytest.mark.django_db
+def test_activate_switches_phoneme_features(store, phoneme, django_capture_on_commit_callbacks):
+    old = AudioVersion.objects.create(phoneme=phoneme, audio_source=_audio_source(phoneme, _wav(f0=120)))
+    new = AudioVersion.objects.create(phoneme=phoneme, audio_source=_audio_source(phoneme, _wav(f0=220)))
+    with django_capture_on_commit_callbacks(execute=True):
+        old.activate()
+
+    phoneme.refresh_from_db()
+    assert store.for_phoneme(phoneme).summary()['pitch_mean'] == pytest.approx(120, rel=0.05)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        new.activate(reason='Clearer voice')
+    assert len(callbacks) == 1
+    assert cache.get(reference_features.phoneme_cache_key(phoneme.id)) is None
+
+    phoneme.refresh_from_db()
+    assert store.for_phoneme(phoneme).summary()['pitch_mean'] == pytest.approx(220, rel=0.05)
@@ -0,0 +1,173 @@
+"""
+Unit tests for TTSBatchSynthesizer.
+
+Tests:
+- Bounded concurrency
+- De-duplication of identical jobs
+- Retry with backoff and permanent failures
+- Progress callback
+- Per-voice rate limiting; throttled or backing-off jobs don't hold a
+  concurrency slot
+- Mock mode through EnglishTTSService
+"""
+
+import asyncio
+import os
+import time
+
+from apps.curriculum.services.edge_tts_service import EnglishTTSService
+from apps.curriculum.services.tts_batch import TTSBatchSynthesizer, TTSJob
+
+
+def make_synthesizer(synthesize, **kwargs):
+    kwargs.setdefault('rate_per_voice', 0)
+    kwargs.setdefault('backoff_base', 0.001)
+    return TTSBatchSynthesizer(synthesize=synthesize, **kwargs)
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def synthesize(job):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"/tmp/{job.text}.mp3"
+
+    jobs = [TTSJob(text=f"word{i}", voice_key="us_female_clear") for i in range(40)]
+    summary = make_synthesizer(synthesize, concurrency=5).run_sync(jobs)
+
+    assert summary['total'] == 40
+    assert summary['successful'] == 40
+    assert peak == 5
+
+
+def test_duplicate_jobs_are_synthesized_once():
+    calls = []
+
+    async def synthesize(job):
+        calls.append(job)
+        return "/tmp/x.mp3"
+
+    job = TTSJob(text="hello", voice_key="gb_male", speed_level="beginner")
+    summary = make_synthesizer(synthesize).run_sync([job, job, job])
+
+    assert summary['total'] == 1
+    assert calls == [job]
+
+
+def test_transient_errors_are_retried():
+    attempts = {}
+
+    async def synthesize(job):
+        attempts[job.text] = attempts.get(job.text, 0) + 1
+        if attempts[job.text] < 3:
+            raise RuntimeError("503 from Edge TTS")
+        return "/tmp/ok.mp3"
+
+    summary = make_synthesizer(synthesize, max_retries=3).run_sync([TTSJob(text="retry")])
+
+    result = summary['results'][0]
+    assert result['success'] is True
+    assert result['attempts'] == 3
+    assert summary['retries'] == 2
+
+
+def test_gives_up_after_max_retries_and_skips_invalid_input():
+    async def synthesize(job):
+        if not job.text.strip():
+            raise ValueError("Text cannot be empty")
+        raise RuntimeError("network down")
+
+    summary = make_synthesizer(synthesize, max_retries=2).run_sync(
+        [TTSJob(text="down"), TTSJob(text="  ")]
+    )
+    results = {r['job'].text: r for r in summary['results']}
+
+    assert summary['failed'] == 2
+    assert results['down']['attempts'] == 3
+    assert results['  ']['attempts'] == 1
+    assert 'empty' in results['  ']['error']
+
+
+def test_progress_callback_reports_every_job():
+    seen = []
+
+    async def synthesize(job):
+        return "/tmp/x.mp3"
+
+    jobs = [TTSJob(text=str(i)) for i in range(7)]
+    make_synthesizer(
+        synthesize,
+        progress_callback=lambda done, total, result: seen.append((done, total)),
+    ).run_sync(jobs)
+
+    assert [done for done, _ in seen] == list(range(1, 8))
+    assert all(total == 7 for _, total in seen)
+
+
+def test_rate_limit_applies_per_voice():
+    async def synthesize(job):
+        return "/tmp/x.mp3"
+
+    # 4 requests at 20/s on one voice need >= 3 * 50ms
+    jobs = [TTSJob(text=str(i), voice_key="us_male_standard") for i in range(4)]
+    started = time.monotonic()
+    make_synthesizer(synthesize, concurrency=4, rate_per_voice=20).run_sync(jobs)
+    single_voice = time.monotonic() - started
+
+    # The same 4 requests spread over 4 voices do not wait on each other
+    voices = ["us_male_standard", "us_female_clear", "gb_male", "gb_female"]
+    jobs = [TTSJob(text=str(i), voice_key=voice) for i, voice in enumerate(voices)]
+    started = time.monotonic()
+    make_synthesizer(synthesize, concurrency=4, rate_per_voice=20).run_sync(jobs)
+    many_voices = time.monotonic() - started
+
+    assert single_voice >= 0.14
+    assert many_voices < single_voice
+
+
+def test_waiting_jobs_do_not_hold_concurrency_slots():
+    finished = []
+    failures = {'flaky': 1}
+
+    async def synthesize(job):
+        if failures.get(job.text):
+            failures[job.text] -= 1
+            raise RuntimeError("503 from Edge TTS")
+        finished.append(job.text)
+        return "/tmp/x.mp3"
+
+    # One slot: a voice limited to 5/s and a job backing off for 0.3s must
+    # not keep the unthrottled voice waiting
+    jobs = [TTSJob(text=f"slow{i}", voice_key="gb_male") for i in range(3)]
+    jobs += [TTSJob(text="flaky", voice_key="us_male_standard")]
+    jobs += [TTSJob(text=f"fast{i}", voice_key="us_female_clear") for i in range(3)]
+    make_synthesizer(
+        synthesize, concurrency=1, rate_overrides={"gb_male": 5}, backoff_base=0.3
+    ).run_sync(jobs)
+
+    assert set(finished[-2:]) == {"slow2", "flaky"}
+    assert {"fast0", "fast1", "fast2"} <= set(finished[:4])
+
+
+def test_mock_mode_batch_through_english_tts_service(db, tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_TTS', 'true')
+    service = EnglishTTSService(output_dir=str(tmp_path))
+
+    jobs = [
+        TTSJob(text=word, voice_key=voice, speed_level=speed)
+        for word in ("apple", "banana")
+        for voice in ("us_female_clear", "gb_male")
+        for speed in ("beginner", "advanced")
+    ]
+    summary = service.generate_speech_batch_sync(
+        jobs, concurrency=8, rate_per_voice=0, mock_latency=0.01
+    )
+
+    assert summary['successful'] == 8
+    assert len({r['path'] for r in summary['results']}) == 8
+    assert all(os.path.exists(r['path']) for r in summary['results'])
@@ -0,0 +1,156 @@
+"""
+Tests for the write-behind audio usage counters.
+
+Tests:
+- Playback lookups write nothing; one flush adds every count with a
+  fixed number of queries (missing AudioCache rows created)
+- A full buffer spills to the database on its own (process-local cache),
+  an idle one once its timer fires
+- With a shared cache, spills go to the cache and the periodic flush moves
+  them to the database, reading only the rows in the dirty log; failed
+  writes keep the counts
+"""
+
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.curriculum import usage_counters
+from apps.curriculum.models import AudioCache, AudioSource, AudioVersion, Phoneme
+from apps.curriculum.services.audio_service import PhonemeAudioService
+from apps.curriculum.tasks import flush_audio_usage_counters
+from apps.curriculum.usage_counters import (
+    AUDIO_SOURCE, AUDIO_VERSION, DIRTY_SEQ_KEY, UsageCounterBuffer, flush_usage_counters, get_usage_buffer,
+    record_usage, spill_usage_buffer
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    cache.clear()
+    get_usage_buffer().drain()
+    yield
+    get_usage_buffer().drain()
+
+
+@pytest.fixture
+def sources(phoneme_category):
+    phonemes = [
+        Phoneme.objects.create(category=phoneme_category, ipa_symbol=symbol, phoneme_type='short_vowel', order=i)
+        for i, symbol in enumerate(['ɪ', 'e'])
+    ]
+    native = AudioSource.objects.create(phoneme=phonemes[0], source_type='native', audio_file='a.mp3')
+    uncached = AudioSource.objects.create(phoneme=phonemes[1], source_type='native', audio_file='b.mp3')
+    AudioCache.objects.create(audio_source=native, usage_count=5)
+    version = AudioVersion.objects.create(phoneme=phonemes[0], audio_source=native)
+    return phonemes, native, uncached, version
+
+
+def _usage(source):
+    return AudioCache.objects.get(audio_source=source).usage_count
+
+
+@pytest.mark.django_db
+def test_lookups_are_buffered_and_flushed_in_batches(sources, django_assert_max_num_queries):
+    phonemes, native, uncached, version = sources
+    service = PhonemeAudioService()
+
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(3):
+            service.get_audio_for_phoneme(phonemes[0], use_cache=False, auto_generate=False)
+        service.get_audio_for_phoneme(phonemes[1], use_cache=False, auto_generate=False)
+        version.increment_usage()
+        version.increment_usage()
+    assert not [q for q in queries.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+    assert _usage(native) == 5
+    assert len(get_usage_buffer()) == 3
+
+    with django_assert_max_num_queries(8):
+        result = flush_audio_usage_counters()
+
+    assert result['local'] == 3
+    assert result['updated'] == {AUDIO_SOURCE: 2, AUDIO_VERSION: 1}
+    assert (_usage(native), _usage(uncached)) == (8, 1)
+    version.refresh_from_db()
+    assert version.usage_count == 2
+    assert flush_usage_counters()['local'] == 0
+
+
+@pytest.mark.django_db
+def test_full_buffer_spills_to_database(sources, settings):
+    _, native, uncached, _ = sources
+    settings.AUDIO_USAGE_MAX_PENDING = 2
+
+    record_usage(AUDIO_SOURCE, native.id)
+    assert _usage(native) == 5
+    record_usage(AUDIO_SOURCE, uncached.id)
+
+    assert len(get_usage_buffer()) == 0
+    assert (_usage(native), _usage(uncached)) == (6, 1)
+
+
+def test_idle_buffer_spills_on_timer(settings):
+    settings.AUDIO_USAGE_FLUSH_SECONDS = 0.01
+    due = threading.Event()
+    buffer = UsageCounterBuffer(on_due=due.set)
+
+    assert not buffer.add(AUDIO_SOURCE, 1)
+    assert due.wait(5)
+
+    # Drained before the timer fired: cancelled
+    due.clear()
+    settings.AUDIO_USAGE_FLUSH_SECONDS = 0.2
+    buffer.add(AUDIO_SOURCE, 1)
+    buffer.drain()
+    assert not due.wait(0.4)
+
+
+@pytest.mark.django_db
+def test_shared_cache_tier(sources, settings, monkeypatch, django_assert_num_queries):
+    _, native, _, version = sources
+    settings.AUDIO_USAGE_SHARED_CACHE = True
+    settings.AUDIO_USAGE_MAX_PENDING = 1
+
+    record_usage(AUDIO_SOURCE, native.id)
+    record_usage(AUDIO_SOURCE, native.id)
+    record_usage(AUDIO_VERSION, version.id, count=4)
+    assert cache.get(f'audio_usage:{AUDIO_SOURCE}:{native.id}') == 2
+    assert _usage(native) == 5
+
+    def broken(deltas):
+        raise RuntimeError('database unavailable')
+
+    # Local counts survive a failed write
+    settings.AUDIO_USAGE_MAX_PENDING = 1000
+    record_usage(AUDIO_SOURCE, native.id)
+    monkeypatch.setattr(usage_counters, 'apply_usage_deltas', broken)
+    with pytest.raises(RuntimeError):
+        flush_usage_counters()
+    assert len(get_usage_buffer()) == 1
+    monkeypatch.undo()
+
+    result = flush_usage_counters()
+    assert (result['local'], result['shared']) == (1, 2)
+    assert _usage(native) == 8
+    version.refresh_from_db()
+    assert version.usage_count == 4
+    assert cache.get(f'audio_usage:{AUDIO_SOURCE}:{native.id}') == 0
+    with django_assert_num_queries(0):
+        assert flush_usage_counters()['shared'] == 0
+
+    # A spill number taken but not written yet: later spills are flushed,
+    # the gap is waited for one flush, then skipped
+    settings.AUDIO_USAGE_MAX_PENDING = 1
+    cache.incr(DIRTY_SEQ_KEY)
+    record_usage(AUDIO_SOURCE, native.id)
+    assert flush_usage_counters()['shared'] == 1
+    record_usage(AUDIO_VERSION, version.id)
+    assert flush_usage_counters()['shared'] == 1
+    assert spill_usage_buffer() == 0
+    assert flush_usage_counters()['shared'] == 0
+    assert _usage(native) == 9
+    version.refresh_from_db()
+    assert version.usage_count == 5
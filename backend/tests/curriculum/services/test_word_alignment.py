@@ -0,0 +1,80 @@
+"""
+Unit tests for word-level alignment (apps.curriculum.word_alignment).
+
+Tests:
+- Insertions/deletions only affect the word itself
+- Accuracy matches the SequenceMatcher ratio
+- Confidence-weighted insertion cost
+- PhonemeAnalyzer and SpeechToTextService use the alignment
+"""
+
+from difflib import SequenceMatcher
+
+import pytest
+
+from apps.curriculum.phoneme_analyzer import PhonemeAnalyzer
+from apps.curriculum.speech_to_text import SpeechToTextService
+from apps.curriculum.word_alignment import (
+    OP_DELETION, OP_INSERTION, OP_MATCH, OP_SUBSTITUTION, align_words
+)
+
+TWISTER = 'She sells seashells by the seashore.'
+
+
+def test_inserted_word_does_not_shift_alignment():
+    alignment = align_words(TWISTER.split(), ['she', 'uh', 'sells', 'seashells', 'by', 'the', 'seashore'])
+
+    assert [w.op for w in alignment.errors] == [OP_INSERTION]
+    assert alignment.errors[0].detected == 'uh'
+    assert alignment.matches == 6
+
+
+def test_dropped_and_substituted_words():
+    alignment = align_words(TWISTER.split(), ['she', 'seashells', 'bye', 'the', 'seashore'])
+
+    assert [(w.op, w.expected) for w in alignment.errors] == [
+        (OP_DELETION, 'sells'), (OP_SUBSTITUTION, 'by')
+    ]
+    assert alignment.deletions == 1
+    assert alignment.substitutions == 1
+    assert alignment.words[-1].op == OP_MATCH
+
+
+@pytest.mark.parametrize('expected, detected', [
+    ('she sells seashells', 'she sells seashells'),
+    ('she sells seashells', 'she shells'),
+    ('red lorry yellow lorry', 'red lorry lorry yellow'),
+    ('a b c d', ''),
+    ('', ''),
+])
+def test_accuracy_matches_sequence_matcher(expected, detected):
+    ratio = SequenceMatcher(None, expected.split(), detected.split()).ratio() * 100
+
+    assert align_words(expected.split(), detected.split()).accuracy == pytest.approx(ratio)
+
+
+def test_low_confidence_extra_word_is_treated_as_insertion():
+    alignment = align_words(['red', 'lorry'], ['uhm', 'rid', 'lorry'], [0.3, 0.9, 0.95])
+
+    assert [(w.op, w.detected) for w in alignment.errors] == [
+        (OP_INSERTION, 'uhm'), (OP_SUBSTITUTION, 'rid')
+    ]
+
+
+def test_problem_phonemes_only_for_misaligned_words():
+    analyzer = PhonemeAnalyzer()
+    detected = ['she', 'seashells', 'by', 'the', 'seashore']
+
+    problems = analyzer.identify_problem_phonemes(TWISTER, detected, [0.95] * len(detected))
+
+    assert {p['word'] for p in problems} == {'sells'}
+    assert {p['issue'] for p in problems} == {'word_missed'}
+
+
+def test_mock_stt_reports_word_errors():
+    result = SpeechToTextService('mock')._mock_stt(None, TWISTER)
+
+    assert result['word_errors'] == [
+        error for error in result['word_errors'] if error['op'] == OP_DELETION
+    ]
+    assert len(result['word_errors']) == result['words_expected'] - result['words_detected']
@@ -0,0 +1,89 @@
+"""
+Tests for the cached pronunciation error heatmap document.
+
+Tests:
+- Document is built from a fixed number of queries, whatever the phoneme count
+- Warm calls are a single cache read
+- Saving phoneme/lesson progress drops the cached document
+"""
+
+import pytest
+
+from apps.curriculum.error_heatmap import get_error_heatmap
+from apps.curriculum.models import CurriculumStage, Phoneme, PronunciationLesson
+from apps.users.models import UserPhonemeProgress, UserPronunciationLessonProgress
+
+
+pytestmark = pytest.mark.usefixtures('clear_cache')
+
+
+@pytest.fixture
+def phonemes(phoneme_category):
+    types = ['short_vowel', 'long_vowel', 'plosive', 'fricative', 'nasal', 'diphthong']
+    return [
+        Phoneme.objects.create(
+            category=phoneme_category, ipa_symbol=f'x{i}', vietnamese_approx=f'x{i}', phoneme_type=phoneme_type, order=i
+        )
+        for i, phoneme_type in enumerate(types)
+    ]
+
+
+@pytest.fixture
+def stage(db):
+    return CurriculumStage.objects.create(number=4, name='Connected Speech', name_vi='Nối âm', order=4)
+
+
+def _lesson(stage, slug, title, phonemes=(), status='published'):
+    lesson = PronunciationLesson.objects.create(
+        stage=stage, title=title, title_vi=title, slug=slug, status=status
+    )
+    lesson.phonemes.set(phonemes)
+    return lesson
+
+
+@pytest.mark.django_db
+def test_heatmap_document(user, phonemes, stage, django_assert_max_num_queries):
+    accuracies = [0.2, 0.5, 0.9, 0.6, 0.1, 0.65]
+    for phoneme, accuracy in zip(phonemes, accuracies):
+        UserPhonemeProgress.objects.create(
+            user=user, phoneme=phoneme, discrimination_accuracy=accuracy, times_practiced=10
+        )
+    _lesson(stage, 'draft', 'Draft', [phonemes[4]], status='draft')
+    lesson = _lesson(stage, 'ending-sounds', 'Ending sounds', [phonemes[4], phonemes[0]])
+    passed = _lesson(stage, 'clusters', 'Consonant clusters')
+    UserPronunciationLessonProgress.objects.create(
+        user=user, pronunciation_lesson=lesson, challenge_correct=2, challenge_total=10
+    )
+    UserPronunciationLessonProgress.objects.create(
+        user=user, pronunciation_lesson=passed, challenge_correct=8, challenge_total=10, status='completed'
+    )
+
+    with django_assert_max_num_queries(4):
+        heatmap = get_error_heatmap(user)
+
+    assert [e['phoneme']['ipa_symbol'] for e in heatmap['phoneme_errors']] == ['x4', 'x0', 'x1', 'x3', 'x5']
+    assert heatmap['phoneme_errors'][0]['error_rate'] == pytest.approx(90)
+    assert heatmap['error_categories'] == {'vowels': 3, 'consonants': 2, 'ending_sounds': 1, 'clusters': 0}
+    assert heatmap['total_lessons'] == 2
+    assert heatmap['completion_rate'] == 50
+    assert heatmap['avg_accuracy'] == 50
+    assert heatmap['common_mistakes'][0]['stage']['name_vi'] == 'Nối âm'
+
+    recommendations = [(r['type'], r['lesson']['slug'], r['priority']) for r in heatmap['recommendations']]
+    assert recommendations == [
+        ('phoneme', 'ending-sounds', 'high'),
+        ('phoneme', 'ending-sounds', 'high'),
+        ('lesson', 'ending-sounds', 'critical'),
+    ]
+
+
+@pytest.mark.django_db
+def test_cached_until_progress_changes(user, phonemes, django_assert_num_queries):
+    progress = UserPhonemeProgress.objects.create(user=user, phoneme=phonemes[0], discrimination_accuracy=0.4)
+    assert len(get_error_heatmap(user)['phoneme_errors']) == 1
+
+    with django_assert_num_queries(0):
+        assert get_error_heatmap(user)['has_errors']
+
+    progress.update_discrimination_progress(correct=9, total=10)
+    assert not get_error_heatmap(user)['has_errors']
@@ -0,0 +1,101 @@
+"""
+Tests for the audio storage garbage collector.
+
+Tests:
+- Store files are evicted by recorded last access, then LRU down to the
+  size budget; dry runs delete nothing
+- The report carries bytes reclaimed and the expected hit-rate loss
+- Expired TTS AudioSources are deleted in bulk with their files; recently
+  played ones are renewed and versioned ones kept
+"""
+
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from apps.curriculum.models import AudioCache, AudioSource, AudioStoreEntry, AudioVersion
+from apps.curriculum.tasks import clean_expired_audio_cache
+from services.audio_gc import collect_audio_store, get_last_gc_report
+from services.audio_store import AudioStore, make_audio_key
+
+
+@pytest.fixture
+def store(db, tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return AudioStore(root=tmp_path / 'audio_store')
+
+
+def _put(store, word, size, days_ago, accesses):
+    key = make_audio_key(word, 'en-US-GuyNeural')
+    tmp = store.temp_path(key)
+    tmp.write_bytes(b'x' * size)
+    store.commit(key, tmp, text=word)
+    AudioStoreEntry.objects.filter(key=key).update(
+        last_accessed_at=timezone.now() - timedelta(days=days_ago), access_count=accesses
+    )
+    return key
+
+
+def test_store_eviction_by_age_then_budget(store):
+    old = _put(store, 'old', 100, days_ago=40, accesses=1)
+    stale = _put(store, 'stale', 200, days_ago=10, accesses=3)
+    warm = _put(store, 'warm', 300, days_ago=2, accesses=6)
+    hot = _put(store, 'hot', 400, days_ago=0, accesses=10)
+
+    preview = collect_audio_store(max_age_days=30, budget_bytes=750, dry_run=True, store=store)
+    assert (preview['expired'], preview['over_budget'], preview['bytes_reclaimed']) == (1, 1, 300)
+    assert store.stats()['total_files'] == 4
+
+    report = collect_audio_store(max_age_days=30, budget_bytes=750, store=store)
+    assert (report['rows_deleted'], report['files_removed'], report['bytes_reclaimed']) == (2, 2, 300)
+    assert report['bytes_remaining'] == 700
+    assert report['hit_rate_impact'] == {
+        'victim_accesses': 4, 'total_accesses': 20, 'expected_hit_rate_loss': 0.2
+    }
+    assert not store.path_for(old).exists() and not store.path_for(stale).exists()
+    assert store.existing_keys([old, stale, warm, hot]) == {warm, hot}
+
+    # AudioStore.cleanup() goes through the collector too
+    assert store.cleanup(max_age_days=1) == 1
+    assert store.existing_keys([warm, hot]) == {hot}
+
+
+@pytest.mark.django_db
+def test_expired_audio_sources(store, phoneme):
+    now = timezone.now()
+
+    def source(voice, expires_in_days, plays=0, played_days_ago=30):
+        audio = AudioSource.objects.create(
+            phoneme=phoneme, source_type='tts', voice_id=voice,
+            cached_until=now + timedelta(days=expires_in_days)
+        )
+        audio.audio_file.save(f'{voice}.mp3', ContentFile(b'x' * 50))
+        AudioCache.objects.create(audio_source=audio, file_size=50, usage_count=plays)
+        AudioCache.objects.filter(audio_source=audio).update(
+            last_accessed_at=now - timedelta(days=played_days_ago)
+        )
+        return audio
+
+    unused = source('unused', -1, plays=1)
+    played = source('played', -1, plays=5, played_days_ago=1)
+    versioned = source('versioned', -1)
+    fresh = source('fresh', 10, plays=4)
+    AudioVersion.objects.create(phoneme=phoneme, audio_source=versioned)
+    unused_path = unused.audio_file.path
+
+    result = clean_expired_audio_cache()
+
+    assert (result['cleaned'], result['files_removed'], result['bytes_reclaimed']) == (1, 1, 50)
+    assert result['renewed'] == 1
+    assert result['hit_rate_impact']['expected_hit_rate_loss'] == 0.1
+    assert set(AudioSource.objects.values_list('voice_id', flat=True)) == {'played', 'versioned', 'fresh'}
+    assert not AudioCache.objects.filter(audio_source_id=unused.id).exists()
+    assert not os.path.exists(unused_path)
+    played.refresh_from_db()
+    assert played.cached_until > now
+    assert fresh.audio_file.storage.exists(fresh.audio_file.name)
+
+    assert get_last_gc_report()['pools']['audio_sources']['rows_deleted'] == 1
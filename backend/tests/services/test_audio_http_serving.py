@@ -0,0 +1,166 @@
+"""
+Tests for the shared audio-serving layer.
+
+Tests:
+- Strong ETag from the store key / file content
+- Conditional GET (304) and immutable caching
+- Byte ranges (206, suffix, unsatisfiable 416, If-Range)
+- X-Accel-Redirect / X-Sendfile offload mode
+- Media audio URLs and the flashcard stream endpoint use the layer;
+  playing a store URL records a (throttled) access
+"""
+
+import pytest
+from django.test import RequestFactory
+
+import services.audio_store as audio_store
+from services.audio_serving import parse_range, serve_audio
+from services.audio_store import AudioStore, make_audio_key
+
+PAYLOAD = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def store(db, tmp_path, settings, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_URL = '/media/'
+    settings.AUDIO_SERVE_MODE = 'django'
+    store = AudioStore(root=tmp_path / 'audio_store')
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+    return store
+
+
+@pytest.fixture
+def stored(store):
+    key = make_audio_key("hello", "en-US-GuyNeural")
+    tmp = store.temp_path(key)
+    tmp.write_bytes(PAYLOAD)
+    return key, store.commit(key, tmp)
+
+
+def _get(path, **headers):
+    return serve_audio(RequestFactory().get('/audio', **headers), path)
+
+
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+def test_store_file_has_immutable_validators(stored):
+    key, path = stored
+
+    response = _get(path)
+
+    assert response.status_code == 200
+    assert response['ETag'] == f'"{key}"'
+    assert response['Accept-Ranges'] == 'bytes'
+    assert 'immutable' in response['Cache-Control']
+    assert response['Last-Modified']
+    assert _body(response) == PAYLOAD
+
+
+def test_if_none_match_returns_304(stored):
+    key, path = stored
+
+    assert _get(path, HTTP_IF_NONE_MATCH=f'"{key}"').status_code == 304
+    assert _get(path, HTTP_IF_NONE_MATCH=f'"other", W/"{key}"').status_code == 304
+    assert _get(path, HTTP_IF_NONE_MATCH='"other"').status_code == 200
+
+
+def test_non_store_file_gets_content_hash_etag(tmp_path, store):
+    import hashlib
+
+    path = tmp_path / 'phonemes' / 'audio' / 'ae.mp3'
+    path.parent.mkdir(parents=True)
+    path.write_bytes(PAYLOAD)
+
+    response = _get(path)
+
+    assert response['ETag'] == f'"{hashlib.sha256(PAYLOAD).hexdigest()}"'
+    assert 'immutable' not in response['Cache-Control']
+    assert _get(path, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+
+def test_parse_range():
+    assert parse_range('bytes=0-99', 1000) == (0, 99)
+    assert parse_range('bytes=900-', 1000) == (900, 999)
+    assert parse_range('bytes=-100', 1000) == (900, 999)
+    assert parse_range('bytes=500-5000', 1000) == (500, 999)
+    assert parse_range('bytes=1000-', 1000) == (-1, -1)
+    assert parse_range('bytes=0-1,5-9', 1000) is None
+    assert parse_range('items=0-1', 1000) is None
+
+
+def test_range_request_returns_206(stored):
+    key, path = stored
+
+    response = _get(path, HTTP_RANGE='bytes=10-19')
+
+    assert response.status_code == 206
+    assert response['Content-Range'] == f'bytes 10-19/{len(PAYLOAD)}'
+    assert response['Content-Length'] == '10'
+    assert _body(response) == PAYLOAD[10:20]
+
+    response = _get(path, HTTP_RANGE=f'bytes={len(PAYLOAD)}-')
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(PAYLOAD)}'
+
+    # Stale If-Range -> full file
+    response = _get(path, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+    assert response.status_code == 200
+    response = _get(path, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=f'"{key}"')
+    assert response.status_code == 206
+
+
+def test_offload_modes(stored, settings):
+    key, path = stored
+
+    settings.AUDIO_SERVE_MODE = 'x-accel-redirect'
+    response = _get(path)
+    assert response['X-Accel-Redirect'] == f'/protected-media/audio_store/{key[:2]}/{key[2:4]}/{key}.mp3'
+    assert response.content == b''
+    assert response['ETag'] == f'"{key}"'
+
+    settings.AUDIO_SERVE_MODE = 'x-sendfile'
+    assert _get(path)['X-Sendfile'] == str(path)
+
+
+def test_media_audio_url_is_served_with_validators(stored, store, client):
+    key, path = stored
+    url = store.url_for(key)
+    store._last_touch.clear()     # Committed more than an interval ago
+
+    response = client.get(url, HTTP_RANGE='bytes=0-3')
+    assert response.status_code == 206
+    assert _body(response) == PAYLOAD[:4]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=f'"{key}"').status_code == 304
+    assert store.entry(key)['access_count'] == 1    # Write throttled, hit counted
+
+    store._last_touch.clear()
+    client.get(url)
+    assert store.entry(key)['access_count'] == 3
+
+    assert client.get('/media/audio_store/index.sqlite3').status_code == 404
+    assert client.get('/media/audio_store/../../etc/passwd.mp3').status_code == 404
+
+
+@pytest.mark.django_db
+def test_flashcard_stream_supports_conditional_and_range(store, authenticated_client, monkeypatch):
+    import apps.vocabulary.views_audio as views_audio
+    from services.tts_flashcard_service import FlashcardTTSService
+
+    service = FlashcardTTSService()
+    monkeypatch.setattr(views_audio, 'get_tts_service', lambda: service)
+    key = service.get_store_key("seek", "us_male", "normal")
+    tmp = store.temp_path(key)
+    tmp.write_bytes(PAYLOAD)
+    store.commit(key, tmp)
+
+    url = '/api/v1/vocabulary/audio/stream/seek/'
+    response = authenticated_client.get(url, HTTP_RANGE='bytes=100-')
+    assert response.status_code == 206
+    assert _body(response) == PAYLOAD[100:]
+
+    response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=f'"{key}"')
+    assert response.status_code == 304
@@ -0,0 +1,142 @@
+"""
+Tests for the content-addressed AudioStore.
+
+Tests:
+- Key normalization (rate/pitch/whitespace)
+- Two-level sharded layout and atomic commit
+- Database index (size, last access, stats, delete); every hit is
+  counted, index writes are throttled
+- One key shared by all three TTS services
+- Adoption of legacy flashcard_audio files
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from services.audio_store import AudioStore, make_audio_key
+
+
+@pytest.fixture
+def store(db, tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_URL = '/media/'
+    return AudioStore(root=tmp_path / 'audio_store')
+
+
+def test_key_normalizes_equivalent_parameters():
+    base = make_audio_key("hello  world", "en-US-GuyNeural", rate="+0%", pitch="+0Hz")
+
+    assert make_audio_key(" hello world ", "en-US-GuyNeural", rate=0, pitch=0) == base
+    assert make_audio_key("hello world", "en-US-GuyNeural", rate="0%", pitch=None) == base
+    assert make_audio_key("hello world", "en-US-GuyNeural", rate="-30%") != base
+    assert make_audio_key("hello world", "en-US-AriaNeural") != base
+    assert make_audio_key("hello world", "en-US-GuyNeural", engine="mock") != base
+
+
+def test_commit_is_sharded_and_indexed(store):
+    key = make_audio_key("apple", "en-US-GuyNeural")
+    tmp = store.temp_path(key)
+    tmp.write_bytes(b"ID3" + b"\0" * 100)
+
+    path = store.commit(key, tmp, text="apple", voice="en-US-GuyNeural", rate="+0%")
+
+    assert path == store.root / key[:2] / key[2:4] / f"{key}.mp3"
+    assert path.exists()
+    assert not tmp.exists()
+    assert store.url_for(key) == f"/media/audio_store/{key[:2]}/{key[2:4]}/{key}.mp3"
+
+    entry = store.entry(key)
+    assert entry['size_bytes'] == 103
+    assert entry['voice'] == "en-US-GuyNeural"
+    assert entry['rate'] == "+0%"
+    assert store.stats()['total_files'] == 1
+
+
+def test_get_records_access_and_delete_removes_everything(store):
+    key = make_audio_key("banana", "en-GB-RyanNeural")
+    tmp = store.temp_path(key)
+    tmp.write_bytes(b"x")
+    store.commit(key, tmp)
+    store._last_touch.clear()
+
+    assert store.get(key) is not None
+    assert store.entry(key)['access_count'] == 1
+
+    # Within the interval hits are only counted; the next write adds them all
+    store.get(key)
+    store.get(key)
+    assert store.entry(key)['access_count'] == 1
+    store._last_touch.clear()
+    store.get(key)
+    assert store.entry(key)['access_count'] == 4
+
+    assert store.delete(key) is True
+    assert store.get(key) is None
+    assert store.entry(key) is None
+    assert store.stats()['total_files'] == 0
+
+
+def test_commit_inside_event_loop_is_indexed_on_flush(store):
+    key = make_audio_key("cherry", "en-US-GuyNeural")
+
+    async def synthesize():
+        tmp = store.temp_path(key)
+        tmp.write_bytes(b"x")
+        return store.commit(key, tmp, text="cherry")
+
+    path = asyncio.run(synthesize())
+
+    assert path.exists()
+    assert store._pending
+    assert store.existing_keys([key]) == {key}     # Reads apply queued writes first
+    assert not store._pending
+    assert store.entry(key)['text'] == "cherry"
+
+
+def test_clear_by_voice(store):
+    for text, voice in [("a", "en-US-GuyNeural"), ("b", "en-US-GuyNeural"), ("c", "en-GB-RyanNeural")]:
+        key = make_audio_key(text, voice)
+        tmp = store.temp_path(key)
+        tmp.write_bytes(b"x")
+        store.commit(key, tmp, voice=voice)
+
+    assert store.clear(voice="en-US-GuyNeural") == 2
+    assert store.stats()['total_files'] == 1
+
+
+def test_all_tts_services_share_one_key(store, monkeypatch):
+    import services.audio_store as audio_store
+    from services.tts_flashcard_service import FlashcardTTSService
+    from utils.tts import TTSService
+
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+
+    flashcard_key = FlashcardTTSService().get_store_key("hello", "us_male", "normal")
+    utils_key = TTSService._get_cache_key("hello", "en-US-GuyNeural", "+0%", "+0Hz")
+
+    assert flashcard_key == utils_key
+    assert TTSService._get_cache_path("hello", "en-US-GuyNeural", "+0%", "+0Hz") == store.path_for(utils_key)
+
+
+def test_legacy_flashcard_file_is_adopted(store, monkeypatch, tmp_path):
+    import services.audio_store as audio_store
+    from services.tts_flashcard_service import FlashcardTTSService
+
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+    service = FlashcardTTSService()
+    service.audio_dir = tmp_path / 'flashcard_audio'
+    service.audio_dir.mkdir()
+    (service.audio_dir / "hello_uk_female_slow.mp3").write_bytes(b"legacy")
+
+    url = service.get_audio_url("hello", "en-GB-SoniaNeural", "slow")
+    key = service.get_store_key("hello", "uk_female", "slow")
+
+    assert url == store.url_for(key)
+    assert store.path_for(key).read_bytes() == b"legacy"
+    assert not os.path.exists(service.audio_dir / "hello_uk_female_slow.mp3")
+
+    # Moved, not copied: an evicted key does not come back from the legacy dir
+    store.delete(key)
+    assert service.get_audio_url("hello", "en-GB-SoniaNeural", "slow") is None
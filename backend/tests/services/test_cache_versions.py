@@ -0,0 +1,45 @@
+"""
+Tests for the shared cache version counters.
+
+Tests:
+- Versions are seeded from the clock, stable until bumped, and never
+  reused after the cache is flushed
+- Counters are created on first use and survive expiry between add/incr
+"""
+
+import pytest
+from django.core.cache import cache
+
+from services.cache_versions import bump_version, get_version, get_versions, incr_counter
+
+
+pytestmark = pytest.mark.usefixtures('clear_cache')
+
+
+def test_versions_survive_flush():
+    version = get_version('test:version')
+    assert version > 1 and get_version('test:version') == version
+
+    bump_version('test:version')
+    bumped = get_version('test:version')
+    assert bumped == version + 1
+
+    cache.clear()
+    assert get_version('test:version') > bumped
+    cache.clear()
+    bump_version('test:version')    # Missing key: re-seeded, not 1
+    assert get_version('test:version') > bumped
+
+    versions = get_versions(['test:version', 'test:other'])
+    assert versions['test:version'] == get_version('test:version')
+    assert versions['test:other'] == get_version('test:other')
+
+
+def test_incr_counter(monkeypatch):
+    assert incr_counter('test:counter') == 1
+    assert incr_counter('test:counter', 2) == 3
+
+    # Expired between add() and incr()
+    monkeypatch.setattr(cache, 'add', lambda *args: False)
+    assert incr_counter('test:missing', 5) == 5
+    assert cache.get('test:missing') == 5
@@ -0,0 +1,135 @@
+"""
+Tests for the shared progress time-series service.
+
+Tests:
+- Grouped buckets are zero-filled (daily and weekly)
+- Dashboard chart runs one query per metric whatever the period
+- Series are cached and invalidated by new attempts
+- Progress history endpoint returns zero-filled daily buckets per phoneme;
+  days < 1 is clamped to today
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.curriculum.models import Phoneme, PhonemeAttempt
+from apps.study.models import DiscriminationSession, ProductionRecording
+from services.progress_timeseries import get_time_series
+
+
+pytestmark = pytest.mark.usefixtures('clear_cache')
+
+
+@pytest.fixture
+def phonemes(phoneme_category):
+    return [
+        Phoneme.objects.create(category=phoneme_category, ipa_symbol=symbol, vietnamese_approx=symbol, order=i)
+        for i, symbol in enumerate(['i:', 'ɪ'])
+    ]
+
+
+def _days_ago(days, hour=10):
+    return timezone.localtime().replace(hour=hour, minute=0, second=0, microsecond=0) - timedelta(days=days)
+
+
+def _session(user, days_ago, accuracy):
+    session = DiscriminationSession.objects.create(
+        user=user, session_id=f'{days_ago}-{accuracy}', status='completed', accuracy=accuracy
+    )
+    DiscriminationSession.objects.filter(pk=session.pk).update(completed_at=_days_ago(days_ago))
+
+
+def _recording(user, phoneme, days_ago):
+    recording = ProductionRecording.objects.create(
+        user=user, phoneme=phoneme, recording_file='user_recordings/x.webm', duration_seconds=1
+    )
+    ProductionRecording.objects.filter(pk=recording.pk).update(created_at=_days_ago(days_ago))
+
+
+def _attempt(user, phoneme, days_ago, accuracy):
+    attempt = PhonemeAttempt.objects.create(user=user, phoneme=phoneme, accuracy=accuracy)
+    PhonemeAttempt.objects.filter(pk=attempt.pk).update(attempted_at=_days_ago(days_ago))
+
+
+@pytest.mark.django_db
+def test_buckets_are_zero_filled(user, phonemes):
+    _session(user, 0, 80)
+    _session(user, 0, 90)
+    _session(user, 2, 60)
+    _session(user, 9, 100)          # Outside a 7 day period
+    for days_ago in (1, 1, 6):
+        _recording(user, phonemes[0], days_ago)
+
+    accuracy = get_time_series(user, 'discrimination_accuracy', days=7)
+    recordings = get_time_series(user, 'production_recordings', days=7)
+
+    assert accuracy['dates'][-1] == timezone.localdate()
+    assert accuracy['values']['accuracy'] == [0, 0, 0, 0, 60.0, 0, 85.0]
+    assert accuracy['values']['sessions'] == [0, 0, 0, 0, 1, 0, 2]
+    assert recordings['values']['count'] == [1, 0, 0, 0, 0, 2, 0]
+
+    weekly = get_time_series(user, 'production_recordings', days=14, bucket='week')
+    assert all(start.weekday() == 0 for start in weekly['dates'])
+    assert sum(weekly['values']['count']) == 3
+
+
+@pytest.mark.django_db
+def test_dashboard_chart_query_count_is_flat(authenticated_client, user, phonemes):
+    _session(user, 3, 70)
+    _recording(user, phonemes[0], 3)
+    url = '/api/v1/dashboard/progress-chart/'
+
+    with CaptureQueriesContext(connection) as week:
+        response = authenticated_client.get(url, {'period': '7days'})
+    assert response.status_code == 200
+    assert response.json()['data']['datasets'][1]['data'] == [0, 0, 0, 1, 0, 0, 0]
+
+    with CaptureQueriesContext(connection) as quarter:
+        response = authenticated_client.get(url, {'period': '90days'})
+    assert len(response.json()['data']['labels']) == 90
+    assert len(quarter.captured_queries) == len(week.captured_queries) <= 2
+
+
+@pytest.mark.django_db
+def test_cached_until_new_attempt(user, phonemes, django_assert_num_queries):
+    _attempt(user, phonemes[0], 0, 90)
+    assert get_time_series(user, 'phoneme_attempts', days=7)['values']['attempts'][-1] == 1
+
+    with django_assert_num_queries(0):
+        get_time_series(user, 'phoneme_attempts', days=7)
+
+    PhonemeAttempt.objects.create(user=user, phoneme=phonemes[1], accuracy=40)
+    series = get_time_series(user, 'phoneme_attempts', days=7)
+    assert series['values']['attempts'][-1] == 2
+    assert series['values']['successful_attempts'][-1] == 1
+
+
+@pytest.mark.django_db
+def test_progress_history_endpoint(authenticated_client, user, phonemes):
+    _attempt(user, phonemes[0], 0, 90)
+    _attempt(user, phonemes[0], 0, 50)
+    _attempt(user, phonemes[1], 0, 100)
+    _attempt(user, phonemes[0], 3, 75)
+
+    response = authenticated_client.get(
+        '/api/v1/progress-history/', {'days': 5, 'phoneme_id': phonemes[0].id}
+    )
+
+    assert response.status_code == 200
+    history = response.json()['history']
+    assert [day['attempts'] for day in history] == [0, 1, 0, 0, 2]
+    assert history[-1] == {
+        'date': timezone.localdate().isoformat(),
+        'attempts': 2,
+        'avg_accuracy': 70.0,
+        'successful_attempts': 1,
+    }
+
+    for days in (0, -3):
+        response = authenticated_client.get('/api/v1/progress-history/', {'days': days})
+        assert response.status_code == 200
+        assert [day['attempts'] for day in response.json()['history']] == [3]
@@ -0,0 +1,118 @@
+"""
+Tests for single-flight on-the-fly audio generation.
+
+Tests:
+- Lock acquire/release and stale lock breaking
+- Concurrent requests for one word trigger a single synthesis
+- Followers that must not wait get a pending result
+- FlashcardAudioViewSet.stream returns 202 + Retry-After while generating
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import services.audio_store as audio_store
+from services.audio_store import AudioStore, make_audio_key
+from services.single_flight import SingleFlight
+from services.tts_flashcard_service import FlashcardTTSService
+
+
+@pytest.fixture
+def store(transactional_db, tmp_path, settings, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_URL = '/media/'
+    store = AudioStore(root=tmp_path / 'audio_store')
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+    return store
+
+
+@pytest.fixture
+def service(store, monkeypatch):
+    service = FlashcardTTSService()
+    service.audio_dir = store.root / 'no_legacy'
+    calls = []
+
+    async def fake_generate(word, voice, speed):
+        calls.append(word)
+        await asyncio.sleep(0.2)
+        key = make_audio_key(word, voice, rate=speed)
+        tmp = store.temp_path(key)
+        tmp.write_bytes(b"mp3")
+        return store.commit(key, tmp)
+
+    monkeypatch.setattr(service, '_generate_audio_async', fake_generate)
+    service.calls = calls
+    return service
+
+
+def test_lock_is_exclusive_until_released(tmp_path):
+    flight = SingleFlight(tmp_path)
+
+    assert flight.try_acquire("k") is True
+    assert flight.try_acquire("k") is False
+    assert flight.in_flight("k") is True
+
+    flight.release("k")
+    assert flight.in_flight("k") is False
+    assert flight.try_acquire("k") is True
+
+
+def test_stale_lock_is_broken(tmp_path):
+    flight = SingleFlight(tmp_path, lock_timeout=10)
+    assert flight.try_acquire("k")
+    old = time.time() - 60
+    os.utime(tmp_path / "k.lock", (old, old))
+
+    assert flight.in_flight("k") is False
+    assert flight.try_acquire("k") is True
+
+
+def test_concurrent_requests_share_one_synthesis(service):
+    results = []
+
+    def request():
+        results.append(service.generate_audio_single_flight("hello", "us_male", "normal", wait_timeout=5))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert service.calls == ["hello"]
+    assert len(results) == 8
+    assert all(url and not pending for url, pending in results)
+    assert len({url for url, _ in results}) == 1
+
+
+def test_follower_without_wait_gets_pending(service):
+    key = service.get_store_key("world", "us_male", "normal")
+    assert service.single_flight.try_acquire(key)
+
+    url, pending = service.generate_audio_single_flight("world", "us_male", "normal", wait_timeout=0)
+
+    assert url is None
+    assert pending is True
+    assert service.calls == []
+
+
+@pytest.mark.django_db
+def test_stream_returns_202_while_generating(service, authenticated_client, monkeypatch):
+    import apps.vocabulary.views_audio as views_audio
+
+    monkeypatch.setattr(views_audio, 'get_tts_service', lambda: service)
+    key = service.get_store_key("busy", "us_male", "normal")
+    service.single_flight.try_acquire(key)
+
+    response = authenticated_client.get(
+        '/api/v1/vocabulary/audio/stream/busy/',
+        HTTP_PREFER='respond-async'
+    )
+
+    assert response.status_code == 202
+    assert response['Retry-After'] == '1'
+    assert response.json()['status'] == 'pending'
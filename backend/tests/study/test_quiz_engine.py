@@ -0,0 +1,137 @@
+"""
+Tests for the discrimination quiz generation engine.
+
+Tests:
+- Weighted sampling without replacement favours weak phonemes
+- Catalogue skips pairs without audio and is rebuilt when pairs change or
+  when it is older than CATALOGUE_MAX_AGE (a bump this process missed)
+- Quiz start runs at most two small queries
+- Completing a session stores accuracy as a 0-1 fraction and pre-generates
+  the next quiz
+"""
+
+import random
+from collections import Counter
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.curriculum.models import MinimalPair, Phoneme
+from apps.study.models import DiscriminationAttempt, DiscriminationSession
+from apps.study import quiz_engine
+from apps.study.quiz_engine import PairCatalogue, QuizEngine, get_quiz_engine
+from apps.users.models import UserPhonemeProgress
+
+START_URL = '/api/v1/discrimination/sessions/start/'
+
+pytestmark = pytest.mark.usefixtures('clear_cache')
+
+
+@pytest.fixture
+def phonemes(phoneme_category):
+    return [
+        Phoneme.objects.create(category=phoneme_category, ipa_symbol=f'x{i}', vietnamese_approx=f'x{i}', order=i)
+        for i in range(4)
+    ]
+
+
+def _pair(phoneme_1, phoneme_2, n, audio=True):
+    return MinimalPair.objects.create(
+        phoneme_1=phoneme_1, phoneme_2=phoneme_2,
+        word_1=f'a{n}', word_1_ipa=f'a{n}', word_2=f'b{n}', word_2_ipa=f'b{n}',
+        word_1_audio=f'minimal_pairs/audio/a{n}.mp3' if audio else '',
+        word_2_audio=f'minimal_pairs/audio/b{n}.mp3',
+    )
+
+
+@pytest.fixture
+def pairs(phonemes):
+    # 6 pairs on /x0/-/x1/, 6 pairs on /x2/-/x3/, 1 pair without audio
+    created = [_pair(phonemes[0], phonemes[1], n) for n in range(6)]
+    created += [_pair(phonemes[2], phonemes[3], n) for n in range(6, 12)]
+    _pair(phonemes[0], phonemes[2], 99, audio=False)
+    return created
+
+
+def test_weighted_sampling_without_replacement():
+    catalogue = PairCatalogue(version=0)
+    for pair_id in range(100):
+        catalogue.pair_phonemes[pair_id] = (1, 2) if pair_id < 50 else (3, 4)
+    engine = QuizEngine(rng=random.Random(7))
+    weights = {1: 2.0, 2: 0.2, 3: 0.2, 4: 0.2}   # Only /1/ is weak
+
+    drawn = Counter()
+    for _ in range(200):
+        pair_ids = engine.sample(catalogue, weights, k=10)
+        assert len(set(pair_ids)) == 10
+        drawn.update('weak' if pair_id < 50 else 'strong' for pair_id in pair_ids)
+
+    assert drawn['weak'] > 4 * drawn['strong']
+    assert len(engine.sample(catalogue, weights, k=10, exclude=tuple(range(95)))) == 10
+
+
+@pytest.mark.django_db
+def test_catalogue_versions(pairs, phonemes, monkeypatch):
+    engine = QuizEngine()
+    catalogue = engine.catalogue()
+    assert len(catalogue) == 12
+    assert sorted(catalogue.by_phoneme) == [p.id for p in phonemes]
+    assert engine.catalogue() is catalogue
+
+    _pair(phonemes[1], phonemes[3], 50)
+    assert len(engine.catalogue()) == 13
+
+    # Edited without a version bump reaching this process: picked up once
+    # the catalogue (in memory and in the cache) is too old
+    MinimalPair.objects.filter(word_1='a99').update(word_1_audio='minimal_pairs/audio/a99.mp3')
+    assert len(engine.catalogue()) == 13
+    monkeypatch.setattr(quiz_engine, 'CATALOGUE_MAX_AGE', 0)
+    assert len(engine.catalogue()) == 14
+
+
+@pytest.mark.django_db
+def test_start_session_queries(authenticated_client, user, pairs, phonemes):
+    recent = timezone.now() - timedelta(days=1)
+    UserPhonemeProgress.objects.create(
+        user=user, phoneme=phonemes[2], discrimination_accuracy=0.95,
+        discrimination_attempts=40, last_practiced_at=recent
+    )
+    authenticated_client.post(START_URL)    # Warm the catalogue
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.post(START_URL)
+
+    assert response.status_code == 200
+    questions = response.json()['questions']
+    assert len({q['minimal_pair_id'] for q in questions}) == 10
+    assert questions[0]['phoneme_1']['vietnamese_approx']
+    selects = [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT')]
+    assert len(selects) <= 2
+
+
+@pytest.mark.django_db
+def test_complete_session_pregenerates_next_quiz(
+    authenticated_client, user, pairs, django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    session = DiscriminationSession.objects.create(user=user, session_id='s1', total_questions=1)
+    DiscriminationAttempt.objects.create(
+        user=user, session=session, minimal_pair=pairs[0], question_number=1,
+        correct_word='word_1', user_answer='word_1', is_correct=True, response_time=1.5
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_client.post('/api/v1/discrimination/sessions/s1/complete/')
+    assert response.status_code == 200
+    progress = UserPhonemeProgress.objects.get(user=user, phoneme=pairs[0].phoneme_1)
+    assert progress.discrimination_accuracy == 1.0     # Stored as a fraction
+
+    engine = get_quiz_engine()
+    with django_assert_num_queries(0):
+        pair_ids = engine.next_session(user)
+    assert len(pair_ids) == 10
+    assert pairs[0].id not in pair_ids
+    assert cache.get(engine._next_key(user.id)) is None
@@ -44,6 +44,23 @@ def flashcard(db, flashcard_deck, word_a1):
     )
 
 
+@pytest.fixture
+def make_deck(db, user):
+    """
+    Factory: deck owned by ``user`` with ``size`` single-word flashcards.
+
+    Words are named ``{prefix}0``, ``{prefix}1``...; extra keyword
+    arguments go to the deck.
+    """
+    def make(name, size, prefix, **deck_fields):
+        deck = FlashcardDeck.objects.create(name=name, level='A1', created_by=user, **deck_fields)
+        for i in range(size):
+            word = Word.objects.create(text=f'{prefix}{i}', pos='noun', cefr_level='A1', meaning_vi='x')
+            Flashcard.objects.create(deck=deck, word=word, front_text=word.text, back_text='x')
+        return deck
+    return make
+
+
 @pytest.fixture
 def user_progress(db, user, flashcard):
     """Create user flashcard progress"""
@@ -0,0 +1,135 @@
+"""
+Tests for the incremental achievement engine.
+
+Tests:
+- Counters updated from review events match a full rebuild
+- Only achievements of affected requirement types are evaluated
+- Review query count does not grow with the user's history
+- Unlocks are written in one bulk insert
+- Cards without a word can be reviewed through both review endpoints
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.vocabulary.models import Achievement, Flashcard, UserAchievement, UserFlashcardProgress
+from apps.vocabulary.models_achievement import (
+    UserAchievementStats, apply_review_events, review_snapshot, unlock_achievements
+)
+from apps.vocabulary.utils_flashcard import ingest_reviews
+
+
+@pytest.fixture
+def cards(make_deck):
+    return list(make_deck('Achievement Deck', 80, 'ach').flashcards.order_by('id'))
+
+
+def _achievement(key, requirement_type, value, data=None):
+    return Achievement.objects.create(
+        key=key, name=key, description=key, icon='*', category='milestone',
+        requirement_type=requirement_type, requirement_value=value, requirement_data=data
+    )
+
+
+def _review(user, card, quality):
+    progress, _ = UserFlashcardProgress.objects.get_or_create(
+        user=user, flashcard=card, defaults={'next_review_date': timezone.now()}
+    )
+    before = review_snapshot(progress)
+    progress.calculate_next_review(quality)
+    return apply_review_events(user, [(before, progress, card.word.cefr_level)])
+
+
+@pytest.mark.django_db
+def test_counters_match_rebuild(user, cards):
+    UserAchievementStats.rebuild(user)
+    for i, card in enumerate(cards[:6]):
+        for quality in (5, 5, 5, 5, 1 if i % 2 else 5):
+            _review(user, card, quality)
+
+    stats = UserAchievementStats.objects.get(user=user)
+    fresh = UserAchievementStats.rebuild(user)
+
+    assert stats.cards_learned == fresh.cards_learned == 6
+    assert stats.total_reviews == fresh.total_reviews == 30
+    assert stats.total_correct == fresh.total_correct
+    assert stats.get_reviews_today() == fresh.get_reviews_today() == 6
+    assert stats.mastered_by_level == fresh.mastered_by_level == {'A1': 6}
+
+
+@pytest.mark.django_db
+def test_only_affected_types_evaluated(user, cards, monkeypatch):
+    for key, requirement_type in [('learned', 'cards_learned'), ('accuracy', 'accuracy_rate'),
+                                  ('day', 'cards_per_day'), ('level', 'level_completed')]:
+        _achievement(key, requirement_type, 500, {'level': 'A1'})
+    _review(user, cards[0], 4)
+
+    evaluated = []
+    original = Achievement.check_user_qualifies
+
+    def recording(self, user, stats=None):
+        evaluated.append(self.requirement_type)
+        return original(self, user, stats)
+
+    monkeypatch.setattr(Achievement, 'check_user_qualifies', recording)
+    stats, affected = _review(user, cards[0], 4)
+    unlock_achievements(user, affected, stats)
+
+    assert sorted(evaluated) == ['accuracy_rate']
+
+
+@pytest.mark.django_db
+def test_review_query_count_is_flat(authenticated_client, user, cards):
+    _achievement('learned', 'cards_learned', 500)
+    url = '/api/v1/vocabulary/flashcards/study/{}/review/'
+    authenticated_client.post(url.format(cards[0].id), {'quality': 4}, format='json')
+
+    with CaptureQueriesContext(connection) as small:
+        authenticated_client.post(url.format(cards[1].id), {'quality': 4}, format='json')
+
+    UserFlashcardProgress.objects.bulk_create([
+        UserFlashcardProgress(user=user, flashcard=card, next_review_date=timezone.now(),
+                              total_reviews=3, total_correct=2)
+        for card in cards[3:]
+    ])
+    with CaptureQueriesContext(connection) as large:
+        response = authenticated_client.post(url.format(cards[2].id), {'quality': 4}, format='json')
+
+    assert response.status_code == 200
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+@pytest.mark.django_db
+def test_unlocks_written_in_bulk(user, cards, django_assert_max_num_queries):
+    _achievement('ten', 'cards_learned', 10)
+    _achievement('twenty', 'cards_learned', 20)
+    _achievement('accurate', 'accuracy_rate', 90)
+    _achievement('daily', 'cards_per_day', 10)
+
+    result = ingest_reviews(user, [{'flashcard_id': card.id, 'quality': 5} for card in cards[:10]])
+
+    assert {a.key for a in result['achievements_unlocked']} == {'ten', 'accurate', 'daily'}
+    assert UserAchievement.objects.filter(user=user).count() == 3
+
+    stats = UserAchievementStats.objects.get(user=user)
+    with django_assert_max_num_queries(2):
+        assert unlock_achievements(user, {'cards_learned'}, stats) == []
+
+
+@pytest.mark.django_db
+def test_review_card_without_word(authenticated_client, user, cards):
+    card = Flashcard.objects.create(deck=cards[0].deck, front_text='phrase', back_text='x')
+
+    response = authenticated_client.post(
+        f'/api/v1/vocabulary/flashcards/study/{card.id}/review/', {'quality': 5}, format='json'
+    )
+    assert response.status_code == 200
+
+    progress = UserFlashcardProgress.objects.get(user=user, flashcard=card)
+    response = authenticated_client.post(
+        f'/api/v1/vocabulary/progress/{progress.id}/review/', {'quality': 5}, format='json'
+    )
+    assert response.status_code == 200
+    assert UserAchievementStats.objects.get(user=user).mastered_by_level == {}
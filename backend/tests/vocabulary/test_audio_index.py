@@ -0,0 +1,101 @@
+"""
+Tests for batched audio URL resolution (AudioAvailabilityIndex).
+
+Tests:
+- One index lookup resolves every voice/speed variant
+- Legacy flashcard_audio files are adopted from a single listing
+- Serializers use the index from the context instead of per-word stats
+"""
+
+import pytest
+
+import services.audio_store as audio_store
+from services.audio_store import AudioStore
+from services.tts_flashcard_service import FlashcardTTSService
+
+
+@pytest.fixture
+def service(db, tmp_path, settings, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_URL = '/media/'
+    store = AudioStore(root=tmp_path / 'audio_store')
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+    service = FlashcardTTSService()
+    service.audio_dir = tmp_path / 'flashcard_audio'
+    monkeypatch.setattr('services.tts_flashcard_service._tts_service', service)
+    return service
+
+
+def _add(service, word, voice, speed):
+    key = service.get_store_key(word, voice, speed)
+    tmp = service.store.temp_path(key)
+    tmp.write_bytes(b"ID3")
+    service.store.commit(key, tmp)
+    return service.store.url_for(key)
+
+
+def test_index_matches_per_word_lookup(service):
+    hello_normal = _add(service, "hello", "us_male", "normal")
+    hello_slow = _add(service, "hello", "uk_female", "slow")
+
+    index = service.build_audio_index(["hello", "world", "hello"])
+
+    assert index.url("hello") == hello_normal
+    assert index.url("hello", "uk_female", "slow") == hello_slow
+    assert index.url("world") is None
+    assert index.urls("hello") == {"us_male_normal": hello_normal, "uk_female_slow": hello_slow}
+    assert index.urls("world") == {}
+    assert index.url("hello") == service.get_audio_url("hello", "en-US-GuyNeural", "normal")
+
+
+def test_index_uses_one_store_query(service, monkeypatch):
+    calls = []
+    original = service.store.existing_keys
+
+    def counting(keys):
+        keys = list(keys)
+        calls.append(len(keys))
+        return original(keys)
+
+    monkeypatch.setattr(service.store, 'existing_keys', counting)
+    service.build_audio_index([f"word{i}" for i in range(200)])
+
+    assert calls == [200 * 12]
+
+
+def test_index_adopts_legacy_files(service):
+    service.audio_dir.mkdir()
+    (service.audio_dir / "legacy_uk_male_fast.mp3").write_bytes(b"legacy")
+
+    index = service.build_audio_index(["legacy"])
+
+    key = service.get_store_key("legacy", "uk_male", "fast")
+    assert index.url("legacy", "uk_male", "fast") == service.store.url_for(key)
+    assert service.store.path_for(key).read_bytes() == b"legacy"
+    assert not (service.audio_dir / "legacy_uk_male_fast.mp3").exists()
+
+
+@pytest.mark.django_db
+def test_study_serializer_reads_audio_index_from_context(service, user, word_a1, monkeypatch):
+    from apps.vocabulary.models import Flashcard, FlashcardDeck
+    from apps.vocabulary.serializers_flashcard import (
+        FlashcardStudySerializer, build_audio_index_for_cards
+    )
+
+    deck = FlashcardDeck.objects.create(name='Audio Deck', level='A1', created_by=user)
+    flashcard = Flashcard.objects.create(deck=deck, word=word_a1, front_text='hello', back_text='hi')
+
+    url = _add(service, "hello", "us_male", "normal")
+    index = build_audio_index_for_cards([flashcard])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("per-word lookup used")
+
+    monkeypatch.setattr(service, 'get_audio_url', fail)
+    monkeypatch.setattr(service, 'build_audio_index', fail)
+
+    data = FlashcardStudySerializer([flashcard], many=True, context={'audio_index': index}).data
+
+    assert data[0]['audio_url'] == url
+    assert data[0]['word']['audio_url'] == url
+    assert data[0]['word']['audio_urls'] == {"us_male_normal": url}
@@ -0,0 +1,149 @@
+"""
+Tests for the nightly flashcard audio warm-up.
+
+Tests:
+- Plan covers due reviews in the window and the exact upcoming new cards
+  of active users, in the default and the preferred voice/speed, with a
+  fixed number of queries
+- Missing audio is synthesized once; coverage metrics are reported
+- Cards without a word are left out of the plan
+- Cold misses are counted per day
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+import services.audio_store as audio_store
+from apps.users.models import User, UserSettings
+from apps.vocabulary.audio_warmup import (
+    LAST_RUN_CACHE_KEY, get_cold_misses, plan_audio_warmup, record_cold_miss, run_audio_warmup
+)
+from apps.vocabulary.models import Flashcard, UserFlashcardProgress
+from apps.vocabulary.utils_flashcard import new_cards_queryset, sample_new_cards, study_seed
+from services.audio_store import AudioStore, make_audio_key
+from services.tts_flashcard_service import FlashcardTTSService
+
+
+@pytest.fixture
+def service(db, tmp_path, settings, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.TTS_BATCH_RATE_PER_VOICE = 0
+    cache.clear()
+    store = AudioStore(root=tmp_path / 'audio_store')
+    monkeypatch.setattr(audio_store, '_audio_store', store)
+    service = FlashcardTTSService()
+    service.audio_dir = tmp_path / 'flashcard_audio'
+    monkeypatch.setattr('services.tts_flashcard_service._tts_service', service)
+
+    synthesized = []
+
+    async def fake_edge_tts(word, voice, rate):
+        key = make_audio_key(word, voice, rate=rate)
+        tmp = service.store.temp_path(key)
+        tmp.write_bytes(b"ID3")
+        synthesized.append((word, voice, rate))
+        return service.store.commit(key, tmp)
+
+    monkeypatch.setattr(service, '_generate_audio_async', fake_edge_tts)
+    service.synthesized = synthesized
+    return service
+
+
+@pytest.fixture
+def deck(make_deck):
+    return make_deck('Warm Deck', 30, 'w', is_public=True)
+
+
+def _progress(user, card, hours, reviewed_days_ago=1, is_learning=True):
+    now = timezone.now()
+    return UserFlashcardProgress.objects.create(
+        user=user,
+        flashcard=card,
+        next_review_date=now + timedelta(hours=hours),
+        last_reviewed_at=now - timedelta(days=reviewed_days_ago),
+        is_learning=is_learning,
+    )
+
+
+@pytest.fixture
+def schedule(user, deck):
+    UserSettings.objects.update_or_create(
+        user=user, defaults={'audio_voice': 'uk_female', 'audio_speed': 'slow', 'cards_per_session': 5}
+    )
+    cards = list(deck.flashcards.order_by('id'))
+    _progress(user, cards[0], 6)
+    _progress(user, cards[1], 20)
+    _progress(user, cards[2], 72)                       # Due after the window
+    _progress(user, cards[3], -30)                      # Overdue
+    _progress(user, cards[4], -1, is_learning=False)    # Mastered
+
+    inactive = User.objects.create_user(username='idle', email='idle@example.com', password='x')
+    _progress(inactive, cards[5], 1, reviewed_days_ago=60)
+    return cards
+
+
+@pytest.mark.django_db
+def test_plan_covers_due_and_upcoming_new_cards(user, deck, schedule, django_assert_num_queries):
+    now = timezone.now()
+    # Active users, their settings, due cards, deck cards, studied cards
+    with django_assert_num_queries(5):
+        plan = plan_audio_warmup(now=now, window_hours=24)
+
+    new_cards = new_cards_queryset(user, deck_id=deck.id)
+    upcoming = set()
+    for day in {now.date(), (now + timedelta(hours=24)).date()}:
+        upcoming |= {card.word.text for card in sample_new_cards(new_cards, 5, study_seed(user, day))}
+
+    expected = {'w0', 'w1', 'w3'} | upcoming
+    assert plan['users'] == 1
+    assert plan['due_cards'] == 3
+    assert set(plan['targets']) == {('us_male', 'normal'), ('uk_female', 'slow')}
+    assert plan['targets'][('us_male', 'normal')] == expected
+    assert plan['targets'][('uk_female', 'slow')] == expected
+
+
+@pytest.mark.django_db
+def test_run_synthesizes_missing_audio_once(service, schedule):
+    service.generate_audio('w0', 'us_male', 'normal')
+    service.synthesized.clear()
+
+    metrics = run_audio_warmup(window_hours=24)
+
+    targets = metrics['targets']
+    assert metrics['cached'] == 1
+    assert metrics['generated'] == targets - 1 == len(service.synthesized)
+    assert metrics['coverage_before'] < metrics['coverage_after'] == 100.0
+    assert metrics['variants']['uk_female_slow']['generated'] == targets // 2
+    assert cache.get(LAST_RUN_CACHE_KEY)['generated'] == targets - 1
+
+    rerun = run_audio_warmup(window_hours=24)
+    assert rerun['generated'] == 0
+    assert rerun['coverage_before'] == 100.0
+
+
+
+@pytest.mark.django_db
+def test_cards_without_word_are_skipped(service, user, deck):
+    for card in deck.flashcards.all():
+        _progress(user, card, 72)
+    due = Flashcard.objects.create(deck=deck, front_text='due phrase', back_text='x')
+    _progress(user, due, 6)
+    Flashcard.objects.create(deck=deck, front_text='new phrase', back_text='x')
+
+    plan = plan_audio_warmup(window_hours=24)
+    assert (plan['due_cards'], plan['new_cards']) == (0, 1)
+    assert all(None not in words for words in plan['targets'].values())
+
+    metrics = run_audio_warmup(window_hours=24)
+    assert metrics['generated'] == len(service.synthesized) == 0
+
+def test_cold_misses_are_counted_per_day():
+    cache.clear()
+    record_cold_miss()
+    record_cold_miss()
+
+    assert get_cold_misses() == 2
+    assert get_cold_misses(timezone.localdate() - timedelta(days=1)) == 0
@@ -0,0 +1,163 @@
+"""
+Tests for bulk SM-2 review ingestion.
+
+Tests:
+- Events are applied in order, relative to reviewed_at; events older than
+  the card's last review are skipped
+- A first review racing another sync lands on the same row
+- Same result as the one-card-at-a-time path
+- Query count does not grow with the number of reviews
+- Unknown flashcards are rejected, DeckStudyHistory updated once
+- POST /flashcards/study/bulk_review/
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.vocabulary.models import UserFlashcardProgress
+from apps.vocabulary.models_study_tracking import DeckStudyHistory
+from apps.vocabulary.utils_flashcard import ingest_reviews
+
+
+@pytest.fixture
+def cards(make_deck):
+    return list(make_deck('Bulk Deck', 10, 'word').flashcards.order_by('id'))
+
+
+@pytest.mark.django_db
+def test_events_applied_in_order(user, cards):
+    first = timezone.now() - timedelta(days=8)
+    second = first + timedelta(days=1)
+
+    result = ingest_reviews(user, [
+        {'flashcard_id': cards[0].id, 'quality': 5, 'reviewed_at': first},
+        {'flashcard_id': cards[0].id, 'quality': 4, 'reviewed_at': second},
+    ])
+
+    progress = UserFlashcardProgress.objects.get(user=user, flashcard=cards[0])
+    assert result['processed'] == 2
+    assert result['created'] == 1
+    assert progress.repetitions == 2
+    assert progress.interval == 6
+    assert progress.total_reviews == 2
+    assert progress.last_quality == 4
+    assert progress.last_reviewed_at == second
+    assert progress.next_review_date == second + timedelta(days=6)
+
+
+@pytest.mark.django_db
+def test_late_events_are_skipped(user, cards):
+    latest = timezone.now() - timedelta(days=1)
+    ingest_reviews(user, [{'flashcard_id': cards[0].id, 'quality': 5, 'reviewed_at': latest}])
+
+    result = ingest_reviews(user, [
+        {'flashcard_id': cards[0].id, 'quality': 0, 'reviewed_at': latest - timedelta(days=3)},
+        {'flashcard_id': cards[1].id, 'quality': 4, 'reviewed_at': latest},
+        {'flashcard_id': cards[1].id, 'quality': 1, 'reviewed_at': latest - timedelta(days=2)},
+    ])
+
+    assert result['stale'] == [cards[0].id]
+    assert result['processed'] == 2
+    progress = UserFlashcardProgress.objects.get(user=user, flashcard=cards[0])
+    assert (progress.total_reviews, progress.last_quality, progress.last_reviewed_at) == (1, 5, latest)
+    progress = UserFlashcardProgress.objects.get(user=user, flashcard=cards[1])
+    assert (progress.total_reviews, progress.last_quality, progress.last_reviewed_at) == (2, 4, latest)
+
+
+@pytest.mark.django_db
+def test_first_review_racing_another_sync(user, cards, monkeypatch):
+    manager = UserFlashcardProgress.objects
+    bulk_create = manager.bulk_create
+
+    def concurrent_sync_first(objs, **kwargs):
+        # The other sync committed its first review of cards[0] in between
+        other = UserFlashcardProgress(user=user, flashcard=cards[0], next_review_date=timezone.now())
+        other.apply_review(5, reviewed_at=timezone.now() - timedelta(hours=1))
+        other.save()
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(manager, 'bulk_create', concurrent_sync_first)
+    result = ingest_reviews(user, [
+        {'flashcard_id': cards[0].id, 'quality': 4},
+        {'flashcard_id': cards[1].id, 'quality': 4},
+    ])
+
+    assert (result['created'], result['updated'], result['processed']) == (1, 1, 2)
+    assert UserFlashcardProgress.objects.get(user=user, flashcard=cards[0]).total_reviews == 2
+    history = DeckStudyHistory.objects.get(user=user, deck=cards[0].deck)
+    assert history.cards_new == 8
+
+
+@pytest.mark.django_db
+def test_matches_single_review_path(user, cards):
+    qualities = [5, 3, 1, 4, 5]
+    reference = UserFlashcardProgress.objects.create(
+        user=user, flashcard=cards[1], next_review_date=timezone.now()
+    )
+    UserFlashcardProgress.objects.create(
+        user=user, flashcard=cards[2], next_review_date=timezone.now()
+    )
+    for quality in qualities:
+        reference.calculate_next_review(quality)
+
+    result = ingest_reviews(user, [{'flashcard_id': cards[2].id, 'quality': q} for q in qualities])
+
+    bulk = UserFlashcardProgress.objects.get(user=user, flashcard=cards[2])
+    assert result['updated'] == 1
+    for field in ('easiness_factor', 'interval', 'repetitions', 'total_correct',
+                  'total_incorrect', 'streak', 'best_streak', 'is_mastered', 'is_learning'):
+        assert getattr(bulk, field) == getattr(reference, field), field
+
+
+@pytest.mark.django_db
+def test_query_count_is_independent_of_batch_size(user, cards, django_assert_max_num_queries):
+    for card in cards[:5]:
+        UserFlashcardProgress.objects.create(user=user, flashcard=card, next_review_date=timezone.now())
+    events = [{'flashcard_id': card.id, 'quality': 4} for card in cards] * 3
+
+    with django_assert_max_num_queries(30):
+        result = ingest_reviews(user, events)
+
+    assert result['processed'] == 30
+    assert result['created'] == 5
+    assert result['updated'] == 5
+
+
+@pytest.mark.django_db
+def test_unknown_cards_rejected_and_history_updated(user, cards):
+    result = ingest_reviews(user, [
+        {'flashcard_id': cards[0].id, 'quality': 5},
+        {'flashcard_id': 999999, 'quality': 5},
+    ])
+
+    assert result['rejected'] == [999999]
+    assert result['processed'] == 1
+    history = DeckStudyHistory.objects.get(user=user, deck=cards[0].deck)
+    assert history.cards_new == 9
+    assert history.progress_percentage == 10.0
+
+
+@pytest.mark.django_db
+def test_bulk_review_endpoint(authenticated_client, cards):
+    response = authenticated_client.post(
+        '/api/v1/vocabulary/flashcards/study/bulk_review/',
+        {'reviews': [
+            {'flashcard_id': cards[0].id, 'quality': 4, 'time_spent': 5},
+            {'flashcard_id': cards[1].id, 'quality': 1},
+        ]},
+        format='json'
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['processed'] == 2
+    assert {card['flashcard_id'] for card in data['cards']} == {cards[0].id, cards[1].id}
+
+    response = authenticated_client.post(
+        '/api/v1/vocabulary/flashcards/study/bulk_review/',
+        {'reviews': [{'flashcard_id': cards[0].id, 'quality': 9}]},
+        format='json'
+    )
+    assert response.status_code == 400
@@ -0,0 +1,225 @@
+"""
+Tests for the materialized DeckStudyHistory progress summary.
+
+Tests:
+- Review deltas (new -> learning -> mastered, difficult threshold) match a rebuild
+- reconcile() is set-based (constant statements) and the command rebuilds all users
+- Deck progress endpoint reads the summary row
+- Adding, moving or removing a card applies a delta (no per-user rebuild)
+  that matches a rebuild
+- Progress created, edited or deleted through the progress API keeps the
+  summary in step
+- The migration backfills existing histories
+"""
+
+import importlib
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.vocabulary.models import Flashcard, FlashcardDeck, UserFlashcardProgress, Word
+from apps.vocabulary.models_study_tracking import DeckStudyHistory
+
+SUMMARY_FIELDS = [
+    'total_cards', 'cards_studied', 'cards_new', 'cards_learning',
+    'cards_mastered', 'cards_difficult', 'progress_percentage',
+]
+
+
+@pytest.fixture
+def deck(make_deck):
+    return make_deck('Summary Deck', 7, 'sum')
+
+
+def _summary(history):
+    return {field: getattr(history, field) for field in SUMMARY_FIELDS}
+
+
+def _review(client, card, quality):
+    response = client.post(f'/api/v1/vocabulary/flashcards/study/{card.id}/review/',
+                           {'quality': quality}, format='json')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_review_deltas_match_rebuild(authenticated_client, user, deck):
+    history = DeckStudyHistory.objects.create(user=user, deck=deck)
+    history.update_progress()
+    cards = list(deck.flashcards.order_by('id'))
+
+    for quality in (5, 5, 5, 5):     # new -> learning -> mastered
+        _review(authenticated_client, cards[0], quality)
+    for quality in (2, 2):           # easiness factor drops below 2.5
+        _review(authenticated_client, cards[1], quality)
+    _review(authenticated_client, cards[2], 4)
+
+    history.refresh_from_db()
+    incremental = _summary(history)
+    history.update_progress()
+
+    assert incremental == _summary(history)
+    assert incremental == {
+        'total_cards': 7, 'cards_studied': 3, 'cards_new': 4, 'cards_learning': 2,
+        'cards_mastered': 1, 'cards_difficult': 1, 'progress_percentage': 42.9,
+    }
+
+
+@pytest.mark.django_db
+def test_reconcile_is_set_based(user, deck, django_user_model):
+    others = [
+        django_user_model.objects.create_user(username=f'r{i}', email=f'r{i}@example.com', password='x')
+        for i in range(5)
+    ]
+    for i, other in enumerate([user] + others):
+        DeckStudyHistory.objects.create(user=other, deck=deck)
+        for card in deck.flashcards.order_by('id')[:i + 1]:
+            UserFlashcardProgress.objects.create(
+                user=other, flashcard=card, next_review_date=timezone.now(), is_mastered=i % 2 == 0
+            )
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert DeckStudyHistory.reconcile() == 6
+    statements = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+    assert len(statements) == 2
+    assert all(sql.startswith('UPDATE') for sql in statements)
+
+    call_command('reconcile_deck_history', batch_size=2, stdout=None)
+    for i, history in enumerate(DeckStudyHistory.objects.order_by('id')):
+        assert history.cards_studied == i + 1
+        assert history.cards_new == 7 - (i + 1)
+        assert history.cards_mastered == (i + 1 if i % 2 == 0 else 0)
+        assert history.progress_percentage == round((i + 1) / 7 * 100, 1)
+
+
+@pytest.mark.django_db
+def test_progress_endpoint_reads_summary(authenticated_client, user, deck, django_assert_max_num_queries):
+    card = deck.flashcards.first()
+    _review(authenticated_client, card, 4)
+    DeckStudyHistory.objects.get_or_create(user=user, deck=deck)[0].update_progress()
+
+    with django_assert_max_num_queries(2):
+        response = authenticated_client.get(f'/api/v1/vocabulary/flashcards/decks/{deck.id}/progress/')
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['deck']['card_count'] == 7
+    assert data['progress']['total_cards'] == 7
+    assert data['progress']['cards_new'] == 6
+    assert data['progress']['progress_percentage'] == 14.3
+
+
+@pytest.mark.django_db
+def test_new_card_updates_summary(user, deck):
+    history = DeckStudyHistory.objects.create(user=user, deck=deck)
+    history.update_progress()
+
+    word = Word.objects.create(text='extra', pos='noun', cefr_level='A1', meaning_vi='x')
+    Flashcard.objects.create(deck=deck, word=word, front_text='extra', back_text='x')
+
+    history.refresh_from_db()
+    assert history.total_cards == 8
+    assert history.cards_new == 8
+
+
+@pytest.mark.django_db
+def test_card_deltas_match_rebuild(user, deck, django_user_model, django_assert_max_num_queries):
+    other = django_user_model.objects.create_user(username='delta', email='delta@example.com', password='x')
+    cards = list(deck.flashcards.order_by('id'))
+    UserFlashcardProgress.objects.create(user=user, flashcard=cards[0], next_review_date=timezone.now())
+    UserFlashcardProgress.objects.create(
+        user=user, flashcard=cards[1], next_review_date=timezone.now(), is_mastered=True
+    )
+    UserFlashcardProgress.objects.create(user=other, flashcard=cards[1], next_review_date=timezone.now())
+    histories = [DeckStudyHistory.objects.create(user=u, deck=deck) for u in (user, other)]
+    DeckStudyHistory.reconcile()
+
+    word = Word.objects.create(text='delta', pos='noun', cefr_level='A1', meaning_vi='x')
+    with django_assert_max_num_queries(6):
+        Flashcard.objects.create(deck=deck, word=word, front_text='delta', back_text='x')
+    cards[1].delete()       # Mastered for user, learning for other
+    cards[2].delete()       # Never studied
+
+    for history in histories:
+        history.refresh_from_db()
+        incremental = _summary(history)
+        history.update_progress()
+        assert incremental == _summary(history)
+    assert (histories[0].total_cards, histories[0].cards_studied, histories[0].cards_mastered) == (6, 1, 0)
+    assert (histories[1].cards_studied, histories[1].cards_new, histories[1].progress_percentage) == (0, 6, 0.0)
+
+
+
+def _assert_matches_rebuild(*histories):
+    for history in histories:
+        history.refresh_from_db()
+        incremental = _summary(history)
+        history.update_progress()
+        assert incremental == _summary(history)
+
+
+@pytest.mark.django_db
+def test_progress_endpoints_keep_summary(authenticated_client, user, deck):
+    other_deck = FlashcardDeck.objects.create(name='Other Deck', level='A1', created_by=user)
+    other_card = Flashcard.objects.create(deck=other_deck, front_text='other', back_text='x')
+    histories = [DeckStudyHistory.objects.create(user=user, deck=d) for d in (deck, other_deck)]
+    DeckStudyHistory.reconcile()
+    card = deck.flashcards.first()
+
+    response = authenticated_client.post('/api/v1/vocabulary/progress/', {'flashcard': card.id}, format='json')
+    assert response.status_code == 201
+    _assert_matches_rebuild(*histories)
+    assert histories[0].cards_studied == 1
+
+    url = f"/api/v1/vocabulary/progress/{response.json()['id']}/"
+    assert authenticated_client.patch(url, {'is_mastered': True}, format='json').status_code == 200
+    _assert_matches_rebuild(*histories)
+    assert histories[0].cards_mastered == 1
+
+    assert authenticated_client.patch(url, {'flashcard': other_card.id}, format='json').status_code == 200
+    _assert_matches_rebuild(*histories)
+    assert (histories[0].cards_studied, histories[1].cards_mastered) == (0, 1)
+
+    assert authenticated_client.delete(url).status_code == 204
+    _assert_matches_rebuild(*histories)
+    assert histories[1].cards_studied == 0
+
+
+@pytest.mark.django_db
+def test_moved_and_bulk_deleted_cards_keep_summary(user, deck, django_user_model):
+    other = django_user_model.objects.create_user(username='mover', email='mover@example.com', password='x')
+    other_deck = FlashcardDeck.objects.create(name='Target Deck', level='A1', created_by=user)
+    cards = list(deck.flashcards.order_by('id'))
+    UserFlashcardProgress.objects.create(
+        user=user, flashcard=cards[0], next_review_date=timezone.now(), is_mastered=True
+    )
+    UserFlashcardProgress.objects.create(user=other, flashcard=cards[1], next_review_date=timezone.now())
+    histories = [DeckStudyHistory.objects.create(user=u, deck=d) for u in (user, other) for d in (deck, other_deck)]
+    DeckStudyHistory.reconcile()
+
+    for card in cards[:3]:
+        card.deck = other_deck
+        card.save()
+    cards[3].front_text = 'renamed'
+    cards[3].save()
+    _assert_matches_rebuild(*histories)
+    assert (histories[1].total_cards, histories[1].cards_mastered) == (3, 1)
+
+    Flashcard.objects.filter(id__in=[cards[1].id, cards[4].id]).delete()
+    _assert_matches_rebuild(*histories)
+    assert (histories[0].total_cards, histories[3].cards_studied) == (3, 0)
+
+@pytest.mark.django_db
+def test_migration_backfills_histories(user, deck):
+    history = DeckStudyHistory.objects.create(user=user, deck=deck)
+    UserFlashcardProgress.objects.create(user=user, flashcard=deck.flashcards.first(), next_review_date=timezone.now())
+    DeckStudyHistory.objects.update(total_cards=0, cards_studied=0, cards_new=0, progress_percentage=0.0)
+
+    migration = importlib.import_module('apps.vocabulary.migrations.0008_deckstudyhistory_materialized_progress')
+    migration.backfill_progress(apps, None)
+
+    history.refresh_from_db()
+    assert (history.total_cards, history.cards_studied, history.cards_new) == (7, 1, 6)
@@ -0,0 +1,95 @@
+"""
+Tests for per-user deck stats computed by annotate_deck_progress.
+
+Tests:
+- Annotated counts match the user's progress rows (other users ignored)
+- Deck list endpoint runs a constant number of queries
+- Recent decks endpoint runs a constant number of queries
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.vocabulary.models import FlashcardDeck, UserFlashcardProgress
+from apps.vocabulary.models_study_tracking import DeckStudyHistory
+from apps.vocabulary.utils_flashcard import annotate_deck_progress
+
+
+@pytest.fixture
+def make_decks(make_deck, user):
+    """Decks of 4 cards: one mastered, one due for review, two new."""
+    def make(count, start=0):
+        decks = []
+        for d in range(start, start + count):
+            deck = make_deck(f'Deck {d:02d}', 4, f'd{d}w', is_public=True)
+            mastered, due = deck.flashcards.order_by('id')[:2]
+            UserFlashcardProgress.objects.create(
+                user=user, flashcard=mastered, next_review_date=timezone.now(),
+                is_mastered=True, is_learning=False
+            )
+            UserFlashcardProgress.objects.create(
+                user=user, flashcard=due,
+                next_review_date=timezone.now() - timedelta(days=1)
+            )
+            DeckStudyHistory.objects.create(user=user, deck=deck)
+            decks.append(deck)
+        return decks
+    return make
+
+
+def _list_query_count(client):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get('/api/v1/vocabulary/flashcards/decks/')
+    assert response.status_code == 200
+    return len(ctx.captured_queries), response.json()['decks']
+
+
+@pytest.mark.django_db
+def test_annotated_counts(user, make_decks):
+    deck = make_decks(1)[0]
+    other = get_user_model().objects.create_user(username='other', email='other@example.com', password='x')
+    for card in deck.flashcards.all():
+        UserFlashcardProgress.objects.create(
+            user=other, flashcard=card, next_review_date=timezone.now(), is_mastered=True
+        )
+
+    annotated = annotate_deck_progress(FlashcardDeck.objects.all(), user).get(pk=deck.pk)
+
+    assert annotated.total_cards == 4
+    assert annotated.mastered_count == 1
+    assert annotated.review_count == 1
+    assert annotated.new_count == 2
+
+
+@pytest.mark.django_db
+def test_deck_list_query_count_is_constant(authenticated_client, make_decks):
+    make_decks(3)
+    few, decks = _list_query_count(authenticated_client)
+    assert decks[0]['card_count'] == 4
+    assert decks[0]['mastered_count'] == 1
+    assert decks[0]['new_count'] == 2
+    assert decks[0]['review_count'] == 1
+    assert decks[0]['progress_percentage'] == 25
+
+    make_decks(27, start=3)
+    many, decks = _list_query_count(authenticated_client)
+
+    assert len(decks) == 30
+    assert many == few
+
+
+@pytest.mark.django_db
+def test_recent_decks_query_count_is_constant(authenticated_client, make_decks, django_assert_max_num_queries):
+    make_decks(6)
+
+    with django_assert_max_num_queries(4):
+        response = authenticated_client.get('/api/v1/vocabulary/flashcards/decks/recent/')
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert all(item['deck']['card_count'] == 4 for item in response.json())
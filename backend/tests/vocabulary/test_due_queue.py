@@ -0,0 +1,105 @@
+"""
+Tests for the shared flashcard due queue.
+
+Tests:
+- Due queue: learning cards only, most overdue first
+- New cards via NOT EXISTS anti-join
+- Seeded new-card sampler (deterministic, no ORDER BY RANDOM())
+- get_cards_for_study and the deck study endpoint share the queue
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.vocabulary.models import UserFlashcardProgress
+from apps.vocabulary.utils_flashcard import (
+    due_progress_queryset, get_cards_for_study, new_cards_queryset, sample_new_cards
+)
+
+
+@pytest.fixture
+def deck(make_deck):
+    return make_deck('Queue Deck', 30, 'q', is_public=True)
+
+
+def _progress(user, card, days, is_learning=True):
+    return UserFlashcardProgress.objects.create(
+        user=user,
+        flashcard=card,
+        next_review_date=timezone.now() + timedelta(days=days),
+        is_learning=is_learning,
+        is_mastered=not is_learning,
+    )
+
+
+@pytest.mark.django_db
+def test_due_queue_orders_learning_cards_by_overdue(user, deck):
+    cards = list(deck.flashcards.order_by('id'))
+    _progress(user, cards[0], -1)
+    _progress(user, cards[1], -5)
+    _progress(user, cards[2], 3)                       # not due yet
+    _progress(user, cards[3], -9, is_learning=False)   # mastered
+
+    due = list(due_progress_queryset(user, deck_id=deck.id).values_list('flashcard_id', flat=True))
+
+    assert due == [cards[1].id, cards[0].id]
+
+
+@pytest.mark.django_db
+def test_new_cards_use_not_exists(user, deck):
+    cards = list(deck.flashcards.order_by('id'))
+    for card in cards[:10]:
+        _progress(user, card, 1)
+
+    new_cards = new_cards_queryset(user, deck_id=deck.id)
+
+    assert 'NOT EXISTS' in str(new_cards.query).upper()
+    assert set(new_cards.values_list('id', flat=True)) == {c.id for c in cards[10:]}
+
+
+@pytest.mark.django_db
+def test_sampler_is_seeded_and_avoids_random_sort(user, deck):
+    new_cards = new_cards_queryset(user, deck_id=deck.id)
+
+    with CaptureQueriesContext(connection) as ctx:
+        first = sample_new_cards(new_cards, 5, seed=42)
+
+    assert len({c.id for c in first}) == 5
+    assert [c.id for c in sample_new_cards(new_cards, 5, seed=42)] == [c.id for c in first]
+    assert all('RANDOM' not in q['sql'].upper() for q in ctx.captured_queries)
+    assert len(sample_new_cards(new_cards, 100, seed=1)) == 30
+    assert sample_new_cards(new_cards, 0, seed=1) == []
+
+
+@pytest.mark.django_db
+def test_cards_for_study_mixes_due_and_new(user, deck):
+    cards = list(deck.flashcards.order_by('id'))
+    for card in cards[:20]:
+        _progress(user, card, -1)
+
+    selected = get_cards_for_study(user, limit=10, deck_id=deck.id, seed=3)
+
+    due_ids = {c.id for c in cards[:20]}
+    assert len(selected) == 10
+    assert sum(1 for c in selected if c.id in due_ids) == 7
+    assert [c.id for c in get_cards_for_study(user, limit=10, deck_id=deck.id, seed=3)] == [c.id for c in selected]
+
+
+@pytest.mark.django_db
+def test_deck_study_endpoint_counts(authenticated_client, user, deck):
+    cards = list(deck.flashcards.order_by('id'))
+    for card in cards[:4]:
+        _progress(user, card, -2)
+    _progress(user, cards[4], 10)
+
+    response = authenticated_client.get(f'/api/v1/vocabulary/decks/{deck.id}/study/')
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['total_due'] == 4
+    assert data['total_new'] == 25
+    assert data['cards_in_session'] == 9
@@ -0,0 +1,117 @@
+"""
+Tests for the streaming vocabulary importer.
+
+Tests:
+- Oxford lines are parsed and imported in chunks, existing keys skipped
+- Dictionary re-imports refresh IPA/meaning of existing words in bulk
+- Chunk writes take a fixed number of queries
+- Level decks are synced set-based (bulk create, changed cards only updated)
+"""
+
+import pytest
+
+from apps.vocabulary.importers import (
+    VocabularyImporter, iter_dictionary_rows, iter_oxford_rows, parse_oxford_line
+)
+from apps.vocabulary.models import Flashcard, FlashcardDeck, Word
+from apps.vocabulary.utils_flashcard import create_flashcards_from_words
+
+OXFORD = """\
+a,an indefinite article A1
+about prep., adv. A1
+account n. B1, v. B2
+abandon v. B2
+all det., pron. A1, adv. A2
+???
+"""
+
+DICTIONARY = """\
+"abandon ","v","əˈbændən ","bỏ rơi"
+"absolute ","adj","ˈæbsəˌlut ","tuyệt đối"
+"academic ","n","ˌækəˈdɛmɪk ","học thuật"
+"© Oxford ","","",""
+"""
+
+
+@pytest.fixture
+def oxford_csv(tmp_path):
+    path = tmp_path / 'oxford.csv'
+    path.write_text(OXFORD, encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def dictionary_csv(tmp_path):
+    path = tmp_path / 'B2.csv'
+    path.write_text(DICTIONARY, encoding='utf-8')
+    return path
+
+
+def test_parse_oxford_line():
+    assert parse_oxford_line('all det., pron. A1, adv. A2') == [
+        ('all', 'det.', 'A1'), ('all', 'pron.', 'A1'), ('all', 'adv.', 'A2')
+    ]
+    assert parse_oxford_line('a,an indefinite article A1') == [
+        ('a', 'indefinite article', 'A1'), ('an', 'indefinite article', 'A1')
+    ]
+
+
+@pytest.mark.django_db
+def test_oxford_import_in_chunks(oxford_csv):
+    Word.objects.create(text='abandon', pos='verb', cefr_level='B2', meaning_vi='bỏ rơi')
+    errors = []
+    progress = []
+
+    importer = VocabularyImporter(chunk_size=3, rank_new_words=True, progress=progress.append)
+    stats = importer.run(iter_oxford_rows(oxford_csv, on_error=lambda n, line: errors.append(n)))
+
+    assert errors == [6]
+    assert stats['rows'] == 10
+    assert (stats['created'], stats['updated'], stats['skipped']) == (9, 0, 1)
+    assert stats['chunks'] == len(progress) == 4
+    assert stats['rows_per_second'] > 0
+    assert Word.objects.filter(text='account').count() == 2
+    assert Word.objects.get(text='an').pos == 'article'
+    assert Word.objects.get(text='all', pos='adverb').cefr_level == 'A2'
+    assert Word.objects.get(text='a').frequency_rank == 1
+
+    rerun = VocabularyImporter().run(iter_oxford_rows(oxford_csv))
+    assert (rerun['created'], rerun['skipped']) == (0, 10)
+    assert Word.objects.count() == 10
+
+
+@pytest.mark.django_db
+def test_dictionary_import_updates_existing(dictionary_csv, django_assert_num_queries):
+    Word.objects.create(text='abandon', pos='verb', cefr_level='B2', meaning_vi='', ipa='')
+    importer = VocabularyImporter(update_fields=['ipa', 'meaning_vi'])
+    importer.keys
+
+    rows = list(iter_dictionary_rows(dictionary_csv, 'B2')) * 2
+    # One chunk: savepoint + upsert + release
+    with django_assert_num_queries(3):
+        stats = importer.run(rows)
+
+    assert (stats['created'], stats['updated']) == (2, 4)
+    abandon = Word.objects.get(text='abandon')
+    assert (abandon.ipa, abandon.meaning_vi) == ('əˈbændən', 'bỏ rơi')
+    assert Word.objects.get(text='academic').pos == 'noun'
+    assert Word.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_level_decks_are_synced_in_bulk(user):
+    for i in range(5):
+        Word.objects.create(text=f'w{i}', pos='noun', cefr_level='A1', meaning_vi=f'm{i}')
+
+    stats = create_flashcards_from_words()
+    assert stats['by_level']['A1'] == {'created': 5, 'updated': 0, 'total': 5}
+
+    Word.objects.filter(text='w0').update(meaning_vi='new')
+    Word.objects.create(text='w5', pos='noun', cefr_level='A1', meaning_vi='m5')
+    stats = create_flashcards_from_words()
+
+    assert stats['decks_created'] == 0
+    assert stats['by_level']['A1'] == {'created': 1, 'updated': 1, 'total': 6}
+    deck = FlashcardDeck.objects.get(name='Oxford A1')
+    assert Flashcard.objects.filter(deck=deck).count() == 6
+    assert Flashcard.objects.get(deck=deck, word__text='w0').back_text == 'new'
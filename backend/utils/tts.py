@@ -24,12 +24,13 @@ Available voices for English:
 
 import os
 import asyncio
-import hashlib
 import logging
 from pathlib import Path
 from typing import Optional
 from django.conf import settings
 
+from services.audio_store import get_audio_store, make_audio_key
+
 logger = logging.getLogger(__name__)
 
 # Try to import edge_tts
@@ -94,26 +95,25 @@ class TTSService:
     - Rate and pitch control
     """
     
-    # Audio output directory
-    AUDIO_DIR = Path(settings.MEDIA_ROOT) / 'tts'
+    # Audio output directory (shared content-addressed store)
+    AUDIO_DIR = Path(getattr(
+        settings, 'AUDIO_STORE_ROOT', os.path.join(settings.MEDIA_ROOT, 'audio_store')
+    ))
     
     # Default settings
     DEFAULT_VOICE = TTSVoice.DEFAULT
     DEFAULT_RATE = "+0%"  # Speed: -50% to +100%
     DEFAULT_PITCH = "+0Hz"  # Pitch: -50Hz to +50Hz
     
+    @classmethod
+    def _get_cache_key(cls, text: str, voice: str, rate: str, pitch: str) -> str:
+        """Content key shared with the other TTS services."""
+        return make_audio_key(text, voice, rate=rate, pitch=pitch)
+    
     @classmethod
     def _get_cache_path(cls, text: str, voice: str, rate: str, pitch: str) -> Path:
         """Generate cache file path based on text and settings hash."""
-        # Create hash of text + settings for caching
-        cache_key = f"{text}_{voice}_{rate}_{pitch}"
-        file_hash = hashlib.md5(cache_key.encode()).hexdigest()
-        
-        # Organize by voice
-        voice_dir = cls.AUDIO_DIR / voice
-        voice_dir.mkdir(parents=True, exist_ok=True)
-        
-        return voice_dir / f"{file_hash}.mp3"
+        return get_audio_store().path_for(cls._get_cache_key(text, voice, rate, pitch))
     
     @classmethod
     async def speak_async(
@@ -150,12 +150,16 @@ class TTSService:
         pitch = pitch or cls.DEFAULT_PITCH
         
         # Check cache
-        cache_path = cls._get_cache_path(text, voice, rate, pitch)
+        store = get_audio_store()
+        key = cls._get_cache_key(text, voice, rate, pitch)
         
-        if use_cache and cache_path.exists():
-            logger.debug(f"Using cached audio: {cache_path}")
-            return str(cache_path)
+        if use_cache:
+            cache_path = store.get(key)
+            if cache_path:
+                logger.debug(f"Using cached audio: {cache_path}")
+                return str(cache_path)
         
+        temp_path = store.temp_path(key)
         try:
             # Generate audio
             communicate = edge_tts.Communicate(
@@ -165,12 +169,16 @@ class TTSService:
                 pitch=pitch
             )
             
-            await communicate.save(str(cache_path))
+            await communicate.save(str(temp_path))
+            cache_path = store.commit(
+                key, temp_path, text=text, voice=voice, rate=rate, pitch=pitch, engine='edge'
+            )
             logger.info(f"Generated TTS audio: {cache_path}")
             
             return str(cache_path)
             
         except Exception as e:
+            store.discard(temp_path)
             logger.error(f"TTS generation failed: {e}")
             return None
     
@@ -332,19 +340,7 @@ class TTSService:
         Returns:
             Number of files deleted
         """
-        count = 0
-        
-        if voice:
-            voice_dir = cls.AUDIO_DIR / voice
-            if voice_dir.exists():
-                for f in voice_dir.glob("*.mp3"):
-                    f.unlink()
-                    count += 1
-        else:
-            if cls.AUDIO_DIR.exists():
-                for f in cls.AUDIO_DIR.rglob("*.mp3"):
-                    f.unlink()
-                    count += 1
+        count = get_audio_store().clear(voice=voice)
         
         logger.info(f"Cleared {count} cached audio files")
         return count